@@ -17,18 +17,65 @@ DATABASE_CONFIG = {
     'charset': 'utf8mb4'
 }
 
+# Pool de conexões MySQL (aberto e preenchido no aquecimento durante o login)
+DATABASE_POOL_CONFIG = {
+    'pool_name': 'sports_management',
+    'pool_size': int(os.getenv('DB_POOL_SIZE', 5)),
+    'pool_reset_session': True
+}
+
 # Configurações da aplicação
 APP_CONFIG = {
     'app_name': 'Sistema de Gestão de Competições Esportivas',
     'version': '1.0.0',
-    'debug': os.getenv('DEBUG', 'False').lower() == 'true'
+    'debug': os.getenv('DEBUG', 'False').lower() == 'true',
+    # Mede importações e marcos da inicialização (ver desktop_app/utils/startup_timeline.py)
+    'startup_profile': os.getenv('STARTUP_PROFILE', 'False').lower() == 'true',
+    'startup_log': os.getenv('STARTUP_LOG', str(BASE_DIR / 'logs' / 'startup_timeline.jsonl'))
 }
 
 # Configurações de segurança
 SECURITY_CONFIG = {
     'password_min_length': 6,
     'session_timeout': 3600,  # 1 hora em segundos
-    'max_login_attempts': 5
+    'max_login_attempts': 5,
+    'max_login_attempts_per_source': 20,
+    'login_window_seconds': 900,  # 15 minutos
+    'login_rate_limit_max_keys': 100000,
+    # Arquivo SQLite compartilhado entre processos; vazio = memória do processo
+    'login_rate_limit_db': os.getenv('LOGIN_RATE_LIMIT_DB', ''),
+    'password_hash_target_ms': 250,  # tempo alvo de um hash bcrypt
+    'password_hash_workers': 0  # 0 = um por núcleo, até 4
+}
+
+# Configurações do log de auditoria (user_logs)
+AUDIT_CONFIG = {
+    'queue_size': 10000,
+    'batch_size': 200,
+    'flush_interval_ms': 500,
+    # 'drop' descarta e conta; 'block' espera até block_timeout antes de descartar
+    'full_queue_policy': 'drop',
+    'block_timeout': 0.05,
+    'partitions_ahead': 3,  # partições mensais criadas antecipadamente
+    'retention_months': 0  # 0 = mantém todo o histórico
+}
+
+# Placares e eventos ao vivo (desktop_app/utils/live_events.py)
+LIVE_EVENTS_CONFIG = {
+    # Arquivo SQLite compartilhado por desktop e workers web; vazio = somente no próprio processo
+    'db': os.getenv('LIVE_EVENTS_DB', str(BASE_DIR / 'data' / 'live_events.sqlite3'))
+}
+
+# Réplica local (SQLite) do aplicativo desktop para trabalho offline
+REPLICA_CONFIG = {
+    'enabled': os.getenv('LOCAL_REPLICA', 'False').lower() == 'true',
+    'path': os.getenv('LOCAL_REPLICA_PATH', str(BASE_DIR / 'data' / 'local_replica.db')),
+    # Competições mantidas na réplica (ids separados por vírgula); também via track_competition
+    'competitions': [int(value) for value in os.getenv('LOCAL_REPLICA_COMPETITIONS', '').split(',')
+                     if value.strip()],
+    'sync_interval': 15,  # segundos entre sincronizações
+    'max_backoff': 300,  # espera máxima entre tentativas sem conexão
+    'max_push_attempts': 5  # falhas de dados antes de a alteração virar conflito
 }
 
 # Configurações das modalidades esportivas
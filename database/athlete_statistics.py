@@ -0,0 +1,323 @@
+"""
+Manutenção incremental da tabela athlete_statistics a partir de game_events
+
+Cada inserção ou remoção de eventos gera deltas por (atleta, competição),
+aplicados com um único upsert em lote. O comando de reconstrução recalcula
+tudo a partir de game_events, uma competição por worker:
+
+    python -m database.athlete_statistics rebuild [--workers N] [competition_id ...]
+"""
+import argparse
+import logging
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from database.connection import execute_query, execute_many, get_db_manager
+
+logger = logging.getLogger(__name__)
+
+# Colunas de contagem mantidas na tabela (exceto games_played)
+STAT_COLUMNS = ('goals_scored', 'points_scored', 'points_2', 'points_3', 'free_throws',
+                'yellow_cards', 'red_cards', 'fouls')
+
+# Coluna contadora incrementada por tipo de evento
+EVENT_COUNTERS = {
+    'goal': 'goals_scored',
+    'point_2': 'points_2',
+    'point_3': 'points_3',
+    'free_throw': 'free_throws',
+    'yellow_card': 'yellow_cards',
+    'red_card': 'red_cards',
+    'foul': 'fouls',
+}
+
+# Pontos somados em points_scored por tipo de evento (None = usa points_value do evento)
+EVENT_POINTS = {
+    'goal': None,
+    'point_2': 2,
+    'point_3': 3,
+    'free_throw': 1,
+    'set_point': None,
+}
+
+_UPSERT_QUERY = """
+INSERT INTO athlete_statistics (athlete_id, competition_id, games_played, {columns})
+VALUES (%s, %s, %s, {placeholders})
+ON DUPLICATE KEY UPDATE
+    games_played = GREATEST(games_played + VALUES(games_played), 0),
+    {updates}
+""".format(
+    columns=', '.join(STAT_COLUMNS),
+    placeholders=', '.join(['%s'] * len(STAT_COLUMNS)),
+    updates=',\n    '.join(f"{col} = GREATEST({col} + VALUES({col}), 0)" for col in STAT_COLUMNS)
+)
+
+_REPLACE_QUERY = """
+INSERT INTO athlete_statistics (athlete_id, competition_id, games_played, {columns})
+VALUES (%s, %s, %s, {placeholders})
+""".format(
+    columns=', '.join(STAT_COLUMNS),
+    placeholders=', '.join(['%s'] * len(STAT_COLUMNS))
+)
+
+
+def _points_case() -> str:
+    """Expressão SQL equivalente a EVENT_POINTS, usada na reconstrução"""
+    whens = []
+    for event_type, points in EVENT_POINTS.items():
+        # Mesmo valor do caminho incremental (points_value or 1)
+        value = 'COALESCE(NULLIF(ge.points_value, 0), 1)' if points is None else str(points)
+        whens.append(f"WHEN '{event_type}' THEN {value}")
+    return f"CASE ge.event_type {' '.join(whens)} ELSE 0 END"
+
+
+def _counter_sums() -> str:
+    """Expressões SQL de soma para cada coluna contadora"""
+    by_column = {column: event_type for event_type, column in EVENT_COUNTERS.items()}
+    sums = []
+    for column in STAT_COLUMNS:
+        if column == 'points_scored':
+            sums.append(f"SUM({_points_case()}) AS points_scored")
+        else:
+            sums.append(f"SUM(ge.event_type = '{by_column[column]}') AS {column}")
+    return ',\n       '.join(sums)
+
+
+_AGGREGATE_QUERY = f"""
+SELECT ge.athlete_id, g.competition_id,
+       COUNT(DISTINCT ge.game_id) AS games_played,
+       {_counter_sums()}
+FROM game_events ge
+JOIN games g ON g.id = ge.game_id
+WHERE g.competition_id = %s AND ge.athlete_id IS NOT NULL
+GROUP BY ge.athlete_id, g.competition_id
+"""
+
+
+def _field(event: Any, name: str):
+    """Lê um campo de um evento em dict (linha do banco) ou GameEvent"""
+    if isinstance(event, dict):
+        value = event.get(name)
+    else:
+        value = getattr(event, name, None)
+    return getattr(value, 'value', value)
+
+
+class AthleteStatisticsAggregator:
+    """Agregador incremental das estatísticas de atletas por competição"""
+
+    def __init__(self):
+        self._listeners: List[Callable[[int, Dict[int, Dict[str, int]]], None]] = []
+
+    def add_listener(self, callback: Callable[[int, Dict[int, Dict[str, int]]], None]):
+        """
+        Registra callback chamado após cada upsert incremental
+
+        O callback recebe (competition_id, {athlete_id: deltas}).
+        """
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        """Remove callback registrado"""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def apply_events_inserted(self, game_id: int, events: Sequence[Any]) -> bool:
+        """
+        Atualiza as estatísticas após a gravação de eventos de um jogo
+
+        Deve ser chamado depois que os eventos já estão em game_events, para
+        que a primeira participação do atleta no jogo conte em games_played.
+        """
+        return self._apply(game_id, events, sign=1)
+
+    def apply_events_deleted(self, game_id: int, events: Sequence[Any]) -> bool:
+        """
+        Atualiza as estatísticas após a remoção de eventos de um jogo
+
+        Deve ser chamado depois da remoção; atletas sem eventos restantes no
+        jogo têm games_played decrementado.
+        """
+        return self._apply(game_id, events, sign=-1)
+
+    def _apply(self, game_id: int, events: Sequence[Any], sign: int) -> bool:
+        try:
+            events = [e for e in events if _field(e, 'athlete_id')]
+            if not events:
+                return True
+
+            competition_id = self._get_competition_id(game_id)
+            if competition_id is None:
+                return False
+
+            deltas = self._compute_deltas(events, sign)
+            self._apply_games_played(game_id, events, deltas, sign)
+
+            rows = []
+            for athlete_id, delta in deltas.items():
+                rows.append((athlete_id, competition_id, delta['games_played'])
+                            + tuple(delta[col] for col in STAT_COLUMNS))
+            execute_many(_UPSERT_QUERY, rows)
+
+            for listener in self._listeners:
+                try:
+                    listener(competition_id, deltas)
+                except Exception as e:
+                    logger.error(f"Erro em listener de estatísticas: {e}")
+
+            return True
+
+        except Exception as e:
+            logger.error(f"Erro ao atualizar estatísticas de atletas: {e}")
+            return False
+
+    @staticmethod
+    def _compute_deltas(events: Iterable[Any], sign: int) -> Dict[int, Dict[str, int]]:
+        """Converte eventos em deltas por atleta"""
+        deltas: Dict[int, Dict[str, int]] = defaultdict(lambda: dict.fromkeys(('games_played',) + STAT_COLUMNS, 0))
+
+        for event in events:
+            event_type = _field(event, 'event_type')
+            delta = deltas[_field(event, 'athlete_id')]
+
+            counter = EVENT_COUNTERS.get(event_type)
+            if counter:
+                delta[counter] += sign
+
+            if event_type in EVENT_POINTS:
+                points = EVENT_POINTS[event_type]
+                if points is None:
+                    points = _field(event, 'points_value') or 1
+                delta['points_scored'] += sign * points
+
+        return deltas
+
+    @staticmethod
+    def _apply_games_played(game_id: int, events: Sequence[Any],
+                            deltas: Dict[int, Dict[str, int]], sign: int):
+        """
+        Ajusta games_played com uma única consulta agrupada
+
+        Inserção: o atleta entrou no jogo se todos os seus eventos no jogo são
+        os recém-inseridos. Remoção: saiu se não restou nenhum evento.
+        """
+        batch_counts: Dict[int, int] = defaultdict(int)
+        for event in events:
+            batch_counts[_field(event, 'athlete_id')] += 1
+
+        athlete_ids = list(batch_counts)
+        placeholders = ', '.join(['%s'] * len(athlete_ids))
+        query = f"""
+        SELECT athlete_id, COUNT(*) as events FROM game_events
+        WHERE game_id = %s AND athlete_id IN ({placeholders})
+        GROUP BY athlete_id
+        """
+        results = execute_query(query, (game_id, *athlete_ids), fetch=True) or []
+        remaining = {row['athlete_id']: row['events'] for row in results}
+
+        for athlete_id, batch_count in batch_counts.items():
+            current = remaining.get(athlete_id, 0)
+            if sign > 0 and current == batch_count:
+                deltas[athlete_id]['games_played'] += 1
+            elif sign < 0 and current == 0:
+                deltas[athlete_id]['games_played'] -= 1
+
+    @staticmethod
+    def _get_competition_id(game_id: int) -> Optional[int]:
+        result = execute_query("SELECT competition_id FROM games WHERE id = %s", (game_id,), fetch=True)
+        return result[0]['competition_id'] if result else None
+
+    def rebuild_competition(self, competition_id: int) -> int:
+        """
+        Recalcula as estatísticas de uma competição a partir de game_events
+
+        Executa em uma única transação para que leitores nunca vejam a
+        competição parcialmente reconstruída.
+
+        Returns:
+            Número de atletas gravados
+        """
+        with get_db_manager().get_connection() as connection:
+            cursor = connection.cursor(dictionary=True)
+            try:
+                cursor.execute(_AGGREGATE_QUERY, (competition_id,))
+                rows = [
+                    (row['athlete_id'], row['competition_id'], row['games_played'])
+                    + tuple(int(row[col] or 0) for col in STAT_COLUMNS)
+                    for row in cursor.fetchall()
+                ]
+
+                cursor.execute("DELETE FROM athlete_statistics WHERE competition_id = %s", (competition_id,))
+                if rows:
+                    cursor.executemany(_REPLACE_QUERY, rows)
+                connection.commit()
+                return len(rows)
+
+            except Exception:
+                connection.rollback()
+                raise
+            finally:
+                cursor.close()
+
+    def rebuild_all(self, competition_ids: Optional[Sequence[int]] = None,
+                    workers: int = 4) -> Dict[int, Any]:
+        """
+        Reconstrói as estatísticas de várias competições em paralelo
+
+        Cada worker usa sua própria conexão e reconstrói uma competição por vez.
+
+        Returns:
+            Dicionário {competition_id: atletas gravados ou mensagem de erro}
+        """
+        if competition_ids is None:
+            results = execute_query("SELECT id FROM competitions ORDER BY id", fetch=True) or []
+            competition_ids = [row['id'] for row in results]
+
+        summary: Dict[int, Any] = {}
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            futures = {executor.submit(self.rebuild_competition, comp_id): comp_id
+                       for comp_id in competition_ids}
+            for future in as_completed(futures):
+                comp_id = futures[future]
+                try:
+                    summary[comp_id] = future.result()
+                except Exception as e:
+                    logger.error(f"Erro ao reconstruir estatísticas da competição {comp_id}: {e}")
+                    summary[comp_id] = f"erro: {e}"
+
+        return summary
+
+
+# Instância global do agregador
+athlete_statistics_aggregator = AthleteStatisticsAggregator()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Linha de comando para reparo da tabela athlete_statistics"""
+    parser = argparse.ArgumentParser(description="Manutenção da tabela athlete_statistics")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    rebuild = subparsers.add_parser('rebuild', help="Recalcula estatísticas a partir de game_events")
+    rebuild.add_argument('competition_ids', nargs='*', type=int,
+                         help="Competições a reconstruir (padrão: todas)")
+    rebuild.add_argument('--workers', type=int, default=4, help="Número de workers paralelos")
+
+    args = parser.parse_args(argv)
+
+    summary = athlete_statistics_aggregator.rebuild_all(args.competition_ids or None, args.workers)
+    failures = 0
+    for comp_id in sorted(summary):
+        result = summary[comp_id]
+        if isinstance(result, int):
+            print(f"Competição {comp_id}: {result} atleta(s)")
+        else:
+            failures += 1
+            print(f"Competição {comp_id}: {result}")
+
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -2,27 +2,80 @@
 Gerenciador de conexão com o banco de dados MySQL
 """
 import mysql.connector
-from mysql.connector import Error
+from mysql.connector import Error, pooling
+from mysql.connector.errors import PoolError
 import logging
+import os
+import threading
+import time
 from typing import Optional, Dict, Any
 from contextlib import contextmanager
 
-from config.settings import DATABASE_CONFIG
+from config.settings import DATABASE_CONFIG, DATABASE_POOL_CONFIG
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Espera (segundos) antes de tentar criar o pool de novo após uma falha
+POOL_RETRY_INTERVAL = 30
+
 
 class DatabaseManager:
     """Gerenciador de conexões com o banco de dados"""
     
-    def __init__(self):
+    def __init__(self, pool_config: Dict[str, Any] = DATABASE_POOL_CONFIG):
         self._connection = None
         self._connection_pool = None
+        self._pool_config = pool_config
+        self._pool_pid = None
+        self._pool_lock = threading.Lock()
+        self._pool_retry_at = 0.0
+    
+    def _get_pool(self) -> Optional[pooling.MySQLConnectionPool]:
+        """Cria o pool na primeira chamada (já com pool_size conexões abertas)"""
+        if self._pool_config.get('pool_size', 0) <= 0:
+            return None
+        # Conexões não atravessam um fork: o processo filho cria o próprio pool
+        if self._connection_pool is not None and self._pool_pid == os.getpid():
+            return self._connection_pool
+        # Banco fora do ar: não refaz a tentativa (e o timeout) a cada chamada
+        if time.monotonic() < self._pool_retry_at:
+            return None
+        with self._pool_lock:
+            if self._connection_pool is None or self._pool_pid != os.getpid():
+                if time.monotonic() < self._pool_retry_at:
+                    return None
+                try:
+                    self._connection_pool = pooling.MySQLConnectionPool(
+                        **self._pool_config, **DATABASE_CONFIG
+                    )
+                    self._pool_pid = os.getpid()
+                    self._pool_retry_at = 0.0
+                    logger.info("Pool de conexões MySQL criado com sucesso")
+                except Error as e:
+                    # Banco indisponível: nova tentativa só após POOL_RETRY_INTERVAL
+                    logger.error(f"Erro ao criar pool de conexões MySQL: {e}")
+                    self._connection_pool = None
+                    self._pool_retry_at = time.monotonic() + POOL_RETRY_INTERVAL
+                    return None
+            return self._connection_pool
+    
+    def warm_up(self) -> bool:
+        """Abre o pool de conexões e confirma que o banco responde"""
+        self._get_pool()
+        return self.test_connection()
         
     def create_connection(self) -> Optional[mysql.connector.MySQLConnection]:
-        """Cria uma nova conexão com o banco de dados"""
+        """Obtém uma conexão do pool ou, se ele estiver esgotado ou indisponível, abre uma nova"""
+        pool = self._get_pool()
+        if pool is not None:
+            try:
+                return pool.get_connection()
+            except PoolError:
+                pass
+            except Error as e:
+                logger.error(f"Erro ao obter conexão do pool: {e}")
         try:
             connection = mysql.connector.connect(**DATABASE_CONFIG)
             if connection.is_connected():
@@ -48,7 +101,10 @@ class DatabaseManager:
                 connection.rollback()
             raise
         finally:
-            if connection and connection.is_connected():
+            if isinstance(connection, pooling.PooledMySQLConnection):
+                # Devolve ao pool, que reconecta se a conexão tiver caído
+                connection.close()
+            elif connection and connection.is_connected():
                 connection.close()
     
     def execute_query(self, query: str, params: tuple = None, fetch: bool = False) -> Optional[Any]:
@@ -42,7 +42,11 @@ CREATE TABLE IF NOT EXISTS competitions (
     created_by INT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-    FOREIGN KEY (created_by) REFERENCES users(id)
+    FOREIGN KEY (created_by) REFERENCES users(id),
+    version INT NOT NULL DEFAULT 1,
+    client_uuid CHAR(36) NULL,
+    UNIQUE KEY unique_competitions_client_uuid (client_uuid),
+    INDEX idx_competitions_updated_at (updated_at)
 );
 
 -- Tabela de equipes
@@ -57,7 +61,12 @@ CREATE TABLE IF NOT EXISTS teams (
     contact_phone VARCHAR(20),
     contact_email VARCHAR(100),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    is_active BOOLEAN DEFAULT TRUE
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    is_active BOOLEAN DEFAULT TRUE,
+    version INT NOT NULL DEFAULT 1,
+    client_uuid CHAR(36) NULL,
+    UNIQUE KEY unique_teams_client_uuid (client_uuid),
+    INDEX idx_teams_updated_at (updated_at)
 );
 
 -- Tabela de atletas
@@ -75,9 +84,14 @@ CREATE TABLE IF NOT EXISTS athletes (
     emergency_phone VARCHAR(20),
     is_captain BOOLEAN DEFAULT FALSE,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     is_active BOOLEAN DEFAULT TRUE,
     FOREIGN KEY (team_id) REFERENCES teams(id),
-    UNIQUE KEY unique_jersey_team (team_id, jersey_number)
+    UNIQUE KEY unique_jersey_team (team_id, jersey_number),
+    version INT NOT NULL DEFAULT 1,
+    client_uuid CHAR(36) NULL,
+    UNIQUE KEY unique_athletes_client_uuid (client_uuid),
+    INDEX idx_athletes_updated_at (updated_at)
 );
 
 -- Tabela de comissão técnica
@@ -130,7 +144,11 @@ CREATE TABLE IF NOT EXISTS games (
     FOREIGN KEY (competition_id) REFERENCES competitions(id),
     FOREIGN KEY (home_team_id) REFERENCES teams(id),
     FOREIGN KEY (away_team_id) REFERENCES teams(id),
-    FOREIGN KEY (venue_id) REFERENCES venues(id)
+    FOREIGN KEY (venue_id) REFERENCES venues(id),
+    version INT NOT NULL DEFAULT 1,
+    client_uuid CHAR(36) NULL,
+    UNIQUE KEY unique_games_client_uuid (client_uuid),
+    INDEX idx_games_updated_at (updated_at)
 );
 
 -- Tabela de eventos do jogo (gols, cartões, pontos, etc.)
@@ -144,8 +162,13 @@ CREATE TABLE IF NOT EXISTS game_events (
     points_value INT DEFAULT 1,
     description TEXT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    version INT NOT NULL DEFAULT 1,
+    client_uuid CHAR(36) NULL,
+    UNIQUE KEY unique_game_events_client_uuid (client_uuid),
     FOREIGN KEY (game_id) REFERENCES games(id),
-    FOREIGN KEY (athlete_id) REFERENCES athletes(id)
+    FOREIGN KEY (athlete_id) REFERENCES athletes(id),
+    INDEX idx_game_events_updated_at (updated_at)
 );
 
 -- Tabela de suspensões
@@ -209,6 +232,48 @@ CREATE TABLE IF NOT EXISTS standings (
     UNIQUE KEY unique_team_competition_standing (competition_id, team_id)
 );
 
+-- Tabela de auditoria (particionada por mês)
+-- Tabelas particionadas não aceitam chaves estrangeiras e exigem a coluna
+-- de particionamento em toda chave única, por isso a chave (id, created_at).
+-- As partições mensais são criadas a partir de p_future pelo log de auditoria.
+CREATE TABLE IF NOT EXISTS user_logs (
+    id BIGINT AUTO_INCREMENT,
+    user_id INT NULL,
+    action VARCHAR(50) NOT NULL,
+    entity_type VARCHAR(50) NULL,
+    entity_id INT NULL,
+    details JSON NULL,
+    ip_address VARCHAR(45),
+    created_at DATETIME NOT NULL,
+    PRIMARY KEY (id, created_at),
+    KEY idx_user_logs_user (user_id, created_at),
+    KEY idx_user_logs_entity (entity_type, entity_id, created_at)
+)
+PARTITION BY RANGE COLUMNS (created_at) (
+    PARTITION p_future VALUES LESS THAN (MAXVALUE)
+);
+
+-- Versão das linhas replicadas pelo aplicativo desktop (réplica local):
+-- toda alteração incrementa version, e o envio da réplica só aplica uma
+-- alteração se a versão ainda for a que ela leu (detecção de conflito).
+-- client_uuid identifica as linhas inseridas offline: se a resposta de um
+-- INSERT se perder, o reenvio encontra a linha em vez de duplicá-la.
+-- Gatilhos de um único comando, pois o script é dividido em ';'.
+CREATE TRIGGER IF NOT EXISTS competitions_version BEFORE UPDATE ON competitions
+FOR EACH ROW SET NEW.version = OLD.version + 1;
+
+CREATE TRIGGER IF NOT EXISTS teams_version BEFORE UPDATE ON teams
+FOR EACH ROW SET NEW.version = OLD.version + 1;
+
+CREATE TRIGGER IF NOT EXISTS athletes_version BEFORE UPDATE ON athletes
+FOR EACH ROW SET NEW.version = OLD.version + 1;
+
+CREATE TRIGGER IF NOT EXISTS games_version BEFORE UPDATE ON games
+FOR EACH ROW SET NEW.version = OLD.version + 1;
+
+CREATE TRIGGER IF NOT EXISTS game_events_version BEFORE UPDATE ON game_events
+FOR EACH ROW SET NEW.version = OLD.version + 1;
+
 -- Inserir usuário master padrão
 INSERT IGNORE INTO users (username, password_hash, user_type, full_name, email) 
 VALUES ('admin', SHA2('admin123', 256), 'master', 'Administrador Master', 'admin@sistema.com');
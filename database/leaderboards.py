@@ -0,0 +1,342 @@
+"""
+Rankings de atletas (artilharia, cestinhas, cartões, faltas)
+
+As consultas top-k usam seleção por heap sobre athlete_statistics, que já é
+mantida agregada. Cada escopo carregado (competição, modalidade ou geral)
+guarda as linhas dos atletas em memória e um índice top-k por estatística,
+atualizado incrementalmente pelos deltas do agregador de estatísticas.
+
+Alterações feitas por outros clientes não passam pelo agregador local: a
+cada REFRESH_INTERVAL segundos, a consulta a um escopo confere a marca
+d'água (MAX(updated_at) e COUNT(*)) de athlete_statistics e relê apenas os
+atletas com linhas alteradas desde a última leitura.
+"""
+import heapq
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from database.connection import execute_query
+from database.athlete_statistics import STAT_COLUMNS, athlete_statistics_aggregator
+
+logger = logging.getLogger(__name__)
+
+# Estatísticas disponíveis para ranking (chave -> colunas somadas)
+LEADERBOARD_STATS: Dict[str, Tuple[str, ...]] = {
+    'points': ('points_scored',),
+    'goals': ('goals_scored',),
+    'points_2': ('points_2',),
+    'three_pointers': ('points_3',),
+    'free_throws': ('free_throws',),
+    'yellow_cards': ('yellow_cards',),
+    'red_cards': ('red_cards',),
+    'cards': ('yellow_cards', 'red_cards'),
+    'fouls': ('fouls',),
+}
+
+# Tamanho do índice top-k mantido por estatística e escopo
+INDEX_SIZE = 50
+
+# Intervalo (s) entre conferências da marca d'água de um escopo
+REFRESH_INTERVAL = 30
+
+_ROWS_QUERY = """
+SELECT s.athlete_id, MAX(a.name) as athlete_name, MAX(a.team_id) as team_id,
+       MAX(t.name) as team_name,
+       SUM(s.games_played) as games_played, {sums}
+FROM athlete_statistics s
+JOIN athletes a ON a.id = s.athlete_id
+LEFT JOIN teams t ON t.id = a.team_id
+JOIN competitions c ON c.id = s.competition_id
+{where}
+GROUP BY s.athlete_id
+""".replace('{sums}', ', '.join(f"SUM(s.{col}) as {col}" for col in STAT_COLUMNS))
+
+_VERSION_QUERY = """
+SELECT MAX(s.updated_at) as last_update, COUNT(*) as total
+FROM athlete_statistics s
+JOIN competitions c ON c.id = s.competition_id
+{where}
+"""
+
+_CHANGED_FILTER = ("s.athlete_id IN (SELECT athlete_id FROM athlete_statistics "
+                   "WHERE updated_at >= %s)")
+
+_ATHLETES_QUERY = """
+SELECT a.id as athlete_id, a.name as athlete_name, a.team_id, t.name as team_name
+FROM athletes a
+LEFT JOIN teams t ON t.id = a.team_id
+WHERE a.id IN ({ids})
+"""
+
+
+def _stat_value(row: Dict[str, Any], stat: str) -> int:
+    return sum(row[col] for col in LEADERBOARD_STATS[stat])
+
+
+def _rank_key(stat: str):
+    """Chave de ordenação: valor desc, menos jogos, menor id"""
+    return lambda row: (_stat_value(row, stat), -row['games_played'], -row['athlete_id'])
+
+
+class _ScopeBoard:
+    """Linhas e índices top-k de um escopo (competição, modalidade ou geral)"""
+
+    def __init__(self, rows: List[Dict[str, Any]], version: Tuple = (None, 0)):
+        self.rows: Dict[int, Dict[str, Any]] = {row['athlete_id']: row for row in rows}
+        self.indexes: Dict[str, List[Dict[str, Any]]] = {}
+        self.version = version  # (MAX(updated_at), COUNT(*)) do escopo na última leitura
+        self.checked_at = time.monotonic()
+
+    def merge(self, rows: List[Dict[str, Any]]):
+        """Substitui as linhas relidas do banco; os índices são refeitos sob demanda"""
+        for row in rows:
+            current = self.rows.get(row['athlete_id'])
+            if current is None:
+                self.rows[row['athlete_id']] = row
+            else:
+                current.update(row)
+        if rows:
+            self.indexes.clear()
+
+    def index(self, stat: str) -> List[Dict[str, Any]]:
+        """Índice top-k da estatística, construído sob demanda"""
+        index = self.indexes.get(stat)
+        if index is None:
+            index = heapq.nlargest(INDEX_SIZE, self.rows.values(), key=_rank_key(stat))
+            self.indexes[stat] = index
+        return index
+
+    def top(self, stat: str, k: int) -> List[Dict[str, Any]]:
+        if k <= INDEX_SIZE:
+            return [row for row in self.index(stat)[:k] if _stat_value(row, stat) > 0]
+        ranked = heapq.nlargest(k, self.rows.values(), key=_rank_key(stat))
+        return [row for row in ranked if _stat_value(row, stat) > 0]
+
+    def apply(self, athlete_id: int, delta: Dict[str, int]) -> bool:
+        """
+        Aplica o delta de um atleta e ajusta os índices afetados
+
+        Returns:
+            False se o atleta não está carregado no escopo
+        """
+        row = self.rows.get(athlete_id)
+        if row is None:
+            return False
+
+        old_keys = {stat: _rank_key(stat)(row) for stat in self.indexes}
+
+        row['games_played'] = max(row['games_played'] + delta.get('games_played', 0), 0)
+        for col in STAT_COLUMNS:
+            row[col] = max(row[col] + delta.get(col, 0), 0)
+
+        for stat, index in self.indexes.items():
+            key = _rank_key(stat)
+            new_key = key(row)
+            if new_key == old_keys[stat]:
+                continue
+
+            in_index = any(entry is row for entry in index)
+
+            if in_index and new_key < old_keys[stat] and len(index) >= INDEX_SIZE:
+                # Um atleta fora do índice pode ter passado à frente
+                self.indexes[stat] = heapq.nlargest(INDEX_SIZE, self.rows.values(), key=key)
+            elif in_index:
+                index.sort(key=key, reverse=True)
+            elif len(index) < INDEX_SIZE or new_key > key(index[-1]):
+                index.append(row)
+                index.sort(key=key, reverse=True)
+                del index[INDEX_SIZE:]
+
+        return True
+
+
+class LeaderboardService:
+    """Serviço de rankings top-k com índices em cache por escopo"""
+
+    def __init__(self, refresh_interval: float = REFRESH_INTERVAL):
+        self.refresh_interval = refresh_interval
+        self._boards: Dict[Tuple, _ScopeBoard] = {}
+        self._competition_sports: Dict[int, str] = {}
+        self._lock = threading.RLock()
+        athlete_statistics_aggregator.add_listener(self._on_statistics_changed)
+
+    def top_competition(self, competition_id: int, stat: str = 'points',
+                        k: int = 10) -> List[Dict[str, Any]]:
+        """Top-k de uma competição"""
+        return self._top(('competition', competition_id), stat, k)
+
+    def top_sport(self, sport: str, stat: str = 'points', k: int = 10) -> List[Dict[str, Any]]:
+        """Top-k somando todas as competições de uma modalidade"""
+        return self._top(('sport', getattr(sport, 'value', sport)), stat, k)
+
+    def top_overall(self, stat: str = 'points', k: int = 10) -> List[Dict[str, Any]]:
+        """Top-k geral, somando todas as competições"""
+        return self._top(('overall',), stat, k)
+
+    def get_ranking(self, competition_id: int = None, stat: str = 'points',
+                    team_id: int = None) -> List[Dict[str, Any]]:
+        """Ranking completo de uma competição (ou geral), opcionalmente de uma equipe"""
+        if stat not in LEADERBOARD_STATS:
+            raise ValueError(f"Estatística inválida para ranking: {stat}")
+
+        scope = ('competition', competition_id) if competition_id else ('overall',)
+        with self._lock:
+            board = self._get_board(scope)
+
+            rows = [row for row in board.rows.values()
+                    if team_id is None or row['team_id'] == team_id]
+            rows.sort(key=_rank_key(stat), reverse=True)
+            return [
+                {**row, 'position': position, 'value': _stat_value(row, stat)}
+                for position, row in enumerate(rows, 1)
+            ]
+
+    def get_available_stats(self) -> List[str]:
+        """Estatísticas aceitas pelas consultas de ranking"""
+        return list(LEADERBOARD_STATS)
+
+    def invalidate(self, competition_id: int = None):
+        """Descarta os índices em cache (de uma competição ou todos)"""
+        with self._lock:
+            if competition_id is None:
+                self._boards.clear()
+                return
+            self._boards.pop(('competition', competition_id), None)
+            self._boards.pop(('sport', self._competition_sports.get(competition_id)), None)
+            self._boards.pop(('overall',), None)
+
+    def _top(self, scope: Tuple, stat: str, k: int) -> List[Dict[str, Any]]:
+        if stat not in LEADERBOARD_STATS:
+            raise ValueError(f"Estatística inválida para ranking: {stat}")
+
+        with self._lock:
+            board = self._get_board(scope)
+
+            return [
+                {**row, 'position': position, 'value': _stat_value(row, stat)}
+                for position, row in enumerate(board.top(stat, k), 1)
+            ]
+
+    def _get_board(self, scope: Tuple) -> _ScopeBoard:
+        board = self._boards.get(scope)
+        if board is None:
+            # Versão lida antes das linhas: alterações no meio aparecem na próxima conferência
+            version = self._scope_version(scope)
+            board = _ScopeBoard(self._load_rows(scope), version)
+            self._boards[scope] = board
+        elif time.monotonic() - board.checked_at >= self.refresh_interval:
+            board = self._refresh_board(scope, board)
+        return board
+
+    def _refresh_board(self, scope: Tuple, board: _ScopeBoard) -> _ScopeBoard:
+        """Relê os atletas do escopo alterados por outros clientes"""
+        board.checked_at = time.monotonic()
+        version = self._scope_version(scope)
+        if version == board.version:
+            return board
+
+        last_update, total = board.version
+        if last_update is None or version[1] != total:
+            # Linhas removidas (ex.: reconstrução) não aparecem por data: relê tudo
+            board = _ScopeBoard(self._load_rows(scope), version)
+            self._boards[scope] = board
+            return board
+
+        board.merge(self._load_rows(scope, since=last_update))
+        board.version = version
+        return board
+
+    @staticmethod
+    def _scope_filter(scope: Tuple) -> Tuple[List[str], List[Any]]:
+        if scope[0] == 'competition':
+            return ["s.competition_id = %s"], [scope[1]]
+        if scope[0] == 'sport':
+            return ["c.sport = %s"], [scope[1]]
+        return [], []
+
+    def _scope_version(self, scope: Tuple) -> Tuple:
+        conditions, params = self._scope_filter(scope)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        result = execute_query(_VERSION_QUERY.replace('{where}', where),
+                               tuple(params) or None, fetch=True)
+        if not result:
+            return (None, 0)
+        return (result[0]['last_update'], int(result[0]['total'] or 0))
+
+    def _load_rows(self, scope: Tuple, since: Any = None) -> List[Dict[str, Any]]:
+        conditions, params = self._scope_filter(scope)
+        if since is not None:
+            # >= pois várias linhas podem ter o mesmo segundo; relidas, chegam iguais
+            conditions.append(_CHANGED_FILTER)
+            params.append(since)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        results = execute_query(_ROWS_QUERY.replace('{where}', where),
+                                tuple(params) or None, fetch=True) or []
+        return [
+            {
+                'athlete_id': row['athlete_id'],
+                'athlete_name': row['athlete_name'],
+                'team_id': row['team_id'],
+                'team_name': row['team_name'] or "N/A",
+                'games_played': int(row['games_played'] or 0),
+                **{col: int(row[col] or 0) for col in STAT_COLUMNS}
+            }
+            for row in results
+        ]
+
+    @staticmethod
+    def _load_athletes(athlete_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Linhas zeradas dos atletas que ainda não estão em um escopo"""
+        placeholders = ', '.join(['%s'] * len(athlete_ids))
+        results = execute_query(_ATHLETES_QUERY.replace('{ids}', placeholders),
+                                tuple(athlete_ids), fetch=True) or []
+        return {
+            row['athlete_id']: {
+                'athlete_id': row['athlete_id'],
+                'athlete_name': row['athlete_name'],
+                'team_id': row['team_id'],
+                'team_name': row['team_name'] or "N/A",
+                'games_played': 0,
+                **{col: 0 for col in STAT_COLUMNS}
+            }
+            for row in results
+        }
+
+    def _get_sport(self, competition_id: int) -> Optional[str]:
+        sport = self._competition_sports.get(competition_id)
+        if sport is None:
+            result = execute_query("SELECT sport FROM competitions WHERE id = %s",
+                                   (competition_id,), fetch=True)
+            if result:
+                sport = result[0]['sport']
+                self._competition_sports[competition_id] = sport
+        return sport
+
+    def _on_statistics_changed(self, competition_id: int, deltas: Dict[int, Dict[str, int]]):
+        """Aplica deltas do agregador aos escopos carregados que contêm a competição"""
+        with self._lock:
+            if not self._boards:
+                return
+
+            scopes = [('competition', competition_id), ('overall',)]
+            if any(scope[0] == 'sport' for scope in self._boards):
+                scopes.append(('sport', self._get_sport(competition_id)))
+
+            boards = [self._boards[scope] for scope in scopes if scope in self._boards]
+            missing = sorted({athlete_id for board in boards for athlete_id in deltas
+                              if athlete_id not in board.rows})
+            new_rows = self._load_athletes(missing) if missing else {}
+
+            for board in boards:
+                for athlete_id, delta in deltas.items():
+                    if athlete_id not in board.rows and athlete_id in new_rows:
+                        # Atleta novo no escopo: entra zerado e recebe o delta
+                        board.rows[athlete_id] = dict(new_rows[athlete_id])
+                    board.apply(athlete_id, delta)
+
+
+# Instância global do serviço de rankings
+leaderboard_service = LeaderboardService()
@@ -689,6 +689,113 @@ class Game:
             return False
 
 
+@dataclass
+class GameEvent:
+    """Modelo para eventos de jogo (gols, pontos, cartões, faltas)"""
+    id: Optional[int] = None
+    game_id: int = 0
+    athlete_id: Optional[int] = None
+    event_type: EventType = EventType.GOAL
+    minute_occurred: Optional[int] = None
+    set_number: int = 1
+    points_value: int = 1
+    description: str = ""
+    created_at: Optional[datetime] = None
+    
+    @classmethod
+    def get_by_game(cls, game_id: int) -> List['GameEvent']:
+        """Retorna eventos de um jogo em ordem cronológica"""
+        query = """
+        SELECT * FROM game_events 
+        WHERE game_id = %s 
+        ORDER BY set_number, minute_occurred, id
+        """
+        results = execute_query(query, (game_id,), fetch=True)
+        
+        events = []
+        if results:
+            for event_data in results:
+                events.append(cls.from_row(event_data))
+        return events
+    
+    @classmethod
+    def from_row(cls, event_data: Dict[str, Any]) -> 'GameEvent':
+        """Cria o evento a partir de uma linha da tabela game_events"""
+        return cls(
+            id=event_data['id'],
+            game_id=event_data['game_id'],
+            athlete_id=event_data['athlete_id'],
+            event_type=EventType(event_data['event_type']),
+            minute_occurred=event_data['minute_occurred'],
+            set_number=event_data['set_number'],
+            points_value=event_data['points_value'],
+            description=event_data['description'],
+            created_at=event_data['created_at']
+        )
+
+
+@dataclass
+class AthleteStatistics:
+    """Estatísticas consolidadas de um atleta em uma competição"""
+    athlete_id: int = 0
+    competition_id: int = 0
+    games_played: int = 0
+    goals_scored: int = 0
+    points_scored: int = 0
+    points_2: int = 0
+    points_3: int = 0
+    free_throws: int = 0
+    yellow_cards: int = 0
+    red_cards: int = 0
+    fouls: int = 0
+    updated_at: Optional[datetime] = None
+    
+    @classmethod
+    def get(cls, athlete_id: int, competition_id: int) -> Optional['AthleteStatistics']:
+        """Busca as estatísticas pela chave única (atleta, competição)"""
+        query = """
+        SELECT * FROM athlete_statistics 
+        WHERE athlete_id = %s AND competition_id = %s
+        """
+        result = execute_query(query, (athlete_id, competition_id), fetch=True)
+        
+        if result:
+            return cls.from_row(result[0])
+        return None
+    
+    @classmethod
+    def get_by_competition(cls, competition_id: int) -> List['AthleteStatistics']:
+        """Retorna as estatísticas de todos os atletas de uma competição"""
+        query = "SELECT * FROM athlete_statistics WHERE competition_id = %s"
+        results = execute_query(query, (competition_id,), fetch=True)
+        return [cls.from_row(row) for row in results] if results else []
+    
+    @classmethod
+    def get_by_athlete(cls, athlete_id: int) -> List['AthleteStatistics']:
+        """Retorna as estatísticas de um atleta em todas as competições"""
+        query = "SELECT * FROM athlete_statistics WHERE athlete_id = %s"
+        results = execute_query(query, (athlete_id,), fetch=True)
+        return [cls.from_row(row) for row in results] if results else []
+    
+    @classmethod
+    def from_row(cls, stats_data: Dict[str, Any]) -> 'AthleteStatistics':
+        """Cria o objeto a partir de uma linha da tabela athlete_statistics"""
+        return cls(
+            athlete_id=stats_data['athlete_id'],
+            competition_id=stats_data['competition_id'],
+            games_played=stats_data['games_played'],
+            goals_scored=stats_data['goals_scored'],
+            points_scored=stats_data['points_scored'],
+            points_2=stats_data['points_2'],
+            points_3=stats_data['points_3'],
+            free_throws=stats_data['free_throws'],
+            yellow_cards=stats_data['yellow_cards'],
+            red_cards=stats_data['red_cards'],
+            fouls=stats_data['fouls'],
+            updated_at=stats_data['updated_at']
+        )
+
+
 # Funções auxiliares para operações específicas
 
 def suggest_competition_format(num_teams: int) -> CompetitionFormat:
@@ -1,23 +1,33 @@
 """
 Controllers para o aplicativo desktop
+
+Cada controller é importado no primeiro acesso, para que a janela de
+login não espere o carregamento dos controllers que ainda não usa.
 """
+from importlib import import_module
+
+_EXPORTS = {
+    'auth_controller': '.auth_controller',
+    'competition_controller': '.competition_controller',
+    'game_controller': '.game_controller',
+    'game_event_controller': '.game_event_controller',
+    'import_controller': '.import_controller',
+    'player_controller': '.player_controller',
+    'report_controller': '.report_controller',
+    'team_controller': '.team_controller',
+    'user_controller': '.user_controller'
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
 
-from .auth_controller import auth_controller
-from .competition_controller import competition_controller
-from .game_controller import game_controller
-from .game_event_controller import game_event_controller
-from .player_controller import player_controller
-from .report_controller import report_controller
-from .team_controller import team_controller
-from .user_controller import user_controller
 
-__all__ = [
-    'auth_controller',
-    'competition_controller',
-    'game_controller',
-    'game_event_controller',
-    'player_controller',
-    'report_controller',
-    'team_controller',
-    'user_controller'
-]
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,12 +1,15 @@
 """
 Controller para autenticação de usuários
 """
-import hashlib
-from typing import Optional, Tuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional, Tuple
 from datetime import datetime, timedelta
 
 from database.models import User, UserType
 from database.connection import execute_query
+from desktop_app.utils.audit_log import audit_log
+from desktop_app.utils.password_hasher import password_hasher
+from desktop_app.utils.rate_limiter import login_throttle
 
 
 class AuthController:
@@ -16,8 +19,10 @@ class AuthController:
         self.current_user: Optional[User] = None
         self.session_start: Optional[datetime] = None
         self.max_session_duration = timedelta(hours=1)
-        self.failed_attempts = {}
-        self.max_attempts = 5
+        self.login_throttle = login_throttle
+        self.password_hasher = password_hasher
+        # Executa logins assíncronos; o bcrypt em si roda no pool do password_hasher
+        self._login_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='login')
     
     def login(self, username: str, password: str) -> Tuple[bool, str]:
         """
@@ -34,12 +39,13 @@ class AuthController:
             # Busca o usuário
             user = User.get_by_username(username)
             if not user:
+                # Mesmo custo de uma senha errada: o tempo não revela se o usuário existe
+                self.password_hasher.verify(password, self.password_hasher.dummy_hash())
                 self._register_failed_attempt(username)
                 return False, "Usuário ou senha incorretos"
             
             # Verifica a senha
-            password_hash = self._hash_password(password)
-            if user.password_hash != password_hash:
+            if not self.password_hasher.verify(password, user.password_hash):
                 self._register_failed_attempt(username)
                 return False, "Usuário ou senha incorretos"
             
@@ -48,6 +54,10 @@ class AuthController:
             self.session_start = datetime.now()
             self._clear_failed_attempts(username)
             
+            # Hash antigo (SHA-256) ou custo desatualizado: regrava em segundo plano
+            if self.password_hasher.needs_rehash(user.password_hash):
+                self._rehash_password(user, password)
+            
             # Log do login
             self._log_login(user.id, True)
             
@@ -56,6 +66,35 @@ class AuthController:
         except Exception as e:
             return False, f"Erro interno durante o login: {str(e)}"
     
+    def login_async(self, username: str, password: str) -> Future:
+        """
+        Realiza login sem bloquear a thread chamadora
+        
+        Returns:
+            Future que resolve para Tuple[bool, str]: (sucesso, mensagem)
+        """
+        return self._login_executor.submit(self.login, username, password)
+    
+    def login_with_callback(self, username: str, password: str,
+                            callback: Callable[[bool, str], None]) -> Future:
+        """
+        Realiza login assíncrono e chama callback(sucesso, mensagem) ao terminar
+        
+        O callback roda na thread do pool: interfaces gráficas devem
+        repassá-lo para a própria thread (ex.: after no Tk, sinal no Qt).
+        """
+        future = self.login_async(username, password)
+        
+        def done(result: Future):
+            try:
+                success, message = result.result()
+            except Exception as e:
+                success, message = False, f"Erro interno durante o login: {str(e)}"
+            callback(success, message)
+        
+        future.add_done_callback(done)
+        return future
+    
     def logout(self) -> bool:
         """Realiza logout do usuário"""
         try:
@@ -151,8 +190,7 @@ class AuthController:
         
         try:
             # Verifica senha atual
-            current_hash = self._hash_password(current_password)
-            if self.current_user.password_hash != current_hash:
+            if not self.password_hasher.verify(current_password, self.current_user.password_hash):
                 return False, "Senha atual incorreta"
             
             # Valida nova senha
@@ -177,52 +215,46 @@ class AuthController:
             self.session_start = datetime.now()
     
     def _hash_password(self, password: str) -> str:
-        """Gera hash da senha"""
-        return hashlib.sha256(password.encode()).hexdigest()
+        """Gera hash bcrypt da senha (custo calibrado, no pool de hash)"""
+        return self.password_hasher.hash(password)
+    
+    def _rehash_password(self, user: User, password: str):
+        """Atualiza o hash do usuário para bcrypt sem atrasar o login"""
+        def save(result: Future):
+            try:
+                new_hash = result.result()
+                execute_query("UPDATE users SET password_hash = %s WHERE id = %s",
+                              (new_hash, user.id))
+                user.password_hash = new_hash
+            except Exception as e:
+                print(f"Erro ao atualizar hash da senha: {e}")
+        
+        self.password_hasher.hash_async(password).add_done_callback(save)
     
     def _is_blocked(self, username: str) -> bool:
         """Verifica se usuário está bloqueado por tentativas falhadas"""
-        if username not in self.failed_attempts:
-            return False
-        
-        attempts, last_attempt = self.failed_attempts[username]
-        
-        # Bloqueia por 15 minutos após 5 tentativas
-        if attempts >= self.max_attempts:
-            if datetime.now() - last_attempt < timedelta(minutes=15):
-                return True
-            else:
-                # Reset após o período de bloqueio
-                del self.failed_attempts[username]
-        
-        return False
+        # Janela deslizante de SECURITY_CONFIG['login_window_seconds']
+        return self.login_throttle.is_blocked(username)
     
     def _register_failed_attempt(self, username: str):
         """Registra tentativa de login falhada"""
-        now = datetime.now()
-        if username in self.failed_attempts:
-            attempts, _ = self.failed_attempts[username]
-            self.failed_attempts[username] = (attempts + 1, now)
-        else:
-            self.failed_attempts[username] = (1, now)
+        self.login_throttle.register_failure(username)
     
     def _clear_failed_attempts(self, username: str):
         """Limpa tentativas falhadas após login bem-sucedido"""
-        if username in self.failed_attempts:
-            del self.failed_attempts[username]
+        self.login_throttle.register_success(username)
+    
+    def audit(self, action: str, entity_type: Optional[str] = None,
+              entity_id: Optional[int] = None, details: Optional[dict] = None):
+        """Registra uma ação do usuário atual no log de auditoria (sem esperar o banco)"""
+        user_id = self.current_user.id if self.current_user else None
+        audit_log.log(action, user_id, entity_type, entity_id, details)
     
     def _log_login(self, user_id: int, success: bool, is_logout: bool = False):
-        """Registra tentativa de login no banco"""
-        try:
-            action = "logout" if is_logout else ("login_success" if success else "login_failed")
-            query = """
-            INSERT INTO user_logs (user_id, action, ip_address, created_at)
-            VALUES (%s, %s, %s, %s)
-            """
-            # Note: Para uma aplicação desktop, o IP seria localhost ou identificador da máquina
-            execute_query(query, (user_id, action, "desktop_app", datetime.now()))
-        except Exception as e:
-            print(f"Erro ao registrar log: {e}")
+        """Registra tentativa de login no log de auditoria"""
+        action = "logout" if is_logout else ("login_success" if success else "login_failed")
+        # Note: Para uma aplicação desktop, o IP seria localhost ou identificador da máquina
+        audit_log.log(action, user_id, 'user', user_id)
 
 
 # Instância global do controlador de autenticação
@@ -8,6 +8,7 @@ from database.models import (Competition, Team, Game, SportType, CompetitionForm
                            GameStatus, calculate_standings, suggest_competition_format)
 from database.connection import execute_query
 from desktop_app.controllers.auth_controller import auth_controller
+from desktop_app.utils.search_index import search_index
 from database.models import UserType
 
 
@@ -65,6 +66,7 @@ class CompetitionController:
             
             if competition.save():
                 self.current_competition = competition
+                search_index.add_competition(competition)
                 return True, "Competição criada com sucesso"
             else:
                 return False, "Erro ao salvar competição"
@@ -96,6 +98,7 @@ class CompetitionController:
                     updated = True
             
             if updated and competition.save():
+                search_index.add_competition(competition)
                 return True, "Competição atualizada com sucesso"
             else:
                 return False, "Nenhuma alteração realizada"
@@ -150,6 +153,8 @@ class CompetitionController:
             VALUES (%s, %s, %s, %s)
             """
             execute_query(query, (competition_id, team_id, group_name, True))
+            auth_controller.audit('team_registered', 'competition', competition_id,
+                                  {'team_id': team_id, 'group_name': group_name})
             
             return True, f"Equipe {team.name} inscrita com sucesso"
             
@@ -174,6 +179,8 @@ class CompetitionController:
             result = execute_query(query, (competition_id, team_id))
             
             if result > 0:
+                auth_controller.audit('team_registration_removed', 'competition', competition_id,
+                                      {'team_id': team_id})
                 return True, "Inscrição removida com sucesso"
             else:
                 return False, "Inscrição não encontrada"
@@ -208,6 +215,7 @@ class CompetitionController:
             # Atualiza status
             competition.status = "ongoing"
             if competition.save():
+                search_index.reload_competition_games(competition.id)
                 return True, "Competição iniciada com sucesso"
             else:
                 return False, "Erro ao atualizar status da competição"
@@ -4,9 +4,11 @@ Controller para gestão de jogos
 from typing import List, Optional, Tuple, Dict, Any
 from datetime import datetime, date, time, timedelta
 
-from database.models import (Game, Team, Competition, GameStatus, calculate_standings,
-                           update_standings_after_game)
+from database.models import Game, Team, Competition, GameStatus, calculate_standings
 from database.connection import execute_query
+from desktop_app.utils.live_events import live_event_hub
+from desktop_app.utils.search_index import search_index
+from desktop_app.utils.local_replica import local_replica
 from desktop_app.controllers.auth_controller import auth_controller
 from database.models import UserType
 
@@ -16,6 +18,7 @@ class GameController:
     
     def __init__(self):
         self.current_game: Optional[Game] = None
+        local_replica.on_pushed('games', self._on_game_pushed)
     
     def create_game(self, competition_id: int, home_team_id: int, away_team_id: int,
                    game_date: date, game_time: time, venue: str = "") -> Tuple[bool, str]:
@@ -62,6 +65,7 @@ class GameController:
             )
             
             if game.save():
+                search_index.add_game(game)
                 return True, "Jogo criado com sucesso"
             else:
                 return False, "Erro ao salvar jogo no banco de dados"
@@ -75,7 +79,7 @@ class GameController:
             return False, "Permissão insuficiente para atualizar jogos"
         
         try:
-            game = Game.get_by_id(game_id)
+            game = self._get_game(game_id)
             if not game:
                 return False, "Jogo não encontrado"
             
@@ -95,7 +99,8 @@ class GameController:
             
             if updated:
                 game.updated_at = datetime.now()
-                if game.save():
+                if self._save_game(game):
+                    search_index.add_game(game)
                     return True, "Jogo atualizado com sucesso"
                 else:
                     return False, "Erro ao salvar alterações"
@@ -111,7 +116,7 @@ class GameController:
             return False, "Permissão insuficiente para iniciar jogos"
         
         try:
-            game = Game.get_by_id(game_id)
+            game = self._get_game(game_id)
             if not game:
                 return False, "Jogo não encontrado"
             
@@ -123,8 +128,9 @@ class GameController:
             game.actual_start_time = datetime.now()
             game.updated_at = datetime.now()
             
-            if game.save():
+            if self._save_game(game):
                 self.current_game = game
+                self._publish_game(game)
                 return True, "Jogo iniciado com sucesso"
             else:
                 return False, "Erro ao iniciar jogo"
@@ -139,7 +145,7 @@ class GameController:
             return False, "Permissão insuficiente para finalizar jogos"
         
         try:
-            game = Game.get_by_id(game_id)
+            game = self._get_game(game_id)
             if not game:
                 return False, "Jogo não encontrado"
             
@@ -158,12 +164,18 @@ class GameController:
             game.actual_end_time = datetime.now()
             game.updated_at = datetime.now()
             
-            if game.save():
+            if self._save_game(game):
+                self._publish_game(game)
+                auth_controller.audit('game_finished', 'game', game_id,
+                                      {'home_score': home_score, 'away_score': away_score})
+                if self.current_game and self.current_game.id == game_id:
+                    self.current_game = None
+                if local_replica.holds('games', game_id):
+                    # Standings são atualizados quando o resultado chega ao servidor
+                    return True, "Jogo finalizado; standings serão atualizados na sincronização"
                 # Atualiza standings da competição
-                success = update_standings_after_game(game)
+                success = calculate_standings(game.competition_id)
                 if success:
-                    if self.current_game and self.current_game.id == game_id:
-                        self.current_game = None
                     return True, "Jogo finalizado e standings atualizados com sucesso"
                 else:
                     return True, "Jogo finalizado, mas houve erro ao atualizar standings"
@@ -179,7 +191,7 @@ class GameController:
             return False, "Permissão insuficiente para cancelar jogos"
         
         try:
-            game = Game.get_by_id(game_id)
+            game = self._get_game(game_id)
             if not game:
                 return False, "Jogo não encontrado"
             
@@ -190,9 +202,10 @@ class GameController:
             game.observations = f"Cancelado: {reason}" if reason else "Cancelado"
             game.updated_at = datetime.now()
             
-            if game.save():
+            if self._save_game(game):
                 if self.current_game and self.current_game.id == game_id:
                     self.current_game = None
+                self._publish_game(game)
                 return True, "Jogo cancelado com sucesso"
             else:
                 return False, "Erro ao cancelar jogo"
@@ -205,6 +218,9 @@ class GameController:
                  date_to: date = None) -> List[Game]:
         """Busca jogos com filtros opcionais"""
         try:
+            if competition_id and local_replica.tracks(competition_id):
+                return self._get_local_games(competition_id, team_id, status, date_from, date_to)
+            
             query = "SELECT * FROM games WHERE 1=1"
             params = []
             
@@ -262,7 +278,7 @@ class GameController:
     
     def get_game_by_id(self, game_id: int) -> Optional[Game]:
         """Busca jogo por ID"""
-        return Game.get_by_id(game_id)
+        return self._get_game(game_id)
     
     def get_next_games(self, limit: int = 10) -> List[Game]:
         """Retorna próximos jogos agendados"""
@@ -314,6 +330,61 @@ class GameController:
             print(f"Erro ao buscar detalhes do jogo: {e}")
             return {}
     
+    def _get_game(self, game_id: int) -> Optional[Game]:
+        """Jogo da réplica local quando ela o contém; senão, do servidor"""
+        if local_replica.holds('games', game_id):
+            return local_replica.get_model(Game, 'games', game_id)
+        return Game.get_by_id(game_id)
+    
+    def _save_game(self, game: Game) -> bool:
+        """Grava na réplica local (envio pela sincronização) ou direto no servidor"""
+        if local_replica.holds('games', game.id):
+            return local_replica.save_model('games', game)
+        return game.save()
+    
+    def _get_local_games(self, competition_id: int, team_id: int = None,
+                         status: GameStatus = None, date_from: date = None,
+                         date_to: date = None) -> List[Game]:
+        """get_games servido pela réplica local"""
+        where = ["competition_id = ?"]
+        params: List[Any] = [competition_id]
+        
+        if team_id:
+            where.append("(home_team_id = ? OR away_team_id = ?)")
+            params.extend([team_id, team_id])
+        
+        if status:
+            where.append("status = ?")
+            params.append(status.value)
+        
+        if date_from:
+            where.append("date(game_date) >= ?")
+            params.append(date_from)
+        
+        if date_to:
+            where.append("date(game_date) <= ?")
+            params.append(date_to)
+        
+        rows = local_replica.rows('games', " AND ".join(where), params, order_by="game_date, round_number")
+        return [local_replica.to_model(Game, row) for row in rows]
+    
+    def _on_game_pushed(self, op: str, game_id: int, changes: Dict[str, Any]):
+        """Resultado enviado pela réplica: atualiza os standings no servidor"""
+        if op != 'update' or changes.get('status') != GameStatus.FINISHED.value:
+            return
+        game = local_replica.get_model(Game, 'games', game_id)
+        if game and not calculate_standings(game.competition_id):
+            print(f"Erro ao atualizar standings após o jogo {game_id}")
+    
+    def _publish_game(self, game: Game):
+        """Publica placar e status do jogo para quem acompanha ao vivo"""
+        live_event_hub.publish('score', {
+            'game_id': game.id,
+            'home_score': game.home_score,
+            'away_score': game.away_score,
+            'status': game.status.value
+        }, game_id=game.id, competition_id=game.competition_id)
+
     def _check_schedule_conflict(self, home_team_id: int, away_team_id: int,
                                game_datetime: datetime, exclude_game_id: int = None) -> Optional[str]:
         """Verifica conflito de horário para as equipes"""
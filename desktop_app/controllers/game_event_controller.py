@@ -0,0 +1,214 @@
+"""
+Controller para gestão de eventos de jogo
+"""
+from datetime import datetime
+from typing import Any, List, Sequence, Tuple
+
+from database.models import GameEvent, EventType, UserType
+from database.connection import execute_query, execute_many
+from database.athlete_statistics import athlete_statistics_aggregator
+from desktop_app.utils.live_events import live_event_hub
+from desktop_app.utils.local_replica import local_replica
+from desktop_app.controllers.auth_controller import auth_controller
+
+
+class GameEventController:
+    """Controlador para eventos de jogo (gols, pontos, cartões, faltas)"""
+
+    def __init__(self):
+        # Com a réplica local, as estatísticas acompanham o envio dos eventos
+        local_replica.on_pushed('game_events', self._on_event_pushed)
+
+    def get_events_by_game_id(self, game_id: int) -> List[GameEvent]:
+        """Retorna os eventos de um jogo"""
+        try:
+            if local_replica.holds('games', game_id):
+                rows = local_replica.rows('game_events', "game_id = ?", (game_id,),
+                                          order_by="set_number, minute_occurred, id")
+                return [local_replica.to_model(GameEvent, row) for row in rows]
+            return GameEvent.get_by_game(game_id)
+        except Exception as e:
+            print(f"Erro ao buscar eventos do jogo: {e}")
+            return []
+
+    def add_events(self, game_id: int, events: Sequence[GameEvent]) -> Tuple[bool, str]:
+        """Registra vários eventos de um jogo e atualiza as estatísticas em lote"""
+        if not auth_controller.has_permission(UserType.ORGANIZATION):
+            return False, "Permissão insuficiente para registrar eventos"
+
+        if not events:
+            return True, "Nenhum evento para registrar"
+
+        try:
+            if local_replica.holds('games', game_id):
+                return self._add_local_events(game_id, events)
+
+            query = """
+            INSERT INTO game_events (game_id, athlete_id, event_type, minute_occurred,
+                                     set_number, points_value, description)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+            """
+            rows = [
+                (game_id, event.athlete_id, EventType(event.event_type).value, event.minute_occurred,
+                 event.set_number, event.points_value, event.description)
+                for event in events
+            ]
+            execute_many(query, rows)
+            payloads = [self._event_payload(event) for event in events]
+            self._publish(game_id, 'events', payloads)
+            auth_controller.audit('game_events_added', 'game', game_id, {'events': payloads})
+
+            if not athlete_statistics_aggregator.apply_events_inserted(game_id, events):
+                return True, "Eventos registrados, mas as estatísticas precisam ser reconstruídas"
+
+            return True, f"{len(rows)} evento(s) registrado(s) com sucesso"
+
+        except Exception as e:
+            print(f"Erro ao registrar eventos: {e}")
+            return False, f"Erro interno: {str(e)}"
+
+    def add_event(self, event: GameEvent) -> Tuple[bool, str]:
+        """Registra um evento de jogo"""
+        return self.add_events(event.game_id, [event])
+
+    def delete_events(self, game_id: int, event_ids: Sequence[int]) -> Tuple[bool, str]:
+        """Remove eventos de um jogo e desconta das estatísticas"""
+        if not auth_controller.has_permission(UserType.ORGANIZATION):
+            return False, "Permissão insuficiente para remover eventos"
+
+        if not event_ids:
+            return True, "Nenhum evento para remover"
+
+        try:
+            if local_replica.holds('games', game_id):
+                return self._delete_local_events(game_id, event_ids)
+
+            placeholders = ', '.join(['%s'] * len(event_ids))
+            params = (game_id, *event_ids)
+            removed = execute_query(
+                f"SELECT * FROM game_events WHERE game_id = %s AND id IN ({placeholders})",
+                params, fetch=True
+            ) or []
+            if not removed:
+                return False, "Eventos não encontrados"
+
+            execute_query(f"DELETE FROM game_events WHERE game_id = %s AND id IN ({placeholders})", params)
+            self._publish(game_id, 'events_removed', [row['id'] for row in removed])
+            auth_controller.audit('game_events_removed', 'game', game_id,
+                                  {'event_ids': [row['id'] for row in removed]})
+
+            if not athlete_statistics_aggregator.apply_events_deleted(game_id, removed):
+                return True, "Eventos removidos, mas as estatísticas precisam ser reconstruídas"
+
+            return True, f"{len(removed)} evento(s) removido(s) com sucesso"
+
+        except Exception as e:
+            print(f"Erro ao remover eventos: {e}")
+            return False, f"Erro interno: {str(e)}"
+
+    def delete_event(self, game_id: int, event_id: int) -> Tuple[bool, str]:
+        """Remove um evento de jogo"""
+        return self.delete_events(game_id, [event_id])
+
+    def save_events(self, game_id: int, event_list: List[Any]) -> bool:
+        """
+        Sincroniza a lista editada de eventos de um jogo
+
+        Eventos sem id são inseridos e eventos gravados que saíram da lista
+        são removidos; as estatísticas recebem apenas a diferença.
+        """
+        try:
+            current_ids = {event.id for event in self.get_events_by_game_id(game_id)}
+            kept_ids = {event.id for event in event_list if getattr(event, 'id', None)}
+
+            removed_ids = sorted(current_ids - kept_ids)
+            new_events = [event for event in event_list if not getattr(event, 'id', None)]
+
+            success, message = self.delete_events(game_id, removed_ids)
+            if not success:
+                print(f"Erro ao salvar eventos: {message}")
+                return False
+
+            success, message = self.add_events(game_id, new_events)
+            if not success:
+                print(f"Erro ao salvar eventos: {message}")
+            return success
+
+        except Exception as e:
+            print(f"Erro ao salvar eventos: {e}")
+            return False
+
+    def _add_local_events(self, game_id: int, events: Sequence[GameEvent]) -> Tuple[bool, str]:
+        """Registra os eventos na réplica local; o envio ao servidor fica na outbox"""
+        for event in events:
+            local_replica.insert('game_events', {
+                'game_id': game_id,
+                'athlete_id': event.athlete_id,
+                'event_type': EventType(event.event_type).value,
+                'minute_occurred': event.minute_occurred,
+                'set_number': event.set_number,
+                'points_value': event.points_value,
+                'description': event.description,
+                'created_at': datetime.now()
+            })
+        payloads = [self._event_payload(event) for event in events]
+        self._publish(game_id, 'events', payloads)
+        auth_controller.audit('game_events_added', 'game', game_id, {'events': payloads})
+        return True, f"{len(events)} evento(s) registrado(s) com sucesso"
+
+    def _delete_local_events(self, game_id: int, event_ids: Sequence[int]) -> Tuple[bool, str]:
+        """Remove os eventos da réplica local; o envio ao servidor fica na outbox"""
+        placeholders = ', '.join('?' * len(event_ids))
+        removed = local_replica.rows('game_events', f"game_id = ? AND id IN ({placeholders})",
+                                     (game_id, *event_ids))
+        if not removed:
+            return False, "Eventos não encontrados"
+
+        for row in removed:
+            local_replica.delete('game_events', row['id'])
+        self._publish(game_id, 'events_removed', [row['id'] for row in removed])
+        auth_controller.audit('game_events_removed', 'game', game_id,
+                              {'event_ids': [row['id'] for row in removed]})
+        return True, f"{len(removed)} evento(s) removido(s) com sucesso"
+
+    @staticmethod
+    def _on_event_pushed(op: str, event_id: int, event: dict):
+        """Evento aceito pelo servidor: aplica a diferença nas estatísticas"""
+        if op == 'insert':
+            applied = athlete_statistics_aggregator.apply_events_inserted(event['game_id'], [event])
+        elif op == 'delete':
+            applied = athlete_statistics_aggregator.apply_events_deleted(event['game_id'], [event])
+        else:
+            return
+        if not applied:
+            print(f"Erro ao atualizar estatísticas do evento {event_id}; reconstrução necessária")
+
+    @staticmethod
+    def _event_payload(event: GameEvent) -> dict:
+        return {
+            'athlete_id': event.athlete_id,
+            'event_type': EventType(event.event_type).value,
+            'minute': event.minute_occurred,
+            'set_number': event.set_number,
+            'points_value': event.points_value,
+            'description': event.description
+        }
+
+    @staticmethod
+    def _publish(game_id: int, event_type: str, items: List[Any]):
+        """Publica a alteração nos canais ao vivo do jogo e da competição"""
+        try:
+            game = local_replica.get('games', game_id) if local_replica.holds('games', game_id) else None
+            if game is not None:
+                competition_id = game['competition_id']
+            else:
+                result = execute_query("SELECT competition_id FROM games WHERE id = %s", (game_id,), fetch=True)
+                competition_id = result[0]['competition_id'] if result else None
+            live_event_hub.publish(event_type, {'game_id': game_id, 'items': items},
+                                   game_id=game_id, competition_id=competition_id)
+        except Exception as e:
+            print(f"Erro ao publicar eventos ao vivo: {e}")
+
+
+# Instância global do controlador de eventos
+game_event_controller = GameEventController()
@@ -0,0 +1,516 @@
+"""
+Controller para importação em lote de equipes e atletas (CSV)
+
+O arquivo é lido em blocos de CHUNK_SIZE linhas, sem carregá-lo inteiro.
+Para cada bloco, em uma única conexão:
+
+    1. equipes citadas                     (1 SELECT ... IN; INSERT em lote das novas)
+    2. atletas atuais dessas equipes       (1 SELECT ... IN, só equipes ainda não vistas)
+    3. capitães substituídos               (1 UPDATE ... IN)
+    4. atletas do bloco                    (INSERT em lote com executemany)
+
+Camisas repetidas e capitães duplicados são detectados tanto dentro do
+arquivo quanto contra o banco, com o estado de cada equipe mantido em
+memória entre os blocos. Linhas inválidas não impedem as demais: o
+relatório traz o erro de cada linha.
+
+Colunas (cabeçalho obrigatório, separador ',' ou ';'): equipe, nome,
+camisa, posicao, nascimento (dd/mm/aaaa), cpf, telefone, email,
+contato_emergencia, telefone_emergencia, capitao. Também são aceitos os
+nomes das colunas do banco (team, name, jersey_number, ...).
+"""
+import csv
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, TextIO, Tuple
+
+from config.settings import SPORTS_CONFIG
+from database.connection import get_db_manager
+from database.models import Athlete, Team, UserType
+from desktop_app.controllers.auth_controller import auth_controller
+from desktop_app.utils.date_utils import DateUtils
+from desktop_app.utils.search_index import normalize, search_index
+from desktop_app.utils.validators import ValidationUtils
+
+CHUNK_SIZE = 1000
+MAX_TEAM_SIZE = max(sport['max_team_size'] for sport in SPORTS_CONFIG.values())
+MAX_JERSEY_NUMBER = 99
+
+# Coluna canônica -> nomes aceitos no cabeçalho (já normalizados)
+COLUMN_ALIASES = {
+    'team': ('team', 'equipe', 'time'),
+    'name': ('name', 'nome', 'atleta'),
+    'jersey_number': ('jersey_number', 'camisa', 'numero'),
+    'position': ('position', 'posicao'),
+    'birth_date': ('birth_date', 'nascimento', 'data_nascimento'),
+    'document_number': ('document_number', 'cpf', 'documento'),
+    'phone': ('phone', 'telefone'),
+    'email': ('email', 'e_mail'),
+    'emergency_contact': ('emergency_contact', 'contato_emergencia'),
+    'emergency_phone': ('emergency_phone', 'telefone_emergencia'),
+    'is_captain': ('is_captain', 'capitao')
+}
+REQUIRED_COLUMNS = ('team', 'name')
+
+# Tamanho máximo das colunas de texto (create_tables.sql)
+TEXT_LIMITS = {
+    'name': 100, 'position': 50, 'document_number': 20, 'phone': 20, 'email': 100,
+    'emergency_contact': 100, 'emergency_phone': 20
+}
+
+TRUE_VALUES = {'1', 'true', 'sim', 's', 'x', 'yes', 'y'}
+FALSE_VALUES = {'', '0', 'false', 'nao', 'n', 'no'}
+
+INSERT_ATHLETE = """
+INSERT INTO athletes (team_id, name, jersey_number, position, birth_date, document_number,
+                      phone, email, emergency_contact, emergency_phone, is_captain, is_active)
+VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, TRUE)
+"""
+ATHLETE_COLUMNS = ('name', 'jersey_number', 'position', 'birth_date', 'document_number',
+                   'phone', 'email', 'emergency_contact', 'emergency_phone', 'is_captain')
+
+
+class ImportFormatError(ValueError):
+    """Arquivo malformado como um todo (ex.: cabeçalho sem as colunas obrigatórias)"""
+
+
+@dataclass
+class ImportRowError:
+    """Erro de uma linha do arquivo (line conta o cabeçalho como linha 1)"""
+    line: int
+    message: str
+    column: str = ""
+
+
+@dataclass
+class ImportReport:
+    """Resultado da importação"""
+    total_rows: int = 0
+    imported: int = 0
+    teams_created: int = 0
+    captains_replaced: int = 0
+    dry_run: bool = False
+    elapsed: float = 0.0
+    errors: List[ImportRowError] = field(default_factory=list)
+
+    def add_error(self, line: int, message: str, column: str = ""):
+        self.errors.append(ImportRowError(line, message, column))
+
+    @property
+    def rejected_lines(self) -> int:
+        return len({error.line for error in self.errors})
+
+    def summary(self) -> str:
+        verb = "seriam importados" if self.dry_run else "importados"
+        text = f"{self.imported} de {self.total_rows} atleta(s) {verb} em {self.elapsed:.1f}s"
+        if self.teams_created:
+            text += f", {self.teams_created} equipe(s) nova(s)"
+        if self.captains_replaced:
+            text += f", {self.captains_replaced} capitão(ães) substituído(s)"
+        if self.errors:
+            text += f"; {self.rejected_lines} linha(s) com erro"
+        return text
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'total_rows': self.total_rows,
+            'imported': self.imported,
+            'teams_created': self.teams_created,
+            'captains_replaced': self.captains_replaced,
+            'dry_run': self.dry_run,
+            'elapsed': round(self.elapsed, 3),
+            'errors': [{'line': e.line, 'column': e.column, 'message': e.message} for e in self.errors]
+        }
+
+    def write_errors_csv(self, target: TextIO):
+        """Grava o relatório de erros por linha (linha;coluna;erro)"""
+        writer = csv.writer(target, delimiter=';')
+        writer.writerow(('linha', 'coluna', 'erro'))
+        for error in self.errors:
+            writer.writerow((error.line, error.column, error.message))
+
+
+@dataclass
+class _AthleteRow:
+    line: int
+    team_key: str
+    team_name: str
+    values: Dict[str, Any]
+    team_id: Optional[int] = None
+
+
+class _TeamState:
+    """Camisas, capitão e tamanho de uma equipe (banco + linhas já aceitas)"""
+
+    def __init__(self):
+        self.jerseys: Dict[int, str] = {}  # camisa -> origem ("linha 12", "atleta ativo", ...)
+        self.captain: Optional[str] = None
+        self.captain_in_database = False
+        self.active_count = 0
+
+
+class AthleteImporter:
+    """Pipeline de importação de atletas a partir de CSV"""
+
+    def __init__(self, connect: Optional[Callable] = None, chunk_size: int = CHUNK_SIZE,
+                 max_team_size: int = MAX_TEAM_SIZE):
+        self.connect = connect
+        self.chunk_size = chunk_size
+        self.max_team_size = max_team_size
+
+    def run(self, stream: TextIO, create_teams: bool = True, dry_run: bool = False) -> ImportReport:
+        """
+        Importa os atletas do CSV
+
+        Args:
+            stream: Arquivo texto aberto (newline='')
+            create_teams: Cria as equipes citadas que não existem
+            dry_run: Apenas valida, sem gravar
+
+        Returns:
+            Relatório com totais e erros por linha
+
+        Raises:
+            ImportFormatError: Cabeçalho ausente ou sem as colunas obrigatórias
+        """
+        started = time.perf_counter()
+        reader, columns = self._open(stream)
+        report = ImportReport(dry_run=dry_run)
+        team_ids: Dict[str, Optional[int]] = {}
+        states: Dict[int, _TeamState] = {}
+
+        with self._connection() as (cursor, connection):
+            for chunk in self._chunks(reader, columns, report):
+                rows = self._resolve_teams(cursor, connection, chunk, team_ids,
+                                           create_teams, dry_run, report)
+                self._load_states(cursor, rows, states)
+                accepted, demote = self._check_conflicts(rows, states, report)
+                if dry_run:
+                    report.imported += len(accepted)
+                elif accepted:
+                    self._insert(cursor, connection, accepted, demote, states, report)
+
+        report.errors.sort(key=lambda error: error.line)
+        report.elapsed = time.perf_counter() - started
+        return report
+
+    @contextmanager
+    def _connection(self):
+        connect = self.connect or get_db_manager().get_connection
+        with connect() as connection:
+            cursor = connection.cursor(dictionary=True)
+            try:
+                yield cursor, connection
+            finally:
+                cursor.close()
+
+    # Leitura
+
+    def _open(self, stream: TextIO) -> Tuple[Iterator[List[str]], Dict[str, int]]:
+        header_line = stream.readline()
+        if not header_line.strip():
+            raise ImportFormatError("Arquivo vazio ou sem cabeçalho")
+
+        delimiter = ';' if header_line.count(';') > header_line.count(',') else ','
+        header = next(csv.reader([header_line], delimiter=delimiter))
+
+        aliases = {alias: column for column, names in COLUMN_ALIASES.items() for alias in names}
+        columns: Dict[str, int] = {}
+        for position, title in enumerate(header):
+            column = aliases.get(normalize(title).replace(' ', '_'))
+            if column and column not in columns:
+                columns[column] = position
+
+        missing = [column for column in REQUIRED_COLUMNS if column not in columns]
+        if missing:
+            raise ImportFormatError(f"Colunas obrigatórias ausentes: {', '.join(missing)}")
+        return csv.reader(stream, delimiter=delimiter), columns
+
+    def _chunks(self, reader, columns: Dict[str, int],
+                report: ImportReport) -> Iterator[List[_AthleteRow]]:
+        chunk: List[_AthleteRow] = []
+        for record in reader:
+            if not any(cell.strip() for cell in record):
+                continue
+            report.total_rows += 1
+            # line_num conta as linhas físicas lidas após o cabeçalho
+            row = self._parse(reader.line_num + 1, record, columns, report)
+            if row is not None:
+                chunk.append(row)
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _parse(self, line: int, record: List[str], columns: Dict[str, int],
+               report: ImportReport) -> Optional[_AthleteRow]:
+        """Valida os campos da linha; None se houver erro"""
+        def cell(column: str) -> str:
+            position = columns.get(column)
+            if position is None or position >= len(record):
+                return ""
+            return ValidationUtils.sanitize_string(record[position])
+
+        errors: List[Tuple[str, str]] = []
+        values: Dict[str, Any] = {}
+
+        team_name = cell('team')
+        if not team_name:
+            errors.append(('team', "Equipe é obrigatória"))
+        elif len(team_name) > 100:
+            errors.append(('team', "Nome da equipe deve ter no máximo 100 caracteres"))
+
+        for column, limit in TEXT_LIMITS.items():
+            values[column] = cell(column)
+            if len(values[column]) > limit:
+                errors.append((column, f"Deve ter no máximo {limit} caracteres"))
+        if not values['name']:
+            errors.append(('name', "Nome do atleta é obrigatório"))
+
+        jersey = cell('jersey_number')
+        values['jersey_number'] = None
+        if jersey:
+            if jersey.isdigit() and int(jersey) <= MAX_JERSEY_NUMBER:
+                values['jersey_number'] = int(jersey)
+            else:
+                errors.append(('jersey_number', f"Número da camisa inválido: {jersey}"))
+
+        birth_date = cell('birth_date')
+        values['birth_date'] = None
+        if birth_date:
+            values['birth_date'] = DateUtils.parse_date_br(birth_date)
+            if values['birth_date'] is None:
+                errors.append(('birth_date', f"Data de nascimento inválida (dd/mm/aaaa): {birth_date}"))
+
+        if values['document_number'] and not ValidationUtils.validate_cpf(values['document_number']):
+            errors.append(('document_number', f"CPF inválido: {values['document_number']}"))
+        if values['email'] and not ValidationUtils.validate_email(values['email']):
+            errors.append(('email', f"Email inválido: {values['email']}"))
+        for column in ('phone', 'emergency_phone'):
+            if values[column] and not ValidationUtils.validate_phone(values[column]):
+                errors.append((column, f"Telefone inválido: {values[column]}"))
+
+        captain = normalize(cell('is_captain'))
+        if captain in TRUE_VALUES:
+            values['is_captain'] = True
+        elif captain in FALSE_VALUES:
+            values['is_captain'] = False
+        else:
+            errors.append(('is_captain', f"Valor inválido para capitão: {cell('is_captain')}"))
+
+        for column, message in errors:
+            report.add_error(line, message, column)
+        if errors:
+            return None
+        return _AthleteRow(line, normalize(team_name), team_name, values)
+
+    # Banco (consultas por conjunto)
+
+    def _resolve_teams(self, cursor, connection, chunk: List[_AthleteRow],
+                       team_ids: Dict[str, Optional[int]], create_teams: bool,
+                       dry_run: bool, report: ImportReport) -> List[_AthleteRow]:
+        """Associa cada linha ao id da equipe, criando as que faltam"""
+        unknown = {}
+        for row in chunk:
+            if row.team_key not in team_ids:
+                unknown.setdefault(row.team_key, row.team_name)
+
+        if unknown:
+            found = self._select_teams(cursor, unknown.values())
+            missing = {key: name for key, name in unknown.items() if key not in found}
+            team_ids.update(found)
+
+            if missing and create_teams:
+                if dry_run:
+                    # Ids provisórios só para o controle de camisas e capitães
+                    for index, key in enumerate(missing, start=len(team_ids) + 1):
+                        team_ids[key] = -index
+                else:
+                    team_ids.update(self._create_teams(cursor, connection, missing))
+                report.teams_created += len(missing)
+            for key in missing:
+                team_ids.setdefault(key, None)
+
+        rows = []
+        for row in chunk:
+            row.team_id = team_ids.get(row.team_key)
+            if row.team_id is None:
+                report.add_error(row.line, f"Equipe não encontrada: {row.team_name}", 'team')
+            else:
+                rows.append(row)
+        return rows
+
+    @staticmethod
+    def _select_teams(cursor, names) -> Dict[str, int]:
+        names = list(names)
+        placeholders = ', '.join(['%s'] * len(names))
+        cursor.execute(f"SELECT id, name FROM teams WHERE name IN ({placeholders}) ORDER BY id", names)
+        found: Dict[str, int] = {}
+        for team in cursor.fetchall():
+            found.setdefault(normalize(team['name']), team['id'])
+        return found
+
+    def _create_teams(self, cursor, connection, missing: Dict[str, str]) -> Dict[str, int]:
+        """Grava as equipes novas (chave normalizada -> nome); devolve seus ids"""
+        cursor.executemany("INSERT INTO teams (name, is_active) VALUES (%s, TRUE)",
+                           [(name,) for name in missing.values()])
+        connection.commit()
+        created = self._select_teams(cursor, missing.values())
+        for key, team_id in created.items():
+            search_index.add_team(Team(id=team_id, name=missing[key]))
+        return created
+
+    @staticmethod
+    def _team_athletes(cursor, team_ids: List[int]) -> List[Dict[str, Any]]:
+        placeholders = ', '.join(['%s'] * len(team_ids))
+        cursor.execute(
+            f"SELECT team_id, jersey_number, is_captain, is_active FROM athletes "
+            f"WHERE team_id IN ({placeholders})", team_ids
+        )
+        return cursor.fetchall()
+
+    def _load_states(self, cursor, rows: List[_AthleteRow], states: Dict[int, _TeamState]):
+        """Carrega camisas e capitão das equipes ainda não vistas"""
+        new_ids = {row.team_id for row in rows if row.team_id not in states}
+        for team_id in new_ids:
+            states[team_id] = _TeamState()
+
+        existing = [team_id for team_id in new_ids if team_id > 0]
+        if not existing:
+            return
+        for athlete in self._team_athletes(cursor, existing):
+            state = states[athlete['team_id']]
+            # A chave única (team_id, jersey_number) vale também para inativos
+            if athlete['jersey_number'] is not None:
+                state.jerseys[athlete['jersey_number']] = (
+                    "atleta já cadastrado" if athlete['is_active'] else "atleta inativo da equipe"
+                )
+            if athlete['is_active']:
+                state.active_count += 1
+                if athlete['is_captain']:
+                    state.captain_in_database = True
+
+    def _check_conflicts(self, rows: List[_AthleteRow], states: Dict[int, _TeamState],
+                         report: ImportReport) -> Tuple[List[_AthleteRow], Set[int]]:
+        """Camisas, capitães e limite de atletas; devolve as linhas aceitas"""
+        accepted = []
+        demote: Set[int] = set()
+        for row in rows:
+            state = states[row.team_id]
+            jersey = row.values['jersey_number']
+            if state.active_count >= self.max_team_size:
+                report.add_error(row.line, f"Equipe {row.team_name} atingiu o limite de "
+                                           f"{self.max_team_size} atletas", 'team')
+                continue
+            if jersey is not None and jersey in state.jerseys:
+                report.add_error(row.line, f"Número da camisa {jersey} já está em uso "
+                                           f"({state.jerseys[jersey]})", 'jersey_number')
+                continue
+            if row.values['is_captain'] and state.captain:
+                report.add_error(row.line, f"Equipe {row.team_name} já tem capitão "
+                                           f"({state.captain})", 'is_captain')
+                continue
+
+            if jersey is not None:
+                state.jerseys[jersey] = f"linha {row.line}"
+            state.active_count += 1
+            if row.values['is_captain']:
+                # Como em add_athlete, o novo capitão substitui o atual
+                state.captain = f"linha {row.line}"
+                if state.captain_in_database:
+                    state.captain_in_database = False
+                    demote.add(row.team_id)
+                    report.captains_replaced += 1
+            accepted.append(row)
+        return accepted, demote
+
+    def _insert(self, cursor, connection, rows: List[_AthleteRow], demote: Set[int],
+                states: Dict[int, _TeamState], report: ImportReport):
+        """Grava o bloco em uma transação; em caso de falha, o bloco inteiro é recusado"""
+        team_ids = sorted({row.team_id for row in rows})
+        try:
+            last_id = self._write_athletes(cursor, rows, demote)
+            connection.commit()
+        except Exception as e:
+            connection.rollback()
+            for row in rows:
+                report.add_error(row.line, f"Bloco não gravado: {e}")
+            # O estado em memória deixou de refletir o banco: relido no próximo bloco
+            for team_id in team_ids:
+                states.pop(team_id, None)
+            return
+
+        report.imported += len(rows)
+        self._index_athletes(cursor, last_id, team_ids)
+
+    @staticmethod
+    def _write_athletes(cursor, rows: List[_AthleteRow], demote: Set[int]) -> int:
+        """Rebaixa os capitães substituídos e insere o bloco; devolve o último id anterior"""
+        cursor.execute("SELECT COALESCE(MAX(id), 0) AS last_id FROM athletes")
+        last_id = cursor.fetchall()[0]['last_id']
+
+        if demote:
+            placeholders = ', '.join(['%s'] * len(demote))
+            cursor.execute(f"UPDATE athletes SET is_captain = FALSE "
+                           f"WHERE is_captain = TRUE AND team_id IN ({placeholders})",
+                           sorted(demote))
+        cursor.executemany(INSERT_ATHLETE, [
+            (row.team_id,) + tuple(row.values[column] for column in ATHLETE_COLUMNS)
+            for row in rows
+        ])
+        return last_id
+
+    @staticmethod
+    def _index_athletes(cursor, last_id: int, team_ids: List[int]):
+        """Acrescenta ao índice de busca os atletas gravados após last_id"""
+        placeholders = ', '.join(['%s'] * len(team_ids))
+        cursor.execute(f"SELECT id, team_id, name, jersey_number FROM athletes "
+                       f"WHERE id > %s AND team_id IN ({placeholders})", [last_id] + team_ids)
+        for athlete in cursor.fetchall():
+            search_index.add_athlete(Athlete(id=athlete['id'], team_id=athlete['team_id'],
+                                             name=athlete['name'],
+                                             jersey_number=athlete['jersey_number']))
+
+
+class ImportController:
+    """Controlador para importação de equipes e atletas"""
+
+    def __init__(self):
+        self.last_report: Optional[ImportReport] = None
+
+    def import_athletes_csv(self, file_path: str, create_teams: bool = True,
+                            dry_run: bool = False) -> Tuple[bool, str]:
+        """Importa atletas de um arquivo CSV (relatório completo em last_report)"""
+        if not auth_controller.has_permission(UserType.ORGANIZATION):
+            return False, "Permissão insuficiente para importar atletas"
+
+        self.last_report = None
+        try:
+            with open(file_path, newline='', encoding='utf-8-sig') as file:
+                report = athlete_importer.run(file, create_teams=create_teams, dry_run=dry_run)
+        except ImportFormatError as e:
+            return False, str(e)
+        except UnicodeDecodeError:
+            return False, "O arquivo deve estar codificado em UTF-8"
+        except Exception as e:
+            print(f"Erro ao importar atletas: {e}")
+            return False, f"Erro interno: {str(e)}"
+
+        self.last_report = report
+        if not dry_run:
+            auth_controller.audit('athletes_imported', 'team', None, {
+                'file': file_path,
+                'imported': report.imported,
+                'teams_created': report.teams_created,
+                'rejected_lines': report.rejected_lines
+            })
+        return report.imported > 0 or not report.errors, report.summary()
+
+
+# Instância global do pipeline de importação
+athlete_importer = AthleteImporter()
+
+# Instância global do controlador de importação
+import_controller = ImportController()
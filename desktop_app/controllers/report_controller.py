@@ -1,17 +1,21 @@
 """
 Controller para geração de relatórios
 """
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Iterator, Sequence
 from datetime import date, datetime, timedelta
 from pathlib import Path
+from dataclasses import replace
 import json
 
-from database.models import Competition, Team, Game, GameStatus, SportType
+from database.models import Competition, Team, Game, GameStatus, SportType, AthleteStatistics
 from database.connection import execute_query
 from desktop_app.controllers.auth_controller import auth_controller
 from desktop_app.controllers.competition_controller import competition_controller
 from desktop_app.controllers.team_controller import team_controller
 from desktop_app.controllers.game_controller import game_controller
+from desktop_app.utils.statistics_aggregator import GameColumns, aggregate_competition
+from desktop_app.utils.pdf_renderer import (TableSection, TextSection, PageBreak, PDFJob,
+                                           render_pdf, render_pdfs_parallel)
 
 
 class ReportController:
@@ -196,7 +200,48 @@ class ReportController:
             
         except Exception as e:
             return {"error": f"Erro ao gerar relatório da equipe: {str(e)}"}
-    
+
+    def generate_player_statistics_report(self, athlete_id: int,
+                                          competition_id: int = None) -> Dict[str, Any]:
+        """Gera relatório de estatísticas de um atleta a partir de athlete_statistics"""
+        try:
+            if competition_id is not None:
+                stats = AthleteStatistics.get(athlete_id, competition_id)
+                stats_list = [stats] if stats else []
+            else:
+                stats_list = AthleteStatistics.get_by_athlete(athlete_id)
+
+            competitions = []
+            for stats in stats_list:
+                competition = competition_controller.get_competition_by_id(stats.competition_id)
+                competitions.append({
+                    "competition_id": stats.competition_id,
+                    "competition": competition.name if competition else "N/A",
+                    "games_played": stats.games_played,
+                    "goals_scored": stats.goals_scored,
+                    "points_scored": stats.points_scored,
+                    "points_2": stats.points_2,
+                    "points_3": stats.points_3,
+                    "free_throws": stats.free_throws,
+                    "yellow_cards": stats.yellow_cards,
+                    "red_cards": stats.red_cards,
+                    "fouls": stats.fouls,
+                    "updated_at": stats.updated_at.isoformat() if stats.updated_at else None
+                })
+
+            return {
+                "athlete_id": athlete_id,
+                "competitions": competitions,
+                "metadata": {
+                    "generated_at": datetime.now().isoformat(),
+                    "generated_by": auth_controller.current_user.full_name if auth_controller.current_user else "Sistema",
+                    "competition_filter": competition_id
+                }
+            }
+
+        except Exception as e:
+            return {"error": f"Erro ao gerar relatório do atleta: {str(e)}"}
+
     def generate_games_schedule_report(self, competition_id: int = None, 
                                      date_from: date = None, date_to: date = None) -> Dict[str, Any]:
         """Gera relatório de programação de jogos"""
@@ -289,79 +334,135 @@ class ReportController:
         except Exception as e:
             return False, f"Erro ao salvar relatório: {str(e)}"
     
+    def export_pdf(self, title: str, sections, filename: str) -> Tuple[bool, str]:
+        """Renderiza seções de relatório em um arquivo PDF, página a página"""
+        try:
+            filepath = Path(filename)
+            if not filepath.is_absolute():
+                filepath = self.reports_dir / filepath
+            if filepath.suffix.lower() != ".pdf":
+                filepath = filepath.with_suffix(".pdf")
+            
+            pages = render_pdf(str(filepath), title, sections)
+            return True, f"Relatório salvo em: {filepath} ({pages} página(s))"
+            
+        except Exception as e:
+            return False, f"Erro ao exportar PDF: {str(e)}"
+    
+    def export_competition_pdf(self, competition_id: int, filename: str) -> Tuple[bool, str]:
+        """Exporta classificação e programação de uma competição em PDF"""
+        competition = competition_controller.get_competition_by_id(competition_id)
+        if not competition:
+            return False, "Competição não encontrada"
+        return self.export_pdf(competition.name, competition_pdf_sections(competition_id), filename)
+    
+    def export_round_scoresheets_pdf(self, competition_id: int, round_number: int,
+                                     filename: str) -> Tuple[bool, str]:
+        """Exporta as súmulas de todos os jogos de uma rodada em PDF"""
+        return self.export_pdf(f"Súmulas - Rodada {round_number}",
+                               round_scoresheet_sections(competition_id, round_number), filename)
+    
+    def export_pdfs_parallel(self, jobs: Sequence[PDFJob],
+                             max_workers: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Renderiza vários relatórios independentes em processos paralelos"""
+        resolved = []
+        for job in jobs:
+            if not Path(job.file_path).is_absolute():
+                job = replace(job, file_path=str(self.reports_dir / job.file_path))
+            resolved.append(job)
+        return list(render_pdfs_parallel(resolved, max_workers=max_workers))
+    
+    def iter_standings_rows(self, competition_id: int) -> Iterator[Tuple]:
+        """Linhas da tabela de classificação para exportação"""
+        for standing in competition_controller.get_standings(competition_id):
+            yield (standing['position'], standing['team_name'], standing['games_played'],
+                   standing['wins'], standing['draws'], standing['losses'],
+                   standing['goals_for'], standing['goals_against'],
+                   standing['goal_difference'], standing['points'])
+    
+    def iter_schedule_rows(self, competition_id: int = None, date_from: date = None,
+                           date_to: date = None) -> Iterator[Tuple]:
+        """Linhas da programação de jogos, com nomes resolvidos na própria consulta"""
+        query = """
+        SELECT g.game_date, g.round_number, g.phase, g.status, g.home_score, g.away_score,
+               ht.name as home_team_name, at.name as away_team_name, v.name as venue_name
+        FROM games g
+        LEFT JOIN teams ht ON g.home_team_id = ht.id
+        LEFT JOIN teams at ON g.away_team_id = at.id
+        LEFT JOIN venues v ON g.venue_id = v.id
+        WHERE 1=1
+        """
+        params = []
+        if competition_id:
+            query += " AND g.competition_id = %s"
+            params.append(competition_id)
+        if date_from:
+            query += " AND g.game_date >= %s"
+            params.append(date_from)
+        if date_to:
+            query += " AND g.game_date <= %s"
+            params.append(date_to)
+        query += " ORDER BY g.game_date, g.round_number"
+        
+        for row in execute_query(query, tuple(params), fetch=True) or []:
+            game_date = row['game_date']
+            result = (f"{row['home_score']} x {row['away_score']}"
+                      if row['status'] == GameStatus.FINISHED.value else "-")
+            yield (game_date.strftime('%d/%m/%Y %H:%M') if game_date else "A definir",
+                   row['round_number'], row['home_team_name'] or "N/A",
+                   row['away_team_name'] or "N/A", result, row['venue_name'] or "")
+    
+    def iter_roster_rows(self, team_id: int) -> Iterator[Tuple]:
+        """Linhas do elenco de uma equipe"""
+        for athlete in team_controller.get_team_athletes(team_id):
+            yield (athlete.jersey_number or "", athlete.name, athlete.position or "",
+                   "C" if athlete.is_captain else "")
+    
     def _calculate_competition_statistics(self, competition_id: int, 
                                         games: List[Game], teams: List[Team]) -> Dict[str, Any]:
-        """Calcula estatísticas gerais da competição"""
+        """Calcula estatísticas gerais da competição em uma única passagem pelos jogos"""
         try:
-            finished_games = [g for g in games if g.status == GameStatus.FINISHED and 
-                            g.home_score is not None and g.away_score is not None]
+            columns = GameColumns.from_games(games, venue=lambda g: g.venue_id)
+            aggregated = aggregate_competition(columns)
+            
+            team_names = {team.id: team.name for team in teams}
+            games_by_id = {game.id: game for game in games}
             
-            total_goals = sum(g.home_score + g.away_score for g in finished_games)
+            def team_name(team_id):
+                return team_names.get(team_id, "N/A")
             
             stats = {
                 "total_teams": len(teams),
                 "total_games_scheduled": len(games),
-                "games_finished": len(finished_games),
-                "completion_percentage": (len(finished_games) / len(games) * 100) if games else 0,
-                "total_goals": total_goals,
-                "average_goals_per_game": total_goals / len(finished_games) if finished_games else 0,
-                "wins": 0,
-                "draws": 0,
-                "highest_scoring_game": None,
-                "most_wins_team": None,
-                "best_attack": None,
-                "best_defense": None
+                "completion_percentage": (len(columns) / len(games) * 100) if games else 0,
+                **aggregated
             }
             
-            # Encontra jogo com mais gols
-            if finished_games:
-                highest_scoring = max(finished_games, key=lambda g: g.home_score + g.away_score)
-                home_team = team_controller.get_team_by_id(highest_scoring.home_team_id)
-                away_team = team_controller.get_team_by_id(highest_scoring.away_team_id)
-                
-                stats["highest_scoring_game"] = {
-                    "home_team": home_team.name if home_team else "N/A",
-                    "away_team": away_team.name if away_team else "N/A",
-                    "score": f"{highest_scoring.home_score}-{highest_scoring.away_score}",
-                    "total_goals": highest_scoring.home_score + highest_scoring.away_score,
-                    "date": highest_scoring.game_date.isoformat()
-                }
-            
-            # Conta vitórias e empates
-            for game in finished_games:
-                if game.home_score > game.away_score or game.away_score > game.home_score:
-                    stats["wins"] += 1
-                else:
-                    stats["draws"] += 1
+            for key in ("highest_scoring_game", "biggest_margin_game"):
+                summary = aggregated[key]
+                if summary:
+                    game = games_by_id.get(summary["game_id"])
+                    stats[key] = {
+                        **summary,
+                        "home_team": team_name(summary["home_team_id"]),
+                        "away_team": team_name(summary["away_team_id"]),
+                        "date": game.game_date.isoformat() if game and game.game_date else None
+                    }
             
-            # Busca estatísticas das equipes para encontrar melhores
-            standings = competition_controller.get_standings(competition_id)
-            if standings:
-                # Equipe com mais vitórias
-                most_wins = max(standings, key=lambda s: s.wins)
-                team = team_controller.get_team_by_id(most_wins.team_id)
-                stats["most_wins_team"] = {
-                    "name": team.name if team else "N/A",
-                    "wins": most_wins.wins
-                }
+            team_stats = aggregated["teams"]
+            stats["most_wins_team"] = None
+            stats["best_attack"] = None
+            stats["best_defense"] = None
+            if aggregated["most_wins_team_id"] is not None:
+                team_id = aggregated["most_wins_team_id"]
+                stats["most_wins_team"] = {"name": team_name(team_id), "wins": team_stats[team_id]["wins"]}
                 
-                # Melhor ataque (mais gols marcados)
-                best_attack = max(standings, key=lambda s: s.goals_for)
-                team = team_controller.get_team_by_id(best_attack.team_id)
-                stats["best_attack"] = {
-                    "name": team.name if team else "N/A",
-                    "goals": best_attack.goals_for
-                }
+                team_id = aggregated["best_attack_team_id"]
+                stats["best_attack"] = {"name": team_name(team_id), "goals": team_stats[team_id]["goals_for"]}
                 
-                # Melhor defesa (menos gols sofridos)
-                teams_with_games = [s for s in standings if s.games_played > 0]
-                if teams_with_games:
-                    best_defense = min(teams_with_games, key=lambda s: s.goals_against)
-                    team = team_controller.get_team_by_id(best_defense.team_id)
-                    stats["best_defense"] = {
-                        "name": team.name if team else "N/A",
-                        "goals_against": best_defense.goals_against
-                    }
+                team_id = aggregated["best_defense_team_id"]
+                stats["best_defense"] = {"name": team_name(team_id),
+                                         "goals_against": team_stats[team_id]["goals_against"]}
             
             return stats
             
@@ -370,5 +471,69 @@ class ReportController:
             return {"error": "Erro ao calcular estatísticas"}
 
 
+# Colunas das seções exportadas em PDF (cabeçalho, largura em caracteres)
+STANDINGS_COLUMNS = [("Pos", 4), ("Equipe", 28), ("J", 3), ("V", 3), ("E", 3), ("D", 3),
+                     ("GP", 4), ("GC", 4), ("SG", 4), ("Pts", 4)]
+SCHEDULE_COLUMNS = [("Data", 16), ("Rd", 3), ("Casa", 22), ("Visitante", 22),
+                    ("Placar", 7), ("Local", 16)]
+ROSTER_COLUMNS = [("Nº", 4), ("Atleta", 36), ("Posição", 18), ("Cap", 4)]
+SCORESHEET_COLUMNS = [("Nº", 4), ("Atleta", 32), ("Pontos/Gols", 12), ("Faltas", 8),
+                      ("Cartões", 9), ("Assinatura", 14)]
+
+
+def competition_pdf_sections(competition_id: int) -> Iterator[Any]:
+    """Seções do PDF de uma competição: classificação e programação"""
+    competition = competition_controller.get_competition_by_id(competition_id)
+    yield f"{competition.name if competition else 'Competição'} - Relatório"
+    yield TableSection("Classificação", STANDINGS_COLUMNS,
+                       report_controller.iter_standings_rows(competition_id))
+    yield TableSection("Programação de Jogos", SCHEDULE_COLUMNS,
+                       report_controller.iter_schedule_rows(competition_id=competition_id))
+
+
+def team_roster_pdf_sections(team_id: int) -> Iterator[Any]:
+    """Seções do PDF de elenco de uma equipe"""
+    team = team_controller.get_team_by_id(team_id)
+    yield f"Elenco - {team.name if team else 'Equipe'}"
+    if team:
+        yield TextSection("Contato", [
+            f"Responsável: {team.contact_person or 'Não informado'}",
+            f"Telefone: {team.contact_phone or 'Não informado'}",
+            f"Email: {team.contact_email or 'Não informado'}"
+        ])
+    yield TableSection("Atletas", ROSTER_COLUMNS, report_controller.iter_roster_rows(team_id))
+
+
+def round_scoresheet_sections(competition_id: int, round_number: int) -> Iterator[Any]:
+    """Súmulas de uma rodada: uma página por jogo, elencos buscados sob demanda"""
+    query = """
+    SELECT g.id, g.game_date, g.home_team_id, g.away_team_id, g.referee_name,
+           ht.name as home_team_name, at.name as away_team_name, v.name as venue_name
+    FROM games g
+    LEFT JOIN teams ht ON g.home_team_id = ht.id
+    LEFT JOIN teams at ON g.away_team_id = at.id
+    LEFT JOIN venues v ON g.venue_id = v.id
+    WHERE g.competition_id = %s AND g.round_number = %s
+    ORDER BY g.game_date
+    """
+    games = execute_query(query, (competition_id, round_number), fetch=True) or []
+    
+    for game in games:
+        game_date = game['game_date']
+        yield f"Súmula - {game['home_team_name']} x {game['away_team_name']}"
+        yield TextSection("Informações do Jogo", [
+            f"Data: {game_date.strftime('%d/%m/%Y %H:%M') if game_date else 'A definir'}",
+            f"Local: {game['venue_name'] or 'Não informado'}",
+            f"Árbitro: {game['referee_name'] or '____________________'}",
+            "Placar final: ______ x ______"
+        ])
+        for team_id, team_name in ((game['home_team_id'], game['home_team_name']),
+                                   (game['away_team_id'], game['away_team_name'])):
+            rows = ((number, name, "", "", "", "") for number, name, _, _ in
+                    report_controller.iter_roster_rows(team_id))
+            yield TableSection(team_name or "Equipe", SCORESHEET_COLUMNS, rows)
+        yield PageBreak()
+
+
 # Instância global do controlador de relatórios
 report_controller = ReportController()
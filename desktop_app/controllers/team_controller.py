@@ -4,9 +4,11 @@ Controller para gestão de equipes e atletas
 from typing import List, Optional, Tuple, Dict, Any
 from datetime import date, datetime
 
-from database.models import Team, Athlete, TechnicalStaff
+from database.models import Team, Athlete
 from database.connection import execute_query, execute_many
 from desktop_app.controllers.auth_controller import auth_controller
+from desktop_app.utils.search_index import search_index
+from desktop_app.utils.local_replica import local_replica
 from database.models import UserType
 from config.settings import SPORTS_CONFIG
 
@@ -61,6 +63,7 @@ class TeamController:
             
             if team.save():
                 self.current_team = team
+                search_index.add_team(team)
                 return True, "Equipe criada com sucesso"
             else:
                 return False, "Erro ao salvar equipe"
@@ -88,6 +91,7 @@ class TeamController:
                     updated = True
             
             if updated and team.save():
+                search_index.add_team(team)
                 return True, "Equipe atualizada com sucesso"
             else:
                 return False, "Nenhuma alteração realizada"
@@ -126,6 +130,7 @@ class TeamController:
             query = "UPDATE athletes SET is_active = FALSE WHERE team_id = %s"
             execute_query(query, (team_id,))
             
+            search_index.remove_team(team_id)
             return True, "Equipe excluída com sucesso"
             
         except Exception as e:
@@ -192,6 +197,7 @@ class TeamController:
             )
             
             if athlete.save():
+                search_index.add_athlete(athlete)
                 return True, f"Atleta {name} adicionado com sucesso"
             else:
                 return False, "Erro ao salvar atleta"
@@ -236,6 +242,10 @@ class TeamController:
                     updated = True
             
             if updated and athlete.save():
+                if athlete.is_active:
+                    search_index.add_athlete(athlete)
+                else:
+                    search_index.remove_athlete(athlete.id)
                 return True, "Atleta atualizado com sucesso"
             else:
                 return False, "Nenhuma alteração realizada"
@@ -267,6 +277,7 @@ class TeamController:
                 # Se tem participações, apenas desativa
                 athlete.is_active = False
                 if athlete.save():
+                    search_index.remove_athlete(athlete_id)
                     return True, "Atleta removido da equipe (mantido no histórico)"
                 else:
                     return False, "Erro ao remover atleta"
@@ -274,6 +285,7 @@ class TeamController:
                 # Se não tem participações, pode deletar
                 query = "DELETE FROM athletes WHERE id = %s"
                 execute_query(query, (athlete_id,))
+                search_index.remove_athlete(athlete_id)
                 return True, "Atleta removido definitivamente"
                 
         except Exception as e:
@@ -319,6 +331,16 @@ class TeamController:
     def get_team_athletes(self, team_id: int, active_only: bool = True) -> List[Athlete]:
         """Retorna atletas de uma equipe"""
         try:
+            if local_replica.holds('teams', team_id):
+                # A réplica não guarda documentos e contatos dos atletas
+                if active_only:
+                    rows = local_replica.rows('athletes', "team_id = ? AND is_active = 1", (team_id,),
+                                              order_by="jersey_number, name")
+                else:
+                    rows = local_replica.rows('athletes', "team_id = ?", (team_id,),
+                                              order_by="is_active DESC, jersey_number, name")
+                return [local_replica.to_model(Athlete, row) for row in rows]
+            
             if active_only:
                 query = """
                 SELECT * FROM athletes 
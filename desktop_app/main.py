@@ -1,23 +1,119 @@
 """
 Janela principal da aplicação desktop
+
+As abas são criadas (e seus módulos importados) na primeira vez em que
+são exibidas. O preenchimento do pool de conexões com o banco e a
+importação da primeira aba rodam em segundo plano enquanto a janela de
+login está aberta. Os marcos da inicialização ficam em startup_timeline;
+com APP_CONFIG['startup_profile'] o relatório é impresso ao abrir a
+primeira aba.
 """
 import sys
+from typing import Optional
+
+# Primeiro import: mede o restante da inicialização
+from desktop_app.utils.startup_timeline import startup_timeline
+
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                            QMenuBar, QStatusBar, QAction, QTabWidget, QLabel,
                            QFrame, QPushButton, QMessageBox, QDialog, QSplitter)
-from PyQt5.QtCore import Qt, QTimer, pyqtSignal
+from PyQt5.QtCore import Qt, QTimer, QObject, QRunnable, QThreadPool, pyqtSignal
 from PyQt5.QtGui import QIcon, QPixmap, QFont
 
 from desktop_app.controllers.auth_controller import auth_controller
-from desktop_app.views.login_dialog import LoginDialog
-from desktop_app.views.dashboard_widget import DashboardWidget
-from desktop_app.views.competitions_widget import CompetitionsWidget
-from desktop_app.views.teams_widget import TeamsWidget
-from desktop_app.views.games_widget import GamesWidget
-from desktop_app.views.users_widget import UsersWidget
-from desktop_app.views.reports_widget import ReportsWidget
+from desktop_app.utils.password_hasher import password_hasher
+from desktop_app.utils.local_replica import local_replica
+from desktop_app.logindialog import LoginDialog
 from database.models import UserType
 
+startup_timeline.mark('imports_done')
+
+# Abas da janela principal: (nome, módulo, classe, título); importadas sob demanda.
+# As telas de competições, equipes, jogos, relatórios e usuários só existem
+# em Tkinter (desktop_app.views.competition_window, team_window, game_window,
+# report_window e admin_window) e não podem ser embutidas em um QTabWidget:
+# até ganharem um widget Qt, essas abas mostram um aviso (módulo None).
+TABS = [
+    ('dashboard', 'desktop_app.widgets.dashboardwidget', 'DashboardWidget', "📊 Dashboard"),
+    ('competitions', None, None, "🏆 Competições"),
+    ('teams', None, None, "👥 Equipes"),
+    ('games', None, None, "⚽ Jogos"),
+    ('reports', None, None, "📈 Relatórios"),
+    # Usuários (apenas para usuários master)
+    ('users', None, None, "👤 Usuários"),
+]
+
+
+class LazyTab(QWidget):
+    """Aba cujo conteúdo é importado e criado na primeira exibição"""
+    
+    def __init__(self, module_path: Optional[str], class_name: Optional[str], title: str):
+        super().__init__()
+        self.module_path = module_path
+        self.class_name = class_name
+        self.title = title
+        self.content = None
+        
+        self._layout = QVBoxLayout(self)
+        self._layout.setContentsMargins(0, 0, 0, 0)
+    
+    @property
+    def loaded(self) -> bool:
+        return self.content is not None
+    
+    def load(self) -> bool:
+        """Cria o conteúdo se ainda não existe; True se criou agora"""
+        if self.content is not None:
+            return False
+        if self.module_path is None:
+            self.content = QLabel(f"{self.title}: tela ainda não disponível nesta versão.")
+            self.content.setAlignment(Qt.AlignCenter)
+            self._layout.addWidget(self.content)
+            return True
+        try:
+            with startup_timeline.span(f"aba {self.title}"):
+                module = startup_timeline.import_module(self.module_path)
+                self.content = getattr(module, self.class_name)()
+        except Exception as e:
+            print(f"Erro ao carregar aba {self.title}: {e}")
+            self.content = QLabel(f"Não foi possível carregar esta aba: {e}")
+            self.content.setAlignment(Qt.AlignCenter)
+        self._layout.addWidget(self.content)
+        return True
+    
+    def refresh(self):
+        """Atualiza o conteúdo, se já foi criado"""
+        if self.content is not None and hasattr(self.content, 'refresh'):
+            self.content.refresh()
+
+
+class StartupSignals(QObject):
+    """Sinais das tarefas de inicialização em segundo plano"""
+    database_checked = pyqtSignal(bool)
+
+
+class DatabaseWarmupTask(QRunnable):
+    """Preenche o pool de conexões do banco e importa a primeira aba durante o login"""
+    
+    def __init__(self, signals: StartupSignals, prefetch_modules=()):
+        super().__init__()
+        self.signals = signals
+        self.prefetch_modules = prefetch_modules
+    
+    def run(self):
+        from database.connection import db_manager
+        
+        with startup_timeline.span("pool de conexões com o banco"):
+            available = db_manager.warm_up()
+        self.signals.database_checked.emit(available)
+        
+        # Só importa: widgets Qt são criados na thread da interface
+        for module_path in self.prefetch_modules:
+            try:
+                startup_timeline.import_module(module_path)
+            except Exception as e:
+                print(f"Erro ao pré-carregar {module_path}: {e}")
+
 
 class MainWindow(QMainWindow):
     """Janela principal da aplicação"""
@@ -32,8 +128,11 @@ class MainWindow(QMainWindow):
         self.setGeometry(100, 100, 1400, 900)
         self.setMinimumSize(1200, 800)
         
+        startup_timeline.mark('main_window_init')
+        
         # Variáveis de estado
         self.current_user = None
+        self.tabs = {}
         self.session_timer = QTimer()
         self.session_timer.timeout.connect(self._check_session)
         self.session_timer.start(60000)  # Verifica a cada minuto
@@ -47,6 +146,12 @@ class MainWindow(QMainWindow):
         self.user_logged_in.connect(self._on_user_logged_in)
         self.user_logged_out.connect(self._on_user_logged_out)
         
+        # Conexão com o banco testada enquanto o login está aberto
+        self.startup_signals = StartupSignals()
+        self.startup_signals.database_checked.connect(self._on_database_checked)
+        QThreadPool.globalInstance().start(
+            DatabaseWarmupTask(self.startup_signals, prefetch_modules=(TABS[0][1],)))
+        
         # Força login inicial
         self._show_login_dialog()
     
@@ -102,35 +207,28 @@ class MainWindow(QMainWindow):
         
         # Cria as abas principais
         self._create_tabs()
+        self.tab_widget.currentChanged.connect(self._on_tab_changed)
         
         main_layout.addWidget(self.tab_widget)
     
     def _create_tabs(self):
-        """Cria as abas da aplicação"""
-        
-        # Dashboard
-        self.dashboard_widget = DashboardWidget()
-        self.tab_widget.addTab(self.dashboard_widget, "📊 Dashboard")
-        
-        # Competições
-        self.competitions_widget = CompetitionsWidget()
-        self.tab_widget.addTab(self.competitions_widget, "🏆 Competições")
-        
-        # Equipes
-        self.teams_widget = TeamsWidget()
-        self.tab_widget.addTab(self.teams_widget, "👥 Equipes")
-        
-        # Jogos
-        self.games_widget = GamesWidget()
-        self.tab_widget.addTab(self.games_widget, "⚽ Jogos")
-        
-        # Relatórios
-        self.reports_widget = ReportsWidget()
-        self.tab_widget.addTab(self.reports_widget, "📈 Relatórios")
-        
-        # Usuários (apenas para usuários master)
-        self.users_widget = UsersWidget()
-        self.tab_widget.addTab(self.users_widget, "👤 Usuários")
+        """Cria as abas da aplicação (o conteúdo só na primeira exibição)"""
+        for name, module_path, class_name, title in TABS:
+            tab = LazyTab(module_path, class_name, title)
+            self.tabs[name] = tab
+            self.tab_widget.addTab(tab, title)
+    
+    def _on_tab_changed(self, index: int):
+        """Cria o conteúdo da aba ao ser exibida pela primeira vez"""
+        if self.tab_widget.isEnabled():
+            self._load_tab(self.tab_widget.widget(index))
+    
+    def _load_tab(self, tab) -> bool:
+        if not isinstance(tab, LazyTab) or not tab.load():
+            return False
+        # Após o próximo ciclo de eventos a aba já foi desenhada
+        QTimer.singleShot(0, lambda: startup_timeline.finish('first_tab_ready'))
+        return True
     
     def _setup_menu(self):
         """Configura menu principal"""
@@ -186,7 +284,10 @@ class MainWindow(QMainWindow):
     def _show_login_dialog(self):
         """Mostra dialog de login"""
         login_dialog = LoginDialog(self)
+        # Disparado pelo loop do dialog, ou seja, com a janela já exibida
+        QTimer.singleShot(0, lambda: startup_timeline.mark('login_window_shown'))
         if login_dialog.exec_() == QDialog.Accepted:
+            startup_timeline.mark('login_accepted')
             user = auth_controller.current_user
             if user:
                 self.current_user = user
@@ -220,14 +321,17 @@ class MainWindow(QMainWindow):
         self.connection_label.setText("🟢 Conectado")
         
         # Esconde aba de usuários se não for master
-        users_tab_index = self.tab_widget.indexOf(self.users_widget)
+        users_tab_index = self.tab_widget.indexOf(self.tabs['users'])
         if user.user_type != UserType.MASTER:
             self.tab_widget.setTabVisible(users_tab_index, False)
         else:
             self.tab_widget.setTabVisible(users_tab_index, True)
         
-        # Atualiza todas as abas
-        self._refresh_all_tabs()
+        # Cria a aba atual; as já criadas (novo login) são atualizadas
+        created = self.tab_widget.currentWidget()
+        if not self._load_tab(created):
+            created = None
+        self._refresh_all_tabs(skip=created)
         
         # Inicia timer de sessão
         self._update_session_info()
@@ -261,19 +365,31 @@ class MainWindow(QMainWindow):
             elapsed = auth_controller.session_start.strftime("%H:%M")
             self.session_label.setText(f"⏱️ Sessão: {elapsed}")
     
+    def _on_database_checked(self, available: bool):
+        """Resultado do teste de conexão feito em segundo plano"""
+        startup_timeline.mark('database_checked')
+        if available:
+            if not self.current_user:
+                self.connection_label.setText("🟢 Banco disponível")
+        elif local_replica.enabled:
+            self.connection_label.setText("🟡 Offline (réplica local)")
+            self.status_bar.showMessage("Servidor indisponível: alterações serão enviadas na sincronização.")
+        else:
+            self.connection_label.setText("🔴 Banco indisponível")
+            self.status_bar.showMessage("Não foi possível conectar ao banco de dados.")
+    
     def _refresh_current_tab(self):
         """Atualiza aba atual"""
         current_widget = self.tab_widget.currentWidget()
-        if hasattr(current_widget, 'refresh'):
+        if isinstance(current_widget, LazyTab) and current_widget.loaded:
             current_widget.refresh()
             self.status_bar.showMessage("Dados atualizados.", 3000)
     
-    def _refresh_all_tabs(self):
-        """Atualiza todas as abas"""
-        for i in range(self.tab_widget.count()):
-            widget = self.tab_widget.widget(i)
-            if hasattr(widget, 'refresh'):
-                widget.refresh()
+    def _refresh_all_tabs(self, skip=None):
+        """Atualiza as abas já criadas (as demais carregam ao serem exibidas)"""
+        for tab in self.tabs.values():
+            if tab is not skip and tab.loaded:
+                tab.refresh()
     
     def _show_about(self):
         """Mostra informações sobre o sistema"""
@@ -326,9 +442,16 @@ class Application:
         from PyQt5.QtWidgets import QApplication
         
         self.app = QApplication(sys.argv)
+        startup_timeline.mark('qapplication_created')
         self.app.setApplicationName("Sistema de Competições Universitárias")
         self.app.setApplicationVersion("1.0.0")
         
+        # Calibra o custo do bcrypt enquanto a janela abre
+        password_hasher.calibrate_async()
+        
+        # Réplica local (LOCAL_REPLICA=true): sincronização em segundo plano
+        local_replica.start()
+        
         # Configura estilo da aplicação
         self.app.setStyleSheet("""
             QMainWindow {
@@ -1,17 +1,33 @@
 """
 Utilitários do sistema
+
+Os utilitários são importados sob demanda (no primeiro acesso ao nome),
+para que importar um módulo leve deste pacote não carregue os geradores
+de relatório e demais dependências pesadas.
 """
+from importlib import import_module
+
+_EXPORTS = {
+    'DatabaseUtils': '.database_utils',
+    'DateUtils': '.date_utils',
+    'ValidationUtils': '.validation_utils',
+    'EncryptionUtils': '.encryption_utils',
+    'ReportGenerator': '.report_generator',
+    'PDFReportRenderer': '.pdf_renderer',
+    'GameColumns': '.statistics_aggregator',
+    'LiveEventHub': '.live_events'
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
 
-from .database_utils import DatabaseUtils
-from .date_utils import DateUtils
-from .validation_utils import ValidationUtils
-from .encryption_utils import EncryptionUtils
-from .report_generator import ReportGenerator
 
-__all__ = [
-    'DatabaseUtils',
-    'DateUtils',
-    'ValidationUtils',
-    'EncryptionUtils',
-    'ReportGenerator'
-]
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
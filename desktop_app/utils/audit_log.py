@@ -0,0 +1,286 @@
+"""
+Log de auditoria assíncrono (tabela user_logs)
+
+As ações auditadas apenas colocam um registro em uma fila em memória de
+tamanho limitado; uma thread de fundo grava os registros em lote com
+executemany a cada flush_interval_ms ou batch_size registros, o que vier
+primeiro. Assim a auditoria nunca acrescenta a latência de uma ida ao
+banco à ação principal.
+
+Com a fila cheia, a política 'drop' descarta o registro e incrementa
+dropped; a política 'block' espera até block_timeout segundos (pressão de
+volta sobre quem produz) antes de descartar. A fila é esvaziada no
+encerramento do processo.
+
+A tabela é particionada por mês (ver create_tables.sql); ensure_partitions
+cria as partições dos próximos meses e, opcionalmente, descarta as antigas.
+"""
+import atexit
+import json
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from config.settings import AUDIT_CONFIG
+from database.connection import execute_many, execute_query
+
+INSERT_QUERY = """
+INSERT INTO user_logs (user_id, action, entity_type, entity_id, details, ip_address, created_at)
+VALUES (%s, %s, %s, %s, %s, %s, %s)
+"""
+
+FUTURE_PARTITION = 'p_future'
+
+
+@dataclass(frozen=True)
+class AuditRecord:
+    """Uma linha de user_logs"""
+    action: str
+    user_id: Optional[int] = None
+    entity_type: Optional[str] = None
+    entity_id: Optional[int] = None
+    details: Optional[str] = None
+    ip_address: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+    def as_row(self) -> tuple:
+        return (self.user_id, self.action, self.entity_type, self.entity_id,
+                self.details, self.ip_address, self.created_at)
+
+
+class _FlushRequest:
+    """Marcador na fila: o escritor grava o lote pendente e sinaliza"""
+
+    def __init__(self):
+        self.done = threading.Event()
+
+
+class AuditLogWriter:
+    """Fila limitada com gravação em lote por uma thread de fundo"""
+
+    def __init__(self, writer: Callable[[str, List[tuple]], Any] = execute_many,
+                 queue_size: int = 10000, batch_size: int = 200, flush_interval_ms: int = 500,
+                 full_queue_policy: str = 'drop', block_timeout: float = 0.05,
+                 ip_address: str = 'desktop_app',
+                 on_start: Optional[Callable[[], None]] = None):
+        self.writer = writer
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.full_queue_policy = full_queue_policy
+        self.block_timeout = block_timeout
+        self.ip_address = ip_address
+        self.on_start = on_start
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.batches = 0
+
+    def log(self, action: str, user_id: Optional[int] = None, entity_type: Optional[str] = None,
+            entity_id: Optional[int] = None, details: Optional[Dict[str, Any]] = None,
+            ip_address: Optional[str] = None) -> bool:
+        """
+        Enfileira uma ação para auditoria
+
+        Args:
+            action: Nome da ação (ex.: 'login_success', 'game_finished')
+            user_id: Usuário responsável
+            entity_type: Tipo da entidade afetada (ex.: 'game')
+            entity_id: Id da entidade afetada
+            details: Dados adicionais, gravados como JSON
+            ip_address: Origem; padrão definido no escritor
+
+        Returns:
+            True se enfileirado, False se descartado
+        """
+        if self._closed:
+            self.dropped += 1
+            return False
+
+        record = AuditRecord(
+            action=action, user_id=user_id, entity_type=entity_type, entity_id=entity_id,
+            details=json.dumps(details, default=str) if details is not None else None,
+            ip_address=ip_address or self.ip_address, created_at=datetime.now()
+        )
+        self._ensure_started()
+        try:
+            if self.full_queue_policy == 'block':
+                self._queue.put(record, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            return False
+        self.enqueued += 1
+        return True
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Aguarda a gravação de tudo que já foi enfileirado"""
+        if self._thread is None or not self._thread.is_alive():
+            return self._queue.empty()
+        request = _FlushRequest()
+        try:
+            self._queue.put(request, timeout=timeout)
+        except queue.Full:
+            return False
+        return request.done.wait(timeout)
+
+    def close(self, timeout: float = 5.0):
+        """Esvazia a fila e encerra a thread de fundo"""
+        self._closed = True
+        self.flush(timeout)
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout)
+            self._thread = None
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'queued': self._queue.qsize(),
+            'enqueued': self.enqueued,
+            'written': self.written,
+            'dropped': self.dropped,
+            'failed': self.failed,
+            'batches': self.batches
+        }
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='audit-log-writer',
+                                                daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+
+    def _run(self):
+        if self.on_start is not None:
+            try:
+                self.on_start()
+            except Exception as e:
+                print(f"Erro ao preparar tabela de auditoria: {e}")
+
+        batch: List[AuditRecord] = []
+        waiting: List[_FlushRequest] = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = False  # intervalo esgotado
+
+            stop = item is None
+            if isinstance(item, AuditRecord):
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+            elif isinstance(item, _FlushRequest):
+                waiting.append(item)
+
+            if stop or waiting or len(batch) >= self.batch_size or (
+                    deadline is not None and time.monotonic() >= deadline):
+                self._write(batch)
+                batch = []
+                deadline = None
+                for request in waiting:
+                    request.done.set()
+                waiting = []
+            if stop:
+                return
+
+    def _write(self, batch: Sequence[AuditRecord]):
+        for start in range(0, len(batch), self.batch_size):
+            chunk = batch[start:start + self.batch_size]
+            try:
+                self.writer(INSERT_QUERY, [record.as_row() for record in chunk])
+                self.written += len(chunk)
+                self.batches += 1
+            except Exception as e:
+                # A auditoria nunca derruba a aplicação: o lote é contado como perdido
+                self.failed += len(chunk)
+                print(f"Erro ao gravar log de auditoria: {e}")
+
+
+def _month_start(day: date, offset: int = 0) -> date:
+    month = day.month - 1 + offset
+    return date(day.year + month // 12, month % 12 + 1, 1)
+
+
+def ensure_partitions(months_ahead: int = 3, retention_months: int = 0,
+                      today: Optional[date] = None,
+                      execute: Callable = execute_query) -> List[str]:
+    """
+    Cria as partições mensais de user_logs até months_ahead meses à frente
+
+    As novas partições são separadas de p_future com REORGANIZE PARTITION.
+    Com retention_months > 0, partições inteiras mais antigas que o período
+    são descartadas (DROP PARTITION, sem varrer linhas).
+
+    Returns:
+        Comandos executados
+    """
+    today = today or date.today()
+    rows = execute(
+        "SELECT PARTITION_NAME AS name FROM information_schema.PARTITIONS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'user_logs' "
+        "AND PARTITION_NAME IS NOT NULL", fetch=True
+    ) or []
+    existing = {row['name'] for row in rows}
+    if FUTURE_PARTITION not in existing:
+        return []  # tabela sem particionamento
+    statements = []
+
+    missing = []
+    for offset in range(months_ahead + 1):
+        start = _month_start(today, offset)
+        name = f"p{start:%Y%m}"
+        if name not in existing:
+            missing.append(f"PARTITION {name} VALUES LESS THAN ('{_month_start(start, 1).isoformat()}')")
+    # Só meses posteriores à última partição podem sair de p_future
+    latest = max((name for name in existing if name != FUTURE_PARTITION), default='')
+    missing = [clause for clause in missing if clause.split()[1] > latest]
+    if missing:
+        statements.append(
+            f"ALTER TABLE user_logs REORGANIZE PARTITION {FUTURE_PARTITION} INTO ("
+            + ', '.join(missing) + f", PARTITION {FUTURE_PARTITION} VALUES LESS THAN (MAXVALUE))"
+        )
+
+    if retention_months > 0:
+        oldest = f"p{_month_start(today, -retention_months):%Y%m}"
+        expired = sorted(name for name in existing if name != FUTURE_PARTITION and name < oldest)
+        if expired:
+            statements.append(f"ALTER TABLE user_logs DROP PARTITION {', '.join(expired)}")
+
+    for statement in statements:
+        execute(statement)
+    return statements
+
+
+def create_audit_log(config: Dict = AUDIT_CONFIG) -> AuditLogWriter:
+    """Monta o escritor a partir de AUDIT_CONFIG"""
+    def prepare():
+        ensure_partitions(config.get('partitions_ahead', 3), config.get('retention_months', 0))
+
+    return AuditLogWriter(
+        queue_size=config.get('queue_size', 10000),
+        batch_size=config.get('batch_size', 200),
+        flush_interval_ms=config.get('flush_interval_ms', 500),
+        full_queue_policy=config.get('full_queue_policy', 'drop'),
+        block_timeout=config.get('block_timeout', 0.05),
+        on_start=prepare
+    )
+
+
+# Instância global do log de auditoria
+audit_log = create_audit_log()
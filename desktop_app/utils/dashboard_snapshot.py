@@ -0,0 +1,261 @@
+"""
+Dados do dashboard desktop carregados por diferença
+
+O DashboardSnapshot mantém em memória as linhas de competições, equipes,
+atletas e jogos necessárias ao dashboard. A cada atualização busca apenas
+as linhas com updated_at a partir da última marca d'água de cada tabela e
+confere as contagens para perceber exclusões (que não deixam linha
+alterada); só quando a contagem diverge a tabela é relida inteira.
+
+Com as linhas em memória, as seções do dashboard (cards, listas) são
+montadas sem novas consultas, e refresh() devolve apenas as seções cujo
+conteúdo mudou, para que a interface não redesenhe o que já exibe.
+
+Bancos criados antes da coluna updated_at em teams/athletes continuam
+funcionando: a tabela sem a coluna é relida inteira a cada atualização.
+"""
+import threading
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from database.connection import execute_query
+
+TABLE_QUERIES = {
+    'competitions': "SELECT id, name, status, start_date, updated_at FROM competitions",
+    'teams': "SELECT id, name, is_active, updated_at FROM teams",
+    'athletes': "SELECT id, team_id, is_active, updated_at FROM athletes",
+    'games': ("SELECT id, competition_id, home_team_id, away_team_id, game_date, status, "
+              "home_score, away_score, updated_at FROM games"),
+}
+
+COUNT_QUERY = "SELECT " + ", ".join(
+    f"(SELECT COUNT(*) FROM {table}) AS {table}" for table in TABLE_QUERIES
+)
+
+# Seção do dashboard -> tabelas de que depende
+SECTION_TABLES = {
+    'stats': ('competitions', 'teams', 'athletes', 'games'),
+    'next_games': ('competitions', 'teams', 'games'),
+    'competitions': ('competitions', 'games'),
+    'notifications': ('competitions', 'teams', 'athletes', 'games'),
+    'activity': ('teams', 'games'),
+}
+
+MIN_ATHLETES = 11
+MAX_ITEMS = 5
+ACTIVITY_DAYS = 7
+
+
+def _game_day(game: Dict[str, Any]) -> Optional[date]:
+    value = game.get('game_date')
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+class _TableCache:
+    """Linhas de uma tabela por id e a marca d'água de updated_at"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.rows: Dict[int, Dict[str, Any]] = {}
+        self.watermark: Optional[datetime] = None
+        self.supports_delta = True
+        self.loaded = False
+
+    def apply(self, rows: List[Dict[str, Any]], replace: bool = False) -> bool:
+        """Aplica as linhas lidas; True se alguma coisa mudou"""
+        changed = False
+        if replace:
+            fresh = {row['id']: row for row in rows}
+            changed = fresh != self.rows
+            self.rows = fresh
+        else:
+            for row in rows:
+                if self.rows.get(row['id']) != row:
+                    self.rows[row['id']] = row
+                    changed = True
+        stamps = [row['updated_at'] for row in rows if row.get('updated_at') is not None]
+        if stamps:
+            newest = max(stamps)
+            if self.watermark is None or newest > self.watermark:
+                self.watermark = newest
+        self.loaded = True
+        return changed
+
+
+class DashboardSnapshot:
+    """Estado do dashboard atualizado por diferença a partir do banco"""
+
+    def __init__(self, execute: Callable = execute_query, today: Callable[[], date] = date.today):
+        self.execute = execute
+        self.today = today
+        self.tables = {name: _TableCache(name) for name in TABLE_QUERIES}
+        self.sections: Dict[str, Any] = {}
+        self._sections_day: Optional[date] = None
+        self._lock = threading.Lock()
+        self.queries = 0
+
+    def refresh(self) -> Dict[str, Any]:
+        """
+        Busca as alterações e recalcula as seções afetadas
+
+        Returns:
+            Apenas as seções cujo conteúdo mudou (vazio se nada mudou)
+        """
+        with self._lock:
+            changed_tables = self._load_changes()
+            day = self.today()
+            if day != self._sections_day:
+                # Virada do dia muda "jogos hoje", pendências e atividades
+                changed_tables = set(self.tables)
+                self._sections_day = day
+            if not changed_tables:
+                return {}
+
+            changed_sections = {}
+            for section, tables in SECTION_TABLES.items():
+                if section in self.sections and not changed_tables.intersection(tables):
+                    continue
+                value = getattr(self, f'_build_{section}')(day)
+                if self.sections.get(section) != value:
+                    self.sections[section] = value
+                    changed_sections[section] = value
+            return changed_sections
+
+    def _query(self, query: str, params: Optional[Tuple] = None) -> List[Dict[str, Any]]:
+        self.queries += 1
+        return self.execute(query, params, fetch=True) or []
+
+    def _load_changes(self) -> Set[str]:
+        changed = set()
+        for table in self.tables.values():
+            if not table.loaded or not table.supports_delta or table.watermark is None:
+                rows = self._query(TABLE_QUERIES[table.name])
+                replace = True
+            else:
+                try:
+                    # >= porque várias linhas podem ter o mesmo segundo da marca;
+                    # as já conhecidas chegam iguais e não contam como mudança
+                    rows = self._query(TABLE_QUERIES[table.name] + " WHERE updated_at >= %s",
+                                       (table.watermark,))
+                    replace = False
+                except Exception as e:
+                    print(f"Erro ao buscar alterações de {table.name}, relendo a tabela: {e}")
+                    table.supports_delta = False
+                    rows = self._query(TABLE_QUERIES[table.name])
+                    replace = True
+            if table.apply(rows, replace=replace):
+                changed.add(table.name)
+            if replace and rows and all(row.get('updated_at') is None for row in rows):
+                table.supports_delta = False
+
+        # Exclusões não aparecem na consulta por data: as contagens revelam
+        counts = self._query(COUNT_QUERY)
+        totals = counts[0] if counts else {}
+        for name, table in self.tables.items():
+            total = totals.get(name)
+            if total is not None and total != len(table.rows):
+                if table.apply(self._query(TABLE_QUERIES[name]), replace=True):
+                    changed.add(name)
+        return changed
+
+    # Montagem das seções (apenas dados em memória)
+
+    def _team_name(self, team_id: int) -> str:
+        team = self.tables['teams'].rows.get(team_id)
+        return team['name'] if team else "N/A"
+
+    def _active_athletes_by_team(self) -> Dict[int, int]:
+        counts: Dict[int, int] = {}
+        for athlete in self.tables['athletes'].rows.values():
+            if athlete['is_active']:
+                counts[athlete['team_id']] = counts.get(athlete['team_id'], 0) + 1
+        return counts
+
+    def _build_stats(self, day: date) -> Dict[str, int]:
+        active_teams = {team_id for team_id, team in self.tables['teams'].rows.items()
+                        if team['is_active']}
+        athletes = self._active_athletes_by_team()
+        return {
+            'competitions': sum(1 for c in self.tables['competitions'].rows.values()
+                                if c['status'] == 'ongoing'),
+            'teams': len(active_teams),
+            'games_today': sum(1 for g in self.tables['games'].rows.values() if _game_day(g) == day),
+            'athletes': sum(athletes.get(team_id, 0) for team_id in active_teams),
+        }
+
+    def _sorted_games(self) -> List[Dict[str, Any]]:
+        return sorted((g for g in self.tables['games'].rows.values() if g.get('game_date')),
+                      key=lambda g: (g['game_date'], g['id']))
+
+    def _build_next_games(self, day: date) -> Tuple[str, ...]:
+        competitions = self.tables['competitions'].rows
+        lines = []
+        for game in self._sorted_games():
+            if game['status'] != 'scheduled' or _game_day(game) < day:
+                continue
+            text = (f"{self._team_name(game['home_team_id'])} x {self._team_name(game['away_team_id'])}"
+                    f" - {game['game_date'].strftime('%d/%m %H:%M')}")
+            competition = competitions.get(game['competition_id'])
+            if competition:
+                text += f" ({competition['name']})"
+            lines.append(text)
+            if len(lines) >= MAX_ITEMS:
+                break
+        return tuple(lines)
+
+    def _build_competitions(self, day: date) -> Tuple[str, ...]:
+        totals: Dict[int, List[int]] = {}
+        for game in self.tables['games'].rows.values():
+            counts = totals.setdefault(game['competition_id'], [0, 0])
+            counts[0] += 1
+            if game['status'] == 'finished':
+                counts[1] += 1
+
+        lines = []
+        for competition in sorted(self.tables['competitions'].rows.values(), key=lambda c: c['name']):
+            if competition['status'] != 'ongoing':
+                continue
+            total, finished = totals.get(competition['id'], (0, 0))
+            if total > 0:
+                lines.append(f"{competition['name']} - {int(finished / total * 100)}% concluída")
+            else:
+                lines.append(f"{competition['name']} - Não iniciada")
+        return tuple(lines)
+
+    def _build_notifications(self, day: date) -> Tuple[str, ...]:
+        notifications = []
+        for competition in self.tables['competitions'].rows.values():
+            start = competition.get('start_date')
+            if competition['status'] == 'planning' and start and start <= day:
+                notifications.append(f"⚠️ Competição '{competition['name']}' pode ser iniciada")
+
+        limit = day - timedelta(days=1)
+        overdue = sum(1 for g in self.tables['games'].rows.values()
+                      if g['status'] == 'scheduled' and g.get('game_date') and _game_day(g) <= limit)
+        if overdue:
+            notifications.append(f"⏰ {overdue} jogo(s) pendente(s) de resultado")
+
+        athletes = self._active_athletes_by_team()
+        for team in self.tables['teams'].rows.values():
+            count = athletes.get(team['id'], 0)
+            if team['is_active'] and count < MIN_ATHLETES:
+                notifications.append(f"👥 Equipe '{team['name']}' com poucos atletas ({count})")
+        return tuple(notifications[:MAX_ITEMS])
+
+    def _build_activity(self, day: date) -> Tuple[str, ...]:
+        since = day - timedelta(days=ACTIVITY_DAYS)
+        lines = []
+        for game in self._sorted_games():
+            if _game_day(game) < since:
+                continue
+            home = self._team_name(game['home_team_id'])
+            away = self._team_name(game['away_team_id'])
+            if game['status'] == 'finished':
+                lines.append(f"🏆 {home} {game['home_score']} x {game['away_score']} {away}")
+            elif game['status'] == 'scheduled':
+                lines.append(f"📅 {home} x {away} - {game['game_date'].strftime('%d/%m %H:%M')}")
+            if len(lines) >= MAX_ITEMS:
+                break
+        return tuple(lines)
@@ -1,10 +1,10 @@
 """
 Utilitários para criptografia e hashing
 """
-import bcrypt
 import hashlib
 import secrets
-from typing import str
+
+from .password_hasher import password_hasher
 
 
 class EncryptionUtils:
@@ -21,8 +21,8 @@ class EncryptionUtils:
         Returns:
             Hash da senha
         """
-        salt = bcrypt.gensalt()
-        return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+        # Custo calibrado e cálculo no pool dedicado
+        return password_hasher.hash(password)
     
     @staticmethod
     def verify_password(password: str, hashed: str) -> bool:
@@ -37,7 +37,7 @@ class EncryptionUtils:
             True se corresponde, False caso contrário
         """
         try:
-            return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+            return password_hasher.verify(password, hashed)
         except Exception:
             return False
     
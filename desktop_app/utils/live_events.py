@@ -0,0 +1,262 @@
+"""
+Publicação de placares e eventos de jogos em tempo real
+
+Os controllers publicam uma única vez cada alteração (placar, status,
+novos eventos) e o hub entrega a todos os inscritos nos canais do jogo e da
+competição. Cada inscrito tem uma fila limitada: um cliente lento perde os
+eventos mais antigos e recebe um aviso de 'resync', sem travar os demais.
+
+Entre processos (aplicação desktop, vários workers web) o hub pode usar um
+arquivo SQLite compartilhado como fan-out: quem publica grava uma linha e
+cada processo com inscritos lê as linhas novas com uma consulta periódica,
+independente do número de clientes conectados.
+
+O fan-out fica ativo por padrão em data/live_events.sqlite3
+(LIVE_EVENTS_CONFIG em config/settings.py). Variável de ambiente:
+    LIVE_EVENTS_DB=/caminho/live_events.sqlite3   outro arquivo
+    LIVE_EVENTS_DB=                               somente no próprio processo
+"""
+import json
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+from config.settings import LIVE_EVENTS_CONFIG
+
+DEFAULT_QUEUE_SIZE = 100
+REPLAY_SIZE = 200
+POLL_INTERVAL = 0.5
+RETENTION_SECONDS = 3600
+
+
+def game_channel(game_id: int) -> str:
+    return f"game:{game_id}"
+
+
+def competition_channel(competition_id: int) -> str:
+    return f"competition:{competition_id}"
+
+
+class Subscription:
+    """Inscrição de um cliente em um ou mais canais"""
+
+    def __init__(self, channels: Iterable[str], maxsize: int = DEFAULT_QUEUE_SIZE):
+        self.channels: Set[str] = set(channels)
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize)
+        self.dropped = 0
+
+    def put(self, event: Dict[str, Any]):
+        """Entrega sem bloquear; com a fila cheia descarta o evento mais antigo"""
+        while True:
+            try:
+                self._queue.put_nowait(event)
+                return
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Próximo evento, ou None se nada chegar dentro do timeout"""
+        try:
+            event = self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        if self.dropped:
+            # O cliente perdeu eventos: pede que recarregue o estado completo
+            self.dropped = 0
+            return {'id': event['id'], 'type': 'resync', 'channels': event['channels'], 'data': {}}
+        return event
+
+
+class SQLiteFanout:
+    """Fan-out entre processos por meio de uma tabela em um arquivo SQLite"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        if path != ':memory:':
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        connection = self._connection()
+        connection.execute("""
+            CREATE TABLE IF NOT EXISTS live_events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                origin TEXT NOT NULL,
+                channels TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+        """)
+        connection.commit()
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+        return connection
+
+    def append(self, origin: str, channels: List[str], event: Dict[str, Any]):
+        connection = self._connection()
+        now = time.time()
+        connection.execute(
+            "INSERT INTO live_events (origin, channels, payload, created_at) VALUES (?, ?, ?, ?)",
+            (origin, ' '.join(channels), json.dumps(event, default=str), now)
+        )
+        connection.execute("DELETE FROM live_events WHERE created_at < ?", (now - RETENTION_SECONDS,))
+        connection.commit()
+
+    def last_id(self) -> int:
+        row = self._connection().execute("SELECT COALESCE(MAX(id), 0) FROM live_events").fetchone()
+        return row[0]
+
+    def read_after(self, last_id: int) -> List[Tuple[int, str, str, str]]:
+        return self._connection().execute(
+            "SELECT id, origin, channels, payload FROM live_events WHERE id > ? ORDER BY id",
+            (last_id,)
+        ).fetchall()
+
+
+class LiveEventHub:
+    """Hub publish/subscribe em processo, com fan-out opcional entre processos"""
+
+    def __init__(self, fanout: Optional[SQLiteFanout] = None):
+        self.fanout = fanout
+        self.origin = uuid.uuid4().hex
+        self._subscriptions: Dict[str, Set[Subscription]] = {}
+        self._recent: Deque[Dict[str, Any]] = deque(maxlen=REPLAY_SIZE)
+        self._lock = threading.Lock()
+        self._sequence = 0
+        self._poller: Optional[threading.Thread] = None
+
+    def configure(self, path: Optional[str]):
+        """Ativa (ou desativa, com None) o fan-out SQLite entre processos"""
+        try:
+            self.fanout = SQLiteFanout(path) if path else None
+        except (OSError, sqlite3.Error) as e:
+            # Sem o arquivo os eventos continuam chegando aos inscritos deste processo
+            print(f"Erro ao abrir fan-out de eventos ao vivo em {path}: {e}")
+            self.fanout = None
+
+    def subscribe(self, channels: Iterable[str], last_event_id: Optional[str] = None,
+                  maxsize: int = DEFAULT_QUEUE_SIZE) -> Subscription:
+        """
+        Inscreve um cliente nos canais informados
+
+        Args:
+            channels: Canais (game_channel / competition_channel)
+            last_event_id: Último id recebido pelo cliente (cabeçalho
+                Last-Event-ID); os eventos recentes posteriores são reenviados
+            maxsize: Tamanho da fila do cliente
+
+        Returns:
+            Inscrição a ser consumida com get() e encerrada com unsubscribe()
+        """
+        subscription = Subscription(channels, maxsize)
+        with self._lock:
+            for channel in subscription.channels:
+                self._subscriptions.setdefault(channel, set()).add(subscription)
+            missed = [event for event in self._recent
+                      if last_event_id and event['id'] > last_event_id
+                      and subscription.channels.intersection(event['channels'])]
+        for event in missed:
+            subscription.put(event)
+
+        if self.fanout is not None:
+            self._ensure_poller()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            for channel in subscription.channels:
+                subscribers = self._subscriptions.get(channel)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._subscriptions[channel]
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len({s for subscribers in self._subscriptions.values() for s in subscribers})
+
+    def publish(self, event_type: str, data: Dict[str, Any], game_id: Optional[int] = None,
+                competition_id: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Publica uma alteração nos canais do jogo e da competição
+
+        Args:
+            event_type: 'score', 'status', 'events' etc.
+            data: Conteúdo serializável em JSON
+            game_id: Jogo afetado
+            competition_id: Competição do jogo
+
+        Returns:
+            Evento publicado
+        """
+        channels = []
+        if game_id is not None:
+            channels.append(game_channel(game_id))
+        if competition_id is not None:
+            channels.append(competition_channel(competition_id))
+
+        with self._lock:
+            self._sequence += 1
+            # Ids ordenáveis como texto, únicos entre processos
+            event_id = f"{time.time_ns():020d}-{self.origin[:8]}-{self._sequence}"
+        event = {'id': event_id, 'type': event_type, 'channels': channels, 'data': data}
+
+        self._dispatch(event)
+        if self.fanout is not None:
+            try:
+                self.fanout.append(self.origin, channels, event)
+            except sqlite3.Error as e:
+                print(f"Erro ao publicar evento ao vivo: {e}")
+        return event
+
+    def _dispatch(self, event: Dict[str, Any]):
+        with self._lock:
+            self._recent.append(event)
+            targets = set()
+            for channel in event['channels']:
+                targets.update(self._subscriptions.get(channel, ()))
+        for subscription in targets:
+            subscription.put(event)
+
+    def _ensure_poller(self):
+        with self._lock:
+            if self._poller is None:
+                # Posição lida já na inscrição: um evento publicado antes de a thread
+                # começar a rodar não pode ficar para trás
+                fanout = self.fanout
+                self._poller = threading.Thread(target=self._poll, args=(fanout, fanout.last_id()),
+                                                name='live-events-poller', daemon=True)
+                self._poller.start()
+
+    def _poll(self, fanout: SQLiteFanout, last_id: int):
+        """Lê eventos publicados por outros processos enquanto houver inscritos"""
+        while True:
+            with self._lock:
+                if self.fanout is not fanout or not self._subscriptions:
+                    self._poller = None
+                    return
+            try:
+                for row_id, origin, _, payload in fanout.read_after(last_id):
+                    last_id = row_id
+                    if origin != self.origin:
+                        self._dispatch(json.loads(payload))
+            except sqlite3.Error as e:
+                print(f"Erro ao ler eventos ao vivo: {e}")
+            time.sleep(POLL_INTERVAL)
+
+
+# Instância global do hub de eventos ao vivo
+live_event_hub = LiveEventHub()
+live_event_hub.configure(LIVE_EVENTS_CONFIG['db'] or None)
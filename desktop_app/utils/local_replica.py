@@ -0,0 +1,777 @@
+"""
+Réplica local (SQLite) para o aplicativo desktop trabalhar offline
+
+Mantém em um arquivo SQLite as competições em que o operador trabalha
+(escopo), com suas equipes, atletas, jogos e eventos. As leituras desses
+dados são locais; as escritas são aplicadas na réplica e enfileiradas em
+uma caixa de saída (outbox), enviada ao MySQL por uma thread de
+sincronização quando há conexão.
+
+Sincronização:
+    - envio: cada alteração pendente é aplicada no servidor condicionada à
+      versão da linha (UPDATE ... WHERE id = %s AND version = %s); se a
+      linha mudou no servidor desde a leitura, a alteração local vai para
+      sync_conflicts e a versão do servidor prevalece. A entrada é
+      reservada (in_flight) durante o envio: alterações feitas nesse meio
+      tempo viram uma nova entrada, rebaseada na versão nova ao final.
+      Uma entrada recusada por erro nos dados espera um intervalo crescente
+      (next_attempt_at) antes de ser reenviada, segurando as posteriores;
+      no limite de tentativas vira conflito, assim como as entradas que
+      dependem dela (alterações da mesma linha provisória e linhas que a
+      referenciam pelo id negativo);
+    - recebimento: por tabela, só as linhas com updated_at a partir da
+      marca d'água (o maior updated_at já recebido, no relógio do
+      servidor); linhas com alteração local pendente não são
+      sobrescritas; exclusões são detectadas pela lista de ids do escopo.
+
+Linhas inseridas offline recebem ids negativos, trocados pelo id do
+servidor (também nas chaves estrangeiras e na outbox) quando enviadas.
+Cada inserção leva um client_uuid (chave única no servidor): se a resposta
+do INSERT se perder, o reenvio encontra a linha já gravada em vez de
+duplicá-la.
+
+A versão de cada linha é incrementada por gatilhos no MySQL (ver
+create_tables.sql), de modo que escritas feitas fora da réplica também
+são percebidas como conflito.
+"""
+import json
+import sqlite3
+import threading
+import uuid
+from dataclasses import dataclass, fields
+from datetime import date, datetime, timedelta
+from enum import Enum
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, get_type_hints
+
+from mysql.connector import errors as mysql_errors
+
+from config.settings import REPLICA_CONFIG
+from database.connection import execute_query
+
+
+@dataclass(frozen=True)
+class TableSpec:
+    """Tabela replicada: colunas (nome, tipo) e filtro de escopo no servidor"""
+    name: str
+    columns: Tuple[Tuple[str, str], ...]
+    scope: str  # fragmento WHERE; {ids} recebe os placeholders das competições
+    references: Tuple[Tuple[str, str], ...] = ()  # (coluna, tabela referenciada)
+
+    @property
+    def column_names(self) -> List[str]:
+        return [name for name, _ in self.columns]
+
+    @property
+    def kinds(self) -> Dict[str, str]:
+        return dict(self.columns)
+
+
+_REGISTERED_TEAMS = "SELECT team_id FROM team_registrations WHERE competition_id IN ({ids})"
+
+# Ordem de dependência: referenciadas antes das que referenciam
+TABLES: Dict[str, TableSpec] = {spec.name: spec for spec in (
+    TableSpec('competitions', (
+        ('id', 'int'), ('name', 'str'), ('sport', 'str'), ('format_type', 'str'),
+        ('start_date', 'date'), ('end_date', 'date'), ('status', 'str'), ('max_teams', 'int')
+    ), "id IN ({ids})"),
+    TableSpec('teams', (
+        ('id', 'int'), ('name', 'str'), ('short_name', 'str'), ('logo_path', 'str'),
+        ('primary_color', 'str'), ('secondary_color', 'str'), ('is_active', 'bool')
+    ), "id IN (" + _REGISTERED_TEAMS + ")"),
+    TableSpec('athletes', (
+        ('id', 'int'), ('team_id', 'int'), ('name', 'str'), ('jersey_number', 'int'),
+        ('position', 'str'), ('birth_date', 'date'), ('is_captain', 'bool'), ('is_active', 'bool')
+    ), "team_id IN (" + _REGISTERED_TEAMS + ")", (('team_id', 'teams'),)),
+    TableSpec('games', (
+        ('id', 'int'), ('competition_id', 'int'), ('home_team_id', 'int'), ('away_team_id', 'int'),
+        ('venue_id', 'int'), ('game_date', 'datetime'), ('round_number', 'int'), ('phase', 'str'),
+        ('status', 'str'), ('home_score', 'int'), ('away_score', 'int'), ('home_sets', 'int'),
+        ('away_sets', 'int'), ('observations', 'str'), ('referee_name', 'str'),
+        ('created_at', 'datetime')
+    ), "competition_id IN ({ids})",
+        (('competition_id', 'competitions'), ('home_team_id', 'teams'), ('away_team_id', 'teams'))),
+    TableSpec('game_events', (
+        ('id', 'int'), ('game_id', 'int'), ('athlete_id', 'int'), ('event_type', 'str'),
+        ('minute_occurred', 'int'), ('set_number', 'int'), ('points_value', 'int'),
+        ('description', 'str'), ('created_at', 'datetime')
+    ), "game_id IN (SELECT id FROM games WHERE competition_id IN ({ids}))",
+        (('game_id', 'games'), ('athlete_id', 'athletes'))),
+)}
+
+LOCAL_SCHEMA = """
+CREATE TABLE IF NOT EXISTS replica_meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS replica_scope (competition_id INTEGER PRIMARY KEY);
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    table_name TEXT NOT NULL,
+    row_id INTEGER NOT NULL,
+    op TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    base_version INTEGER,
+    created_at TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    client_uuid TEXT,
+    in_flight INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_row ON outbox (table_name, row_id);
+CREATE TABLE IF NOT EXISTS sync_conflicts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    table_name TEXT NOT NULL,
+    row_id INTEGER NOT NULL,
+    op TEXT NOT NULL,
+    reason TEXT NOT NULL,
+    local_payload TEXT,
+    server_row TEXT,
+    detected_at TEXT NOT NULL,
+    resolved INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+class SyncConflict(Exception):
+    """A linha mudou (ou sumiu) no servidor desde a versão lida"""
+
+    def __init__(self, reason: str, server_row: Optional[Dict[str, Any]] = None):
+        super().__init__(reason)
+        self.reason = reason
+        self.server_row = server_row
+
+
+def is_offline_error(error: Exception) -> bool:
+    """Falha de conexão (tentar de novo mais tarde), e não erro nos dados"""
+    if isinstance(error, (mysql_errors.InterfaceError, mysql_errors.OperationalError,
+                          ConnectionError, TimeoutError)):
+        return True
+    return "conexão" in str(error).lower()
+
+
+def _to_local(value: Any) -> Any:
+    if isinstance(value, Enum):
+        value = value.value
+    if isinstance(value, datetime):
+        return value.isoformat(sep=' ')
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, bool):
+        return int(value)
+    return value
+
+
+def _from_local(kind: str, value: Any) -> Any:
+    if value is None:
+        return None
+    if kind == 'datetime':
+        return datetime.fromisoformat(value)
+    if kind == 'date':
+        return date.fromisoformat(value)
+    if kind == 'bool':
+        return bool(value)
+    return value
+
+
+def _json(data: Any) -> str:
+    return json.dumps({key: _to_local(value) for key, value in data.items()}, default=str)
+
+
+class LocalReplica:
+    """Réplica SQLite com outbox e sincronização em segundo plano"""
+
+    def __init__(self, path: str, competitions: Sequence[int] = (), enabled: bool = True,
+                 sync_interval: float = 15, max_backoff: float = 300, max_push_attempts: int = 5,
+                 execute: Callable = execute_query, now: Callable[[], datetime] = datetime.now):
+        self.path = path
+        self.enabled = enabled
+        self.sync_interval = sync_interval
+        self.max_backoff = max_backoff
+        self.max_push_attempts = max_push_attempts
+        self.execute = execute
+        self.now = now
+
+        self.online = False
+        self.last_sync: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+
+        self._initial_competitions = list(competitions)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+        self._sync_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._listeners: Dict[str, List[Callable[[str, int, Dict[str, Any]], None]]] = {}
+
+    # Banco local
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        with self._lock:
+            if self._conn is None:
+                if self.path != ':memory:':
+                    Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+                conn.row_factory = sqlite3.Row
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.executescript(LOCAL_SCHEMA)
+                # Réplicas criadas antes de next_attempt_at
+                if 'next_attempt_at' not in {row['name'] for row in conn.execute("PRAGMA table_info(outbox)")}:
+                    conn.execute("ALTER TABLE outbox ADD COLUMN next_attempt_at TEXT")
+                # Envio interrompido (aplicação encerrada no meio): a entrada volta para a fila
+                conn.execute("UPDATE outbox SET in_flight = 0")
+                for spec in TABLES.values():
+                    columns = ', '.join(
+                        f"{name} INTEGER PRIMARY KEY" if name == 'id' else name
+                        for name in spec.column_names
+                    )
+                    conn.execute(f"CREATE TABLE IF NOT EXISTS {spec.name} "
+                                 f"({columns}, version INTEGER, updated_at TEXT)")
+                    for column, _ in spec.references:
+                        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{spec.name}_{column} "
+                                     f"ON {spec.name} ({column})")
+                for competition_id in self._initial_competitions:
+                    conn.execute("INSERT OR IGNORE INTO replica_scope VALUES (?)", (competition_id,))
+                self._conn = conn
+            return self._conn
+
+    def _transaction(self):
+        replica = self
+
+        class _Transaction:
+            def __enter__(self):
+                replica._lock.acquire()
+                replica.conn.execute("BEGIN IMMEDIATE")
+                return replica.conn
+
+            def __exit__(self, exc_type, exc, tb):
+                try:
+                    replica.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+                finally:
+                    replica._lock.release()
+                return False
+
+        return _Transaction()
+
+    # Escopo
+
+    def competitions(self) -> List[int]:
+        with self._lock:
+            return [row[0] for row in self.conn.execute("SELECT competition_id FROM replica_scope")]
+
+    def tracks(self, competition_id: int) -> bool:
+        return self.enabled and competition_id in self.competitions()
+
+    def track_competition(self, competition_id: int):
+        """Inclui a competição na réplica; a próxima sincronização a carrega inteira"""
+        with self._transaction() as conn:
+            conn.execute("INSERT OR IGNORE INTO replica_scope VALUES (?)", (competition_id,))
+            conn.execute("DELETE FROM replica_meta WHERE key LIKE 'watermark:%'")
+        self.sync_soon()
+
+    def untrack_competition(self, competition_id: int):
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM replica_scope WHERE competition_id = ?", (competition_id,))
+        self.sync_soon()
+
+    # Leitura
+
+    def _decode(self, spec: TableSpec, row: sqlite3.Row) -> Dict[str, Any]:
+        kinds = spec.kinds
+        data = {key: _from_local(kinds.get(key, ''), row[key]) for key in row.keys()}
+        if data.get('updated_at'):
+            data['updated_at'] = datetime.fromisoformat(data['updated_at'])
+        return data
+
+    def holds(self, table: str, row_id: Optional[int]) -> bool:
+        """True se a réplica está ativa e tem a linha"""
+        if not self.enabled or row_id is None:
+            return False
+        with self._lock:
+            return self.conn.execute(f"SELECT 1 FROM {table} WHERE id = ?", (row_id,)).fetchone() is not None
+
+    def get(self, table: str, row_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self.conn.execute(f"SELECT * FROM {table} WHERE id = ?", (row_id,)).fetchone()
+        return self._decode(TABLES[table], row) if row is not None else None
+
+    def rows(self, table: str, where: str = "", params: Sequence[Any] = (),
+             order_by: str = "") -> List[Dict[str, Any]]:
+        """Linhas da tabela local; where/order_by em SQL do SQLite com placeholders ?"""
+        query = f"SELECT * FROM {table}"
+        if where:
+            query += f" WHERE {where}"
+        if order_by:
+            query += f" ORDER BY {order_by}"
+        with self._lock:
+            rows = self.conn.execute(query, [_to_local(value) for value in params]).fetchall()
+        spec = TABLES[table]
+        return [self._decode(spec, row) for row in rows]
+
+    @staticmethod
+    def to_model(model_cls, row: Dict[str, Any]):
+        """Monta o dataclass do modelo a partir da linha, convertendo enums"""
+        hints = get_type_hints(model_cls)
+        values = {}
+        for field in fields(model_cls):
+            if field.name not in row:
+                continue
+            value = row[field.name]
+            hint = hints.get(field.name)
+            if value is not None and isinstance(hint, type) and issubclass(hint, Enum):
+                value = hint(value)
+            values[field.name] = value
+        return model_cls(**values)
+
+    def get_model(self, model_cls, table: str, row_id: int):
+        row = self.get(table, row_id)
+        return self.to_model(model_cls, row) if row is not None else None
+
+    # Escrita (local + outbox)
+
+    def _pending(self, conn, table: str, row_id: int) -> List[sqlite3.Row]:
+        return conn.execute("SELECT * FROM outbox WHERE table_name = ? AND row_id = ? ORDER BY id",
+                            (table, row_id)).fetchall()
+
+    def insert(self, table: str, values: Dict[str, Any]) -> int:
+        """Insere localmente com id provisório negativo e enfileira o envio"""
+        spec = TABLES[table]
+        with self._transaction() as conn:
+            lowest = conn.execute(f"SELECT MIN(id) FROM {table}").fetchone()[0] or 0
+            temp_id = min(lowest, 0) - 1
+            data = {key: values.get(key) for key in spec.column_names if key != 'id'}
+            columns = ['id'] + list(data) + ['version']
+            conn.execute(f"INSERT INTO {table} ({', '.join(columns)}) VALUES "
+                         f"({', '.join('?' * len(columns))})",
+                         [temp_id] + [_to_local(value) for value in data.values()] + [0])
+            conn.execute("INSERT INTO outbox (table_name, row_id, op, payload, base_version, created_at, "
+                         "client_uuid) VALUES (?, ?, 'insert', ?, NULL, ?, ?)",
+                         (table, temp_id, _json(data), datetime.now().isoformat(sep=' '),
+                          str(uuid.uuid4())))
+        self.sync_soon()
+        return temp_id
+
+    def update(self, table: str, row_id: int, changes: Dict[str, Any]):
+        """Altera a linha localmente; alterações pendentes da mesma linha são agrupadas"""
+        spec = TABLES[table]
+        changes = {key: value for key, value in changes.items()
+                   if key in spec.column_names and key != 'id'}
+        if not changes:
+            return
+        with self._transaction() as conn:
+            row = conn.execute(f"SELECT version FROM {table} WHERE id = ?", (row_id,)).fetchone()
+            if row is None:
+                raise KeyError(f"{table} {row_id} não está na réplica")
+            conn.execute(f"UPDATE {table} SET {', '.join(f'{key} = ?' for key in changes)} WHERE id = ?",
+                         [_to_local(value) for value in changes.values()] + [row_id])
+
+            # A entrada em envio não muda: o que foi enviado é o que o servidor aplica
+            pending = [entry for entry in self._pending(conn, table, row_id)
+                       if entry['op'] in ('insert', 'update') and not entry['in_flight']]
+            if pending:
+                # Mesma versão base: um único envio com todas as mudanças
+                entry = pending[-1]
+                payload = json.loads(entry['payload'])
+                payload.update(json.loads(_json(changes)))
+                conn.execute("UPDATE outbox SET payload = ? WHERE id = ?", (json.dumps(payload), entry['id']))
+            else:
+                conn.execute("INSERT INTO outbox (table_name, row_id, op, payload, base_version, created_at) "
+                             "VALUES (?, ?, 'update', ?, ?, ?)",
+                             (table, row_id, _json(changes), row['version'],
+                              datetime.now().isoformat(sep=' ')))
+        self.sync_soon()
+
+    def delete(self, table: str, row_id: int):
+        """Remove localmente; uma inserção ainda não enviada é apenas descartada"""
+        with self._transaction() as conn:
+            row = conn.execute(f"SELECT * FROM {table} WHERE id = ?", (row_id,)).fetchone()
+            if row is None:
+                return
+            pending = self._pending(conn, table, row_id)
+            # A entrada em envio segue; a exclusão é rebaseada quando ela terminar
+            conn.execute("DELETE FROM outbox WHERE table_name = ? AND row_id = ? AND in_flight = 0",
+                         (table, row_id))
+            conn.execute(f"DELETE FROM {table} WHERE id = ?", (row_id,))
+            if not any(entry['op'] == 'insert' and not entry['in_flight'] for entry in pending):
+                conn.execute("INSERT INTO outbox (table_name, row_id, op, payload, base_version, created_at) "
+                             "VALUES (?, ?, 'delete', ?, ?, ?)",
+                             (table, row_id, json.dumps(dict(row)), row['version'],
+                              datetime.now().isoformat(sep=' ')))
+        self.sync_soon()
+
+    def save_model(self, table: str, model) -> bool:
+        """Grava na réplica as colunas do modelo que diferem da linha local"""
+        current = self.get(table, model.id)
+        if current is None:
+            return False
+        changes = {}
+        for column in TABLES[table].column_names:
+            if column == 'id' or not hasattr(model, column):
+                continue
+            value = getattr(model, column)
+            if _to_local(value) != _to_local(current.get(column)):
+                changes[column] = value
+        self.update(table, model.id, changes)
+        return True
+
+    # Notificações de envio
+
+    def on_pushed(self, table: str, callback: Callable[[str, int, Dict[str, Any]], None]):
+        """Chamado (na thread de sincronização) após cada alteração aceita pelo servidor"""
+        self._listeners.setdefault(table, []).append(callback)
+
+    def _notify(self, table: str, op: str, row_id: int, payload: Dict[str, Any]):
+        for callback in self._listeners.get(table, ()):
+            try:
+                callback(op, row_id, payload)
+            except Exception as e:
+                print(f"Erro ao processar alteração sincronizada de {table}: {e}")
+
+    # Sincronização
+
+    def start(self):
+        """Inicia a thread de sincronização (apenas se a réplica estiver ativa)"""
+        if not self.enabled or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='local-replica-sync', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def sync_soon(self):
+        self._wake.set()
+
+    def _run(self):
+        delay = self.sync_interval
+        while not self._stop.is_set():
+            if self.sync():
+                delay = self.sync_interval
+            else:
+                delay = min(max(delay, 1) * 2, self.max_backoff)
+            self._wake.wait(delay)
+            self._wake.clear()
+
+    def sync(self) -> bool:
+        """Envia a outbox e recebe as alterações; False se o servidor está inacessível"""
+        with self._sync_lock:
+            try:
+                self.push()
+                self.pull()
+            except Exception as e:
+                if not is_offline_error(e):
+                    print(f"Erro na sincronização da réplica: {e}")
+                self.online = False
+                self.last_error = str(e)
+                return False
+            self.online = True
+            self.last_error = None
+            self.last_sync = datetime.now()
+            return True
+
+    def push(self):
+        """Aplica no servidor as alterações pendentes, na ordem em que foram feitas"""
+        while True:
+            with self._transaction() as conn:
+                entry = conn.execute(
+                    "SELECT * FROM outbox WHERE attempts < ? ORDER BY id LIMIT 1",
+                    (self.max_push_attempts,)
+                ).fetchone()
+                if entry is None:
+                    return
+                # Recusada há pouco: ela e as posteriores esperam a próxima tentativa
+                if entry['next_attempt_at'] and entry['next_attempt_at'] > self.now().isoformat(sep=' '):
+                    return
+                # Reservada: update() e delete() não mexem mais nela até o fim do envio
+                conn.execute("UPDATE outbox SET in_flight = 1 WHERE id = ?", (entry['id'],))
+            payload = json.loads(entry['payload'])
+            try:
+                self._push_entry(entry, payload)
+            except SyncConflict as conflict:
+                self._record_conflict(entry, conflict.reason, conflict.server_row)
+            except Exception as e:
+                if is_offline_error(e):
+                    with self._transaction() as conn:
+                        conn.execute("UPDATE outbox SET in_flight = 0 WHERE id = ?", (entry['id'],))
+                    raise
+                # Erro nos dados (ex.: chave estrangeira): tenta de novo mais tarde e, no limite, vira conflito
+                attempts = entry['attempts'] + 1
+                delay = min(self.sync_interval * 2 ** (attempts - 1), self.max_backoff)
+                next_attempt = self.now() + timedelta(seconds=delay)
+                with self._transaction() as conn:
+                    conn.execute("UPDATE outbox SET attempts = ?, last_error = ?, in_flight = 0, "
+                                 "next_attempt_at = ? WHERE id = ?",
+                                 (attempts, str(e), next_attempt.isoformat(sep=' '), entry['id']))
+                if attempts >= self.max_push_attempts:
+                    self._record_conflict(entry, f"rejeitada pelo servidor: {e}", None)
+
+    def _push_entry(self, entry: sqlite3.Row, payload: Dict[str, Any]):
+        table, row_id, op = entry['table_name'], entry['row_id'], entry['op']
+        spec = TABLES[table]
+        values = {key: value for key, value in payload.items() if key in spec.column_names}
+
+        if op == 'insert':
+            # Reenvio após uma resposta perdida: a linha já está no servidor
+            new_id = self._inserted_id(table, entry['client_uuid'])
+            if new_id is None:
+                values['client_uuid'] = entry['client_uuid']
+                columns = list(values)
+                new_id = self.execute(
+                    f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})",
+                    tuple(values.values())
+                )
+                del values['client_uuid']
+            self._replace_temp_id(table, row_id, new_id, entry)
+            self._notify(table, op, new_id, dict(values, id=new_id))
+            return
+
+        if op == 'update':
+            assignments = ', '.join(f"{key} = %s" for key in values)
+            changed = self.execute(
+                f"UPDATE {table} SET {assignments} WHERE id = %s AND version = %s",
+                tuple(values.values()) + (row_id, entry['base_version'])
+            )
+            if not changed:
+                self._raise_conflict(table, row_id)
+            with self._transaction() as conn:
+                # O gatilho do servidor incrementa a versão a cada UPDATE
+                conn.execute(f"UPDATE {table} SET version = ? WHERE id = ?",
+                             (entry['base_version'] + 1, row_id))
+                self._complete(conn, entry, row_id, entry['base_version'] + 1)
+            self._notify(table, op, row_id, values)
+            return
+
+        if op == 'delete':
+            removed = self.execute(f"DELETE FROM {table} WHERE id = %s AND version = %s",
+                                   (row_id, entry['base_version']))
+            if not removed and self._server_row(table, row_id) is not None:
+                self._raise_conflict(table, row_id)
+            with self._transaction() as conn:
+                conn.execute("DELETE FROM outbox WHERE id = ?", (entry['id'],))
+            self._notify(table, op, row_id, payload)
+
+    def _inserted_id(self, table: str, client_uuid: Optional[str]) -> Optional[int]:
+        if not client_uuid:
+            return None
+        rows = self.execute(f"SELECT id FROM {table} WHERE client_uuid = %s", (client_uuid,), fetch=True)
+        return rows[0]['id'] if rows else None
+
+    def _complete(self, conn, entry: sqlite3.Row, row_id: int, version: int):
+        """
+        Encerra a entrada enviada, já com a linha na versão nova do servidor
+
+        Só é removida se o payload ainda for o enviado; o que tiver mudado
+        nela segue pendente como atualização sobre a versão nova. Entradas
+        posteriores da mesma linha foram feitas sobre a versão anterior e
+        também passam a partir da nova.
+        """
+        current = conn.execute("SELECT payload FROM outbox WHERE id = ?", (entry['id'],)).fetchone()
+        remainder = {}
+        if current is not None and current['payload'] != entry['payload']:
+            sent = json.loads(entry['payload'])
+            remainder = {key: value for key, value in json.loads(current['payload']).items()
+                         if key not in sent or sent[key] != value}
+        if remainder:
+            conn.execute("UPDATE outbox SET op = 'update', row_id = ?, payload = ?, base_version = ?, "
+                         "in_flight = 0, attempts = 0, last_error = NULL, next_attempt_at = NULL "
+                         "WHERE id = ?",
+                         (row_id, json.dumps(remainder), version, entry['id']))
+        else:
+            conn.execute("DELETE FROM outbox WHERE id = ?", (entry['id'],))
+        conn.execute("UPDATE outbox SET base_version = ? WHERE table_name = ? AND row_id = ? AND id > ?",
+                     (version, entry['table_name'], row_id, entry['id']))
+
+    def _server_row(self, table: str, row_id: int) -> Optional[Dict[str, Any]]:
+        spec = TABLES[table]
+        rows = self.execute(f"SELECT {', '.join(spec.column_names)}, version, updated_at "
+                            f"FROM {table} WHERE id = %s", (row_id,), fetch=True)
+        return rows[0] if rows else None
+
+    def _raise_conflict(self, table: str, row_id: int):
+        server_row = self._server_row(table, row_id)
+        if server_row is None:
+            raise SyncConflict("linha removida no servidor")
+        raise SyncConflict("linha alterada no servidor", server_row)
+
+    def _record_conflict(self, entry: sqlite3.Row, reason: str, server_row: Optional[Dict[str, Any]]):
+        """Guarda a alteração local recusada e adota a versão do servidor"""
+        table, row_id = entry['table_name'], entry['row_id']
+        with self._transaction() as conn:
+            self._store_conflict(conn, entry, reason, server_row)
+            if server_row is not None:
+                self._upsert(conn, TABLES[table], server_row)
+            elif entry['op'] != 'insert':
+                conn.execute(f"DELETE FROM {table} WHERE id = ?", (row_id,))
+            if entry['op'] == 'insert' and row_id < 0:
+                self._cascade_conflict(conn, table, row_id)
+
+    def _store_conflict(self, conn, entry: sqlite3.Row, reason: str,
+                        server_row: Optional[Dict[str, Any]] = None):
+        conn.execute(
+            "INSERT INTO sync_conflicts (table_name, row_id, op, reason, local_payload, server_row, "
+            "detected_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (entry['table_name'], entry['row_id'], entry['op'], reason, entry['payload'],
+             _json(server_row) if server_row else None, datetime.now().isoformat(sep=' '))
+        )
+        conn.execute("DELETE FROM outbox WHERE id = ?", (entry['id'],))
+
+    def _cascade_conflict(self, conn, table: str, temp_id: int):
+        """
+        Inserção recusada: as entradas que dependem da linha provisória
+        (alterações dela e linhas que apontam para o id negativo) nunca
+        poderão ser enviadas e também viram conflito, em cascata
+        """
+        dependents = conn.execute("SELECT * FROM outbox WHERE table_name = ? AND row_id = ? ORDER BY id",
+                                  (table, temp_id)).fetchall()
+        for spec in TABLES.values():
+            columns = [column for column, referenced in spec.references if referenced == table]
+            if not columns:
+                continue
+            for pending in conn.execute("SELECT * FROM outbox WHERE table_name = ? "
+                                        "AND op IN ('insert', 'update') ORDER BY id", (spec.name,)):
+                payload = json.loads(pending['payload'])
+                if any(payload.get(column) == temp_id for column in columns):
+                    dependents.append(pending)
+        reason = f"depende de {table} {temp_id}, recusada pelo servidor"
+        for dependent in {pending['id']: pending for pending in dependents}.values():
+            # Já recusada por outro caminho da cascata
+            if conn.execute("SELECT 1 FROM outbox WHERE id = ?", (dependent['id'],)).fetchone() is None:
+                continue
+            self._store_conflict(conn, dependent, reason)
+            if dependent['op'] == 'insert' and dependent['row_id'] < 0:
+                self._cascade_conflict(conn, dependent['table_name'], dependent['row_id'])
+
+    def _replace_temp_id(self, table: str, temp_id: int, new_id: int, entry: sqlite3.Row):
+        with self._transaction() as conn:
+            # Linhas novas nascem com version = 1 no servidor
+            conn.execute(f"UPDATE {table} SET id = ?, version = 1 WHERE id = ?", (new_id, temp_id))
+            conn.execute("UPDATE outbox SET row_id = ? WHERE table_name = ? AND row_id = ?",
+                         (new_id, table, temp_id))
+            self._complete(conn, entry, new_id, 1)
+            for spec in TABLES.values():
+                for column, referenced in spec.references:
+                    if referenced != table:
+                        continue
+                    conn.execute(f"UPDATE {spec.name} SET {column} = ? WHERE {column} = ?",
+                                 (new_id, temp_id))
+                    # Envios pendentes que apontam para a linha provisória
+                    for pending in conn.execute("SELECT id, payload FROM outbox WHERE table_name = ?",
+                                                (spec.name,)).fetchall():
+                        payload = json.loads(pending['payload'])
+                        if payload.get(column) == temp_id:
+                            payload[column] = new_id
+                            conn.execute("UPDATE outbox SET payload = ? WHERE id = ?",
+                                         (json.dumps(payload), pending['id']))
+
+    def pull(self):
+        """Recebe do servidor as linhas do escopo alteradas desde a última marca d'água"""
+        competitions = self.competitions()
+        if not competitions:
+            return
+        placeholders = ', '.join(['%s'] * len(competitions))
+        for spec in TABLES.values():
+            scope = spec.scope.format(ids=placeholders)
+            scope_params = tuple(competitions) * spec.scope.count('{ids}')
+            watermark = self._meta(f'watermark:{spec.name}')
+
+            query = (f"SELECT {', '.join(spec.column_names)}, version, updated_at "
+                     f"FROM {spec.name} WHERE {scope}")
+            params = scope_params
+            if watermark:
+                # >= pois várias linhas podem ter o mesmo segundo; as já recebidas chegam iguais
+                query += " AND updated_at >= %s"
+                params += (watermark,)
+            changed = self.execute(query, params, fetch=True) or []
+            server_ids = {row['id'] for row in
+                          self.execute(f"SELECT id FROM {spec.name} WHERE {scope}", scope_params, fetch=True) or []}
+
+            with self._transaction() as conn:
+                pending = {row[0] for row in conn.execute(
+                    "SELECT DISTINCT row_id FROM outbox WHERE table_name = ?", (spec.name,))}
+                for row in changed:
+                    # Alteração local pendente prevalece até o envio (que detecta o conflito)
+                    if row['id'] not in pending:
+                        self._upsert(conn, spec, row)
+                local_ids = {row[0] for row in conn.execute(f"SELECT id FROM {spec.name} WHERE id > 0")}
+                for row_id in local_ids - server_ids - pending:
+                    conn.execute(f"DELETE FROM {spec.name} WHERE id = ?", (row_id,))
+
+                stamps = [row['updated_at'] for row in changed if row.get('updated_at')]
+                if stamps:
+                    newest = _to_local(max(stamps))
+                    if not watermark or newest > watermark:
+                        conn.execute("INSERT OR REPLACE INTO replica_meta VALUES (?, ?)",
+                                     (f'watermark:{spec.name}', newest))
+
+    def _upsert(self, conn, spec: TableSpec, row: Dict[str, Any]):
+        columns = spec.column_names + ['version', 'updated_at']
+        conn.execute(f"INSERT OR REPLACE INTO {spec.name} ({', '.join(columns)}) "
+                     f"VALUES ({', '.join('?' * len(columns))})",
+                     [_to_local(row.get(column)) for column in columns])
+
+    def _meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self.conn.execute("SELECT value FROM replica_meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    # Situação e conflitos
+
+    def conflicts(self, include_resolved: bool = False) -> List[Dict[str, Any]]:
+        query = "SELECT * FROM sync_conflicts"
+        if not include_resolved:
+            query += " WHERE resolved = 0"
+        with self._lock:
+            rows = self.conn.execute(query + " ORDER BY id").fetchall()
+        return [dict(row) for row in rows]
+
+    def resolve_conflict(self, conflict_id: int, keep_local: bool = False):
+        """
+        Encerra um conflito
+
+        Com keep_local, a alteração local é reaplicada sobre a versão atual
+        do servidor (uma nova atualização pendente).
+        """
+        with self._lock:
+            conflict = self.conn.execute("SELECT * FROM sync_conflicts WHERE id = ?",
+                                         (conflict_id,)).fetchone()
+        if conflict is None:
+            return
+        if keep_local and conflict['op'] == 'update' and self.holds(conflict['table_name'], conflict['row_id']):
+            self.update(conflict['table_name'], conflict['row_id'], json.loads(conflict['local_payload']))
+        with self._transaction() as conn:
+            conn.execute("UPDATE sync_conflicts SET resolved = 1 WHERE id = ?", (conflict_id,))
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            pending = self.conn.execute("SELECT COUNT(*) FROM outbox").fetchone()[0]
+            conflicts = self.conn.execute("SELECT COUNT(*) FROM sync_conflicts WHERE resolved = 0").fetchone()[0]
+        return {
+            'enabled': self.enabled,
+            'online': self.online,
+            'pending': pending,
+            'conflicts': conflicts,
+            'last_sync': self.last_sync,
+            'last_error': self.last_error
+        }
+
+
+def create_local_replica(config: Dict = REPLICA_CONFIG) -> LocalReplica:
+    """Monta a réplica a partir de REPLICA_CONFIG"""
+    return LocalReplica(
+        path=config.get('path', 'local_replica.db'),
+        competitions=config.get('competitions', []),
+        enabled=config.get('enabled', False),
+        sync_interval=config.get('sync_interval', 15),
+        max_backoff=config.get('max_backoff', 300),
+        max_push_attempts=config.get('max_push_attempts', 5)
+    )
+
+
+# Instância global da réplica local
+local_replica = create_local_replica()
@@ -0,0 +1,168 @@
+"""
+Hash de senhas com bcrypt em um pool de threads dedicado
+
+O bcrypt é propositalmente lento e libera o GIL durante o cálculo, então
+rodá-lo em um pool pequeno (uma thread por núcleo, até HASH_MAX_WORKERS)
+mantém a interface responsiva e deixa vários logins avançarem em paralelo.
+
+O custo (log2 das rodadas) é calibrado uma vez na inicialização para que um
+hash leve aproximadamente SECURITY_CONFIG['password_hash_target_ms'].
+Hashes SHA-256 antigos (64 caracteres hexadecimais, sem salt) continuam
+aceitos na verificação; needs_rehash indica quando convém regravá-los.
+"""
+import hashlib
+import hmac
+import os
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+import bcrypt
+
+from config.settings import SECURITY_CONFIG
+
+MIN_ROUNDS = 10
+MAX_ROUNDS = 16
+DEFAULT_TARGET_MS = 250
+HASH_MAX_WORKERS = 4
+
+_LEGACY_SHA256 = re.compile(r'^[0-9a-f]{64}$')
+
+
+class PasswordHasher:
+    """Serviço de hash de senhas com custo calibrado"""
+
+    def __init__(self, target_ms: float = DEFAULT_TARGET_MS, workers: int = 0,
+                 min_rounds: int = MIN_ROUNDS, max_rounds: int = MAX_ROUNDS):
+        self.target_ms = target_ms
+        self.min_rounds = min_rounds
+        self.max_rounds = max_rounds
+        self.rounds = min_rounds
+        self.workers = workers or min(os.cpu_count() or 1, HASH_MAX_WORKERS)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._calibrated = threading.Event()
+        self._dummy_hash: Optional[Tuple[int, str]] = None
+        self._lock = threading.Lock()
+        self._calibration_lock = threading.Lock()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        # Criado sob demanda: importar o módulo não cria threads
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                                    thread_name_prefix='password-hasher')
+            return self._executor
+
+    def calibrate(self) -> int:
+        """
+        Escolhe o custo cujo tempo de hash mais se aproxima do alvo
+
+        Cada rodada a mais dobra o tempo, então basta medir o custo mínimo.
+
+        Returns:
+            Custo escolhido
+        """
+        started = time.perf_counter()
+        bcrypt.hashpw(b'calibration', bcrypt.gensalt(self.min_rounds))
+        elapsed_ms = max((time.perf_counter() - started) * 1000, 0.001)
+
+        rounds = self.min_rounds
+        while rounds < self.max_rounds and elapsed_ms * 2 <= self.target_ms * 1.5:
+            elapsed_ms *= 2
+            rounds += 1
+        self.rounds = rounds
+        self._calibrated.set()
+        return rounds
+
+    def calibrate_async(self) -> Future:
+        """Calibra no pool, sem atrasar a abertura da aplicação"""
+        return self.executor.submit(self._current_rounds)
+
+    def _current_rounds(self) -> int:
+        # Sem calibração prévia, o primeiro hash calibra; os demais esperam por ele
+        if not self._calibrated.is_set():
+            with self._calibration_lock:
+                if not self._calibrated.is_set():
+                    self.calibrate()
+        return self.rounds
+
+    def _hash(self, password: str) -> str:
+        salt = bcrypt.gensalt(self._current_rounds())
+        return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+
+    @staticmethod
+    def _verify(password: str, hashed: str) -> bool:
+        if not hashed:
+            return False
+        if is_legacy_hash(hashed):
+            legacy = hashlib.sha256(password.encode('utf-8')).hexdigest()
+            return hmac.compare_digest(legacy, hashed)
+        try:
+            return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+        except ValueError:
+            return False
+
+    def hash_async(self, password: str) -> Future:
+        """Gera o hash no pool; o Future resolve para a string bcrypt"""
+        return self.executor.submit(self._hash, password)
+
+    def verify_async(self, password: str, hashed: str) -> Future:
+        """Verifica a senha no pool; o Future resolve para bool"""
+        return self.executor.submit(self._verify, password, hashed)
+
+    def hash(self, password: str) -> str:
+        """Gera o hash bcrypt da senha (bloqueia até o pool terminar)"""
+        return self.hash_async(password).result()
+
+    def verify(self, password: str, hashed: str) -> bool:
+        """Verifica a senha contra um hash bcrypt ou SHA-256 antigo"""
+        return self.verify_async(password, hashed).result()
+
+    def dummy_hash(self) -> str:
+        """
+        Hash descartável no custo atual
+
+        Verificar a senha contra ele quando o usuário não existe faz o login
+        levar o mesmo tempo nos dois casos, sem revelar quais nomes existem.
+        """
+        rounds = self._current_rounds()
+        dummy = self._dummy_hash
+        if dummy is None or dummy[0] != rounds:
+            hashed = bcrypt.hashpw(os.urandom(16), bcrypt.gensalt(rounds)).decode('utf-8')
+            dummy = self._dummy_hash = (rounds, hashed)
+        return dummy[1]
+
+    def needs_rehash(self, hashed: str) -> bool:
+        """True para hashes SHA-256 antigos ou bcrypt com custo abaixo do atual"""
+        if is_legacy_hash(hashed):
+            return True
+        if not self._calibrated.is_set():
+            return False
+        try:
+            return int(hashed.split('$')[2]) < self.rounds
+        except (IndexError, ValueError):
+            return True
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+
+def is_legacy_hash(hashed: str) -> bool:
+    """Hash SHA-256 sem salt usado pelas versões anteriores"""
+    return bool(_LEGACY_SHA256.match(hashed or ''))
+
+
+def create_password_hasher(config: Dict = SECURITY_CONFIG) -> PasswordHasher:
+    """Monta o serviço a partir de SECURITY_CONFIG"""
+    return PasswordHasher(target_ms=config.get('password_hash_target_ms', DEFAULT_TARGET_MS),
+                          workers=config.get('password_hash_workers', 0))
+
+
+# Instância global do serviço de hash de senhas
+password_hasher = create_password_hasher()
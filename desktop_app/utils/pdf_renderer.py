@@ -0,0 +1,397 @@
+"""
+Renderizador incremental de relatórios em PDF
+
+Gera PDFs página a página a partir de iteradores de seções (tabelas de
+classificação, programação de jogos, elencos), gravando cada página no
+arquivo assim que ela é concluída. Não depende de bibliotecas externas:
+usa as fontes padrão do PDF (Helvetica e Courier), que não precisam ser
+embutidas no arquivo.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# Tamanho de página A4 em pontos (1/72 polegada)
+A4 = (595.0, 842.0)
+
+# Fontes padrão do PDF, compartilhadas por todas as páginas do documento
+_FONTS = {
+    'F1': 'Helvetica',
+    'F2': 'Helvetica-Bold',
+    'F3': 'Courier',
+}
+
+# Largura média de um caractere Courier em relação ao tamanho da fonte
+_COURIER_CHAR_WIDTH = 0.6
+
+
+@dataclass
+class PageLayout:
+    """Configuração de layout reaproveitada por todas as páginas"""
+    page_size: Tuple[float, float] = A4
+    margin_left: float = 40.0
+    margin_right: float = 40.0
+    margin_top: float = 50.0
+    margin_bottom: float = 50.0
+    title_size: float = 16.0
+    heading_size: float = 12.0
+    text_size: float = 10.0
+    table_size: float = 8.5
+    line_spacing: float = 1.35
+    footer: str = "Sistema de Gestão de Competições Esportivas"
+
+    @property
+    def content_width(self) -> float:
+        return self.page_size[0] - self.margin_left - self.margin_right
+
+    def line_height(self, size: float) -> float:
+        return size * self.line_spacing
+
+    def table_chars(self) -> int:
+        """Quantidade de caracteres Courier que cabem em uma linha da tabela"""
+        return int(self.content_width / (self.table_size * _COURIER_CHAR_WIDTH))
+
+
+@dataclass
+class TextSection:
+    """Seção de texto corrido; as linhas podem vir de um gerador"""
+    title: str
+    lines: Iterable[str] = field(default_factory=list)
+
+
+@dataclass
+class TableSection:
+    """
+    Seção tabular; as linhas são consumidas sob demanda
+
+    Args:
+        title: Título da seção
+        columns: Sequência de (cabeçalho, largura em caracteres)
+        rows: Iterável de linhas (sequências de valores)
+    """
+    title: str
+    columns: Sequence[Tuple[str, int]]
+    rows: Iterable[Sequence[Any]] = field(default_factory=list)
+
+
+@dataclass
+class PageBreak:
+    """Força o início de uma nova página (ex.: uma súmula por jogo)"""
+
+
+def _escape(text: str) -> bytes:
+    """Codifica texto para string literal do PDF (WinAnsiEncoding)"""
+    data = text.encode('cp1252', errors='replace')
+    return data.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)')
+
+
+class PDFWriter:
+    """
+    Escritor de baixo nível que grava objetos PDF diretamente no arquivo
+
+    Apenas os deslocamentos dos objetos e as referências das páginas ficam
+    em memória; o conteúdo de cada página é descartado logo após gravado.
+    """
+
+    # Objetos com número fixo, reservados no início do documento
+    _CATALOG = 1
+    _PAGES = 2
+    _RESOURCES = 3
+
+    def __init__(self, stream: BinaryIO, layout: PageLayout):
+        self.stream = stream
+        self.layout = layout
+        self._offsets: Dict[int, int] = {}
+        self._page_refs: List[int] = []
+        self._next_obj = self._RESOURCES + 1
+        self._position = 0
+        self._closed = False
+
+        self._write(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+        self._write_shared_resources()
+
+    def _write(self, data: bytes):
+        self.stream.write(data)
+        self._position += len(data)
+
+    def _allocate(self) -> int:
+        number = self._next_obj
+        self._next_obj += 1
+        return number
+
+    def _write_object(self, number: int, body: bytes):
+        self._offsets[number] = self._position
+        self._write(b'%d 0 obj\n' % number)
+        self._write(body)
+        self._write(b'\nendobj\n')
+
+    def _write_shared_resources(self):
+        """Grava fontes e dicionário de recursos uma única vez"""
+        font_entries = []
+        for alias, base_font in _FONTS.items():
+            number = self._allocate()
+            self._write_object(number, (
+                '<< /Type /Font /Subtype /Type1 /BaseFont /%s '
+                '/Encoding /WinAnsiEncoding >>' % base_font
+            ).encode('ascii'))
+            font_entries.append('/%s %d 0 R' % (alias, number))
+
+        self._write_object(self._RESOURCES, (
+            '<< /Font << %s >> >>' % ' '.join(font_entries)
+        ).encode('ascii'))
+
+    def add_page(self, content: bytes):
+        """Grava uma página completa e libera o buffer para o sistema operacional"""
+        if self._closed:
+            raise ValueError("Documento PDF já foi finalizado")
+
+        content_ref = self._allocate()
+        self._write_object(content_ref, (
+            b'<< /Length %d >>\nstream\n' % len(content) + content + b'\nendstream'
+        ))
+
+        page_ref = self._allocate()
+        width, height = self.layout.page_size
+        self._write_object(page_ref, (
+            '<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %.2f %.2f] '
+            '/Resources %d 0 R /Contents %d 0 R >>'
+            % (self._PAGES, width, height, self._RESOURCES, content_ref)
+        ).encode('ascii'))
+
+        self._page_refs.append(page_ref)
+        self.stream.flush()
+
+    @property
+    def page_count(self) -> int:
+        return len(self._page_refs)
+
+    def close(self, title: str = ""):
+        """Grava a árvore de páginas, o catálogo e a tabela de referências"""
+        if self._closed:
+            return
+
+        kids = ' '.join('%d 0 R' % ref for ref in self._page_refs)
+        self._write_object(self._PAGES, (
+            '<< /Type /Pages /Kids [%s] /Count %d >>' % (kids, len(self._page_refs))
+        ).encode('ascii'))
+        self._write_object(self._CATALOG, (
+            '<< /Type /Catalog /Pages %d 0 R >>' % self._PAGES
+        ).encode('ascii'))
+
+        info_ref = self._allocate()
+        self._write_object(info_ref, b'<< /Title (' + _escape(title) + b') >>')
+
+        xref_position = self._position
+        total = self._next_obj
+        self._write(b'xref\n0 %d\n' % total)
+        self._write(b'0000000000 65535 f \n')
+        for number in range(1, total):
+            self._write(b'%010d 00000 n \n' % self._offsets.get(number, 0))
+        self._write((
+            'trailer\n<< /Size %d /Root %d 0 R /Info %d 0 R >>\nstartxref\n%d\n%%%%EOF\n'
+            % (total, self._CATALOG, info_ref, xref_position)
+        ).encode('ascii'))
+        self.stream.flush()
+        self._closed = True
+
+
+class PDFReportRenderer:
+    """
+    Renderizador de relatórios que diagrama seções em páginas
+
+    O renderizador mantém apenas a página corrente em memória. Cabeçalhos de
+    tabela são repetidos automaticamente quando uma tabela continua na
+    página seguinte.
+    """
+
+    def __init__(self, stream: BinaryIO, title: str, layout: Optional[PageLayout] = None):
+        self.layout = layout or PageLayout()
+        self.title = title
+        self.writer = PDFWriter(stream, self.layout)
+        self._ops: List[bytes] = []
+        self._cursor_y = 0.0
+        self._page_open = False
+
+    # Controle de páginas
+
+    def _start_page(self):
+        self._ops = []
+        self._page_open = True
+        self._cursor_y = self.layout.page_size[1] - self.layout.margin_top
+
+        # Cabeçalho discreto com o título do documento
+        self._text(self.title, 'F1', 8, self.layout.margin_left,
+                   self.layout.page_size[1] - self.layout.margin_top / 2)
+
+    def _finish_page(self):
+        if not self._page_open:
+            return
+
+        footer = f"{self.layout.footer} - Página {self.writer.page_count + 1}"
+        self._text(footer, 'F1', 8, self.layout.margin_left, self.layout.margin_bottom / 2)
+
+        self.writer.add_page(b'\n'.join(self._ops))
+        self._ops = []
+        self._page_open = False
+
+    def _ensure_space(self, height: float) -> bool:
+        """Abre nova página se necessário; retorna True se houve quebra"""
+        if not self._page_open:
+            self._start_page()
+            return True
+        if self._cursor_y - height < self.layout.margin_bottom:
+            self._finish_page()
+            self._start_page()
+            return True
+        return False
+
+    # Primitivas de desenho
+
+    def _text(self, text: str, font: str, size: float, x: float, y: float):
+        self._ops.append(
+            b'BT /' + font.encode('ascii') + b' %.2f Tf %.2f %.2f Td (' % (size, x, y)
+            + _escape(text) + b') Tj ET'
+        )
+
+    def _line(self, text: str, font: str, size: float):
+        height = self.layout.line_height(size)
+        self._ensure_space(height)
+        self._cursor_y -= height
+        self._text(text, font, size, self.layout.margin_left, self._cursor_y)
+
+    def _rule(self):
+        y = self._cursor_y - 2
+        x1 = self.layout.margin_left
+        x2 = self.layout.page_size[0] - self.layout.margin_right
+        self._ops.append(b'0.5 w %.2f %.2f m %.2f %.2f l S' % (x1, y, x2, y))
+
+    # Seções
+
+    def render_title(self, text: str):
+        self._line(text, 'F2', self.layout.title_size)
+        self._cursor_y -= self.layout.text_size / 2
+
+    def render_text(self, section: TextSection):
+        self._line(section.title, 'F2', self.layout.heading_size)
+        for line in section.lines:
+            self._line(str(line), 'F1', self.layout.text_size)
+        self._cursor_y -= self.layout.text_size
+
+    def render_table(self, section: TableSection):
+        max_chars = self.layout.table_chars()
+        header = self._format_row([name for name, _ in section.columns], section.columns, max_chars)
+        row_height = self.layout.line_height(self.layout.table_size)
+
+        # Título e cabeçalho precisam caber junto com ao menos uma linha
+        self._ensure_space(self.layout.line_height(self.layout.heading_size) + 3 * row_height)
+        self._line(section.title, 'F2', self.layout.heading_size)
+        self._table_header(header)
+
+        for row in section.rows:
+            if self._ensure_space(row_height):
+                self._line(f"{section.title} (continuação)", 'F2', self.layout.heading_size)
+                self._table_header(header)
+            self._line(self._format_row(row, section.columns, max_chars), 'F3', self.layout.table_size)
+
+        self._cursor_y -= self.layout.text_size
+
+    def _table_header(self, header: str):
+        self._line(header, 'F3', self.layout.table_size)
+        self._rule()
+
+    @staticmethod
+    def _format_row(values: Sequence[Any], columns: Sequence[Tuple[str, int]], max_chars: int) -> str:
+        cells = []
+        for value, (_, width) in zip(values, columns):
+            text = "" if value is None else str(value)
+            if len(text) > width:
+                text = text[:max(width - 1, 0)] + '.'
+            cells.append(text.ljust(width))
+        return ' '.join(cells)[:max_chars]
+
+    def render(self, sections: Iterable[Any]):
+        """Consome as seções e grava as páginas à medida que são preenchidas"""
+        for section in sections:
+            if isinstance(section, PageBreak):
+                self._finish_page()
+            elif isinstance(section, TableSection):
+                self.render_table(section)
+            elif isinstance(section, TextSection):
+                self.render_text(section)
+            elif isinstance(section, str):
+                self.render_title(section)
+            else:
+                raise TypeError(f"Seção de relatório não suportada: {type(section).__name__}")
+
+    def close(self) -> int:
+        """Finaliza o documento e retorna o número de páginas"""
+        if not self._page_open and self.writer.page_count == 0:
+            self._start_page()
+        self._finish_page()
+        self.writer.close(self.title)
+        return self.writer.page_count
+
+
+def render_pdf(file_path: str, title: str, sections: Iterable[Any],
+               layout: Optional[PageLayout] = None) -> int:
+    """
+    Renderiza um relatório completo em um arquivo PDF
+
+    Args:
+        file_path: Caminho do arquivo de saída
+        title: Título do documento
+        sections: Iterável de seções (str, TextSection, TableSection, PageBreak)
+        layout: Layout opcional
+
+    Returns:
+        Número de páginas geradas
+    """
+    directory = os.path.dirname(file_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    with open(file_path, 'wb') as stream:
+        renderer = PDFReportRenderer(stream, title, layout)
+        renderer.render(sections)
+        return renderer.close()
+
+
+@dataclass
+class PDFJob:
+    """
+    Relatório independente para renderização em processo separado
+
+    ``sections_factory`` deve ser uma função de nível de módulo (serializável)
+    que recebe ``args`` e devolve o iterável de seções.
+    """
+    file_path: str
+    title: str
+    sections_factory: Callable[..., Iterable[Any]]
+    args: Tuple[Any, ...] = ()
+
+
+def _run_job(job: PDFJob) -> Tuple[str, int]:
+    pages = render_pdf(job.file_path, job.title, job.sections_factory(*job.args))
+    return job.file_path, pages
+
+
+def render_pdfs_parallel(jobs: Sequence[PDFJob], max_workers: Optional[int] = None) -> Iterator[Tuple[str, int]]:
+    """
+    Renderiza vários relatórios independentes em processos de trabalho
+
+    Args:
+        jobs: Relatórios a serem gerados
+        max_workers: Número de processos (padrão: número de CPUs)
+
+    Yields:
+        Tuplas (caminho do arquivo, número de páginas) na ordem dos jobs
+    """
+    if len(jobs) <= 1:
+        for job in jobs:
+            yield _run_job(job)
+        return
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for result in executor.map(_run_job, jobs):
+            yield result
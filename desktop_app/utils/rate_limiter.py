@@ -0,0 +1,280 @@
+"""
+Limitador de tentativas de login por janela deslizante
+
+Cada chave (usuário ou origem) guarda apenas três números: o índice da
+janela atual, a contagem da janela atual e a da anterior. A contagem
+deslizante é estimada ponderando a janela anterior pela fração ainda
+coberta, o que dá custo O(1) por tentativa e memória constante por chave.
+
+As chaves expiram por uma roda de tempo (timing wheel) com baldes de
+duração fixa, e o número total de chaves é limitado: sob uma rajada de
+usuários inexistentes as chaves mais próximas de expirar são descartadas
+primeiro.
+
+O armazenamento é plugável: MemoryRateLimitStore (um processo) ou
+SQLiteRateLimitStore (arquivo compartilhado entre workers web e clientes
+desktop na mesma máquina). Com vários workers o armazenamento em memória
+multiplicaria o limite pelo número de processos, por isso a aplicação web
+troca para o SQLite com LoginThrottle.require_shared_store().
+"""
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from config.settings import SECURITY_CONFIG
+
+# (índice da janela, contagem atual, contagem anterior)
+WindowState = Tuple[int, int, int]
+
+DEFAULT_MAX_KEYS = 100000
+DEFAULT_SHARED_DB = 'login_rate_limits.db'
+WHEEL_SLOTS = 64
+
+
+class MemoryRateLimitStore:
+    """Armazenamento em memória com expiração por roda de tempo e limite de chaves"""
+
+    def __init__(self, ttl: float, max_keys: int = DEFAULT_MAX_KEYS, slots: int = WHEEL_SLOTS):
+        self.max_keys = max_keys
+        self._slot_seconds = max(ttl / slots, 1.0)
+        self._wheel: List[Set[str]] = [set() for _ in range(slots)]
+        self._entries: Dict[str, Tuple[WindowState, int]] = {}  # chave -> (estado, tick de expiração)
+        self._tick = int(time.time() // self._slot_seconds)
+        self._lock = threading.Lock()
+
+    def update(self, key: str, fn: Callable[[Optional[WindowState]], WindowState],
+               expires_at: float) -> WindowState:
+        with self._lock:
+            self._advance(time.time())
+            entry = self._entries.get(key)
+            state = fn(entry[0] if entry else None)
+            expire_tick = min(int(expires_at // self._slot_seconds), self._tick + len(self._wheel) - 1)
+            if entry is None or entry[1] != expire_tick:
+                if entry is not None:
+                    self._wheel[entry[1] % len(self._wheel)].discard(key)
+                self._wheel[expire_tick % len(self._wheel)].add(key)
+            self._entries[key] = (state, expire_tick)
+            if len(self._entries) > self.max_keys:
+                self._evict()
+            return state
+
+    def get(self, key: str) -> Optional[WindowState]:
+        with self._lock:
+            self._advance(time.time())
+            entry = self._entries.get(key)
+            return entry[0] if entry else None
+
+    def delete(self, key: str):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._wheel[entry[1] % len(self._wheel)].discard(key)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _advance(self, now: float):
+        """Esvazia os baldes cujo tempo já passou"""
+        current = int(now // self._slot_seconds)
+        # Mesmo após muito tempo parado, no máximo uma volta completa
+        for tick in range(max(self._tick, current - len(self._wheel)), current):
+            self._expire_bucket(tick)
+        self._tick = max(self._tick, current)
+
+    def _expire_bucket(self, tick: int):
+        bucket = self._wheel[tick % len(self._wheel)]
+        for key in list(bucket):
+            if self._entries[key][1] <= tick:
+                del self._entries[key]
+                bucket.discard(key)
+
+    def _evict(self):
+        """Descarta as chaves mais próximas de expirar até voltar ao limite"""
+        for offset in range(len(self._wheel)):
+            bucket = self._wheel[(self._tick + offset) % len(self._wheel)]
+            while bucket and len(self._entries) > self.max_keys:
+                del self._entries[bucket.pop()]
+            if len(self._entries) <= self.max_keys:
+                return
+
+
+class SQLiteRateLimitStore:
+    """Armazenamento em arquivo SQLite compartilhado entre processos"""
+
+    def __init__(self, path: str, max_keys: int = DEFAULT_MAX_KEYS):
+        self.path = path
+        self.max_keys = max_keys
+        self._local = threading.local()
+        self._operations = 0
+        connection = self._connection()
+        connection.execute("""
+            CREATE TABLE IF NOT EXISTS rate_limits (
+                key TEXT PRIMARY KEY,
+                window_index INTEGER NOT NULL,
+                current_count INTEGER NOT NULL,
+                previous_count INTEGER NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        """)
+        connection.execute("CREATE INDEX IF NOT EXISTS idx_rate_limits_expires ON rate_limits (expires_at)")
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def update(self, key: str, fn: Callable[[Optional[WindowState]], WindowState],
+               expires_at: float) -> WindowState:
+        connection = self._connection()
+        # BEGIN IMMEDIATE: leitura e escrita atômicas entre processos
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = connection.execute(
+                "SELECT window_index, current_count, previous_count FROM rate_limits WHERE key = ?",
+                (key,)
+            ).fetchone()
+            state = fn(tuple(row) if row else None)
+            connection.execute(
+                "INSERT OR REPLACE INTO rate_limits VALUES (?, ?, ?, ?, ?)",
+                (key, state[0], state[1], state[2], expires_at)
+            )
+            self._operations += 1
+            if self._operations % 100 == 0:
+                self._cleanup(connection)
+            connection.execute("COMMIT")
+            return state
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+
+    def get(self, key: str) -> Optional[WindowState]:
+        row = self._connection().execute(
+            "SELECT window_index, current_count, previous_count FROM rate_limits "
+            "WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        return tuple(row) if row else None
+
+    def delete(self, key: str):
+        self._connection().execute("DELETE FROM rate_limits WHERE key = ?", (key,))
+
+    def _cleanup(self, connection: sqlite3.Connection):
+        connection.execute("DELETE FROM rate_limits WHERE expires_at <= ?", (time.time(),))
+        connection.execute("""
+            DELETE FROM rate_limits WHERE key IN (
+                SELECT key FROM rate_limits ORDER BY expires_at
+                LIMIT MAX((SELECT COUNT(*) FROM rate_limits) - ?, 0)
+            )
+        """, (self.max_keys,))
+
+
+class SlidingWindowLimiter:
+    """Contador deslizante aproximado (janela atual + fração da anterior)"""
+
+    def __init__(self, limit: int, window: float, store):
+        self.limit = limit
+        self.window = window
+        self.store = store
+
+    def _rolled(self, state: Optional[WindowState], index: int) -> WindowState:
+        if state is None or state[0] < index - 1:
+            return index, 0, 0
+        if state[0] == index - 1:
+            return index, 0, state[1]
+        return state
+
+    def _estimate(self, state: WindowState, now: float) -> float:
+        elapsed = (now % self.window) / self.window
+        return state[2] * (1 - elapsed) + state[1]
+
+    def hit(self, key: str, now: Optional[float] = None) -> float:
+        """Registra uma ocorrência e retorna a contagem deslizante resultante"""
+        now = time.time() if now is None else now
+        index = int(now // self.window)
+
+        def increment(state):
+            _, current, previous = self._rolled(state, index)
+            return index, current + 1, previous
+
+        state = self.store.update(key, increment, (index + 2) * self.window)
+        return self._estimate(state, now)
+
+    def count(self, key: str, now: Optional[float] = None) -> float:
+        now = time.time() if now is None else now
+        state = self.store.get(key)
+        if state is None:
+            return 0.0
+        return self._estimate(self._rolled(state, int(now // self.window)), now)
+
+    def is_limited(self, key: str, now: Optional[float] = None) -> bool:
+        return self.count(key, now) >= self.limit
+
+    def reset(self, key: str):
+        self.store.delete(key)
+
+
+class LoginThrottle:
+    """Bloqueio de login por usuário e por origem (IP ou estação)"""
+
+    def __init__(self, max_attempts: int, window: float, max_attempts_per_source: int, store):
+        self.by_user = SlidingWindowLimiter(max_attempts, window, store)
+        self.by_source = SlidingWindowLimiter(max_attempts_per_source, window, store)
+
+    @property
+    def store(self):
+        return self.by_user.store
+
+    def require_shared_store(self, path: Optional[str] = None):
+        """
+        Garante um armazenamento compartilhado entre processos
+
+        Chamado antes do fork quando vários workers atendem o login: se o
+        armazenamento atual é em memória, passa a usar o SQLite em path
+        (login_rate_limit_db ou DEFAULT_SHARED_DB).
+        """
+        if not isinstance(self.store, MemoryRateLimitStore):
+            return
+        path = path or SECURITY_CONFIG.get('login_rate_limit_db') or DEFAULT_SHARED_DB
+        store = SQLiteRateLimitStore(path, self.store.max_keys)
+        self.by_user.store = store
+        self.by_source.store = store
+
+    @staticmethod
+    def _user_key(username: str) -> str:
+        return f"user:{(username or '').strip().lower()}"
+
+    def is_blocked(self, username: str, source: Optional[str] = None) -> bool:
+        if self.by_user.is_limited(self._user_key(username)):
+            return True
+        return source is not None and self.by_source.is_limited(f"source:{source}")
+
+    def register_failure(self, username: str, source: Optional[str] = None):
+        self.by_user.hit(self._user_key(username))
+        if source is not None:
+            self.by_source.hit(f"source:{source}")
+
+    def register_success(self, username: str, source: Optional[str] = None):
+        # A origem continua contando: um acerto não libera uma rajada de outros usuários
+        self.by_user.reset(self._user_key(username))
+
+
+def create_login_throttle(config: Dict = SECURITY_CONFIG) -> LoginThrottle:
+    """Monta o limitador a partir de SECURITY_CONFIG"""
+    window = config.get('login_window_seconds', 900)
+    max_keys = config.get('login_rate_limit_max_keys', DEFAULT_MAX_KEYS)
+    path = config.get('login_rate_limit_db')
+    if path:
+        store = SQLiteRateLimitStore(path, max_keys)
+    else:
+        store = MemoryRateLimitStore(2 * window, max_keys)
+    max_attempts = config.get('max_login_attempts', 5)
+    return LoginThrottle(max_attempts, window,
+                         config.get('max_login_attempts_per_source', max_attempts * 4), store)
+
+
+# Instância global do limitador de login
+login_throttle = create_login_throttle()
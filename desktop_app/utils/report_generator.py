@@ -1,196 +1,328 @@
 """
 Gerador de relatórios
+
+Os relatórios são produzidos linha a linha por geradores (iter_*), a partir
+de templates de texto compilados uma única vez. As linhas podem ser gravadas
+diretamente em um arquivo ou stream (write_report) ou enviadas como resposta
+HTTP em streaming, sem montar o relatório inteiro em memória.
 """
 from datetime import datetime, date
-from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from string import Formatter
+from typing import List, Dict, Any, Optional, Callable, Iterable, Iterator, TextIO, Union
 import tempfile
 import os
 
-from database.models import Team, Player, Game, Competition
+from database.models import Team, Game, Competition
 
+NOT_INFORMED = 'Não informado'
 
-class ReportGenerator:
-    """Gerador de relatórios do sistema"""
-    
-    @staticmethod
-    def generate_team_report(team: Team) -> str:
-        """
-        Gera relatório detalhado de uma equipe
-        
-        Args:
-            team: Objeto Team
-            
-        Returns:
-            Relatório como string
-        """
-        report = f"""
+TEAM_HEADER = """
 RELATÓRIO DA EQUIPE
 ==================
 
-Nome: {team.name}
-Abreviação: {team.abbreviation}
-Cidade: {team.city or 'Não informado'}
-Estado: {team.state or 'Não informado'}
-Ano de Fundação: {team.founded_year or 'Não informado'}
-Cores: {team.colors or 'Não informado'}
-Estádio: {team.stadium or 'Não informado'}
-Técnico: {team.coach or 'Não informado'}
+Nome: {name}
+Abreviação: {abbreviation}
+Cidade: {city}
+Estado: {state}
+Ano de Fundação: {founded_year}
+Cores: {colors}
+Estádio: {stadium}
+Técnico: {coach}
 
-Data de Criação: {team.created_at.strftime('%d/%m/%Y %H:%M') if team.created_at else 'Não informado'}
-Última Atualização: {team.updated_at.strftime('%d/%m/%Y %H:%M') if team.updated_at else 'Não informado'}
+Data de Criação: {created_at}
+Última Atualização: {updated_at}
 
 Jogadores:
 """
-        
-        if hasattr(team, 'players') and team.players:
-            for player in team.players:
-                report += f"- {player.name}"
-                if player.position:
-                    report += f" ({player.position})"
-                if player.age:
-                    report += f" - {player.age} anos"
-                report += "\n"
-        else:
-            report += "Nenhum jogador cadastrado.\n"
-        
-        return report
-    
-    @staticmethod
-    def generate_competition_report(competition: Competition) -> str:
-        """
-        Gera relatório de uma competição
-        
-        Args:
-            competition: Objeto Competition
-            
-        Returns:
-            Relatório como string
-        """
-        report = f"""
+
+COMPETITION_HEADER = """
 RELATÓRIO DA COMPETIÇÃO
 ======================
 
-Nome: {competition.name}
-Tipo: {competition.competition_type.value}
-Temporada: {competition.season}
-Descrição: {competition.description or 'Não informado'}
+Nome: {name}
+Tipo: {competition_type}
+Temporada: {season}
+Descrição: {description}
 
 Datas:
-Início: {competition.start_date.strftime('%d/%m/%Y') if competition.start_date else 'Não informado'}
-Término: {competition.end_date.strftime('%d/%m/%Y') if competition.end_date else 'Não informado'}
-Limite de Inscrições: {competition.registration_deadline.strftime('%d/%m/%Y') if competition.registration_deadline else 'Não informado'}
+Início: {start_date}
+Término: {end_date}
+Limite de Inscrições: {registration_deadline}
 
 Configurações:
-Máximo de Equipes: {competition.max_teams or 'Ilimitado'}
-Status: {'Ativa' if competition.is_active else 'Inativa'}
+Máximo de Equipes: {max_teams}
+Status: {status}
 
 Equipes Participantes:
 """
-        
-        if hasattr(competition, 'teams') and competition.teams:
-            for team in competition.teams:
-                report += f"- {team.name}\n"
+
+GAME_HEADER = """
+RELATÓRIO DO JOGO
+================
+
+Data: {game_date}
+Hora: {game_time}
+
+Equipes:
+Casa: {home_team}
+Visitante: {away_team}
+
+Resultado:
+"""
+
+GAME_FOOTER = """
+Local: {location}
+Status: {status}
+"""
+
+STANDINGS_HEADER = """
+CLASSIFICAÇÃO - {name}
+{season}
+{underline}
+
+Pos | Equipe                | J  | V  | E  | D  | GP | GC | SG | Pts
+"""
+
+STANDINGS_ROW = "{position:<3} | {team:<21} | {games:<2} | {wins:<2} | {draws:<2} | {losses:<2} | {goals_for:<2} | {goals_against:<2} | {goal_difference:<2} | {points:<2} |\n"
+
+PLAYER_LINE = "- {name}{position}{age}\n"
+EVENT_LINE = "{minute}' - {event_type} - {player}\n"
+
+
+@lru_cache(maxsize=32)
+def compile_template(template: str) -> Callable[[Dict[str, Any]], str]:
+    """
+    Valida e prepara um template no formato str.format uma única vez
+
+    Args:
+        template: Texto com campos {nome} ou {nome:formato}
+
+    Returns:
+        Função que recebe o contexto e retorna o texto renderizado
+    """
+    fields = {field for _, field, _, _ in Formatter().parse(template) if field is not None}
+    if any(not field.isidentifier() for field in fields):
+        raise ValueError(f"Campos inválidos no template: {sorted(fields)}")
+    return template.format_map
+
+
+def _format_datetime(value: Optional[datetime], pattern: str) -> str:
+    return value.strftime(pattern) if value else NOT_INFORMED
+
+
+def _event_sort_key(event: Any):
+    """Chave de ordenação dos eventos: minuto, com eventos sem minuto ao final"""
+    minute = event.minute
+    return (minute is None, minute or 0)
+
+
+class ReportGenerator:
+    """Gerador de relatórios do sistema"""
+
+    @staticmethod
+    def iter_team_report(team: Team) -> Iterator[str]:
+        """
+        Gera o relatório de uma equipe linha a linha
+
+        Args:
+            team: Objeto Team
+
+        Returns:
+            Iterador de trechos do relatório
+        """
+        yield compile_template(TEAM_HEADER)({
+            'name': team.name,
+            'abbreviation': team.abbreviation,
+            'city': team.city or NOT_INFORMED,
+            'state': team.state or NOT_INFORMED,
+            'founded_year': team.founded_year or NOT_INFORMED,
+            'colors': team.colors or NOT_INFORMED,
+            'stadium': team.stadium or NOT_INFORMED,
+            'coach': team.coach or NOT_INFORMED,
+            'created_at': _format_datetime(team.created_at, '%d/%m/%Y %H:%M'),
+            'updated_at': _format_datetime(team.updated_at, '%d/%m/%Y %H:%M')
+        })
+
+        players = getattr(team, 'players', None)
+        if players:
+            render_player = compile_template(PLAYER_LINE)
+            for player in players:
+                yield render_player({
+                    'name': player.name,
+                    'position': f" ({player.position})" if player.position else "",
+                    'age': f" - {player.age} anos" if player.age else ""
+                })
         else:
-            report += "Nenhuma equipe inscrita.\n"
-        
-        return report
-    
+            yield "Nenhum jogador cadastrado.\n"
+
     @staticmethod
-    def generate_game_report(game: Game) -> str:
+    def iter_competition_report(competition: Competition) -> Iterator[str]:
+        """
+        Gera o relatório de uma competição linha a linha
+
+        Args:
+            competition: Objeto Competition
+
+        Returns:
+            Iterador de trechos do relatório
+        """
+        yield compile_template(COMPETITION_HEADER)({
+            'name': competition.name,
+            'competition_type': competition.competition_type.value,
+            'season': competition.season,
+            'description': competition.description or NOT_INFORMED,
+            'start_date': _format_datetime(competition.start_date, '%d/%m/%Y'),
+            'end_date': _format_datetime(competition.end_date, '%d/%m/%Y'),
+            'registration_deadline': _format_datetime(competition.registration_deadline, '%d/%m/%Y'),
+            'max_teams': competition.max_teams or 'Ilimitado',
+            'status': 'Ativa' if competition.is_active else 'Inativa'
+        })
+
+        teams = getattr(competition, 'teams', None)
+        if teams:
+            for team in teams:
+                yield f"- {team.name}\n"
+        else:
+            yield "Nenhuma equipe inscrita.\n"
+
+    @staticmethod
+    def iter_game_report(game: Game) -> Iterator[str]:
         """
-        Gera relatório de um jogo
-        
+        Gera o relatório de um jogo linha a linha
+
         Args:
             game: Objeto Game
-            
+
         Returns:
-            Relatório como string
+            Iterador de trechos do relatório
         """
         home_team_name = game.home_team.name if game.home_team else "Equipe não encontrada"
         away_team_name = game.away_team.name if game.away_team else "Equipe não encontrada"
-        
-        report = f"""
-RELATÓRIO DO JOGO
-================
 
-Data: {game.game_date.strftime('%d/%m/%Y') if game.game_date else 'Não informado'}
-Hora: {game.game_time.strftime('%H:%M') if game.game_time else 'Não informado'}
+        yield compile_template(GAME_HEADER)({
+            'game_date': _format_datetime(game.game_date, '%d/%m/%Y'),
+            'game_time': _format_datetime(game.game_time, '%H:%M'),
+            'home_team': home_team_name,
+            'away_team': away_team_name
+        })
 
-Equipes:
-Casa: {home_team_name}
-Visitante: {away_team_name}
-
-Resultado:
-"""
-        
         if game.home_team_score is not None and game.away_team_score is not None:
-            report += f"{home_team_name} {game.home_team_score} x {game.away_team_score} {away_team_name}\n"
-            
+            yield f"{home_team_name} {game.home_team_score} x {game.away_team_score} {away_team_name}\n"
+
             # Determinar vencedor
             if game.home_team_score > game.away_team_score:
-                report += f"Vencedor: {home_team_name}\n"
+                yield f"Vencedor: {home_team_name}\n"
             elif game.away_team_score > game.home_team_score:
-                report += f"Vencedor: {away_team_name}\n"
+                yield f"Vencedor: {away_team_name}\n"
             else:
-                report += "Resultado: Empate\n"
+                yield "Resultado: Empate\n"
         else:
-            report += "Jogo ainda não realizado.\n"
-        
-        report += f"\nLocal: {game.location or 'Não informado'}\n"
-        report += f"Status: {game.status.value if game.status else 'Não informado'}\n"
-        
+            yield "Jogo ainda não realizado.\n"
+
+        yield compile_template(GAME_FOOTER)({
+            'location': game.location or NOT_INFORMED,
+            'status': game.status.value if game.status else NOT_INFORMED
+        })
+
         # Eventos do jogo
-        if hasattr(game, 'events') and game.events:
-            report += "\nEventos do Jogo:\n"
-            report += "----------------\n"
-            for event in sorted(game.events, key=lambda x: x.minute):
-                player_name = event.player.name if event.player else "Jogador não encontrado"
-                report += f"{event.minute}' - {event.event_type.value} - {player_name}\n"
-        
-        return report
-    
+        events = getattr(game, 'events', None)
+        if events:
+            yield "\nEventos do Jogo:\n"
+            yield "----------------\n"
+            render_event = compile_template(EVENT_LINE)
+            for event in sorted(events, key=_event_sort_key):
+                yield render_event({
+                    'minute': event.minute if event.minute is not None else '-',
+                    'event_type': event.event_type.value,
+                    'player': event.player.name if event.player else "Jogador não encontrado"
+                })
+
     @staticmethod
-    def generate_standings_report(competition: Competition) -> str:
+    def iter_standings_report(competition: Competition,
+                              standings: Optional[Iterable[Dict[str, Any]]] = None) -> Iterator[str]:
         """
-        Gera relatório de classificação de uma competição
-        
+        Gera o relatório de classificação de uma competição linha a linha
+
         Args:
             competition: Objeto Competition
-            
+            standings: Linhas da classificação já ordenadas (position, team,
+                games, wins, draws, losses, goals_for, goals_against,
+                goal_difference, points)
+
         Returns:
-            Relatório como string
+            Iterador de trechos do relatório
         """
-        report = f"""
-CLASSIFICAÇÃO - {competition.name}
-{competition.season}
-{'=' * (len(competition.name) + len(str(competition.season)) + 4)}
+        yield compile_template(STANDINGS_HEADER)({
+            'name': competition.name,
+            'season': competition.season,
+            'underline': '=' * (len(competition.name) + len(str(competition.season)) + 4)
+        })
+
+        if standings is None:
+            # Aqui você implementaria a lógica para calcular a classificação
+            # Por enquanto, retorna um placeholder
+            standings = [
+                {'position': 1, 'team': 'Exemplo Futebol Club', 'games': 10, 'wins': 7, 'draws': 2,
+                 'losses': 1, 'goals_for': 18, 'goals_against': 8, 'goal_difference': 10, 'points': 23},
+                {'position': 2, 'team': 'Esporte Clube', 'games': 10, 'wins': 6, 'draws': 3,
+                 'losses': 1, 'goals_for': 15, 'goals_against': 7, 'goal_difference': 8, 'points': 21}
+            ]
+
+        render_row = compile_template(STANDINGS_ROW)
+        for row in standings:
+            yield render_row(row)
+
+    @staticmethod
+    def generate_team_report(team: Team) -> str:
+        """Gera relatório detalhado de uma equipe como string"""
+        return ''.join(ReportGenerator.iter_team_report(team))
+
+    @staticmethod
+    def generate_competition_report(competition: Competition) -> str:
+        """Gera relatório de uma competição como string"""
+        return ''.join(ReportGenerator.iter_competition_report(competition))
+
+    @staticmethod
+    def generate_game_report(game: Game) -> str:
+        """Gera relatório de um jogo como string"""
+        return ''.join(ReportGenerator.iter_game_report(game))
 
-Pos | Equipe                | J  | V  | E  | D  | GP | GC | SG | Pts
-"""
-        
-        # Aqui você implementaria a lógica para calcular a classificação
-        # Por enquanto, retorna um placeholder
-        report += "1   | Exemplo Futebol Club | 10 | 7  | 2  | 1  | 18 | 8  | 10 | 23 |\n"
-        report += "2   | Esporte Clube        | 10 | 6  | 3  | 1  | 15 | 7  | 8  | 21 |\n"
-        
-        return report
-    
     @staticmethod
-    def save_report_to_file(report_content: str, filename: str) -> str:
+    def generate_standings_report(competition: Competition) -> str:
+        """Gera relatório de classificação de uma competição como string"""
+        return ''.join(ReportGenerator.iter_standings_report(competition))
+
+    @staticmethod
+    def write_report(report: Union[str, Iterable[str]], stream: TextIO) -> None:
+        """
+        Grava um relatório em um stream à medida que é gerado
+
+        Args:
+            report: Texto pronto ou iterador retornado por um método iter_*
+            stream: Arquivo ou qualquer objeto com write/writelines
+        """
+        if isinstance(report, str):
+            stream.write(report)
+        else:
+            stream.writelines(report)
+
+    @staticmethod
+    def save_report_to_file(report_content: Union[str, Iterable[str]], filename: str) -> str:
         """
         Salva relatório em arquivo
-        
+
         Args:
-            report_content: Conteúdo do relatório
+            report_content: Conteúdo do relatório ou iterador de um método iter_*
             filename: Nome do arquivo
-            
+
         Returns:
             Caminho do arquivo salvo
         """
         temp_dir = tempfile.gettempdir()
         file_path = os.path.join(temp_dir, filename)
-        
+
         with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(report_content)
-        
+            ReportGenerator.write_report(report_content, f)
+
         return file_path
@@ -0,0 +1,418 @@
+"""
+Índice de busca em memória para o aplicativo desktop
+
+Indexa nomes e nomes abreviados de equipes, nomes e números de camisa de
+atletas e nomes de competições. Os jogos são encontrados pelas equipes e
+competições a que pertencem, então renomear uma equipe não exige
+reindexar os jogos.
+
+Cada tipo de entidade tem:
+    - uma trie de prefixos dos termos (até MAX_PREFIX_LENGTH caracteres),
+      em que cada nó guarda o conjunto de documentos com aquele prefixo;
+    - postings de trigramas, para encontrar trechos no meio dos nomes
+      ("silva" em "Ana da Silva Souza").
+
+Os termos são normalizados sem acentos e sem diferenciar maiúsculas, de
+modo que "joao" encontra "João" e "acai" encontra "Açaí". Consultas com
+vários termos exigem todos eles (E lógico).
+
+O índice é montado uma vez em segundo plano (ensure_built) e depois
+atualizado incrementalmente pelos controllers ao salvar entidades.
+"""
+import heapq
+import re
+import threading
+import unicodedata
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from database.connection import execute_query
+
+MAX_PREFIX_LENGTH = 8
+DEFAULT_LIMIT = 20
+# Abaixo disso, os termos seguintes da consulta são conferidos documento a documento
+NARROW_LIMIT = 5000
+
+_NON_WORD = re.compile(r'[^0-9a-z]+')
+
+# Ordem de exibição dos tipos nos resultados combinados
+KIND_ORDER = ('team', 'athlete', 'competition')
+
+
+def normalize(text: str) -> str:
+    """Remove acentos, pontuação e maiúsculas: 'São Paulo F.C.' -> 'sao paulo f c'"""
+    decomposed = unicodedata.normalize('NFKD', str(text or ''))
+    stripped = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return _NON_WORD.sub(' ', stripped.casefold()).strip()
+
+
+def tokenize(text: str) -> List[str]:
+    return normalize(text).split()
+
+
+def _trigrams(term: str) -> Set[str]:
+    return {term[i:i + 3] for i in range(len(term) - 2)}
+
+
+@dataclass
+class SearchResult:
+    kind: str
+    id: int
+    label: str
+
+
+class _Document:
+    __slots__ = ('id', 'label', 'terms', 'text', 'first_term')
+
+    def __init__(self, entity_id: int, label: str, terms: List[str]):
+        self.id = entity_id
+        self.label = label
+        self.terms = terms
+        self.text = ' '.join(terms)
+        self.first_term = terms[0] if terms else ''
+
+
+class _TrieNode:
+    __slots__ = ('children', 'docs', 'leading')
+
+    def __init__(self):
+        self.children: Dict[str, '_TrieNode'] = {}
+        self.docs: Set[int] = set()
+        # Documentos cujo primeiro termo passa por este nó (melhor classificados)
+        self.leading: Set[int] = set()
+
+
+class _KindIndex:
+    """Trie de prefixos e trigramas de um tipo de entidade"""
+
+    def __init__(self):
+        self.docs: Dict[int, _Document] = {}
+        self.texts: Dict[int, str] = {}  # atalho para a conferência dos trechos
+        self.root = _TrieNode()
+        self.trigrams: Dict[str, Set[int]] = {}
+
+    def add(self, entity_id: int, label: str, texts: Iterable[str]):
+        if entity_id in self.docs:
+            self.remove(entity_id)
+        terms: List[str] = []
+        for text in texts:
+            for term in tokenize(text):
+                if term not in terms:
+                    terms.append(term)
+        doc = _Document(entity_id, label, terms)
+        self.docs[entity_id] = doc
+        self.texts[entity_id] = doc.text
+
+        for position, term in enumerate(terms):
+            node = self.root
+            for ch in term[:MAX_PREFIX_LENGTH]:
+                node = node.children.setdefault(ch, _TrieNode())
+                node.docs.add(entity_id)
+                if position == 0:
+                    node.leading.add(entity_id)
+        for trigram in _trigrams(doc.text):
+            self.trigrams.setdefault(trigram, set()).add(entity_id)
+
+    def remove(self, entity_id: int):
+        doc = self.docs.pop(entity_id, None)
+        if doc is None:
+            return
+        del self.texts[entity_id]
+        for term in doc.terms:
+            node, path = self.root, []
+            for ch in term[:MAX_PREFIX_LENGTH]:
+                child = node.children.get(ch)
+                if child is None:
+                    break
+                child.docs.discard(entity_id)
+                child.leading.discard(entity_id)
+                path.append((node, ch, child))
+                node = child
+            # Remove os nós que ficaram vazios, de baixo para cima
+            for parent, ch, child in reversed(path):
+                if child.docs or child.children:
+                    break
+                del parent.children[ch]
+        for trigram in _trigrams(doc.text):
+            postings = self.trigrams.get(trigram)
+            if postings is not None:
+                postings.discard(entity_id)
+                if not postings:
+                    del self.trigrams[trigram]
+
+    def _node(self, term: str) -> Optional[_TrieNode]:
+        node = self.root
+        for ch in term[:MAX_PREFIX_LENGTH]:
+            node = node.children.get(ch)
+            if node is None:
+                return None
+        return node
+
+    def prefix_matches(self, term: str) -> Set[int]:
+        """
+        Documentos com algum termo começando por term
+
+        Termos maiores que a profundidade da trie são conferidos no texto,
+        o que também aceita o termo no meio de uma palavra; como a busca
+        já aceita trechos, o resultado final é o mesmo.
+        """
+        node = self._node(term)
+        if node is None:
+            return set()
+        if len(term) <= MAX_PREFIX_LENGTH:
+            return node.docs
+        texts = self.texts
+        return {doc_id for doc_id in node.docs if term in texts[doc_id]}
+
+    def leading_matches(self, term: str) -> Set[int]:
+        """Documentos cujo primeiro termo começa por term"""
+        node = self._node(term)
+        return node.leading if node is not None else set()
+
+    def infix_matches(self, term: str, exclude: Set[int] = frozenset()) -> Set[int]:
+        """Documentos com o termo no meio do texto (termos de 3 caracteres ou mais)"""
+        if len(term) < 3:
+            return set()
+        postings = sorted((self.trigrams.get(t, set()) for t in _trigrams(term)), key=len)
+        if not postings or not postings[0]:
+            return set()
+        candidates = postings[0].intersection(*postings[1:])
+        # Os trigramas só eliminam candidatos; a confirmação é no texto
+        candidates.difference_update(exclude)
+        if len(postings) == 1:
+            return candidates  # um único trigrama: o trecho é o próprio trigrama
+        texts = self.texts
+        return {doc_id for doc_id in candidates if term in texts[doc_id]}
+
+    def term_matches(self, term: str) -> Set[int]:
+        prefix = self.prefix_matches(term)
+        infix = self.infix_matches(term, exclude=prefix)
+        return prefix | infix if infix else prefix
+
+    def _contains(self, doc_id: int, term: str) -> bool:
+        doc = self.docs[doc_id]
+        if len(term) < 3:
+            return any(t.startswith(term) for t in doc.terms)
+        return term in doc.text
+
+    def match(self, terms: List[str]) -> Set[int]:
+        result: Optional[Set[int]] = None
+        # Termos mais longos primeiro: conjuntos menores, interseção mais barata
+        for term in sorted(terms, key=len, reverse=True):
+            if result is not None and len(result) <= NARROW_LIMIT:
+                # Poucos candidatos: conferir o texto sai mais barato que consultar o índice
+                result = {doc_id for doc_id in result if self._contains(doc_id, term)}
+            else:
+                matches = self.term_matches(term)
+                result = set(matches) if result is None else result & matches
+            if not result:
+                return set()
+        return result or set()
+
+
+class SearchIndex:
+    """Índice de equipes, atletas, competições e jogos"""
+
+    def __init__(self):
+        self._kinds: Dict[str, _KindIndex] = {kind: _KindIndex() for kind in KIND_ORDER}
+        self._athletes_by_team: Dict[int, Set[int]] = {}
+        self._athlete_team: Dict[int, int] = {}
+        self._games_by_team: Dict[int, Set[int]] = {}
+        self._games_by_competition: Dict[int, Set[int]] = {}
+        self._game_links: Dict[int, Tuple[int, int, int]] = {}
+        self._lock = threading.RLock()
+        self._build_started = False
+        self.ready = threading.Event()
+
+    # Atualização incremental
+
+    def add_team(self, team):
+        with self._lock:
+            self._kinds['team'].add(team.id, team.name, (team.name, team.short_name or ''))
+
+    def remove_team(self, team_id: int):
+        """Remove a equipe e os atletas dela (desativados junto com a equipe)"""
+        with self._lock:
+            self._kinds['team'].remove(team_id)
+            for athlete_id in list(self._athletes_by_team.get(team_id, ())):
+                self.remove_athlete(athlete_id)
+
+    def add_athlete(self, athlete):
+        with self._lock:
+            self.remove_athlete(athlete.id)
+            number = str(athlete.jersey_number) if athlete.jersey_number is not None else ''
+            self._kinds['athlete'].add(athlete.id, athlete.name, (athlete.name, number))
+            self._athlete_team[athlete.id] = athlete.team_id
+            self._athletes_by_team.setdefault(athlete.team_id, set()).add(athlete.id)
+
+    def remove_athlete(self, athlete_id: int):
+        with self._lock:
+            self._kinds['athlete'].remove(athlete_id)
+            team_id = self._athlete_team.pop(athlete_id, None)
+            if team_id is not None:
+                self._athletes_by_team.get(team_id, set()).discard(athlete_id)
+
+    def add_competition(self, competition):
+        with self._lock:
+            self._kinds['competition'].add(competition.id, competition.name, (competition.name,))
+
+    def remove_competition(self, competition_id: int):
+        with self._lock:
+            self._kinds['competition'].remove(competition_id)
+
+    def add_game(self, game):
+        with self._lock:
+            self.remove_game(game.id)
+            links = (game.home_team_id, game.away_team_id, game.competition_id)
+            self._game_links[game.id] = links
+            for team_id in links[:2]:
+                self._games_by_team.setdefault(team_id, set()).add(game.id)
+            self._games_by_competition.setdefault(links[2], set()).add(game.id)
+
+    def remove_game(self, game_id: int):
+        with self._lock:
+            links = self._game_links.pop(game_id, None)
+            if links is None:
+                return
+            for team_id in links[:2]:
+                self._games_by_team.get(team_id, set()).discard(game_id)
+            self._games_by_competition.get(links[2], set()).discard(game_id)
+
+    # Consultas
+
+    def match_ids(self, query: str, kind: str) -> Set[int]:
+        """Ids do tipo que contêm todos os termos da consulta"""
+        terms = tokenize(query)
+        if not terms:
+            return set()
+        with self._lock:
+            return set(self._kinds[kind].match(terms))
+
+    def match_team_ids(self, query: str, include_athletes: bool = True) -> Set[int]:
+        """Equipes cujo nome (ou o nome/número de um atleta) corresponde à consulta"""
+        with self._lock:
+            team_ids = self.match_ids(query, 'team')
+            if include_athletes:
+                athlete_team = self._athlete_team
+                team_ids.update(map(athlete_team.get, self.match_ids(query, 'athlete')))
+                team_ids.discard(None)
+            return team_ids
+
+    def match_game_ids(self, query: str) -> Set[int]:
+        """Jogos em que cada termo corresponde a uma das equipes ou à competição"""
+        terms = tokenize(query)
+        if not terms:
+            return set()
+        result: Optional[Set[int]] = None
+        with self._lock:
+            for term in sorted(terms, key=len, reverse=True):
+                games: Set[int] = set()
+                for team_id in self._kinds['team'].term_matches(term):
+                    games |= self._games_by_team.get(team_id, set())
+                for competition_id in self._kinds['competition'].term_matches(term):
+                    games |= self._games_by_competition.get(competition_id, set())
+                result = games if result is None else result & games
+                if not result:
+                    return set()
+        return result or set()
+
+    def search(self, query: str, kinds: Iterable[str] = KIND_ORDER,
+               limit: int = DEFAULT_LIMIT) -> List[SearchResult]:
+        """
+        Melhores resultados para busca enquanto o usuário digita
+
+        Documentos cujo primeiro termo começa com a consulta vêm antes dos
+        demais, em ordem alfabética; os demais são amostrados até poucos
+        múltiplos de limit para não ordenar milhares de resultados.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+        first = terms[0]
+        results: List[SearchResult] = []
+        with self._lock:
+            for kind in kinds:
+                index = self._kinds[kind]
+                matches = index.match(terms)
+                leading = index.leading_matches(first) & matches
+                chosen = [index.docs[doc_id] for doc_id in
+                          heapq.nsmallest(limit, leading, key=lambda doc_id: index.docs[doc_id].text)]
+                if len(chosen) < limit:
+                    others = []
+                    for doc_id in matches:
+                        if index.docs[doc_id].first_term.startswith(first):
+                            continue
+                        others.append(index.docs[doc_id])
+                        if len(others) >= limit * 4:
+                            break
+                    chosen += sorted(others, key=lambda d: d.text)[:limit - len(chosen)]
+                results.extend(SearchResult(kind, doc.id, doc.label) for doc in chosen)
+        return results
+
+    # Carga inicial
+
+    def build(self, teams: Iterable, athletes: Iterable, competitions: Iterable, games: Iterable):
+        """Monta um índice novo e o troca pelo atual de uma vez"""
+        fresh = SearchIndex()
+        for team in teams:
+            fresh.add_team(team)
+        for athlete in athletes:
+            fresh.add_athlete(athlete)
+        for competition in competitions:
+            fresh.add_competition(competition)
+        for game in games:
+            fresh.add_game(game)
+        with self._lock:
+            for name in ('_kinds', '_athletes_by_team', '_athlete_team', '_games_by_team',
+                         '_games_by_competition', '_game_links'):
+                setattr(self, name, getattr(fresh, name))
+        self.ready.set()
+
+    def build_from_database(self):
+        """Carrega as entidades ativas com uma consulta por tabela"""
+        def rows(query):
+            return [_Row(row) for row in execute_query(query, fetch=True) or []]
+
+        self.build(
+            rows("SELECT id, name, short_name FROM teams WHERE is_active = TRUE"),
+            rows("SELECT id, team_id, name, jersey_number FROM athletes WHERE is_active = TRUE"),
+            rows("SELECT id, name FROM competitions"),
+            rows("SELECT id, home_team_id, away_team_id, competition_id FROM games")
+        )
+
+    def reload_competition_games(self, competition_id: int):
+        """Indexa os jogos gerados em lote para a competição (ex.: ao iniciá-la)"""
+        rows = execute_query(
+            "SELECT id, home_team_id, away_team_id, competition_id FROM games WHERE competition_id = %s",
+            (competition_id,), fetch=True
+        ) or []
+        for row in rows:
+            self.add_game(_Row(row))
+
+    def ensure_built(self):
+        """Inicia a carga em segundo plano na primeira chamada"""
+        with self._lock:
+            if self._build_started:
+                return
+            self._build_started = True
+
+        def run():
+            try:
+                self.build_from_database()
+            except Exception as e:
+                print(f"Erro ao montar índice de busca: {e}")
+                with self._lock:
+                    self._build_started = False
+
+        threading.Thread(target=run, name='search-index-build', daemon=True).start()
+
+
+class _Row:
+    """Acesso por atributo às linhas retornadas como dicionário"""
+
+    def __init__(self, data: dict):
+        self.__dict__.update(data)
+
+
+# Instância global do índice de busca
+search_index = SearchIndex()
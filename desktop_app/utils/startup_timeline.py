@@ -0,0 +1,185 @@
+"""
+Linha do tempo da inicialização do aplicativo desktop
+
+Registra marcos (ex.: 'login_window_shown', 'first_tab_ready') e trechos
+medidos (importações tardias, criação de abas) em milissegundos desde a
+criação da linha do tempo (o primeiro import de desktop_app/main.py), para
+acompanhar o tempo até a janela de login e até a primeira aba utilizável.
+
+Com APP_CONFIG['startup_profile'] (variável STARTUP_PROFILE=true), o
+ImportTimer mede também cada módulo importado pela primeira vez, o
+relatório é impresso ao final da inicialização e uma linha JSON é
+acrescentada a APP_CONFIG['startup_log'] para comparação entre versões.
+
+Este módulo só depende da biblioteca padrão e da configuração, para poder
+ser importado antes de tudo e medir o restante.
+"""
+import builtins
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from importlib import import_module
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.settings import APP_CONFIG
+
+REPORT_TOP_IMPORTS = 15
+
+
+class ImportTimer:
+    """
+    Mede o tempo das importações feitas por import (builtins.__import__)
+
+    Para cada módulo carregado pela primeira vez guarda o tempo total
+    (incluindo os módulos que ele importa) e o tempo próprio.
+    """
+
+    def __init__(self):
+        self.inclusive: Dict[str, float] = {}
+        self.self_time: Dict[str, float] = {}
+        self._original = None
+        self._local = threading.local()
+
+    def install(self):
+        if self._original is None:
+            self._original = builtins.__import__
+            builtins.__import__ = self._import
+
+    def uninstall(self):
+        if self._original is not None:
+            builtins.__import__ = self._original
+            self._original = None
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        # Importações relativas ou de módulos já carregados não custam nada a medir
+        if level != 0 or name in sys.modules:
+            return self._original(name, globals, locals, fromlist, level)
+
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        stack.append(0.0)  # tempo gasto em importações aninhadas
+        started = time.perf_counter()
+        try:
+            return self._original(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            children = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            self.inclusive.setdefault(name, elapsed)
+            self.self_time.setdefault(name, elapsed - children)
+
+    def slowest(self, limit: int = REPORT_TOP_IMPORTS) -> List[Tuple[str, float, float]]:
+        """Módulos mais lentos: (nome, total ms, próprio ms)"""
+        names = sorted(self.inclusive, key=self.inclusive.get, reverse=True)[:limit]
+        return [(name, self.inclusive[name], self.self_time[name]) for name in names]
+
+
+class StartupTimeline:
+    """Marcos e trechos da inicialização, em ms desde start"""
+
+    def __init__(self, start: Optional[float] = None, profile: bool = False,
+                 log_path: Optional[str] = None):
+        self.start = start if start is not None else time.perf_counter()
+        self.profile = profile
+        self.log_path = log_path
+        self.marks: Dict[str, float] = {}
+        self.spans: List[Tuple[str, float, float]] = []  # (nome, início ms, duração ms)
+        self.import_timer = ImportTimer()
+        self._lock = threading.Lock()
+        self._reported = False
+
+    def now(self) -> float:
+        return (time.perf_counter() - self.start) * 1000
+
+    def mark(self, name: str) -> float:
+        """Registra um marco; só a primeira ocorrência conta (ex.: novo login)"""
+        with self._lock:
+            return self.marks.setdefault(name, self.now())
+
+    @contextmanager
+    def span(self, name: str):
+        """Mede um trecho: with startup_timeline.span('tab:Equipes'): ..."""
+        started = self.now()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.spans.append((name, started, self.now() - started))
+
+    def import_module(self, path: str):
+        """Importa um módulo sob demanda, registrando o tempo gasto"""
+        if path in sys.modules:
+            return sys.modules[path]
+        with self.span(f'import {path}'):
+            return import_module(path)
+
+    def elapsed(self, name: str) -> Optional[float]:
+        return self.marks.get(name)
+
+    def as_dict(self) -> Dict[str, Any]:
+        data = {
+            'recorded_at': datetime.now().isoformat(timespec='seconds'),
+            'python': sys.version.split()[0],
+            'marks': {name: round(ms, 1) for name, ms in self.marks.items()},
+            'spans': [{'name': name, 'start_ms': round(start, 1), 'duration_ms': round(duration, 1)}
+                      for name, start, duration in self.spans],
+        }
+        if self.import_timer.inclusive:
+            data['slowest_imports'] = [
+                {'module': name, 'total_ms': round(total, 1), 'self_ms': round(own, 1)}
+                for name, total, own in self.import_timer.slowest()
+            ]
+        return data
+
+    def report(self) -> str:
+        """Relatório legível da inicialização"""
+        lines = ["Linha do tempo da inicialização (ms desde o início):"]
+        previous = 0.0
+        for name, ms in sorted(self.marks.items(), key=lambda item: item[1]):
+            lines.append(f"  {ms:9.1f}  (+{ms - previous:8.1f})  {name}")
+            previous = ms
+        if self.spans:
+            lines.append("Trechos:")
+            for name, start, duration in sorted(self.spans, key=lambda span: span[1]):
+                lines.append(f"  {start:9.1f}  {duration:9.1f} ms  {name}")
+        if self.import_timer.inclusive:
+            lines.append("Importações mais lentas (total / próprio):")
+            for name, total, own in self.import_timer.slowest():
+                lines.append(f"  {total:9.1f}  {own:9.1f} ms  {name}")
+        return "\n".join(lines)
+
+    def finish(self, name: str = 'startup_complete'):
+        """Fecha a medição: imprime e grava o relatório quando o perfil está ativo"""
+        self.mark(name)
+        if not self.profile or self._reported:
+            return
+        self._reported = True
+        self.import_timer.uninstall()
+        print(self.report())
+        if self.log_path:
+            try:
+                path = Path(self.log_path)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with open(path, 'a', encoding='utf-8') as file:
+                    file.write(json.dumps(self.as_dict(), ensure_ascii=False) + "\n")
+            except OSError as e:
+                print(f"Erro ao gravar linha do tempo da inicialização: {e}")
+
+
+def create_startup_timeline(config: Dict = APP_CONFIG) -> StartupTimeline:
+    """Monta a linha do tempo a partir de APP_CONFIG, já medindo importações se configurado"""
+    timeline = StartupTimeline(profile=config.get('startup_profile', False),
+                               log_path=config.get('startup_log'))
+    if timeline.profile:
+        timeline.import_timer.install()
+    return timeline
+
+
+# Instância global da linha do tempo da inicialização
+startup_timeline = create_startup_timeline()
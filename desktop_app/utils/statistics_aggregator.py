@@ -0,0 +1,316 @@
+"""
+Agregador de estatísticas de competição em passagem única
+
+Os jogos finalizados são convertidos em uma representação colunar compacta
+(arrays de inteiros e tabelas de códigos para fase e local) e todas as
+métricas são calculadas em uma única varredura. Com NumPy disponível e
+volume suficiente, a mesma agregação é vetorizada.
+"""
+from array import array
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Union
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional
+    np = None
+
+# Abaixo deste número de jogos o laço em Python é mais rápido que o NumPy
+NUMPY_MIN_GAMES = 2000
+
+
+def _is_finished(game: Any) -> bool:
+    status = getattr(game, 'status', None)
+    status = getattr(status, 'value', status)
+    return (str(status).lower() == 'finished' and
+            game.home_score is not None and game.away_score is not None)
+
+
+class _LabelCodes:
+    """Tabela de códigos inteiros para rótulos repetidos (fase, local)"""
+
+    __slots__ = ('codes', 'labels')
+
+    def __init__(self):
+        self.codes: Dict[Any, int] = {}
+        self.labels: List[Any] = []
+
+    def code(self, label: Any) -> int:
+        code = self.codes.get(label)
+        if code is None:
+            code = self.codes[label] = len(self.labels)
+            self.labels.append(label)
+        return code
+
+
+class GameColumns:
+    """Representação colunar dos jogos finalizados de uma competição"""
+
+    __slots__ = ('game_ids', 'home_team_ids', 'away_team_ids', 'home_scores', 'away_scores',
+                 'rounds', 'phase_codes', 'venue_codes', 'phases', 'venues')
+
+    def __init__(self):
+        self.game_ids = array('l')
+        self.home_team_ids = array('l')
+        self.away_team_ids = array('l')
+        self.home_scores = array('l')
+        self.away_scores = array('l')
+        self.rounds = array('l')
+        self.phase_codes = array('l')
+        self.venue_codes = array('l')
+        self.phases = _LabelCodes()
+        self.venues = _LabelCodes()
+
+    def __len__(self) -> int:
+        return len(self.game_ids)
+
+    def append(self, game_id: int, home_team_id: int, away_team_id: int,
+               home_score: int, away_score: int, round_number: Optional[int] = None,
+               phase: Any = None, venue: Any = None):
+        """Adiciona um jogo finalizado"""
+        self.game_ids.append(game_id or 0)
+        self.home_team_ids.append(home_team_id or 0)
+        self.away_team_ids.append(away_team_id or 0)
+        self.home_scores.append(home_score)
+        self.away_scores.append(away_score)
+        self.rounds.append(round_number or 0)
+        self.phase_codes.append(self.phases.code(phase if phase is not None else "N/A"))
+        self.venue_codes.append(self.venues.code(venue if venue is not None else "N/A"))
+
+    @classmethod
+    def from_games(cls, games: Iterable[Any],
+                   venue: Union[str, Callable[[Any], Any]] = 'venue') -> 'GameColumns':
+        """
+        Monta as colunas a partir de objetos de jogo (desktop ou web)
+
+        Args:
+            games: Jogos; apenas os finalizados com placar são considerados
+            venue: Nome do atributo ou função que retorna o local do jogo
+
+        Returns:
+            Colunas dos jogos finalizados
+        """
+        get_venue = venue if callable(venue) else (lambda game: getattr(game, venue, None))
+        columns = cls()
+        for game in games:
+            if _is_finished(game):
+                columns.append(game.id, game.home_team_id, game.away_team_id,
+                               game.home_score, game.away_score,
+                               getattr(game, 'round_number', None),
+                               getattr(game, 'phase', None), get_venue(game))
+        return columns
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Sequence[Any]]) -> 'GameColumns':
+        """
+        Monta as colunas a partir de tuplas já filtradas
+
+        Cada tupla contém (id, mandante, visitante, gols mandante, gols visitante,
+        rodada, fase, local).
+        """
+        columns = cls()
+        for row in rows:
+            columns.append(*row)
+        return columns
+
+
+def aggregate_competition(columns: GameColumns,
+                          use_numpy: Optional[bool] = None) -> Dict[str, Any]:
+    """
+    Calcula todas as métricas da competição em uma única varredura
+
+    Args:
+        columns: Jogos finalizados em formato colunar
+        use_numpy: Força (True) ou impede (False) a versão vetorizada;
+            por padrão usa NumPy quando disponível e o volume compensa
+
+    Returns:
+        Dicionário com totais, médias, vitórias/empates, extremos, quebras por
+        rodada, fase e local, vantagem de mando e totais por equipe
+    """
+    if use_numpy is None:
+        use_numpy = np is not None and len(columns) >= NUMPY_MIN_GAMES
+    if use_numpy and np is not None and len(columns):
+        return _aggregate_numpy(columns)
+    return _aggregate_python(columns)
+
+
+def _aggregate_python(columns: GameColumns) -> Dict[str, Any]:
+    n = len(columns)
+    total_goals = home_goals = home_wins = away_wins = 0
+    highest = margin = -1
+    highest_idx = margin_idx = -1
+
+    by_round: Dict[int, List[int]] = {}
+    by_phase = [[0, 0] for _ in columns.phases.labels]
+    by_venue = [[0, 0] for _ in columns.venues.labels]
+    # Por equipe: [jogos, vitórias, empates, derrotas, gols pró, gols contra]
+    teams: Dict[int, List[int]] = {}
+
+    home_ids, away_ids = columns.home_team_ids, columns.away_team_ids
+    home_scores, away_scores = columns.home_scores, columns.away_scores
+    rounds, phase_codes, venue_codes = columns.rounds, columns.phase_codes, columns.venue_codes
+
+    for i in range(n):
+        h = home_scores[i]
+        a = away_scores[i]
+        goals = h + a
+        total_goals += goals
+        home_goals += h
+
+        if goals > highest:
+            highest, highest_idx = goals, i
+        diff = h - a if h >= a else a - h
+        if diff > margin:
+            margin, margin_idx = diff, i
+
+        home = teams.get(home_ids[i])
+        if home is None:
+            home = teams[home_ids[i]] = [0, 0, 0, 0, 0, 0]
+        away = teams.get(away_ids[i])
+        if away is None:
+            away = teams[away_ids[i]] = [0, 0, 0, 0, 0, 0]
+
+        home[0] += 1
+        away[0] += 1
+        home[4] += h
+        home[5] += a
+        away[4] += a
+        away[5] += h
+        if h > a:
+            home_wins += 1
+            home[1] += 1
+            away[3] += 1
+        elif a > h:
+            away_wins += 1
+            away[1] += 1
+            home[3] += 1
+        else:
+            home[2] += 1
+            away[2] += 1
+
+        bucket = by_round.get(rounds[i])
+        if bucket is None:
+            bucket = by_round[rounds[i]] = [0, 0]
+        bucket[0] += 1
+        bucket[1] += goals
+
+        bucket = by_phase[phase_codes[i]]
+        bucket[0] += 1
+        bucket[1] += goals
+
+        bucket = by_venue[venue_codes[i]]
+        bucket[0] += 1
+        bucket[1] += goals
+
+    return _build_result(columns, n, total_goals, home_goals, home_wins, away_wins,
+                         highest_idx, margin_idx,
+                         {r: tuple(v) for r, v in by_round.items()},
+                         {columns.phases.labels[c]: tuple(v) for c, v in enumerate(by_phase) if v[0]},
+                         {columns.venues.labels[c]: tuple(v) for c, v in enumerate(by_venue) if v[0]},
+                         {t: tuple(v) for t, v in teams.items()})
+
+
+def _as_numpy(values: array):
+    """Visão NumPy sem cópia de um array de inteiros"""
+    return np.frombuffer(values, dtype=np.dtype(f'i{values.itemsize}'))
+
+
+def _aggregate_numpy(columns: GameColumns) -> Dict[str, Any]:
+    n = len(columns)
+    h = _as_numpy(columns.home_scores)
+    a = _as_numpy(columns.away_scores)
+    goals = h + a
+    diff = np.abs(h - a)
+
+    home_win = h > a
+    away_win = a > h
+    draw = ~(home_win | away_win)
+
+    def grouped(codes):
+        keys, inverse = np.unique(_as_numpy(codes), return_inverse=True)
+        counts = np.bincount(inverse)
+        sums = np.bincount(inverse, weights=goals)
+        return {int(k): (int(c), int(s)) for k, c, s in zip(keys, counts, sums)}
+
+    by_round = grouped(columns.rounds)
+    by_phase = {columns.phases.labels[c]: v for c, v in grouped(columns.phase_codes).items()}
+    by_venue = {columns.venues.labels[c]: v for c, v in grouped(columns.venue_codes).items()}
+
+    # Por equipe: mandantes e visitantes empilhados
+    team_ids = np.concatenate([_as_numpy(columns.home_team_ids), _as_numpy(columns.away_team_ids)])
+    keys, inverse = np.unique(team_ids, return_inverse=True)
+    wins = np.concatenate([home_win, away_win])
+    draws = np.concatenate([draw, draw])
+    losses = np.concatenate([away_win, home_win])
+    goals_for = np.concatenate([h, a])
+    goals_against = np.concatenate([a, h])
+    stacked = [np.bincount(inverse)] + [np.bincount(inverse, weights=w) for w in
+                                         (wins, draws, losses, goals_for, goals_against)]
+    teams = {int(t): tuple(int(col[i]) for col in stacked) for i, t in enumerate(keys)}
+
+    return _build_result(columns, n, int(goals.sum()), int(h.sum()), int(home_win.sum()),
+                         int(away_win.sum()), int(np.argmax(goals)), int(np.argmax(diff)),
+                         by_round, by_phase, by_venue, teams)
+
+
+def _game_summary(columns: GameColumns, i: int) -> Optional[Dict[str, Any]]:
+    if i < 0:
+        return None
+    h, a = columns.home_scores[i], columns.away_scores[i]
+    return {
+        "game_id": columns.game_ids[i],
+        "home_team_id": columns.home_team_ids[i],
+        "away_team_id": columns.away_team_ids[i],
+        "score": f"{h}-{a}",
+        "total_goals": h + a,
+        "margin": abs(h - a)
+    }
+
+
+def _breakdown(groups: Dict[Any, tuple]) -> Dict[Any, Dict[str, Any]]:
+    return {
+        key: {"games": games, "goals": goals, "average_goals": goals / games if games else 0}
+        for key, (games, goals) in groups.items()
+    }
+
+
+def _build_result(columns: GameColumns, n: int, total_goals: int, home_goals: int,
+                  home_wins: int, away_wins: int, highest_idx: int, margin_idx: int,
+                  by_round: Dict[int, tuple], by_phase: Dict[Any, tuple],
+                  by_venue: Dict[Any, tuple], teams: Dict[int, tuple]) -> Dict[str, Any]:
+    away_goals = total_goals - home_goals
+    draws = n - home_wins - away_wins
+
+    team_stats = {
+        team_id: dict(zip(("games_played", "wins", "draws", "losses", "goals_for", "goals_against"), values))
+        for team_id, values in teams.items()
+    }
+
+    # Empates resolvidos pelo menor id de equipe, igual nas duas implementações
+    team_ids = sorted(team_stats)
+    most_wins = max(team_ids, key=lambda t: (team_stats[t]["wins"], -t), default=None)
+    best_attack = max(team_ids, key=lambda t: (team_stats[t]["goals_for"], -t), default=None)
+    best_defense = min(team_ids, key=lambda t: (team_stats[t]["goals_against"], t), default=None)
+
+    return {
+        "games_finished": n,
+        "total_goals": total_goals,
+        "average_goals_per_game": total_goals / n if n else 0,
+        "home_goals": home_goals,
+        "away_goals": away_goals,
+        "wins": home_wins + away_wins,
+        "home_wins": home_wins,
+        "away_wins": away_wins,
+        "draws": draws,
+        "home_win_percentage": home_wins / n * 100 if n else 0,
+        "home_advantage": (home_goals - away_goals) / n if n else 0,
+        "highest_scoring_game": _game_summary(columns, highest_idx if n else -1),
+        "biggest_margin_game": _game_summary(columns, margin_idx if n else -1),
+        "by_round": dict(sorted(_breakdown(by_round).items())),
+        "by_phase": _breakdown(by_phase),
+        "by_venue": _breakdown(by_venue),
+        "teams": team_stats,
+        "most_wins_team_id": most_wins,
+        "best_attack_team_id": best_attack,
+        "best_defense_team_id": best_defense
+    }
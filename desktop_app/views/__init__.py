@@ -1,40 +1,42 @@
 """
 Módulo de views do desktop app
+
+As janelas e dialogs são importados no primeiro acesso ao nome; cada aba
+carrega apenas o que usa.
 """
+from importlib import import_module
+
+_EXPORTS = {
+    # Principais janelas
+    'MainWindow': '.main_window',
+    'LoginWindow': '.login_window',
+    'TeamsWindow': '.team_window',
+    'CompetitionsWindow': '.competition_window',
+    'GamesWindow': '.game_window',
+    'ReportsWindow': '.report_window',
+    'AdminWindow': '.admin_window',
+
+    # Dialogs
+    'TeamDialog': '.teamdialog',
+    'CompetitionDialog': '.competitiondialog',
+    'GameDialog': '.gamedialog',
+    'PlayerDialog': '.playerdialog',
+    'UserDialog': '.userdialog',
+    'GameResultDialog': '.gameresult_dialog',
+    'GameEventsDialog': '.gameevents_dialog',
+    'GameReportDialog': '.gamereport_dialog'
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
 
-# Importar as principais janelas
-from .main_window import MainWindow
-from .login_window import LoginWindow
-from .teams_window import TeamsWindow
-from .competitions_window import CompetitionsWindow
-from .games_window import GamesWindow
-from .reports_window import ReportsWindow
-from .admin_window import AdminWindow
-
-# Importar dialogs
-from .team_dialog import TeamDialog
-from .competition_dialog import CompetitionDialog
-from .game_dialog import GameDialog
-from .player_dialog import PlayerDialog
-from .user_dialog import UserDialog
-from .game_result_dialog import GameResultDialog
-from .game_events_dialog import GameEventsDialog
-from .game_report_dialog import GameReportDialog
-
-__all__ = [
-    'MainWindow',
-    'LoginWindow', 
-    'TeamsWindow',
-    'CompetitionsWindow',
-    'GamesWindow',
-    'ReportsWindow',
-    'AdminWindow',
-    'TeamDialog',
-    'CompetitionDialog',
-    'GameDialog',
-    'PlayerDialog',
-    'UserDialog',
-    'GameResultDialog',
-    'GameEventsDialog',
-    'GameReportDialog'
-]
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
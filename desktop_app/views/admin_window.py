@@ -8,6 +8,7 @@ from typing import Optional
 from desktop_app.controllers.admin_controller import admin_controller
 from desktop_app.controllers.auth_controller import auth_controller
 from database.models import UserType
+from .virtual_tree import VirtualTree
 
 
 class AdminWindow:
@@ -22,7 +23,7 @@ class AdminWindow:
             return
         
         # Widgets principais
-        self.users_tree: Optional[ttk.Treeview] = None
+        self.users_tree: Optional[VirtualTree] = None
         self.selected_user_id: Optional[int] = None
         
         # Frames
@@ -105,35 +106,19 @@ class AdminWindow:
         users_container = ttk.LabelFrame(parent, text="Usuários do Sistema", padding="10")
         users_container.pack(fill="both", expand=True, padx=10, pady=(0, 10))
         
-        # Treeview
+        # Lista virtual: só as linhas visíveis viram itens do Treeview
         columns = ("nome", "usuario", "email", "tipo", "status", "ultimo_acesso")
-        self.users_tree = ttk.Treeview(users_container, columns=columns, show="headings")
-        
-        # Cabeçalhos
-        self.users_tree.heading("nome", text="Nome Completo")
-        self.users_tree.heading("usuario", text="Usuário")
-        self.users_tree.heading("email", text="Email")
-        self.users_tree.heading("tipo", text="Tipo")
-        self.users_tree.heading("status", text="Status")
-        self.users_tree.heading("ultimo_acesso", text="Último Acesso")
-        
-        # Larguras
-        self.users_tree.column("nome", width=150)
-        self.users_tree.column("usuario", width=120)
-        self.users_tree.column("email", width=200)
-        self.users_tree.column("tipo", width=100)
-        self.users_tree.column("status", width=80)
-        self.users_tree.column("ultimo_acesso", width=120)
-        
+        self.users_tree = VirtualTree(
+            users_container, columns,
+            headings={"nome": "Nome Completo", "usuario": "Usuário", "email": "Email",
+                      "tipo": "Tipo", "status": "Status", "ultimo_acesso": "Último Acesso"},
+            widths={"nome": 150, "usuario": 120, "email": 200, "tipo": 100,
+                    "status": 80, "ultimo_acesso": 120}
+        )
         self.users_tree.pack(fill="both", expand=True)
         
-        # Scrollbars
-        users_scroll = ttk.Scrollbar(users_container, orient="vertical", command=self.users_tree.yview)
-        self.users_tree.configure(yscrollcommand=users_scroll.set)
-        users_scroll.pack(side="right", fill="y")
-        
         # Bind para seleção
-        self.users_tree.bind("<<TreeviewSelect>>", self.on_user_select)
+        self.users_tree.bind_select(self.on_user_select)
         
         # Carregar usuários
         self.refresh_users()
@@ -291,39 +276,32 @@ Espaço em Disco: {system_info.get('disk_space', 'N/A')}
     def refresh_users(self):
         """Atualiza lista de usuários"""
         try:
-            # Limpar árvore
-            for item in self.users_tree.get_children():
-                self.users_tree.delete(item)
-            
             # Buscar usuários
             users = admin_controller.get_all_users()
             
+            rows = []
             for user in users:
                 status = "Ativo" if user.is_active else "Inativo"
                 last_login = user.last_login.strftime('%d/%m/%Y %H:%M') if user.last_login else "Nunca"
                 
-                item_id = self.users_tree.insert('', 'end', values=(
+                rows.append((user.id, (
                     user.full_name,
                     user.username,
                     user.email,
                     user.user_type.value,
                     status,
                     last_login
-                ))
-                
-                # Salvar ID do usuário
-                self.users_tree.set(item_id, 'user_id', user.id)
+                )))
+            
+            # Atualiza por diferença, mantendo seleção e posição
+            self.users_tree.set_rows(rows)
                 
         except Exception as e:
             print(f"Erro ao carregar usuários: {e}")
     
     def on_user_select(self, event=None):
         """Chamado quando seleciona um usuário"""
-        selection = self.users_tree.selection()
-        if selection:
-            item = selection[0]
-            user_id = self.users_tree.set(item, 'user_id')
-            self.selected_user_id = int(user_id) if user_id else None
+        self.selected_user_id = self.users_tree.selected_key()
     
     def new_user(self):
         """Cria novo usuário"""
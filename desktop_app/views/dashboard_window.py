@@ -4,7 +4,7 @@ Janela do dashboard principal
 import tkinter as tk
 from tkinter import ttk
 from datetime import datetime, date, timedelta
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 
 from .base_window import BaseWindow
 from desktop_app.controllers.team_controller import team_controller
@@ -12,6 +12,7 @@ from desktop_app.controllers.competition_controller import competition_controlle
 from desktop_app.controllers.game_controller import game_controller
 from desktop_app.controllers.auth_controller import auth_controller
 from database.models import GameStatus, UserType
+from .task_runner import CancelToken, LoadingIndicator, TaskRunner
 
 
 class DashboardWindow:
@@ -19,12 +20,17 @@ class DashboardWindow:
     
     def __init__(self, parent_frame: ttk.Frame):
         self.parent = parent_frame
+        self.tasks = TaskRunner(parent_frame)
         
         # Widgets principais
         self.stats_frame: Optional[ttk.Frame] = None
         self.games_frame: Optional[ttk.Frame] = None
         self.standings_frame: Optional[ttk.Frame] = None
         self.recent_frame: Optional[ttk.Frame] = None
+        
+        # Dados do último carregamento, usados pela classificação
+        self._team_names: Dict[int, str] = {}
+        self._competition_ids: Dict[str, int] = {}
     
     def setup_dashboard(self):
         """Configura o dashboard"""
@@ -213,100 +219,120 @@ class DashboardWindow:
         recent_scroll.pack(side="right", fill="y")
     
     def refresh_data(self):
-        """Atualiza todos os dados do dashboard"""
-        try:
-            self.update_statistics()
-            self.update_games()
-            self.update_competitions()
-            self.update_recent_activities()
-        except Exception as e:
-            print(f"Erro ao atualizar dashboard: {e}")
+        """Atualiza todos os dados do dashboard (consulta em segundo plano)"""
+        self.tasks.submit('dashboard', self._load_dashboard, self._show_dashboard,
+                          on_error=lambda e: print(f"Erro ao atualizar dashboard: {e}"),
+                          indicator=LoadingIndicator(self.games_tree, self.recent_tree))
+    
+    def _load_dashboard(self, token: CancelToken) -> Dict[str, Any]:
+        """Busca todos os dados do dashboard de uma vez (thread de trabalho)"""
+        teams = {team.id: team for team in team_controller.get_all_teams()}
+        competitions = competition_controller.get_all_competitions()
+        token.raise_if_cancelled()
+        
+        data = {
+            'team_names': {team_id: team.name for team_id, team in teams.items()},
+            'competitions': [(f"{comp.name} ({comp.season})", comp.id) for comp in competitions]
+        }
+        data['statistics'] = self._load_statistics(teams, competitions)
+        token.raise_if_cancelled()
+        data['games'] = self._load_games(teams, competitions)
+        token.raise_if_cancelled()
+        data['activities'] = self._load_recent_activities(teams)
+        return data
+    
+    def _show_dashboard(self, data: Dict[str, Any]):
+        """Exibe os dados carregados (thread do Tk)"""
+        self._team_names = data['team_names']
+        self.update_statistics(data['statistics'])
+        self.update_games(data['games'])
+        self.update_competitions(data['competitions'])
+        self.update_recent_activities(data['activities'])
     
-    def update_statistics(self):
+    def _load_statistics(self, teams: Dict[int, Any], competitions: List[Any]) -> Dict[str, int]:
+        """Calcula estatísticas gerais"""
+        # Jogos hoje
+        today = date.today()
+        today_games = game_controller.get_games_by_date(today)
+        
+        # Jogos esta semana
+        week_start = today - timedelta(days=today.weekday())
+        week_end = week_start + timedelta(days=6)
+        week_games = game_controller.get_games(date_from=week_start, date_to=week_end)
+        
+        return {
+            'equipes_ativas': len([t for t in teams.values() if t.is_active]),
+            'competições': len(competitions),
+            'jogos_hoje': len(today_games),
+            'jogos_esta_semana': len(week_games)
+        }
+    
+    def update_statistics(self, statistics: Dict[str, int]):
         """Atualiza estatísticas gerais"""
         try:
-            # Contar equipes ativas
-            teams = team_controller.get_all_teams()
-            active_teams = len([t for t in teams if t.is_active])
-            
-            # Contar competições
-            competitions = competition_controller.get_all_competitions()
-            total_competitions = len(competitions)
-            
-            # Jogos hoje
-            today = date.today()
-            today_games = game_controller.get_games_by_date(today)
-            games_today = len(today_games)
-            
-            # Jogos esta semana
-            week_start = today - timedelta(days=today.weekday())
-            week_end = week_start + timedelta(days=6)
-            week_games = game_controller.get_games(date_from=week_start, date_to=week_end)
-            games_week = len(week_games)
-            
             # Atualizar labels
-            if hasattr(self, 'equipes_ativas_label'):
-                self.equipes_ativas_label.config(text=str(active_teams))
-            if hasattr(self, 'competições_label'):
-                self.competições_label.config(text=str(total_competitions))
-            if hasattr(self, 'jogos_hoje_label'):
-                self.jogos_hoje_label.config(text=str(games_today))
-            if hasattr(self, 'jogos_esta_semana_label'):
-                self.jogos_esta_semana_label.config(text=str(games_week))
+            for name, value in statistics.items():
+                if hasattr(self, f"{name}_label"):
+                    getattr(self, f"{name}_label").config(text=str(value))
                 
         except Exception as e:
             print(f"Erro ao atualizar estatísticas: {e}")
     
-    def update_games(self):
+    def _load_games(self, teams: Dict[int, Any], competitions: List[Any]) -> List[tuple]:
+        """Monta as linhas dos próximos jogos (próximos 7 dias)"""
+        today = date.today()
+        week_end = today + timedelta(days=7)
+        
+        games = game_controller.get_games(
+            date_from=today,
+            date_to=week_end,
+            status_filter=GameStatus.SCHEDULED
+        )
+        
+        # Ordenar por data e hora
+        games.sort(key=lambda g: (g.game_date, g.game_time or datetime.min.time()))
+        
+        competition_names = {comp.id: comp.name for comp in competitions}
+        rows = []
+        for game in games[:10]:  # Máximo 10 jogos
+            home_team = teams.get(game.home_team_id)
+            away_team = teams.get(game.away_team_id)
+            
+            rows.append((
+                game.game_date.strftime("%d/%m"),
+                game.game_time.strftime("%H:%M") if game.game_time else "",
+                home_team.name if home_team else "N/A",
+                away_team.name if away_team else "N/A",
+                competition_names.get(game.competition_id, "N/A")
+            ))
+        return rows
+    
+    def update_games(self, rows: List[tuple]):
         """Atualiza lista de próximos jogos"""
         try:
             # Limpar árvore
-            for item in self.games_tree.get_children():
-                self.games_tree.delete(item)
-            
-            # Buscar próximos jogos (próximos 7 dias)
-            today = date.today()
-            week_end = today + timedelta(days=7)
-            
-            games = game_controller.get_games(
-                date_from=today,
-                date_to=week_end,
-                status_filter=GameStatus.SCHEDULED
-            )
-            
-            # Ordenar por data e hora
-            games.sort(key=lambda g: (g.game_date, g.game_time or datetime.min.time()))
+            self.games_tree.delete(*self.games_tree.get_children())
             
             # Adicionar jogos na árvore
-            for game in games[:10]:  # Máximo 10 jogos
-                home_team = team_controller.get_team_by_id(game.home_team_id)
-                away_team = team_controller.get_team_by_id(game.away_team_id)
-                competition = competition_controller.get_competition_by_id(game.competition_id)
-                
-                self.games_tree.insert('', 'end', values=(
-                    game.game_date.strftime("%d/%m"),
-                    game.game_time.strftime("%H:%M") if game.game_time else "",
-                    home_team.name if home_team else "N/A",
-                    away_team.name if away_team else "N/A",
-                    competition.name if competition else "N/A"
-                ))
+            for values in rows:
+                self.games_tree.insert('', 'end', values=values)
                 
         except Exception as e:
             print(f"Erro ao atualizar jogos: {e}")
     
-    def update_competitions(self):
+    def update_competitions(self, competitions: List[tuple]):
         """Atualiza lista de competições"""
         try:
-            competitions = competition_controller.get_all_competitions()
+            self._competition_ids = dict(competitions)
             
             # Atualizar combobox
-            comp_names = [f"{comp.name} ({comp.season})" for comp in competitions]
+            comp_names = [label for label, _ in competitions]
             self.competition_combo['values'] = comp_names
             
             # Selecionar primeira competição se houver
             if comp_names and not self.competition_var.get():
                 self.competition_combo.current(0)
-                self.update_standings()
+            self.update_standings()
                 
         except Exception as e:
             print(f"Erro ao atualizar competições: {e}")
@@ -316,93 +342,92 @@ class DashboardWindow:
         self.update_standings()
     
     def update_standings(self):
-        """Atualiza classificação da competição selecionada"""
+        """Atualiza classificação da competição selecionada (consulta em segundo plano)"""
+        # Encontrar ID da competição selecionada
+        competition_id = self._competition_ids.get(self.competition_var.get())
+        if not competition_id:
+            self.tasks.cancel('standings')
+            self.standings_tree.delete(*self.standings_tree.get_children())
+            return
+        
+        team_names = self._team_names
+        self.tasks.submit('standings', lambda token: self._load_standings(competition_id, team_names),
+                          self._show_standings,
+                          on_error=lambda e: print(f"Erro ao atualizar classificação: {e}"),
+                          indicator=LoadingIndicator(self.standings_tree))
+    
+    @staticmethod
+    def _load_standings(competition_id: int, team_names: Dict[int, str]) -> List[tuple]:
+        """Busca a classificação e monta as linhas (thread de trabalho)"""
+        standings = competition_controller.get_standings(competition_id)
+        
+        return [(
+            i,  # Posição
+            team_names.get(standing.team_id, "N/A"),
+            standing.games_played,
+            standing.wins,
+            standing.draws,
+            standing.losses,
+            standing.goals_for,
+            standing.goals_against,
+            standing.goal_difference,
+            standing.points
+        ) for i, standing in enumerate(standings, 1)]
+    
+    def _show_standings(self, rows: List[tuple]):
+        """Preenche a árvore de classificação (thread do Tk)"""
         try:
-            # Limpar árvore
-            for item in self.standings_tree.get_children():
-                self.standings_tree.delete(item)
-            
-            # Obter competição selecionada
-            selected = self.competition_var.get()
-            if not selected:
-                return
-            
-            # Encontrar ID da competição
-            competitions = competition_controller.get_all_competitions()
-            competition_id = None
-            
-            for comp in competitions:
-                if f"{comp.name} ({comp.season})" == selected:
-                    competition_id = comp.id
-                    break
-            
-            if not competition_id:
-                return
-            
-            # Buscar classificação
-            standings = competition_controller.get_standings(competition_id)
-            
-            # Adicionar na árvore
-            for i, standing in enumerate(standings, 1):
-                team = team_controller.get_team_by_id(standing.team_id)
-                
-                self.standings_tree.insert('', 'end', values=(
-                    i,  # Posição
-                    team.name if team else "N/A",
-                    standing.games_played,
-                    standing.wins,
-                    standing.draws,
-                    standing.losses,
-                    standing.goals_for,
-                    standing.goals_against,
-                    standing.goal_difference,
-                    standing.points
-                ))
+            self.standings_tree.delete(*self.standings_tree.get_children())
+            for values in rows:
+                self.standings_tree.insert('', 'end', values=values)
                 
         except Exception as e:
             print(f"Erro ao atualizar classificação: {e}")
     
-    def update_recent_activities(self):
+    def _load_recent_activities(self, teams: Dict[int, Any]) -> List[tuple]:
+        """Monta as linhas das atividades recentes"""
+        activities = []
+        
+        # Jogos recentes finalizados
+        recent_games = game_controller.get_recent_games(limit=5)
+        for game in recent_games:
+            if game.status == GameStatus.FINISHED:
+                home_team = teams.get(game.home_team_id)
+                away_team = teams.get(game.away_team_id)
+                
+                activities.append({
+                    'datetime': game.actual_end_time or game.updated_at,
+                    'type': 'Jogo Finalizado',
+                    'description': f"{home_team.name if home_team else 'N/A'} {game.home_score} x {game.away_score} {away_team.name if away_team else 'N/A'}"
+                })
+        
+        # Equipes criadas recentemente
+        recent_teams = team_controller.get_recent_teams(limit=3)
+        for team in recent_teams:
+            activities.append({
+                'datetime': team.created_at,
+                'type': 'Nova Equipe',
+                'description': f"Equipe '{team.name}' foi cadastrada"
+            })
+        
+        # Ordenar por data
+        activities.sort(key=lambda x: x['datetime'], reverse=True)
+        
+        return [(
+            activity['datetime'].strftime("%d/%m %H:%M"),
+            activity['type'],
+            activity['description']
+        ) for activity in activities[:10]]  # Máximo 10 atividades
+    
+    def update_recent_activities(self, rows: List[tuple]):
         """Atualiza atividades recentes"""
         try:
             # Limpar árvore
-            for item in self.recent_tree.get_children():
-                self.recent_tree.delete(item)
-            
-            activities = []
-            
-            # Jogos recentes finalizados
-            recent_games = game_controller.get_recent_games(limit=5)
-            for game in recent_games:
-                if game.status == GameStatus.FINISHED:
-                    home_team = team_controller.get_team_by_id(game.home_team_id)
-                    away_team = team_controller.get_team_by_id(game.away_team_id)
-                    
-                    activities.append({
-                        'datetime': game.actual_end_time or game.updated_at,
-                        'type': 'Jogo Finalizado',
-                        'description': f"{home_team.name if home_team else 'N/A'} {game.home_score} x {game.away_score} {away_team.name if away_team else 'N/A'}"
-                    })
-            
-            # Equipes criadas recentemente
-            recent_teams = team_controller.get_recent_teams(limit=3)
-            for team in recent_teams:
-                activities.append({
-                    'datetime': team.created_at,
-                    'type': 'Nova Equipe',
-                    'description': f"Equipe '{team.name}' foi cadastrada"
-                })
-            
-            # Ordenar por data
-            activities.sort(key=lambda x: x['datetime'], reverse=True)
+            self.recent_tree.delete(*self.recent_tree.get_children())
             
             # Adicionar na árvore
-            for activity in activities[:10]:  # Máximo 10 atividades
-                self.recent_tree.insert('', 'end', values=(
-                    activity['datetime'].strftime("%d/%m %H:%M"),
-                    activity['type'],
-                    activity['description']
-                ))
+            for values in rows:
+                self.recent_tree.insert('', 'end', values=values)
                 
         except Exception as e:
             print(f"Erro ao atualizar atividades recentes: {e}")
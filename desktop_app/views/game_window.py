@@ -10,6 +10,11 @@ from desktop_app.controllers.game_controller import game_controller
 from desktop_app.controllers.competition_controller import competition_controller
 from desktop_app.controllers.auth_controller import auth_controller
 from database.models import UserType, GameStatus
+from desktop_app.utils.search_index import search_index
+from .task_runner import CancelToken, Debouncer, LoadingIndicator, TaskRunner
+from .virtual_tree import VirtualTree
+
+SEARCH_DEBOUNCE_MS = 150
 
 
 class GamesWindow:
@@ -17,11 +22,15 @@ class GamesWindow:
     
     def __init__(self, parent_frame: ttk.Frame):
         self.parent = parent_frame
+        self.tasks = TaskRunner(parent_frame)
+        self.search_debouncer = Debouncer(parent_frame, SEARCH_DEBOUNCE_MS, self.apply_search)
+        search_index.ensure_built()
         
         # Widgets principais
         self.competition_filter_var: Optional[tk.StringVar] = None
         self.status_filter_var: Optional[tk.StringVar] = None
-        self.games_tree: Optional[ttk.Treeview] = None
+        self.search_var: Optional[tk.StringVar] = None
+        self.games_tree: Optional[VirtualTree] = None
         self.selected_game_id: Optional[int] = None
         
         # Frames de detalhes
@@ -85,9 +94,18 @@ class GamesWindow:
         status_combo = ttk.Combobox(filters_frame, textvariable=self.status_filter_var,
                                   values=["TODOS", "AGENDADO", "EM_ANDAMENTO", "FINALIZADO", "CANCELADO"],
                                   state="readonly", width=15)
-        status_combo.pack(side="left")
+        status_combo.pack(side="left", padx=(0, 15))
         status_combo.bind("<<ComboboxSelected>>", self.on_filter_change)
         
+        # Busca por equipe ou competição
+        ttk.Label(filters_frame, text="Buscar:").pack(side="left", padx=(0, 5))
+        
+        self.search_var = tk.StringVar()
+        search_entry = ttk.Entry(filters_frame, textvariable=self.search_var, width=20)
+        search_entry.pack(side="left")
+        search_entry.bind("<KeyRelease>", lambda e: self.search_debouncer.call())
+        search_entry.bind("<Return>", lambda e: self.search_debouncer.flush())
+        
         # Botões
         button_frame = ttk.Frame(toolbar_frame)
         button_frame.pack(side="right")
@@ -111,43 +129,26 @@ class GamesWindow:
         list_frame = ttk.LabelFrame(parent, text="Jogos", padding="10")
         list_frame.pack(fill="both", expand=True)
         
-        # Treeview
+        # Lista virtual: só as linhas visíveis viram itens do Treeview
         columns = ("data", "hora", "competicao", "equipe_casa", "equipe_visitante", 
                   "resultado", "status")
-        self.games_tree = ttk.Treeview(list_frame, columns=columns, show="headings")
-        
-        # Cabeçalhos
-        self.games_tree.heading("data", text="Data")
-        self.games_tree.heading("hora", text="Hora")
-        self.games_tree.heading("competicao", text="Competição")
-        self.games_tree.heading("equipe_casa", text="Casa")
-        self.games_tree.heading("equipe_visitante", text="Visitante")
-        self.games_tree.heading("resultado", text="Resultado")
-        self.games_tree.heading("status", text="Status")
-        
-        # Larguras
-        self.games_tree.column("data", width=80)
-        self.games_tree.column("hora", width=60)
-        self.games_tree.column("competicao", width=150)
-        self.games_tree.column("equipe_casa", width=120)
-        self.games_tree.column("equipe_visitante", width=120)
-        self.games_tree.column("resultado", width=80)
-        self.games_tree.column("status", width=100)
-        
+        self.games_tree = VirtualTree(
+            list_frame, columns,
+            headings={"data": "Data", "hora": "Hora", "competicao": "Competição",
+                      "equipe_casa": "Casa", "equipe_visitante": "Visitante",
+                      "resultado": "Resultado", "status": "Status"},
+            widths={"data": 80, "hora": 60, "competicao": 150, "equipe_casa": 120,
+                    "equipe_visitante": 120, "resultado": 80, "status": 100}
+        )
         self.games_tree.pack(fill="both", expand=True)
         
-        # Scrollbars
-        v_scroll = ttk.Scrollbar(list_frame, orient="vertical", command=self.games_tree.yview)
-        self.games_tree.configure(yscrollcommand=v_scroll.set)
-        v_scroll.pack(side="right", fill="y")
-        
-        h_scroll = ttk.Scrollbar(list_frame, orient="horizontal", command=self.games_tree.xview)
-        self.games_tree.configure(xscrollcommand=h_scroll.set)
+        h_scroll = ttk.Scrollbar(list_frame, orient="horizontal", command=self.games_tree.tree.xview)
+        self.games_tree.tree.configure(xscrollcommand=h_scroll.set)
         h_scroll.pack(side="bottom", fill="x")
         
         # Bind para seleção
-        self.games_tree.bind("<<TreeviewSelect>>", self.on_game_select)
-        self.games_tree.bind("<Double-1>", self.on_game_double_click)
+        self.games_tree.bind_select(self.on_game_select)
+        self.games_tree.tree.bind("<Double-1>", self.on_game_double_click)
     
     def setup_game_details(self, parent: ttk.Frame):
         """Configura painel de detalhes do jogo"""
@@ -205,81 +206,87 @@ class GamesWindow:
     
     def load_competitions_filter(self):
         """Carrega competições para o filtro"""
-        try:
-            competitions = competition_controller.get_all_competitions()
-            comp_names = ["TODAS"] + [comp.name for comp in competitions]
-            self.competition_combo.config(values=comp_names)
-        except Exception as e:
-            print(f"Erro ao carregar competições: {e}")
+        self.tasks.submit(
+            'competitions',
+            lambda token: ["TODAS"] + [comp.name for comp in competition_controller.get_all_competitions()],
+            lambda comp_names: self.competition_combo.config(values=comp_names),
+            on_error=lambda e: print(f"Erro ao carregar competições: {e}")
+        )
     
     def refresh_games(self):
-        """Atualiza lista de jogos"""
-        try:
-            # Limpar árvore
-            for item in self.games_tree.get_children():
-                self.games_tree.delete(item)
-            
-            # Buscar jogos
-            games = game_controller.get_all_games()
+        """Atualiza lista de jogos (consulta em segundo plano)"""
+        self.tasks.submit('games', self._load_games, self._show_games,
+                          on_error=lambda e: print(f"Erro ao carregar jogos: {e}"),
+                          indicator=LoadingIndicator(self.games_tree))
+    
+    def _load_games(self, token: CancelToken) -> list:
+        """Busca jogos, equipes e competições de uma vez e monta as linhas (thread de trabalho)"""
+        from desktop_app.controllers.team_controller import team_controller
+        
+        games = game_controller.get_all_games()
+        token.raise_if_cancelled()
+        competitions = {comp.id: comp for comp in competition_controller.get_all_competitions()}
+        token.raise_if_cancelled()
+        teams = {team.id: team for team in team_controller.get_all_teams()}
+        
+        rows = []
+        for game in games:
+            competition = competitions.get(game.competition_id)
+            home_team = teams.get(game.home_team_id)
+            away_team = teams.get(game.away_team_id)
             
-            # Aplicar filtros
-            comp_filter = self.competition_filter_var.get() if self.competition_filter_var else "TODAS"
-            status_filter = self.status_filter_var.get() if self.status_filter_var else "TODOS"
+            # Formatar resultado
+            if game.home_score is not None and game.away_score is not None:
+                result = f"{game.home_score} x {game.away_score}"
+            else:
+                result = "- x -"
             
-            for game in games:
-                # Filtro de competição
-                if comp_filter != "TODAS":
-                    competition = competition_controller.get_competition_by_id(game.competition_id)
-                    if not competition or competition.name != comp_filter:
-                        continue
-                
-                # Filtro de status
-                if status_filter != "TODOS" and game.status.value != status_filter:
-                    continue
-                
-                # Obter dados para exibição
-                from desktop_app.controllers.team_controller import team_controller
-                
-                home_team = team_controller.get_team_by_id(game.home_team_id)
-                away_team = team_controller.get_team_by_id(game.away_team_id)
-                competition = competition_controller.get_competition_by_id(game.competition_id)
-                
-                # Formatrar resultado
-                if game.home_score is not None and game.away_score is not None:
-                    result = f"{game.home_score} x {game.away_score}"
-                else:
-                    result = "- x -"
-                
-                item_id = self.games_tree.insert('', 'end', values=(
-                    game.game_date.strftime('%d/%m/%Y'),
-                    game.game_time.strftime('%H:%M') if game.game_time else "",
-                    competition.name if competition else "N/A",
-                    home_team.name if home_team else "N/A",
-                    away_team.name if away_team else "N/A",
-                    result,
-                    game.status.value
-                ))
-                
-                # Salvar ID do jogo
-                self.games_tree.set(item_id, 'game_id', game.id)
-                
+            rows.append((game.id, (
+                game.game_date.strftime('%d/%m/%Y'),
+                game.game_time.strftime('%H:%M') if game.game_time else "",
+                competition.name if competition else "N/A",
+                home_team.name if home_team else "N/A",
+                away_team.name if away_team else "N/A",
+                result,
+                game.status.value
+            )))
+        return rows
+    
+    def _show_games(self, rows: list):
+        """Atualiza a lista de jogos por diferença (thread do Tk)"""
+        try:
+            self.games_tree.set_rows(rows)
         except Exception as e:
             print(f"Erro ao carregar jogos: {e}")
     
     def on_filter_change(self, event=None):
-        """Chamado quando muda filtros"""
-        self.refresh_games()
+        """Chamado quando muda filtros; filtra as linhas já carregadas"""
+        comp_filter = self.competition_filter_var.get()
+        status_filter = self.status_filter_var.get()
+        
+        def matches(values) -> bool:
+            # values: (data, hora, competição, casa, visitante, resultado, status)
+            if comp_filter != "TODAS" and values[2] != comp_filter:
+                return False
+            return status_filter == "TODOS" or values[6] == status_filter
+        
+        self.games_tree.set_filter(None if comp_filter == "TODAS" and status_filter == "TODOS" else matches)
+    
+    def apply_search(self):
+        """Mantém só os jogos cujas equipes ou competição correspondem à busca"""
+        search_term = self.search_var.get().strip()
+        if search_term and search_index.ready.is_set():
+            self.games_tree.set_keys(search_index.match_game_ids(search_term))
+        else:
+            self.games_tree.set_keys(None)
     
     def on_game_select(self, event=None):
         """Chamado quando seleciona um jogo"""
-        selection = self.games_tree.selection()
-        if not selection:
+        game_id = self.games_tree.selected_key()
+        if game_id is None:
             self.clear_game_details()
             return
         
-        item = selection[0]
-        game_id = self.games_tree.set(item, 'game_id')
-        
         if game_id:
             self.selected_game_id = int(game_id)
             self.load_game_details(self.selected_game_id)
@@ -290,18 +297,31 @@ class GamesWindow:
             self.edit_game()
     
     def load_game_details(self, game_id: int):
-        """Carrega detalhes do jogo selecionado"""
+        """Carrega detalhes do jogo selecionado (consulta em segundo plano)"""
+        self.tasks.submit('game_details', lambda token: self._load_game_details(game_id),
+                          self._show_game_details,
+                          on_error=lambda e: print(f"Erro ao carregar detalhes do jogo: {e}"))
+    
+    def _load_game_details(self, game_id: int):
+        """Busca o jogo e os dados relacionados (thread de trabalho)"""
+        game = game_controller.get_game_by_id(game_id)
+        if not game:
+            return None
+        
+        from desktop_app.controllers.team_controller import team_controller
+        
+        return (game,
+                team_controller.get_team_by_id(game.home_team_id),
+                team_controller.get_team_by_id(game.away_team_id),
+                competition_controller.get_competition_by_id(game.competition_id))
+    
+    def _show_game_details(self, details):
+        """Exibe os detalhes do jogo (thread do Tk)"""
+        if details is None:
+            return
+        
         try:
-            game = game_controller.get_game_by_id(game_id)
-            if not game:
-                return
-            
-            from desktop_app.controllers.team_controller import team_controller
-            
-            # Obter dados relacionados
-            home_team = team_controller.get_team_by_id(game.home_team_id)
-            away_team = team_controller.get_team_by_id(game.away_team_id)
-            competition = competition_controller.get_competition_by_id(game.competition_id)
+            game, home_team, away_team, competition = details
             
             # Atualizar informações básicas
             self.game_competition_label.config(text=f"Competição: {competition.name if competition else 'N/A'}")
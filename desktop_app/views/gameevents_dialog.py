@@ -6,8 +6,8 @@ from tkinter import ttk, messagebox
 from typing import Optional
 
 from desktop_app.controllers.game_event_controller import game_event_controller
-from desktop_app.controllers.game_controller import game_controller
-from desktop_app.controllers.player_controller import player_controller
+from desktop_app.controllers.team_controller import team_controller
+from .virtual_tree import VirtualTree
 
 
 class GameEventsDialog:
@@ -21,6 +21,7 @@ class GameEventsDialog:
         # Variáveis e dados
         self.event_list = []
         self.selected_event = None
+        self._athlete_names = {}  # cache de nomes por atleta
         
         # Criar janela
         self.create_dialog()
@@ -66,17 +67,12 @@ class GameEventsDialog:
         list_frame = ttk.Frame(parent)
         list_frame.pack(fill="both", expand=True, pady=(0, 10))
         
-        self.events_tree = ttk.Treeview(list_frame, columns=("minuto", "tipo", "jogador"), show="headings")
-        self.events_tree.heading("minuto", text="Minuto")
-        self.events_tree.heading("tipo", text="Tipo de Evento")
-        self.events_tree.heading("jogador", text="Jogador")
-        
+        self.events_tree = VirtualTree(
+            list_frame, ("minuto", "tipo", "jogador"),
+            headings={"minuto": "Minuto", "tipo": "Tipo de Evento", "jogador": "Jogador"}
+        )
         self.events_tree.pack(fill="both", expand=True, side="left")
         
-        list_scroll = ttk.Scrollbar(list_frame, orient="vertical", command=self.events_tree.yview)
-        self.events_tree.configure(yscrollcommand=list_scroll.set)
-        list_scroll.pack(side="right", fill="y")
-        
         # Botões de adição e remoção
         add_button = ttk.Button(parent, text="Adicionar Evento", command=self.add_event)
         add_button.pack(side="left", padx=(0, 5))
@@ -103,20 +99,27 @@ class GameEventsDialog:
             messagebox.showerror("Erro", f"Erro ao carregar eventos do jogo: {str(e)}")
     
     def populate_tree(self):
-        """Popula a treeview com eventos"""
-        for event in self.events_tree.get_children():
-            self.events_tree.delete(event)
-        
-        for event in self.event_list:
-            player = player_controller.get_player_by_id(event.player_id)
-            player_name = player.name if player else "Desconhecido"
-            
+        """Popula a lista com eventos (chave = posição em event_list)"""
+        rows = []
+        for index, event in enumerate(self.event_list):
+            event_type = getattr(event.event_type, 'value', event.event_type)
             event_data = (
-                event.minute,
-                event.event_type,
-                player_name
+                event.minute_occurred if event.minute_occurred is not None else "",
+                event_type,
+                self._athlete_name(event.athlete_id)
             )
-            self.events_tree.insert('', 'end', values=event_data)
+            rows.append((index, event_data))
+        
+        self.events_tree.set_rows(rows)
+    
+    def _athlete_name(self, athlete_id: Optional[int]) -> str:
+        """Nome do atleta do evento (consultado uma vez por atleta)"""
+        if athlete_id is None:
+            return "-"
+        if athlete_id not in self._athlete_names:
+            athlete = team_controller.get_athlete_by_id(athlete_id)
+            self._athlete_names[athlete_id] = athlete.name if athlete else "Desconhecido"
+        return self._athlete_names[athlete_id]
     
     def add_event(self):
         """Adiciona novo evento"""
@@ -130,10 +133,10 @@ class GameEventsDialog:
     
     def remove_selected_event(self):
         """Remove o evento selecionado"""
-        selected_item = self.events_tree.selection()
-        if selected_item:
-            event_idx = self.events_tree.index(selected_item)
+        event_idx = self.events_tree.selected_key()
+        if event_idx is not None:
             self.event_list.pop(event_idx)
+            self.events_tree.clear_selection()
             self.populate_tree()
     
     def save_events(self):
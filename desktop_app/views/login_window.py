@@ -93,10 +93,19 @@ class LoginWindow(BaseWindow):
         # Desabilitar botão durante login
         self.login_button.config(state="disabled", text="Entrando...")
         self.status_label.config(text="")
-        self.window.update()
+        
+        # O bcrypt roda fora da thread do Tk; o resultado é consultado com after
+        future = auth_controller.login_async(username, password)
+        self.window.after(50, self._check_login, future)
+    
+    def _check_login(self, future):
+        """Consulta o resultado do login sem bloquear a interface"""
+        if not future.done():
+            self.window.after(50, self._check_login, future)
+            return
         
         try:
-            success, message = auth_controller.login(username, password)
+            success, message = future.result()
             
             if success:
                 # Salvar preferência de lembrar
@@ -109,14 +118,14 @@ class LoginWindow(BaseWindow):
                     self.on_success_callback()
                 
                 self.close()
+                return
             else:
                 self.status_label.config(text=message)
                 
         except Exception as e:
             self.status_label.config(text=f"Erro no login: {str(e)}")
         
-        finally:
-            self.login_button.config(state="normal", text="Entrar")
+        self.login_button.config(state="normal", text="Entrar")
     
     def show_register(self):
         """Exibe janela de registro"""
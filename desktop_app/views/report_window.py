@@ -8,8 +8,12 @@ import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
 from desktop_app.controllers.reports_controller import reports_controller
+from desktop_app.controllers.report_controller import report_controller
 from desktop_app.controllers.competition_controller import competition_controller
 from desktop_app.controllers.team_controller import team_controller
+from desktop_app.utils.pdf_renderer import TextSection
+from database.leaderboards import leaderboard_service
+from database.models import SportType
 
 
 class ReportsWindow:
@@ -363,8 +367,35 @@ class ReportsWindow:
     
     def generate_players_stats_report(self, competition_id: Optional[int], team_id: Optional[int]):
         """Gera relatório de estatísticas dos jogadores"""
-        # Implementação simplificada
-        self.show_message("Relatório de jogadores em desenvolvimento")
+        try:
+            stat = self.get_scoring_stat(competition_id)
+            players = leaderboard_service.get_ranking(competition_id, stat, team_id)
+            
+            if not players:
+                self.show_message("Nenhuma estatística de jogador encontrada")
+                return
+            
+            self.show_message(f"{len(players)} jogador(es) com estatísticas registradas")
+            
+            self.report_text.config(state="normal")
+            self.report_text.delete(1.0, tk.END)
+            
+            lines = ["ESTATÍSTICAS DOS JOGADORES", "=" * 50, "",
+                     f"{'Pos':<4} {'Atleta':<24} {'Equipe':<18} {'J':<3} {'Gols':<5} {'Pts':<5} "
+                     f"{'3PT':<4} {'CA':<3} {'CV':<3} {'Flt':<4}",
+                     "-" * 80]
+            for player in players:
+                lines.append(
+                    f"{player['position']:<4} {player['athlete_name'][:24]:<24} {player['team_name'][:18]:<18} "
+                    f"{player['games_played']:<3} {player['goals_scored']:<5} {player['points_scored']:<5} "
+                    f"{player['points_3']:<4} {player['yellow_cards']:<3} {player['red_cards']:<3} {player['fouls']:<4}"
+                )
+            
+            self.report_text.insert(1.0, "\n".join(lines) + "\n")
+            self.report_text.config(state="disabled")
+            
+        except Exception as e:
+            print(f"Erro ao gerar relatório de jogadores: {e}")
     
     def generate_games_analysis_report(self, competition_id: Optional[int]):
         """Gera relatório de análise de jogos"""
@@ -418,8 +449,60 @@ class ReportsWindow:
     
     def generate_top_scorers_report(self, competition_id: Optional[int]):
         """Gera relatório de artilharia"""
-        # Implementação simplificada
-        self.show_message("Relatório de artilharia em desenvolvimento")
+        try:
+            stat = self.get_scoring_stat(competition_id)
+            if competition_id:
+                scorers = leaderboard_service.top_competition(competition_id, stat, k=10)
+            else:
+                scorers = leaderboard_service.top_overall(stat, k=10)
+            
+            if not scorers:
+                self.show_message("Nenhum dado de artilharia encontrado")
+                return
+            
+            # Gerar gráfico
+            self.clear_charts()
+            
+            fig, ax = plt.subplots(figsize=(12, 8))
+            
+            names = [s['athlete_name'] for s in scorers]
+            values = [s['value'] for s in scorers]
+            
+            ax.barh(names[::-1], values[::-1], color='steelblue')
+            ax.set_title('Artilharia' if stat == 'goals' else 'Cestinhas')
+            ax.set_xlabel('Gols' if stat == 'goals' else 'Pontos')
+            
+            plt.tight_layout()
+            
+            canvas = FigureCanvasTkAgg(fig, self.canvas_frame)
+            canvas.draw()
+            canvas.get_tk_widget().pack(fill="both", expand=True)
+            
+            # Gerar relatório textual
+            self.report_text.config(state="normal")
+            self.report_text.delete(1.0, tk.END)
+            
+            label = 'Gols' if stat == 'goals' else 'Pontos'
+            lines = ["ARTILHARIA", "=" * 50, "",
+                     f"{'Pos':<4} {'Atleta':<26} {'Equipe':<20} {'J':<3} {label:<6}",
+                     "-" * 60]
+            for scorer in scorers:
+                lines.append(f"{scorer['position']:<4} {scorer['athlete_name'][:26]:<26} "
+                             f"{scorer['team_name'][:20]:<20} {scorer['games_played']:<3} {scorer['value']:<6}")
+            
+            self.report_text.insert(1.0, "\n".join(lines) + "\n")
+            self.report_text.config(state="disabled")
+            
+        except Exception as e:
+            print(f"Erro ao gerar relatório de artilharia: {e}")
+    
+    def get_scoring_stat(self, competition_id: Optional[int]) -> str:
+        """Estatística de pontuação da modalidade (gols ou pontos)"""
+        if competition_id:
+            competition = competition_controller.get_competition_by_id(competition_id)
+            if competition and competition.sport in (SportType.FUTSAL, SportType.HANDBALL):
+                return 'goals'
+        return 'points'
     
     def generate_text_report(self, data, title: str):
         """Gera relatório textual"""
@@ -507,8 +590,49 @@ class ReportsWindow:
     
     def export_pdf(self):
         """Exporta relatório para PDF"""
-        from tkinter import messagebox
-        messagebox.showinfo("Info", "Exportação para PDF em desenvolvimento")
+        from tkinter import messagebox, filedialog
+        
+        report_type = self.report_type_var.get()
+        title = self.report_type_map.get(report_type, "Relatório")
+        
+        filename = filedialog.asksaveasfilename(
+            title="Exportar PDF",
+            defaultextension=".pdf",
+            initialfile=f"{report_type}.pdf",
+            filetypes=[("PDF", "*.pdf")]
+        )
+        if not filename:
+            return
+        
+        try:
+            competition_id = self.get_selected_competition_id()
+            
+            if report_type == "classificacoes" and competition_id:
+                # Classificação e programação são lidas direto do banco, seção a seção
+                success, message = report_controller.export_competition_pdf(competition_id, filename)
+            else:
+                text = self.report_text.get("1.0", "end-1c")
+                sections = [title, TextSection(title, iter(text.splitlines()))]
+                success, message = report_controller.export_pdf(title, sections, filename)
+            
+            if success:
+                messagebox.showinfo("Sucesso", message)
+            else:
+                messagebox.showerror("Erro", message)
+                
+        except Exception as e:
+            messagebox.showerror("Erro", f"Erro ao exportar PDF: {str(e)}")
+    
+    def get_selected_competition_id(self) -> Optional[int]:
+        """Retorna o ID da competição selecionada no filtro"""
+        competition = self.competition_var.get()
+        if competition == "TODAS":
+            return None
+        
+        for comp in competition_controller.get_all_competitions():
+            if comp.name == competition:
+                return comp.id
+        return None
     
     def export_excel(self):
         """Exporta relatório para Excel"""
@@ -0,0 +1,234 @@
+"""
+Carregamento de dados em segundo plano para as views Tk
+
+O Tk só pode ser manipulado pela thread principal. O TaskRunner executa os
+carregadores (consultas ao banco) em threads de trabalho e entrega o
+resultado à thread do Tk por uma fila consultada com after(), de modo que
+o loop de eventos nunca espera por I/O.
+
+Cada tarefa tem uma chave: uma nova tarefa com a mesma chave (ex.: o
+usuário trocou o filtro antes de a lista carregar) cancela a anterior,
+cujo resultado é descartado mesmo que já tenha chegado.
+
+    self.tasks = TaskRunner(self.parent)
+    self.tasks.submit('games', self._load_games, self._show_games,
+                      indicator=LoadingIndicator(self.games_tree))
+
+O carregador recebe um CancelToken e deve retornar dados prontos para
+exibir; consultas longas podem chamar token.raise_if_cancelled() entre as
+etapas.
+"""
+import queue
+import threading
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import ttk
+from typing import Any, Callable, Dict, List, Optional
+
+LOADER_MAX_WORKERS = 4
+POLL_INTERVAL_MS = 30
+
+
+class TaskCancelled(Exception):
+    """Lançada pelo carregador quando a tarefa foi substituída ou cancelada"""
+
+
+class CancelToken:
+    """Sinalizador de cancelamento compartilhado com o carregador"""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self):
+        self._event.set()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise TaskCancelled()
+
+
+class LoadingIndicator:
+    """Rótulo "Carregando..." sobreposto ao centro de um ou mais widgets"""
+
+    def __init__(self, *widgets: tk.Widget, text: str = "Carregando..."):
+        self.widgets = widgets
+        self.text = text
+        self._labels: List[ttk.Label] = []
+
+    def show(self):
+        if not self._labels:
+            self._labels = [ttk.Label(widget.master, text=self.text, padding=8)
+                            for widget in self.widgets]
+        for widget, label in zip(self.widgets, self._labels):
+            label.place(in_=widget, relx=0.5, rely=0.5, anchor="center")
+            label.lift()
+
+    def hide(self):
+        for label in self._labels:
+            try:
+                label.destroy()
+            except tk.TclError:
+                pass
+        self._labels = []
+
+
+class _Task:
+    def __init__(self, key: str, on_success: Callable[[Any], None],
+                 on_error: Optional[Callable[[Exception], None]],
+                 indicator: Optional[LoadingIndicator]):
+        self.key = key
+        self.token = CancelToken()
+        self.on_success = on_success
+        self.on_error = on_error
+        self.indicator = indicator
+
+
+class TaskRunner:
+    """Executa carregadores fora da thread do Tk, uma tarefa ativa por chave"""
+
+    def __init__(self, widget: tk.Widget, executor: Optional[ThreadPoolExecutor] = None,
+                 poll_interval_ms: int = POLL_INTERVAL_MS):
+        self.widget = widget
+        self.executor = executor or loader_executor
+        self.poll_interval_ms = poll_interval_ms
+        self._active: Dict[str, _Task] = {}
+        self._results: "queue.Queue" = queue.Queue()
+        self._polling = False
+
+    def submit(self, key: str, loader: Callable[[CancelToken], Any],
+               on_success: Callable[[Any], None],
+               on_error: Optional[Callable[[Exception], None]] = None,
+               indicator: Optional[LoadingIndicator] = None) -> CancelToken:
+        """
+        Agenda um carregamento (chamar apenas da thread do Tk)
+
+        Args:
+            key: Identifica o carregamento; substitui a tarefa pendente de mesma chave
+            loader: Função executada na thread de trabalho; recebe o CancelToken
+            on_success: Recebe o resultado, na thread do Tk
+            on_error: Recebe a exceção, na thread do Tk (padrão: imprime o erro)
+            indicator: Exibido enquanto a tarefa está pendente
+
+        Returns:
+            Token da nova tarefa
+        """
+        self.cancel(key)
+        task = _Task(key, on_success, on_error, indicator)
+        self._active[key] = task
+        if indicator is not None:
+            indicator.show()
+
+        def run():
+            if task.token.cancelled:
+                return
+            try:
+                result, error = loader(task.token), None
+            except TaskCancelled:
+                return
+            except Exception as e:
+                result, error = None, e
+            self._results.put((task, result, error))
+
+        self.executor.submit(run)
+        self._schedule_poll()
+        return task.token
+
+    def cancel(self, key: str):
+        """Cancela a tarefa pendente da chave, se houver"""
+        task = self._active.pop(key, None)
+        if task is not None:
+            task.token.cancel()
+            if task.indicator is not None:
+                task.indicator.hide()
+
+    def cancel_all(self):
+        """Cancela todas as tarefas (ex.: ao destruir a view)"""
+        for key in list(self._active):
+            self.cancel(key)
+
+    def is_loading(self, key: str) -> bool:
+        return key in self._active
+
+    def _schedule_poll(self):
+        if not self._polling:
+            self._polling = True
+            self.widget.after(self.poll_interval_ms, self._poll)
+
+    def _poll(self):
+        self._polling = False
+        try:
+            if not self.widget.winfo_exists():
+                self.cancel_all()
+                return
+        except tk.TclError:
+            self.cancel_all()
+            return
+
+        while True:
+            try:
+                task, result, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            # Tarefas substituídas chegam tarde e são ignoradas
+            if task.token.cancelled or self._active.get(task.key) is not task:
+                continue
+            del self._active[task.key]
+            if task.indicator is not None:
+                task.indicator.hide()
+            try:
+                if error is None:
+                    task.on_success(result)
+                elif task.on_error is not None:
+                    task.on_error(error)
+                else:
+                    print(f"Erro ao carregar {task.key}: {error}")
+            except tk.TclError:
+                # Widget destruído enquanto a tarefa rodava
+                pass
+
+        if self._active:
+            self._schedule_poll()
+
+
+class Debouncer:
+    """
+    Adia um callback até o usuário parar de digitar por delay_ms
+
+    Cada call() reagenda a execução; só a última chamada da rajada roda,
+    com os argumentos dela, na thread do Tk.
+    """
+
+    def __init__(self, widget: tk.Widget, delay_ms: int, callback: Callable[..., Any]):
+        self.widget = widget
+        self.delay_ms = delay_ms
+        self.callback = callback
+        self._after_id: Optional[str] = None
+
+    def call(self, *args):
+        self.cancel()
+        self._after_id = self.widget.after(self.delay_ms, self._fire, *args)
+
+    def cancel(self):
+        if self._after_id is not None:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except tk.TclError:
+                pass
+            self._after_id = None
+
+    def flush(self, *args):
+        """Executa imediatamente (ex.: Enter no campo de busca)"""
+        self.cancel()
+        self.callback(*args)
+
+    def _fire(self, *args):
+        self._after_id = None
+        self.callback(*args)
+
+
+# Instância global do executor compartilhado pelos carregadores das views
+loader_executor = ThreadPoolExecutor(max_workers=LOADER_MAX_WORKERS, thread_name_prefix='view-loader')
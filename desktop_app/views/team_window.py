@@ -9,6 +9,11 @@ from .base_window import BaseWindow
 from desktop_app.controllers.team_controller import team_controller
 from desktop_app.controllers.auth_controller import auth_controller
 from database.models import UserType
+from desktop_app.utils.search_index import normalize, search_index
+from .task_runner import CancelToken, Debouncer, LoadingIndicator, TaskRunner
+from .virtual_tree import VirtualTree
+
+SEARCH_DEBOUNCE_MS = 150
 
 
 class TeamsWindow:
@@ -16,10 +21,13 @@ class TeamsWindow:
     
     def __init__(self, parent_frame: ttk.Frame):
         self.parent = parent_frame
+        self.tasks = TaskRunner(parent_frame)
+        self.search_debouncer = Debouncer(parent_frame, SEARCH_DEBOUNCE_MS, self.apply_search)
+        search_index.ensure_built()
         
         # Widgets principais
         self.search_var: Optional[tk.StringVar] = None
-        self.teams_tree: Optional[ttk.Treeview] = None
+        self.teams_tree: Optional[VirtualTree] = None
         self.selected_team_id: Optional[int] = None
         
         # Frames
@@ -75,6 +83,7 @@ class TeamsWindow:
         search_entry = ttk.Entry(search_frame, textvariable=self.search_var, width=30)
         search_entry.pack(side="left", padx=(0, 10))
         search_entry.bind("<KeyRelease>", self.on_search_change)
+        search_entry.bind("<Return>", lambda e: self.search_debouncer.flush())
         
         # Botões
         button_frame = ttk.Frame(self.toolbar_frame)
@@ -87,6 +96,8 @@ class TeamsWindow:
                       command=self.edit_team).pack(side="left", padx=(0, 5))
             ttk.Button(button_frame, text="Excluir", 
                       command=self.delete_team).pack(side="left", padx=(0, 5))
+            ttk.Button(button_frame, text="Importar CSV", 
+                      command=self.import_csv).pack(side="left", padx=(0, 5))
         
         ttk.Button(button_frame, text="Atualizar", 
                   command=self.refresh_teams).pack(side="left")
@@ -97,36 +108,23 @@ class TeamsWindow:
         list_frame = ttk.LabelFrame(parent, text="Equipes", padding="10")
         list_frame.pack(fill="both", expand=True)
         
-        # Treeview
+        # Lista virtual: só as linhas visíveis viram itens do Treeview
         columns = ("nome", "universidade", "atletas", "status")
-        self.teams_tree = ttk.Treeview(list_frame, columns=columns, show="headings")
-        
-        # Cabeçalhos
-        self.teams_tree.heading("nome", text="Nome")
-        self.teams_tree.heading("universidade", text="Universidade")
-        self.teams_tree.heading("atletas", text="Atletas")
-        self.teams_tree.heading("status", text="Status")
-        
-        # Larguras
-        self.teams_tree.column("nome", width=200)
-        self.teams_tree.column("universidade", width=200)
-        self.teams_tree.column("atletas", width=80)
-        self.teams_tree.column("status", width=80)
-        
+        self.teams_tree = VirtualTree(
+            list_frame, columns,
+            headings={"nome": "Nome", "universidade": "Universidade",
+                      "atletas": "Atletas", "status": "Status"},
+            widths={"nome": 200, "universidade": 200, "atletas": 80, "status": 80}
+        )
         self.teams_tree.pack(fill="both", expand=True)
         
-        # Scrollbars
-        v_scroll = ttk.Scrollbar(list_frame, orient="vertical", command=self.teams_tree.yview)
-        self.teams_tree.configure(yscrollcommand=v_scroll.set)
-        v_scroll.pack(side="right", fill="y")
-        
-        h_scroll = ttk.Scrollbar(list_frame, orient="horizontal", command=self.teams_tree.xview)
-        self.teams_tree.configure(xscrollcommand=h_scroll.set)
+        h_scroll = ttk.Scrollbar(list_frame, orient="horizontal", command=self.teams_tree.tree.xview)
+        self.teams_tree.tree.configure(xscrollcommand=h_scroll.set)
         h_scroll.pack(side="bottom", fill="x")
         
         # Bind para seleção
-        self.teams_tree.bind("<<TreeviewSelect>>", self.on_team_select)
-        self.teams_tree.bind("<Double-1>", self.on_team_double_click)
+        self.teams_tree.bind_select(self.on_team_select)
+        self.teams_tree.tree.bind("<Double-1>", self.on_team_double_click)
     
     def setup_team_details(self, parent: ttk.Frame):
         """Configura painel de detalhes da equipe"""
@@ -182,53 +180,66 @@ class TeamsWindow:
                       command=self.view_statistics).pack(fill="x")
     
     def refresh_teams(self):
-        """Atualiza lista de equipes"""
+        """Atualiza lista de equipes (consulta em segundo plano)"""
+        self.tasks.submit('teams', self._load_teams, self._show_teams,
+                          on_error=lambda e: print(f"Erro ao carregar equipes: {e}"),
+                          indicator=LoadingIndicator(self.teams_tree))
+    
+    def _load_teams(self, token: CancelToken) -> list:
+        """Busca as equipes e monta as linhas (thread de trabalho)"""
+        teams = team_controller.get_all_teams()
+        
+        rows = []
+        for team in teams:
+            # Uma atualização mais recente torna esta lista obsoleta
+            token.raise_if_cancelled()
+            athletes_count = len(team.get_athletes())
+            status = "Ativa" if team.is_active else "Inativa"
+            rows.append((team.id, (team.name, team.university, athletes_count, status)))
+        return rows
+    
+    def _show_teams(self, rows: list):
+        """Atualiza a lista de equipes por diferença (thread do Tk)"""
         try:
-            # Limpar árvore
-            for item in self.teams_tree.get_children():
-                self.teams_tree.delete(item)
-            
-            # Buscar equipes
-            teams = team_controller.get_all_teams()
-            
-            # Filtrar por busca se necessário
-            search_term = self.search_var.get().lower() if self.search_var else ""
-            if search_term:
-                teams = [t for t in teams if search_term in t.name.lower() or 
-                        search_term in t.university.lower()]
-            
-            # Adicionar na árvore
-            for team in teams:
-                athletes_count = len(team.get_athletes())
-                status = "Ativa" if team.is_active else "Inativa"
-                
-                item_id = self.teams_tree.insert('', 'end', values=(
-                    team.name,
-                    team.university,
-                    athletes_count,
-                    status
-                ))
-                
-                # Salvar ID da equipe no item
-                self.teams_tree.set(item_id, 'team_id', team.id)
-                
+            self.teams_tree.set_rows(rows)
         except Exception as e:
             print(f"Erro ao carregar equipes: {e}")
     
     def on_search_change(self, event=None):
-        """Chamado quando muda o texto de busca"""
-        self.refresh_teams()
+        """Chamado a cada tecla; a busca roda quando o usuário para de digitar"""
+        self.search_debouncer.call()
+    
+    def apply_search(self):
+        """Filtra as equipes pelo índice de busca (nome, sigla ou atletas)"""
+        search_term = self.search_var.get().strip()
+        
+        if not search_term:
+            self.teams_tree.source.set_filter(None)
+            self.teams_tree.set_keys(None)
+            return
+        
+        if search_index.ready.is_set():
+            self.teams_tree.source.set_filter(None)
+            self.teams_tree.set_keys(search_index.match_team_ids(search_term))
+            return
+        
+        # Índice ainda carregando: filtra as linhas já carregadas
+        normalized = normalize(search_term)
+        
+        def matches(values) -> bool:
+            # values: (nome, universidade, atletas, status)
+            return normalized in normalize(values[0]) or normalized in normalize(values[1] or "")
+        
+        self.teams_tree.source.set_keys(None)
+        self.teams_tree.set_filter(matches)
     
     def on_team_select(self, event=None):
         """Chamado quando seleciona uma equipe"""
-        selection = self.teams_tree.selection()
-        if not selection:
+        team_id = self.teams_tree.selected_key()
+        if team_id is None:
             self.clear_team_details()
             return
         
-        item = selection[0]
-        team_id = self.teams_tree.set(item, 'team_id')
-        
         if team_id:
             self.selected_team_id = int(team_id)
             self.load_team_details(self.selected_team_id)
@@ -320,6 +331,49 @@ class TeamsWindow:
             except Exception as e:
                 messagebox.showerror("Erro", f"Erro ao excluir equipe: {str(e)}")
     
+    def import_csv(self):
+        """Importa equipes e atletas de um arquivo CSV (em segundo plano)"""
+        from tkinter import filedialog
+        file_path = filedialog.askopenfilename(
+            title="Importar atletas",
+            filetypes=[("Arquivos CSV", "*.csv"), ("Todos os arquivos", "*.*")]
+        )
+        if not file_path:
+            return
+        
+        from desktop_app.controllers.import_controller import import_controller
+        self.tasks.submit('import', lambda token: import_controller.import_athletes_csv(file_path),
+                          self._show_import_result,
+                          on_error=lambda e: print(f"Erro ao importar atletas: {e}"),
+                          indicator=LoadingIndicator(self.teams_tree, text="Importando..."))
+    
+    def _show_import_result(self, result):
+        """Exibe o resumo da importação e oferece salvar o relatório de erros"""
+        from tkinter import filedialog, messagebox
+        from desktop_app.controllers.import_controller import import_controller
+        
+        success, message = result
+        report = import_controller.last_report
+        if report is not None and report.errors:
+            if messagebox.askyesno("Importação concluída com erros",
+                                   f"{message}\n\nDeseja salvar o relatório de erros por linha?"):
+                target = filedialog.asksaveasfilename(title="Salvar relatório de erros",
+                                                      defaultextension=".csv",
+                                                      filetypes=[("Arquivos CSV", "*.csv")])
+                if target:
+                    try:
+                        with open(target, 'w', newline='', encoding='utf-8-sig') as file:
+                            report.write_errors_csv(file)
+                    except OSError as e:
+                        messagebox.showerror("Erro", f"Erro ao salvar relatório: {str(e)}")
+        elif success:
+            messagebox.showinfo("Importação concluída", message)
+        else:
+            messagebox.showerror("Erro", message)
+        
+        if report is not None and report.imported:
+            self.refresh_teams()
+    
     def manage_athletes(self):
         """Abre janela de gerenciamento de atletas"""
         if not self.selected_team_id:
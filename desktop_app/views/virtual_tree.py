@@ -0,0 +1,315 @@
+"""
+Lista virtualizada sobre ttk.Treeview
+
+O Treeview fica lento com milhares de itens: inserir, apagar e rolar custam
+proporcionalmente ao número de linhas. A VirtualTree mantém no widget
+apenas as linhas visíveis; a barra de rolagem controla um deslocamento sobre
+a fonte de dados (RowSource), de onde as linhas são buscadas sob demanda.
+
+Ordenação e filtro são feitos na fonte, não no widget. Ao atualizar, as
+linhas já exibidas são reaproveitadas (atualizadas ou movidas) em vez de
+apagar tudo e inserir de novo.
+
+Cada linha é um par (chave, valores); a chave identifica a linha entre
+atualizações e é o que selection() retorna.
+"""
+import tkinter as tk
+from tkinter import ttk
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Set, Tuple
+
+Row = Tuple[Hashable, Tuple[Any, ...]]
+
+DEFAULT_ROW_HEIGHT = 20
+WHEEL_ROWS = 3
+
+
+def _sort_key(value: Any) -> tuple:
+    # Números antes de textos, vazios por último; textos sem diferenciar maiúsculas
+    if value is None or value == "":
+        return (2, "")
+    if isinstance(value, (int, float)):
+        return (0, value)
+    return (1, str(value).lower())
+
+
+class RowSource:
+    """Fonte de linhas de uma VirtualTree"""
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def fetch(self, start: int, stop: int) -> List[Row]:
+        """Linhas de start (inclusive) a stop (exclusive), já filtradas e ordenadas"""
+        raise NotImplementedError
+
+    def index_of(self, key: Hashable) -> Optional[int]:
+        """Posição da linha com a chave, ou None"""
+        raise NotImplementedError
+
+    def sort_by(self, column: int, reverse: bool = False):
+        raise NotImplementedError
+
+    def set_filter(self, predicate: Optional[Callable[[Tuple[Any, ...]], bool]]):
+        raise NotImplementedError
+
+    def set_keys(self, keys: Optional[Set[Hashable]]):
+        """Restringe às linhas cujas chaves estão no conjunto (None remove a restrição)"""
+        raise NotImplementedError
+
+
+class ListRowSource(RowSource):
+    """Fonte em memória; o filtro e a ordenação geram uma visão sobre as linhas"""
+
+    def __init__(self, rows: Sequence[Row] = ()):
+        self._rows: List[Row] = list(rows)
+        self._view: List[Row] = self._rows
+        self._positions: Optional[Dict[Hashable, int]] = None
+        self._filter: Optional[Callable[[Tuple[Any, ...]], bool]] = None
+        self._keys: Optional[Set[Hashable]] = None
+        self._sort: Optional[Tuple[int, bool]] = None
+
+    def set_rows(self, rows: Sequence[Row]):
+        """Substitui as linhas mantendo filtro e ordenação"""
+        self._rows = list(rows)
+        self._apply()
+
+    def sort_by(self, column: int, reverse: bool = False):
+        self._sort = (column, reverse)
+        self._apply()
+
+    def set_filter(self, predicate: Optional[Callable[[Tuple[Any, ...]], bool]]):
+        self._filter = predicate
+        self._apply()
+
+    def set_keys(self, keys: Optional[Set[Hashable]]):
+        self._keys = keys
+        self._apply()
+
+    @property
+    def sort_order(self) -> Optional[Tuple[int, bool]]:
+        return self._sort
+
+    def _apply(self):
+        view = self._rows
+        if self._keys is not None:
+            view = [row for row in view if row[0] in self._keys]
+        if self._filter is not None:
+            view = [row for row in view if self._filter(row[1])]
+        if self._sort is not None:
+            column, reverse = self._sort
+            view = sorted(view, key=lambda row: _sort_key(row[1][column]), reverse=reverse)
+        self._view = view
+        self._positions = None
+
+    def __len__(self) -> int:
+        return len(self._view)
+
+    def fetch(self, start: int, stop: int) -> List[Row]:
+        return self._view[start:stop]
+
+    def index_of(self, key: Hashable) -> Optional[int]:
+        if self._positions is None:
+            self._positions = {row_key: i for i, (row_key, _) in enumerate(self._view)}
+        return self._positions.get(key)
+
+
+class VirtualTree(ttk.Frame):
+    """Treeview com rolagem virtual: só as linhas visíveis viram itens"""
+
+    def __init__(self, parent: tk.Widget, columns: Sequence[str],
+                 headings: Optional[Dict[str, str]] = None,
+                 widths: Optional[Dict[str, int]] = None,
+                 source: Optional[RowSource] = None, sortable: bool = True, **tree_options):
+        super().__init__(parent)
+        self.columns = tuple(columns)
+        self.source = source if source is not None else ListRowSource()
+        self.offset = 0
+        self._visible_rows = int(tree_options.pop('height', 10))
+        self._items: Dict[Hashable, str] = {}  # chave -> iid dos itens exibidos
+        self._values: Dict[Hashable, Tuple[Any, ...]] = {}
+        self._selected: List[Hashable] = []
+        # Seleção aplicada pela própria lista; eventos que a repetem não vêm do usuário
+        self._synced_selection: Tuple[str, ...] = ()
+        self._select_callbacks: List[Callable[[Any], Any]] = []
+
+        self.tree = ttk.Treeview(self, columns=self.columns, show="headings",
+                                 height=self._visible_rows, **tree_options)
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.tree.configure(yscrollcommand=lambda first, last: None)
+        self.scrollbar.pack(side="right", fill="y")
+        self.tree.pack(side="left", fill="both", expand=True)
+
+        for index, column in enumerate(self.columns):
+            text = (headings or {}).get(column, column)
+            if sortable:
+                self.tree.heading(column, text=text,
+                                  command=lambda index=index: self.toggle_sort(index))
+            else:
+                self.tree.heading(column, text=text)
+            if widths and column in widths:
+                self.tree.column(column, width=widths[column])
+
+        self.tree.bind("<Configure>", self._on_resize)
+        self.tree.bind("<MouseWheel>", self._on_wheel)
+        self.tree.bind("<Button-4>", lambda e: self.scroll(-WHEEL_ROWS))
+        self.tree.bind("<Button-5>", lambda e: self.scroll(WHEEL_ROWS))
+        self.tree.bind("<Up>", self._on_arrow)
+        self.tree.bind("<Down>", self._on_arrow)
+        self.tree.bind("<Prior>", lambda e: self._page(-1))
+        self.tree.bind("<Next>", lambda e: self._page(1))
+        self.tree.bind("<<TreeviewSelect>>", self._on_select, add="+")
+
+    # Dados
+
+    def set_rows(self, rows: Sequence[Row]):
+        """Substitui as linhas de uma ListRowSource e atualiza por diferença"""
+        self.source.set_rows(rows)
+        self.refresh()
+
+    def set_filter(self, predicate: Optional[Callable[[Tuple[Any, ...]], bool]]):
+        self.source.set_filter(predicate)
+        self.offset = 0
+        self.refresh()
+
+    def set_keys(self, keys: Optional[Set[Hashable]]):
+        """Exibe só as linhas com as chaves dadas (ex.: resultado de uma busca)"""
+        self.source.set_keys(keys)
+        self.offset = 0
+        self.refresh()
+
+    def toggle_sort(self, column: int):
+        """Ordena pela coluna; um segundo clique inverte a ordem"""
+        current = getattr(self.source, 'sort_order', None)
+        reverse = current is not None and current[0] == column and not current[1]
+        self.source.sort_by(column, reverse)
+        self.refresh()
+
+    def refresh(self):
+        """Reexibe a janela visível a partir da fonte"""
+        total = len(self.source)
+        self.offset = max(0, min(self.offset, total - self._visible_rows))
+        rows = self.source.fetch(self.offset, self.offset + self._visible_rows)
+        self._render(rows)
+        self._update_scrollbar(total)
+
+    def _render(self, rows: List[Row]):
+        wanted = {key for key, _ in rows}
+        for key in [key for key in self._items if key not in wanted]:
+            self.tree.delete(self._items.pop(key))
+            del self._values[key]
+
+        for index, (key, values) in enumerate(rows):
+            values = tuple(values)
+            iid = self._items.get(key)
+            if iid is None:
+                self._items[key] = self.tree.insert('', index, values=values)
+                self._values[key] = values
+                continue
+            if self._values[key] != values:
+                self.tree.item(iid, values=values)
+                self._values[key] = values
+            if self.tree.index(iid) != index:
+                self.tree.move(iid, '', index)
+
+        visible_selection = tuple(self._items[key] for key in self._selected if key in self._items)
+        self._synced_selection = visible_selection
+        if visible_selection != tuple(self.tree.selection()):
+            self.tree.selection_set(visible_selection)
+
+    # Seleção
+
+    def selection(self) -> List[Hashable]:
+        """Chaves das linhas selecionadas (inclusive fora da área visível)"""
+        return list(self._selected)
+
+    def selected_key(self) -> Optional[Hashable]:
+        return self._selected[0] if self._selected else None
+
+    def select(self, key: Hashable):
+        """Seleciona a linha e rola até ela"""
+        self._selected = [key]
+        self.see(key)
+
+    def clear_selection(self):
+        self._selected = []
+        self.refresh()
+
+    def see(self, key: Hashable):
+        index = self.source.index_of(key)
+        if index is None:
+            return
+        if index < self.offset or index >= self.offset + self._visible_rows:
+            self.offset = max(0, index - self._visible_rows // 2)
+        self.refresh()
+
+    def _on_select(self, event=None):
+        current = tuple(self.tree.selection())
+        if current == self._synced_selection:
+            return
+        keys_by_iid = {iid: key for key, iid in self._items.items()}
+        self._selected = [keys_by_iid[iid] for iid in current if iid in keys_by_iid]
+        self._synced_selection = current
+        for callback in self._select_callbacks:
+            callback(event)
+
+    def bind_select(self, callback: Callable[[Any], Any]):
+        """Liga um callback à mudança de seleção feita pelo usuário"""
+        self._select_callbacks.append(callback)
+
+    # Rolagem
+
+    def scroll(self, rows: int):
+        total = len(self.source)
+        new_offset = max(0, min(self.offset + rows, total - self._visible_rows))
+        if new_offset != self.offset:
+            self.offset = new_offset
+            self.refresh()
+        return "break"
+
+    def _page(self, direction: int):
+        return self.scroll(direction * max(self._visible_rows - 1, 1))
+
+    def _on_wheel(self, event):
+        return self.scroll(-WHEEL_ROWS if event.delta > 0 else WHEEL_ROWS)
+
+    def _on_arrow(self, event):
+        # Nas bordas da janela visível, as setas rolam a fonte
+        focus = self.tree.focus()
+        children = self.tree.get_children()
+        if not children or not focus:
+            return None
+        if event.keysym == "Down" and focus == children[-1]:
+            self.scroll(1)
+        elif event.keysym == "Up" and focus == children[0]:
+            self.scroll(-1)
+        else:
+            return None
+        children = self.tree.get_children()
+        target = children[-1] if event.keysym == "Down" else children[0]
+        self.tree.focus(target)
+        self.tree.selection_set(target)
+        return "break"
+
+    def _on_scrollbar(self, action: str, amount: str, unit: Optional[str] = None):
+        total = len(self.source)
+        if action == "moveto":
+            self.offset = int(float(amount) * total)
+            self.refresh()
+        elif action == "scroll":
+            step = int(amount) * (self._visible_rows if unit == "pages" else 1)
+            self.scroll(step)
+
+    def _update_scrollbar(self, total: int):
+        if total <= self._visible_rows:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            self.scrollbar.set(self.offset / total, (self.offset + self._visible_rows) / total)
+
+    def _on_resize(self, event):
+        style = ttk.Style(self)
+        row_height = int(style.lookup("Treeview", "rowheight") or DEFAULT_ROW_HEIGHT)
+        # Desconta o cabeçalho, que tem aproximadamente a altura de uma linha
+        rows = max(1, event.height // row_height - 1)
+        if rows != self._visible_rows:
+            self._visible_rows = rows
+            self.refresh()
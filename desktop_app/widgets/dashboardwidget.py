@@ -1,18 +1,26 @@
 """
 Widget do dashboard principal
+
+A atualização roda em um QRunnable no QThreadPool global: o
+DashboardSnapshot busca só as linhas alteradas desde a última atualização
+e o resultado volta à thread da interface por sinal, contendo apenas as
+seções que mudaram. Sem mudanças, nada é redesenhado.
 """
+from typing import Any, Dict, Sequence
+
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
                            QLabel, QFrame, QPushButton, QScrollArea,
                            QGroupBox, QProgressBar, QListWidget, QListWidgetItem)
-from PyQt5.QtCore import Qt, QTimer, pyqtSignal
+from PyQt5.QtCore import Qt, QTimer, QObject, QRunnable, QThreadPool, pyqtSignal
 from PyQt5.QtGui import QFont, QPalette
 
-from desktop_app.controllers.competition_controller import competition_controller
-from desktop_app.controllers.team_controller import team_controller
 from desktop_app.controllers.game_controller import game_controller
-from database.models import GameStatus, CompetitionStatus
+from desktop_app.utils.dashboard_snapshot import DashboardSnapshot
+from database.models import GameStatus
 from datetime import date, datetime, timedelta
 
+REFRESH_INTERVAL_MS = 60000
+
 
 class StatsCard(QFrame):
     """Card para exibir estatísticas"""
@@ -68,11 +76,51 @@ class StatsCard(QFrame):
         self.value_label.setText(str(value))
 
 
+def set_list_items(list_widget: QListWidget, lines: Sequence[str], empty_text: str):
+    """Atualiza a lista trocando só os itens cujo texto mudou"""
+    lines = list(lines) or [empty_text]
+    for row, text in enumerate(lines):
+        item = list_widget.item(row)
+        if item is None:
+            list_widget.addItem(QListWidgetItem(text))
+        elif item.text() != text:
+            item.setText(text)
+    while list_widget.count() > len(lines):
+        list_widget.takeItem(list_widget.count() - 1)
+
+
+class DashboardSignals(QObject):
+    """Sinais da tarefa de atualização (QRunnable não é QObject)"""
+    sections_changed = pyqtSignal(dict)
+    failed = pyqtSignal(str)
+    finished = pyqtSignal()
+
+
+class DashboardRefreshTask(QRunnable):
+    """Busca as alterações do dashboard fora da thread da interface"""
+    
+    def __init__(self, snapshot: DashboardSnapshot, signals: DashboardSignals):
+        super().__init__()
+        self.snapshot = snapshot
+        self.signals = signals
+    
+    def run(self):
+        try:
+            changed = self.snapshot.refresh()
+            if changed:
+                self.signals.sections_changed.emit(changed)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+        finally:
+            self.signals.finished.emit()
+
+
 class RecentActivityWidget(QWidget):
     """Widget para mostrar atividades recentes"""
     
-    def __init__(self):
+    def __init__(self, load_on_init: bool = True):
         super().__init__()
+        self.load_on_init = load_on_init
         self.setup_ui()
     
     def setup_ui(self):
@@ -92,7 +140,12 @@ class RecentActivityWidget(QWidget):
         self.activity_list.setMaximumHeight(200)
         layout.addWidget(self.activity_list)
         
-        self.refresh()
+        if self.load_on_init:
+            self.refresh()
+    
+    def set_activities(self, lines: Sequence[str]):
+        """Exibe atividades já montadas (ex.: pelo DashboardSnapshot)"""
+        set_list_items(self.activity_list, lines, "Nenhuma atividade recente")
     
     def refresh(self):
         """Atualiza lista de atividades"""
@@ -137,12 +190,24 @@ class DashboardWidget(QWidget):
     def __init__(self):
         super().__init__()
         self.stats_cards = {}
+        
+        # Atualização em segundo plano
+        self.snapshot = DashboardSnapshot()
+        self.thread_pool = QThreadPool.globalInstance()
+        self.refresh_signals = DashboardSignals()
+        self.refresh_signals.sections_changed.connect(self._apply_sections)
+        self.refresh_signals.failed.connect(
+            lambda message: print(f"Erro ao atualizar dashboard: {message}"))
+        self.refresh_signals.finished.connect(self._on_refresh_finished)
+        self._refresh_running = False
+        self._refresh_pending = False
+        
         self.setup_ui()
         
         # Timer para atualizar dados periodicamente
         self.refresh_timer = QTimer()
         self.refresh_timer.timeout.connect(self.refresh)
-        self.refresh_timer.start(60000)  # Atualiza a cada minuto
+        self.refresh_timer.start(REFRESH_INTERVAL_MS)  # Atualiza a cada minuto
     
     def setup_ui(self):
         """Configura interface do dashboard"""
@@ -225,7 +290,7 @@ class DashboardWidget(QWidget):
         right_column = QVBoxLayout()
         
         # Atividades recentes
-        self.activity_widget = RecentActivityWidget()
+        self.activity_widget = RecentActivityWidget(load_on_init=False)
         right_column.addWidget(self.activity_widget)
         
         # Avisos e notificações
@@ -274,147 +339,38 @@ class DashboardWidget(QWidget):
         self.refresh()
     
     def refresh(self):
-        """Atualiza todos os dados do dashboard"""
-        try:
-            self._update_stats_cards()
-            self._update_next_games()
-            self._update_competitions()
-            self._update_notifications()
-            self.activity_widget.refresh()
-            
-        except Exception as e:
-            print(f"Erro ao atualizar dashboard: {e}")
+        """Agenda a atualização do dashboard no pool de threads"""
+        if self._refresh_running:
+            # Uma atualização por vez; a próxima sai assim que esta terminar
+            self._refresh_pending = True
+            return
+        self._refresh_running = True
+        self.thread_pool.start(DashboardRefreshTask(self.snapshot, self.refresh_signals))
     
-    def _update_stats_cards(self):
-        """Atualiza cards de estatísticas"""
-        try:
-            # Competições ativas
-            competitions = competition_controller.get_competitions()
-            active_competitions = len([c for c in competitions if c.status == CompetitionStatus.ACTIVE])
-            self.stats_cards['competitions'].update_value(active_competitions)
-            
-            # Total de equipes
-            teams = team_controller.get_teams()
-            self.stats_cards['teams'].update_value(len(teams))
-            
-            # Jogos hoje
-            today_games = game_controller.get_games(
-                date_from=date.today(),
-                date_to=date.today()
-            )
-            self.stats_cards['games_today'].update_value(len(today_games))
-            
-            # Total de atletas
-            total_athletes = 0
-            for team in teams:
-                athletes = team.get_athletes()
-                total_athletes += len(athletes)
-            self.stats_cards['athletes'].update_value(total_athletes)
-            
-        except Exception as e:
-            print(f"Erro ao atualizar estatísticas: {e}")
+    def _on_refresh_finished(self):
+        self._refresh_running = False
+        if self._refresh_pending:
+            self._refresh_pending = False
+            self.refresh()
     
-    def _update_next_games(self):
-        """Atualiza lista de próximos jogos"""
-        self.next_games_list.clear()
-        
-        try:
-            # Próximos 5 jogos programados
-            upcoming_games = game_controller.get_games(
-                status=GameStatus.SCHEDULED,
-                date_from=date.today()
-            )
-            
-            for game in upcoming_games[:5]:
-                home_team = game.get_home_team()
-                away_team = game.get_away_team()
-                competition = game.get_competition()
-                
-                game_date = game.game_date.strftime("%d/%m %H:%M")
-                text = f"{home_team.name} x {away_team.name} - {game_date}"
-                if competition:
-                    text += f" ({competition.name})"
-                
-                item = QListWidgetItem(text)
-                self.next_games_list.addItem(item)
-            
-            if self.next_games_list.count() == 0:
-                item = QListWidgetItem("Nenhum jogo programado")
-                self.next_games_list.addItem(item)
-                
-        except Exception as e:
-            print(f"Erro ao carregar próximos jogos: {e}")
+    def _apply_sections(self, sections: Dict[str, Any]):
+        """Redesenha apenas as seções alteradas (thread da interface)"""
+        if 'stats' in sections:
+            self._update_stats_cards(sections['stats'])
+        if 'next_games' in sections:
+            set_list_items(self.next_games_list, sections['next_games'], "Nenhum jogo programado")
+        if 'competitions' in sections:
+            set_list_items(self.competitions_list, sections['competitions'], "Nenhuma competição ativa")
+        if 'notifications' in sections:
+            set_list_items(self.notifications_list, sections['notifications'], "✅ Nenhuma notificação")
+        if 'activity' in sections:
+            self.activity_widget.set_activities(sections['activity'])
     
-    def _update_competitions(self):
-        """Atualiza lista de competições ativas"""
-        self.competitions_list.clear()
-        
-        try:
-            competitions = competition_controller.get_competitions()
-            active_competitions = [c for c in competitions if c.status == CompetitionStatus.ACTIVE]
-            
-            for competition in active_competitions:
-                # Calcula progresso da competição
-                total_games = len(competition.get_games())
-                finished_games = len([g for g in competition.get_games() 
-                                    if g.status == GameStatus.FINISHED])
-                
-                if total_games > 0:
-                    progress = int((finished_games / total_games) * 100)
-                    text = f"{competition.name} - {progress}% concluída"
-                else:
-                    text = f"{competition.name} - Não iniciada"
-                
-                item = QListWidgetItem(text)
-                self.competitions_list.addItem(item)
-            
-            if self.competitions_list.count() == 0:
-                item = QListWidgetItem("Nenhuma competição ativa")
-                self.competitions_list.addItem(item)
-                
-        except Exception as e:
-            print(f"Erro ao carregar competições: {e}")
-    
-    def _update_notifications(self):
-        """Atualiza notificações do sistema"""
-        self.notifications_list.clear()
-        
-        try:
-            notifications = []
-            
-            # Verifica competições que precisam ser iniciadas
-            competitions = competition_controller.get_competitions()
-            for competition in competitions:
-                if (competition.status == CompetitionStatus.DRAFT and 
-                    competition.start_date <= date.today()):
-                    notifications.append(f"⚠️ Competição '{competition.name}' pode ser iniciada")
-            
-            # Verifica jogos sem resultado há mais de 1 dia
-            overdue_games = game_controller.get_games(
-                status=GameStatus.SCHEDULED,
-                date_to=date.today() - timedelta(days=1)
-            )
-            if overdue_games:
-                notifications.append(f"⏰ {len(overdue_games)} jogo(s) pendente(s) de resultado")
-            
-            # Verifica equipes com poucos atletas
-            teams = team_controller.get_teams()
-            for team in teams:
-                athletes = team.get_athletes()
-                if len(athletes) < 11:  # Mínimo para futebol
-                    notifications.append(f"👥 Equipe '{team.name}' com poucos atletas ({len(athletes)})")
-            
-            # Adiciona notificações à lista
-            for notification in notifications[:5]:  # Máximo 5 notificações
-                item = QListWidgetItem(notification)
-                self.notifications_list.addItem(item)
-            
-            if self.notifications_list.count() == 0:
-                item = QListWidgetItem("✅ Nenhuma notificação")
-                self.notifications_list.addItem(item)
-                
-        except Exception as e:
-            print(f"Erro ao carregar notificações: {e}")
+    def _update_stats_cards(self, stats: Dict[str, int]):
+        """Atualiza cards de estatísticas"""
+        for key, value in stats.items():
+            if key in self.stats_cards:
+                self.stats_cards[key].update_value(value)
     
     def _new_competition(self):
         """Abre dialog para nova competição"""
@@ -0,0 +1,31 @@
+"""
+Fixtures compartilhadas dos testes
+
+O banco web usa SQLite em memória: DATABASE_URL precisa estar definido
+antes da primeira importação de web_app.database. Os eventos ao vivo ficam
+no próprio processo (sem o arquivo de fan-out padrão em data/).
+"""
+import os
+
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+os.environ.setdefault('LIVE_EVENTS_DB', '')
+
+import pytest
+
+
+@pytest.fixture
+def web_db():
+    """Tabelas web recriadas a cada teste, com revisões e caches zerados"""
+    from web_app.database.database import Base, engine, init_db
+    from web_app.services.dashboard_stats import dashboard_stats
+    from web_app.services.fragment_cache import fragment_cache
+    from web_app.services.revisions import init_revisions
+    from web_app.services.user_cache import user_cache
+
+    init_db()
+    init_revisions()
+    yield
+    Base.metadata.drop_all(bind=engine)
+    dashboard_stats.invalidate()
+    fragment_cache.clear()
+    user_cache.clear()
@@ -0,0 +1,114 @@
+"""Listagens da API (cursor, fields, include) e estatísticas de competição"""
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip('mysql.connector')
+
+from web_app.app import create_app
+from web_app.database.database import SessionLocal
+from web_app.database.models import Competition, Game, Player, Team, User
+
+
+@pytest.fixture
+def client(web_db):
+    app = create_app({'TESTING': True})
+    session = SessionLocal()
+    try:
+        user = User(username='admin', email='admin@example.com', password_hash='x', name='Admin')
+        session.add(user)
+        session.commit()
+        user_id = user.id
+    finally:
+        session.close()
+
+    client = app.test_client()
+    with client.session_transaction() as flask_session:
+        flask_session['_user_id'] = str(user_id)
+    return client
+
+
+def _seed(*objects):
+    session = SessionLocal()
+    try:
+        session.add_all(objects)
+        session.commit()
+        return [obj.id for obj in objects]
+    finally:
+        session.close()
+
+
+def test_api_blueprint_is_registered(client):
+    assert 'api' in client.application.blueprints
+
+
+def test_teams_pages_through_cursor_with_projected_fields(client):
+    _seed(*[Team(name=f'Equipe {n}', city='Recife', state='PE') for n in range(5)])
+
+    names, cursor, pages = [], None, 0
+    while True:
+        url = '/api/teams?limit=2&fields=id,name'
+        if cursor:
+            url += f'&after={cursor}'
+        body = client.get(url).get_json()
+        pages += 1
+        for record in body['data']:
+            assert set(record) == {'id', 'name'}
+        names += [record['name'] for record in body['data']]
+        cursor = body['next_cursor']
+        assert body['has_more'] == (cursor is not None)
+        if not cursor:
+            break
+
+    assert pages == 3
+    assert names == [f'Equipe {n}' for n in range(5)]
+
+
+def test_teams_rejects_unknown_include_and_bad_cursor(client):
+    assert client.get('/api/teams?include=players').status_code == 400
+    assert client.get('/api/teams?after=@@').status_code == 400
+
+
+def test_players_include_team_summary(client):
+    team_id, = _seed(Team(name='Tigres', city='Natal', state='RN'))
+    _seed(Player(name='Ana', team_id=team_id), Player(name='Bia'))
+
+    body = client.get('/api/players?fields=name&include=team').get_json()
+
+    assert body['data'] == [
+        {'name': 'Ana', 'team': {'id': team_id, 'name': 'Tigres', 'city': 'Natal', 'state': 'RN'}},
+        {'name': 'Bia', 'team': None},
+    ]
+
+
+def test_player_detail_reads_web_database(client):
+    team_id, = _seed(Team(name='Tigres'))
+    player_id, = _seed(Player(name='Ana', position='Ala', team_id=team_id))
+
+    assert client.get(f'/api/players/{player_id}').get_json()['team'] == 'Tigres'
+    assert client.get('/api/players/999').status_code == 404
+
+
+def test_competition_statistics_skip_finished_games_without_score(client):
+    home, away = _seed(Team(name='Casa'), Team(name='Fora'))
+    competition_id, = _seed(Competition(name='Copa', season='2026'))
+    kickoff = datetime(2026, 3, 1, 16, 0)
+    _, unscored = _seed(
+        Game(home_team_id=home, away_team_id=away, competition_id=competition_id, game_date=kickoff,
+             home_score=3, away_score=1, status='finished', round_number=1),
+        Game(home_team_id=away, away_team_id=home, competition_id=competition_id, game_date=kickoff,
+             status='finished', round_number=2),
+    )
+    # O default da coluna é 0: o placar ausente precisa ser gravado como NULL explicitamente
+    session = SessionLocal()
+    try:
+        session.query(Game).filter(Game.id == unscored).update({'home_score': None, 'away_score': None})
+        session.commit()
+    finally:
+        session.close()
+
+    stats = client.get(f'/api/statistics/competitions/{competition_id}').get_json()
+
+    assert stats['games_finished'] == 1
+    assert stats['total_goals'] == 4
+    assert [item['round'] for item in stats['by_round']] == [1]
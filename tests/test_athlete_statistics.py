@@ -0,0 +1,127 @@
+"""Manutenção incremental de athlete_statistics (database.athlete_statistics)"""
+import sqlite3
+
+import pytest
+
+pytest.importorskip('mysql.connector')
+
+from database import athlete_statistics
+from database.athlete_statistics import STAT_COLUMNS, AthleteStatisticsAggregator
+
+
+class FakeDatabase:
+    """game_events em SQLite; o upsert em lote é aplicado em memória"""
+
+    def __init__(self):
+        self.db = sqlite3.connect(':memory:')
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript("""
+            CREATE TABLE games (id INTEGER PRIMARY KEY, competition_id INT);
+            CREATE TABLE game_events (id INTEGER PRIMARY KEY AUTOINCREMENT, game_id INT,
+                                      athlete_id INT, event_type TEXT, points_value INT);
+            INSERT INTO games VALUES (1, 7), (2, 7);
+        """)
+        self.stats = {}
+        self.upserts = 0
+
+    def execute_query(self, query, params=None, fetch=False):
+        cursor = self.db.execute(query.replace('%s', '?'), params or ())
+        return [dict(row) for row in cursor.fetchall()] if fetch else cursor.rowcount
+
+    def execute_many(self, query, rows):
+        self.upserts += 1
+        for athlete_id, competition_id, games_played, *values in rows:
+            current = self.stats.setdefault((athlete_id, competition_id),
+                                            dict.fromkeys(('games_played',) + STAT_COLUMNS, 0))
+            for column, delta in zip(('games_played',) + STAT_COLUMNS, (games_played, *values)):
+                current[column] = max(current[column] + delta, 0)
+
+    def add_events(self, game_id, *events):
+        rows = []
+        for athlete_id, event_type, points_value in events:
+            cursor = self.db.execute("INSERT INTO game_events (game_id, athlete_id, event_type, points_value) "
+                                     "VALUES (?, ?, ?, ?)", (game_id, athlete_id, event_type, points_value))
+            rows.append({'id': cursor.lastrowid, 'game_id': game_id, 'athlete_id': athlete_id,
+                         'event_type': event_type, 'points_value': points_value})
+        return rows
+
+    def delete_events(self, events):
+        self.db.executemany("DELETE FROM game_events WHERE id = ?", [(e['id'],) for e in events])
+
+    def rebuilt(self):
+        """Resultado da consulta de reconstrução completa"""
+        rows = self.execute_query(athlete_statistics._AGGREGATE_QUERY, (7,), fetch=True)
+        return {(row['athlete_id'], row['competition_id']):
+                {'games_played': row['games_played'], **{c: int(row[c] or 0) for c in STAT_COLUMNS}}
+                for row in rows}
+
+
+@pytest.fixture
+def database(monkeypatch):
+    database = FakeDatabase()
+    monkeypatch.setattr(athlete_statistics, 'execute_query', database.execute_query)
+    monkeypatch.setattr(athlete_statistics, 'execute_many', database.execute_many)
+    return database
+
+
+def test_inserted_events_update_counters_in_one_upsert(database):
+    aggregator = AthleteStatisticsAggregator()
+    received = []
+    aggregator.add_listener(lambda competition_id, deltas: received.append((competition_id, set(deltas))))
+
+    events = database.add_events(1, (10, 'goal', 1), (10, 'goal', 0), (10, 'yellow_card', 0),
+                                 (11, 'point_3', 3), (None, 'foul', 0))
+    assert aggregator.apply_events_inserted(1, events)
+
+    assert database.upserts == 1
+    assert database.stats[(10, 7)]['goals_scored'] == 2
+    assert database.stats[(10, 7)]['points_scored'] == 2       # points_value 0 conta 1
+    assert database.stats[(10, 7)]['yellow_cards'] == 1
+    assert database.stats[(11, 7)]['points_scored'] == 3
+    assert database.stats[(10, 7)]['games_played'] == 1
+    assert received == [(7, {10, 11})]
+
+
+def test_games_played_counts_first_and_last_event_per_game(database):
+    aggregator = AthleteStatisticsAggregator()
+    first = database.add_events(1, (10, 'goal', 1))
+    aggregator.apply_events_inserted(1, first)
+    second = database.add_events(1, (10, 'foul', 0))
+    aggregator.apply_events_inserted(1, second)
+    aggregator.apply_events_inserted(2, database.add_events(2, (10, 'goal', 1)))
+    assert database.stats[(10, 7)]['games_played'] == 2
+
+    # Remover um dos eventos do jogo 1 não tira o atleta do jogo
+    database.delete_events(first)
+    aggregator.apply_events_deleted(1, first)
+    assert database.stats[(10, 7)]['games_played'] == 2
+
+    database.delete_events(second)
+    aggregator.apply_events_deleted(1, second)
+    assert database.stats[(10, 7)]['games_played'] == 1
+
+
+def test_incremental_path_matches_rebuild_query(database):
+    aggregator = AthleteStatisticsAggregator()
+    batches = [
+        (1, [(10, 'goal', 1), (11, 'point_2', 2), (11, 'free_throw', 1), (12, 'red_card', 0)]),
+        (2, [(10, 'goal', 2), (10, 'set_point', None), (12, 'foul', 0), (11, 'point_3', 3)]),
+        (1, [(12, 'goal', 0), (10, 'yellow_card', 0)]),
+    ]
+    inserted = []
+    for game_id, events in batches:
+        rows = database.add_events(game_id, *events)
+        aggregator.apply_events_inserted(game_id, rows)
+        inserted.append((game_id, rows))
+
+    game_id, rows = inserted[1]
+    removed = [rows[0], rows[2]]
+    database.delete_events(removed)
+    aggregator.apply_events_deleted(game_id, removed)
+
+    assert database.stats == database.rebuilt()
+
+
+def test_unknown_game_reports_failure(database):
+    assert not AthleteStatisticsAggregator().apply_events_inserted(99, [{'athlete_id': 10, 'event_type': 'goal'}])
+    assert database.upserts == 0
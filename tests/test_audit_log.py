@@ -0,0 +1,76 @@
+"""Log de auditoria em lote (desktop_app.utils.audit_log)"""
+import json
+import threading
+from datetime import date
+
+import pytest
+
+pytest.importorskip('mysql.connector')
+
+from desktop_app.utils.audit_log import AuditLogWriter, ensure_partitions
+
+
+class Recorder:
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, query, rows):
+        self.batches.append(rows)
+
+
+def test_records_are_written_in_batches(monkeypatch):
+    writer = Recorder()
+    log = AuditLogWriter(writer, batch_size=3, flush_interval_ms=10000)
+    for index in range(7):
+        assert log.log('login_success', user_id=index, details={'n': index})
+    assert log.flush()
+    log.close()
+
+    assert [len(batch) for batch in writer.batches] == [3, 3, 1]
+    user_id, action, _, _, details, ip_address, _ = writer.batches[0][0]
+    assert (user_id, action, json.loads(details), ip_address) == (0, 'login_success', {'n': 0},
+                                                                  'desktop_app')
+    assert log.stats()['written'] == 7
+
+
+def test_full_queue_drops_instead_of_blocking():
+    release = threading.Event()
+    log = AuditLogWriter(lambda query, rows: None, queue_size=1,
+                         on_start=lambda: release.wait(5))
+    results = [log.log('a'), log.log('b'), log.log('c')]
+    release.set()
+    log.close()
+
+    assert results[0] and not all(results)
+    assert log.dropped >= 1
+
+
+def test_writer_failure_is_counted_not_raised():
+    def broken(query, rows):
+        raise RuntimeError('banco fora do ar')
+
+    log = AuditLogWriter(broken)
+    log.log('a')
+    log.close()
+    assert (log.failed, log.written) == (1, 0)
+    assert not log.log('depois do close')
+
+
+def test_partitions_are_split_from_future_and_expired_ones_dropped():
+    executed = []
+
+    def execute(query, params=None, fetch=False):
+        if fetch:
+            return [{'name': name} for name in ('p202607', 'p202610', 'p_future')]
+        executed.append(query)
+
+    statements = ensure_partitions(months_ahead=2, retention_months=2,
+                                   today=date(2026, 10, 19), execute=execute)
+
+    assert statements == executed
+    assert statements[0] == (
+        "ALTER TABLE user_logs REORGANIZE PARTITION p_future INTO ("
+        "PARTITION p202611 VALUES LESS THAN ('2026-12-01'), "
+        "PARTITION p202612 VALUES LESS THAN ('2027-01-01'), "
+        "PARTITION p_future VALUES LESS THAN (MAXVALUE))")
+    assert statements[1] == "ALTER TABLE user_logs DROP PARTITION p202607"
@@ -0,0 +1,115 @@
+"""Respostas condicionais (ETag / Last-Modified) de services.conditional"""
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip('mysql.connector')
+
+from flask import Flask
+from flask_login import LoginManager
+
+from web_app.database.database import SessionLocal
+from web_app.database.models import Team
+from web_app.services import conditional
+from web_app.services.conditional import conditional_get, mysql_versioned, versioned
+
+
+@pytest.fixture
+def client(web_db):
+    app = Flask(__name__)
+    app.config['SECRET_KEY'] = 'test'
+    login_manager = LoginManager(app)
+    login_manager.user_loader(lambda user_id: None)
+    calls = []
+
+    @app.route('/teams')
+    @conditional_get(lambda: versioned('teams', Team))
+    def teams():
+        calls.append(1)
+        return 'lista'
+
+    client = app.test_client()
+    client.calls = calls
+    return client
+
+
+def _rename(team_id, name):
+    session = SessionLocal()
+    try:
+        session.get(Team, team_id).name = name
+        session.commit()
+    finally:
+        session.close()
+
+
+def _create_team(name):
+    session = SessionLocal()
+    try:
+        team = Team(name=name)
+        session.add(team)
+        session.commit()
+        return team.id
+    finally:
+        session.close()
+
+
+def test_matching_etag_returns_304_without_running_the_view(client):
+    _create_team('Tigres')
+    first = client.get('/teams')
+    assert first.status_code == 200 and first.headers['ETag']
+    assert first.headers['Cache-Control'] == 'private, no-cache'
+
+    second = client.get('/teams', headers={'If-None-Match': first.headers['ETag']})
+    assert second.status_code == 304
+    assert len(client.calls) == 1
+
+
+def test_same_second_edits_change_the_etag(client):
+    team_id = _create_team('Tigres')
+    etags = [client.get('/teams').headers['ETag']]
+    for name in ('Tigres FC', 'Tigres EC'):
+        _rename(team_id, name)
+        etags.append(client.get('/teams').headers['ETag'])
+
+    # Sem depender do relógio: cada gravação incrementa a revisão
+    assert len(set(etags)) == 3
+
+
+def test_delete_changes_the_etag(client):
+    team_id = _create_team('Tigres')
+    _create_team('Leões')
+    etag = client.get('/teams').headers['ETag']
+
+    session = SessionLocal()
+    try:
+        session.delete(session.get(Team, team_id))
+        session.commit()
+    finally:
+        session.close()
+
+    response = client.get('/teams', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+
+
+def test_mysql_versioned_uses_row_versions(monkeypatch):
+    updated = datetime(2026, 10, 19, 12, 30, 15)
+    rows = [{'version': 3, 'updated_at': updated}]
+    monkeypatch.setattr(conditional, 'execute_query', lambda query, params, fetch: rows)
+
+    version = mysql_versioned('competition', 'SELECT ...', (7,))
+    assert version.last_modified.replace(tzinfo=None) == updated
+
+    rows[0] = {'version': 4, 'updated_at': updated}
+    assert mysql_versioned('competition', 'SELECT ...', (7,)).etag != version.etag
+
+
+def test_mysql_versioned_without_row_or_database(monkeypatch):
+    monkeypatch.setattr(conditional, 'execute_query', lambda query, params, fetch: [])
+    assert mysql_versioned('competition', 'SELECT ...', (7,)) is None
+
+    def offline(query, params, fetch):
+        raise ConnectionError('sem servidor')
+
+    monkeypatch.setattr(conditional, 'execute_query', offline)
+    assert mysql_versioned('competition', 'SELECT ...', (7,)) is None
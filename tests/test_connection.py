@@ -0,0 +1,62 @@
+"""Pool de conexões MySQL (database.connection)"""
+import pytest
+
+pytest.importorskip('mysql.connector')
+
+from database import connection
+from database.connection import DatabaseManager, POOL_RETRY_INTERVAL
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(connection.time, 'monotonic', clock)
+    return clock
+
+
+def test_failed_pool_creation_waits_before_retrying(monkeypatch, clock):
+    attempts = []
+
+    def unavailable(**kwargs):
+        attempts.append(kwargs)
+        raise connection.Error('sem servidor')
+
+    monkeypatch.setattr(connection.pooling, 'MySQLConnectionPool', unavailable)
+    manager = DatabaseManager({'pool_name': 'teste', 'pool_size': 2})
+
+    assert manager._get_pool() is None
+    assert manager._get_pool() is None
+    clock.now += POOL_RETRY_INTERVAL - 1
+    assert manager._get_pool() is None
+    assert len(attempts) == 1
+
+    clock.now += 1
+    assert manager._get_pool() is None
+    assert len(attempts) == 2
+
+
+def test_pool_is_created_once_the_database_is_back(monkeypatch, clock):
+    pool = object()
+    available = []
+
+    def create(**kwargs):
+        if not available:
+            raise connection.Error('sem servidor')
+        return pool
+
+    monkeypatch.setattr(connection.pooling, 'MySQLConnectionPool', create)
+    manager = DatabaseManager({'pool_name': 'teste', 'pool_size': 2})
+
+    assert manager._get_pool() is None
+    available.append(True)
+    clock.now += POOL_RETRY_INTERVAL
+    assert manager._get_pool() is pool
+    assert manager._get_pool() is pool
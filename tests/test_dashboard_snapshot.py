@@ -0,0 +1,88 @@
+"""Dashboard desktop atualizado por diferença (desktop_app.utils.dashboard_snapshot)"""
+from datetime import date, datetime
+
+import pytest
+
+pytest.importorskip('mysql.connector')
+
+from desktop_app.utils.dashboard_snapshot import COUNT_QUERY, DashboardSnapshot
+
+TODAY = date(2026, 10, 19)
+STAMP = datetime(2026, 10, 18, 12, 0)
+
+
+class FakeDatabase:
+    """Tabelas em memória respondendo às consultas do snapshot"""
+
+    def __init__(self):
+        self.tables = {
+            'competitions': {1: {'id': 1, 'name': 'Copa', 'status': 'ongoing',
+                                 'start_date': date(2026, 10, 1), 'updated_at': STAMP}},
+            'teams': {n: {'id': n, 'name': name, 'is_active': True, 'updated_at': STAMP}
+                      for n, name in ((1, 'Tigres'), (2, 'Leões'))},
+            'athletes': {n: {'id': n, 'team_id': 1 + n % 2, 'is_active': True, 'updated_at': STAMP}
+                         for n in range(1, 25)},
+            'games': {1: {'id': 1, 'competition_id': 1, 'home_team_id': 1, 'away_team_id': 2,
+                          'game_date': datetime(2026, 10, 19, 20, 0), 'status': 'scheduled',
+                          'home_score': None, 'away_score': None, 'updated_at': STAMP}},
+        }
+        self.queries = []
+
+    def execute(self, query, params=None, fetch=False):
+        self.queries.append(query)
+        if query == COUNT_QUERY:
+            return [{name: len(rows) for name, rows in self.tables.items()}]
+        table = query.split(' FROM ')[1].split()[0]
+        rows = [dict(row) for row in self.tables[table].values()]
+        if params:
+            rows = [row for row in rows if row['updated_at'] >= params[0]]
+        return rows
+
+
+@pytest.fixture
+def db():
+    return FakeDatabase()
+
+
+@pytest.fixture
+def snapshot(db):
+    snapshot = DashboardSnapshot(execute=db.execute, today=lambda: TODAY)
+    snapshot.refresh()
+    db.queries.clear()
+    return snapshot
+
+
+def test_first_refresh_builds_every_section(db):
+    sections = DashboardSnapshot(execute=db.execute, today=lambda: TODAY).refresh()
+    assert set(sections) == {'stats', 'next_games', 'competitions', 'notifications', 'activity'}
+    assert sections['stats'] == {'competitions': 1, 'teams': 2, 'games_today': 1, 'athletes': 24}
+    assert sections['next_games'] == ('Tigres x Leões - 19/10 20:00 (Copa)',)
+
+
+def test_unchanged_database_costs_one_delta_per_table_and_returns_nothing(db, snapshot):
+    assert snapshot.refresh() == {}
+    assert len(db.queries) == 5
+    assert all('WHERE updated_at >=' in query for query in db.queries[:4])
+
+
+def test_finished_game_updates_only_the_sections_that_changed(db, snapshot):
+    db.tables['games'][1].update(status='finished', home_score=2, away_score=1,
+                                 updated_at=datetime(2026, 10, 19, 22, 0))
+
+    changed = snapshot.refresh()
+
+    assert changed['activity'] == ('🏆 Tigres 2 x 1 Leões',)
+    assert changed['competitions'] == ('Copa - 100% concluída',)
+    assert changed['next_games'] == ()
+    assert 'stats' not in changed
+
+
+def test_deletion_is_detected_by_the_counts(db, snapshot):
+    del db.tables['teams'][2]
+    for athlete_id in [a for a, row in db.tables['athletes'].items() if row['team_id'] == 2]:
+        del db.tables['athletes'][athlete_id]
+
+    changed = snapshot.refresh()
+
+    assert changed['stats']['teams'] == 1
+    assert changed['next_games'] == ('Tigres x N/A - 19/10 20:00 (Copa)',)
@@ -0,0 +1,71 @@
+"""Contadores do dashboard web (services.dashboard_stats)"""
+import threading
+
+from web_app.database.database import SessionLocal
+from web_app.database.models import Competition, Game, Player, Team
+from web_app.services.dashboard_stats import DashboardStatsService
+
+
+def _seed():
+    session = SessionLocal()
+    try:
+        home, away = Team(name='Tigres'), Team(name='Leões')
+        session.add_all([home, away, Player(name='Ana', team=home),
+                         Competition(name='Copa', is_active=True),
+                         Competition(name='Antiga', is_active=False)])
+        session.flush()
+        session.add_all([Game(home_team_id=home.id, away_team_id=away.id, status='finished'),
+                         Game(home_team_id=home.id, away_team_id=away.id, status='Scheduled'),
+                         Game(home_team_id=away.id, away_team_id=home.id, status='scheduled')])
+        session.commit()
+    finally:
+        session.close()
+
+
+def test_counters_come_from_one_query(web_db):
+    _seed()
+    assert DashboardStatsService().get_stats() == {
+        'total_teams': 2, 'total_players': 1, 'total_games': 3, 'recent_games': 1,
+        'scheduled_games': 2, 'total_competitions': 2, 'active_competitions': 1
+    }
+
+
+def test_cached_until_invalidated(web_db, monkeypatch):
+    service = DashboardStatsService(ttl=60)
+    loads = []
+    original = service._load
+    monkeypatch.setattr(service, '_load', lambda: loads.append(1) or original())
+
+    assert service.get_stats()['total_teams'] == 0
+    _seed()
+    assert service.get_stats()['total_teams'] == 0
+    service.invalidate()
+    assert service.get_stats()['total_teams'] == 2
+    assert len(loads) == 2
+
+
+def test_concurrent_misses_load_once(web_db, monkeypatch):
+    service = DashboardStatsService()
+    started, release = threading.Event(), threading.Event()
+    loads = []
+
+    def slow_load():
+        loads.append(1)
+        started.set()
+        release.wait(5)
+        return {'total_teams': 7}
+
+    monkeypatch.setattr(service, '_load', slow_load)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(service.get_stats()))
+               for _ in range(4)]
+    threads[0].start()
+    started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert loads == [1]
+    assert results == [{'total_teams': 7}] * 4
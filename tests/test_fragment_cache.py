@@ -0,0 +1,129 @@
+"""Cache de fragmentos (services.fragment_cache) e tabela de classificação em cache"""
+from datetime import date
+
+import pytest
+
+pytest.importorskip('mysql.connector')
+
+from database.models import Competition as DesktopCompetition, CompetitionFormat, SportType
+from web_app.app import create_app
+from web_app.database.database import SessionLocal
+from web_app.database.models import Competition, Game, Team, User
+from web_app.routes import competitionroutes
+from web_app.services.conditional import ResourceVersion
+from web_app.services.fragment_cache import FragmentCache, fragment_cache
+
+STANDINGS = [
+    {'position': 1, 'team_name': 'Tigres', 'team_short_name': 'TIG', 'games_played': 2, 'wins': 2,
+     'draws': 0, 'losses': 0, 'goals_for': 5, 'goals_against': 1, 'goal_difference': 4, 'points': 6,
+     'sets_for': 0, 'sets_against': 0},
+    {'position': 2, 'team_name': 'Leões', 'team_short_name': None, 'games_played': 2, 'wins': 0,
+     'draws': 0, 'losses': 2, 'goals_for': 1, 'goals_against': 5, 'goal_difference': -4, 'points': 0,
+     'sets_for': 0, 'sets_against': 0},
+]
+
+
+def test_invalidation_is_scoped_to_the_competition():
+    cache = FragmentCache()
+    renders = []
+
+    def render(name):
+        return lambda: renders.append(name) or name
+
+    for _ in range(2):
+        cache.get_or_render('tabela', render('c1'), competition=1)
+        cache.get_or_render('tabela', render('c2'), competition=2)
+        cache.get_or_render('resumo', render('all'), competition='all')
+    assert renders == ['c1', 'c2', 'all']
+
+    cache.invalidate_competition(1)
+    for competition, name in ((1, 'c1'), (2, 'c2'), ('all', 'all')):
+        cache.get_or_render('tabela' if competition != 'all' else 'resumo', render(name),
+                            competition=competition)
+    assert renders == ['c1', 'c2', 'all', 'c1', 'all']
+
+
+def test_lru_drops_oldest_entries():
+    cache = FragmentCache(max_entries=2)
+    for key in 'abc':
+        cache.get_or_render(key, lambda: key)
+    assert cache.misses == 3
+    cache.get_or_render('a', lambda: 'a')
+    assert cache.misses == 4
+
+
+def test_game_commit_bumps_only_its_competition(web_db):
+    create_app({'TESTING': True})
+    session = SessionLocal()
+    try:
+        home, away = Team(name='Casa'), Team(name='Fora')
+        copa, liga = Competition(name='Copa'), Competition(name='Liga')
+        session.add_all([home, away, copa, liga])
+        session.commit()
+        generations = {copa.id: fragment_cache._generation(copa.id),
+                       liga.id: fragment_cache._generation(liga.id)}
+
+        session.add(Game(home_team_id=home.id, away_team_id=away.id, competition_id=copa.id))
+        session.commit()
+
+        assert fragment_cache._generation(copa.id) == generations[copa.id] + 1
+        assert fragment_cache._generation(liga.id) == generations[liga.id]
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def standings_client(web_db, monkeypatch):
+    calls = []
+    versions = ['v1']
+    competition = DesktopCompetition(id=7, name='Copa Regional', sport=SportType.FUTSAL,
+                                     format_type=CompetitionFormat.ROUND_ROBIN,
+                                     start_date=date(2026, 3, 1), status='active')
+    controller = competitionroutes.competition_controller
+    monkeypatch.setattr(controller, 'get_competition_by_id', lambda competition_id: competition)
+    monkeypatch.setattr(controller, 'get_standings', lambda competition_id: calls.append(competition_id) or STANDINGS)
+    monkeypatch.setattr(competitionroutes, 'mysql_versioned',
+                        lambda name, query, params: ResourceVersion(versions[0]) if versions[0] else None)
+
+    app = create_app({'TESTING': True})
+    session = SessionLocal()
+    try:
+        user = User(username='admin', email='admin@example.com', password_hash='-', name='Admin')
+        session.add(user)
+        session.commit()
+        user_id = user.id
+    finally:
+        session.close()
+
+    client = app.test_client()
+    with client.session_transaction() as flask_session:
+        flask_session['_user_id'] = str(user_id)
+    client.calls, client.versions = calls, versions
+    return client
+
+
+def test_standings_table_is_cached_per_mysql_version(standings_client):
+    first = standings_client.get('/competitions/7/standings')
+    assert first.status_code == 200
+    html = first.get_data(as_text=True)
+    assert 'Tigres' in html and '(TIG)' in html and '100.0%' in html and '01/03/2026' in html
+
+    standings_client.get('/competitions/7/standings')
+    assert standings_client.calls == [7]
+
+    standings_client.versions[0] = 'v2'
+    standings_client.get('/competitions/7/standings')
+    assert standings_client.calls == [7, 7]
+
+
+def test_standings_without_version_are_not_cached(standings_client):
+    standings_client.versions[0] = None
+    for _ in range(2):
+        assert standings_client.get('/competitions/7/standings').status_code == 200
+    assert standings_client.calls == [7, 7]
+
+
+def test_statistics_page_renders_without_fragment_cache(standings_client):
+    misses = fragment_cache.misses
+    assert standings_client.get('/dashboard/statistics').status_code == 200
+    assert fragment_cache.misses == misses
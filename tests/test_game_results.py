@@ -0,0 +1,127 @@
+"""Ingestão em lote de resultados (services.game_results) e rotas que a usam"""
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip('mysql.connector')
+
+from web_app.app import create_app
+from web_app.database.database import SessionLocal
+from web_app.database.models import (Competition, Game, Player, PlayerStatistic, Team,
+                                     TeamCompetition, User)
+from web_app.routes import gameroutes
+from web_app.services import game_results
+from web_app.services.game_results import ingest_results
+from web_app.services.query_counter import count_statements
+
+
+@pytest.fixture
+def published(monkeypatch):
+    events = []
+    monkeypatch.setattr(game_results.live_event_hub, 'publish',
+                        lambda kind, payload, **scope: events.append((kind, payload, scope)))
+    return events
+
+
+def _seed(games, name='Copa'):
+    session = SessionLocal()
+    try:
+        competition = Competition(name=name)
+        teams = [Team(name=f'{name} {n}') for n in range(2 * games)]
+        session.add_all([competition, *teams])
+        session.flush()
+        session.add_all(TeamCompetition(team_id=team.id, competition_id=competition.id) for team in teams)
+        players = [Player(name=f'Jogador {team.id}', team_id=team.id) for team in teams]
+        rows = [Game(home_team_id=home.id, away_team_id=away.id, competition_id=competition.id,
+                     game_date=datetime(2026, 5, 1), status='scheduled')
+                for home, away in zip(teams[::2], teams[1::2])]
+        session.add_all(players + rows)
+        session.commit()
+        return [(game.id, game.home_team_id) for game in rows], {p.team_id: p.id for p in players}
+    finally:
+        session.close()
+
+
+def _batch(games, players):
+    return [{'game_id': game_id, 'home_score': 2, 'away_score': 1,
+             'events': [{'player_id': players[home_id], 'type': 'goal', 'minute': 10}]}
+            for game_id, home_id in games]
+
+
+def _statements_for(games):
+    batch = _batch(*_seed(games, name=f'Copa {games}'))
+    with count_statements() as statements:
+        outcome = ingest_results(batch)
+    assert outcome['updated'] == games
+    return len(statements)
+
+
+def test_statement_count_does_not_grow_with_the_batch(web_db, published):
+    # Primeiro lote cria as linhas de resource_revisions (INSERT no lugar do UPDATE)
+    _statements_for(1)
+    few = _statements_for(2)
+    many = _statements_for(12)
+    assert few == many
+    assert len(published) == 15
+
+
+def test_published_scores_match_the_batch(web_db, published):
+    games, players = _seed(2)
+    outcome = ingest_results(_batch(games, players) + [{'game_id': 999, 'home_score': 1, 'away_score': 0}])
+
+    assert (outcome['updated'], outcome['failed']) == (2, 1)
+    assert [payload for _, payload, _ in published] == [
+        {'game_id': game_id, 'home_score': 2, 'away_score': 1, 'status': 'finished'}
+        for game_id, _ in games]
+
+    session = SessionLocal()
+    try:
+        assert session.query(PlayerStatistic).count() == 2
+        assert sorted(r.points for r in session.query(TeamCompetition)) == [0, 0, 3, 3]
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client(web_db, published, monkeypatch):
+    monkeypatch.setattr(gameroutes, 'render_template', lambda template, **context: template)
+    app = create_app({'TESTING': True})
+    session = SessionLocal()
+    try:
+        user = User(username='admin', email='admin@example.com', password_hash='-', name='Admin')
+        session.add(user)
+        session.commit()
+        user_id = user.id
+    finally:
+        session.close()
+
+    client = app.test_client()
+    with client.session_transaction() as flask_session:
+        flask_session['_user_id'] = str(user_id)
+    return client
+
+
+def test_results_endpoint(client):
+    games, players = _seed(2)
+
+    response = client.post('/api/games/results', json={'results': _batch(games, players)})
+    assert response.status_code == 200
+    assert response.get_json()['updated'] == 2
+
+    assert client.post('/api/games/results', json={'results': []}).status_code == 400
+
+
+def test_result_form_writes_the_same_store(client, published):
+    (game_id, _), = _seed(1)[0]
+
+    response = client.post(f'/games/{game_id}/result',
+                           data={'home_team_score': '3', 'away_team_score': '0'})
+    assert response.status_code == 302
+
+    session = SessionLocal()
+    try:
+        game = session.get(Game, game_id)
+        assert (game.home_score, game.away_score, game.status) == (3, 0, 'finished')
+    finally:
+        session.close()
+    assert published[0][1]['game_id'] == game_id
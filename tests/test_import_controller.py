@@ -0,0 +1,155 @@
+"""Importação de atletas em lote (desktop_app.controllers.import_controller)"""
+import io
+import sqlite3
+from contextlib import contextmanager
+
+import pytest
+
+pytest.importorskip('mysql.connector')
+
+from desktop_app.controllers.import_controller import AthleteImporter, ImportFormatError
+
+SCHEMA = """
+CREATE TABLE teams (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT COLLATE NOCASE,
+                    short_name TEXT, is_active BOOL);
+CREATE TABLE athletes (id INTEGER PRIMARY KEY AUTOINCREMENT, team_id INT, name TEXT,
+                       jersey_number INT, position TEXT, birth_date TEXT, document_number TEXT,
+                       phone TEXT, email TEXT, emergency_contact TEXT, emergency_phone TEXT,
+                       is_captain BOOL, is_active BOOL, UNIQUE (team_id, jersey_number));
+INSERT INTO teams (name, is_active) VALUES ('Tigres', 1);
+INSERT INTO athletes (team_id, name, jersey_number, is_captain, is_active)
+VALUES (1, 'Velho', 10, 1, 1), (1, 'Inativo', 7, 0, 0);
+"""
+
+CSV = """Equipe;Nome;Camisa;Nascimento;CPF;Email;Telefone;Capitão
+Tigres;Ana;10;01/02/2000;;;;
+Tigres;Bia;7;;;;;
+Tigres;Carla;11;31/02/2000;;;;
+Tigres;Duda;12;;111.444.777-35;d@x.com;(11) 99999-9999;sim
+Tigres;Eva;13;;123;;;sim
+Leões;Fabi;10;;;bad@;;s
+Leões;Gabi;10;;;;;
+;;;;;;;
+Leões;Hana;abc;;;;;talvez
+"""
+
+
+class FakeMySQL:
+    """Conexão no formato do mysql.connector sobre um SQLite em memória"""
+
+    def __init__(self):
+        self.db = sqlite3.connect(':memory:')
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript(SCHEMA)
+        self.statements = 0
+
+    def cursor(self, dictionary=False):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.db.commit()
+
+    def rollback(self):
+        self.db.rollback()
+
+    @contextmanager
+    def connect(self):
+        yield self
+
+    def query(self, sql):
+        return [dict(row) for row in self.db.execute(sql)]
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+        self.cursor = connection.db.cursor()
+
+    def execute(self, sql, params=()):
+        self.connection.statements += 1
+        self.cursor.execute(sql.replace('%s', '?'), list(params))
+
+    def executemany(self, sql, rows):
+        self.connection.statements += 1
+        self.cursor.executemany(sql.replace('%s', '?'), rows)
+
+    def fetchall(self):
+        return [dict(row) for row in self.cursor.fetchall()]
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def mysql():
+    return FakeMySQL()
+
+
+def _errors(report):
+    return [(error.line, error.column) for error in report.errors]
+
+
+EXPECTED_ERRORS = [
+    (2, 'jersey_number'),   # camisa de um atleta ativo
+    (3, 'jersey_number'),   # camisa de um atleta inativo (chave única no banco)
+    (4, 'birth_date'),
+    (6, 'document_number'),
+    (7, 'email'),
+    (10, 'jersey_number'),
+    (10, 'is_captain'),
+]
+
+
+def test_invalid_rows_do_not_block_the_others(mysql):
+    report = AthleteImporter(connect=mysql.connect, chunk_size=3).run(io.StringIO(CSV))
+
+    assert report.total_rows == 8
+    assert report.imported == 2
+    assert report.teams_created == 1
+    assert report.captains_replaced == 1
+    assert _errors(report) == EXPECTED_ERRORS
+    assert report.rejected_lines == 6
+
+    athletes = {row['name']: row for row in mysql.query("SELECT * FROM athletes")}
+    assert set(athletes) == {'Velho', 'Inativo', 'Duda', 'Gabi'}
+    # Novo capitão substitui o anterior da equipe
+    assert athletes['Duda']['is_captain'] == 1 and athletes['Velho']['is_captain'] == 0
+    assert [row['name'] for row in mysql.query("SELECT name FROM teams")] == ['Tigres', 'Leões']
+
+
+def test_dry_run_validates_without_writing(mysql):
+    report = AthleteImporter(connect=mysql.connect, chunk_size=3).run(io.StringIO(CSV), dry_run=True)
+
+    assert report.dry_run and report.imported == 2
+    assert _errors(report) == EXPECTED_ERRORS
+    assert 'seriam importados' in report.summary()
+    assert mysql.query("SELECT COUNT(*) AS n FROM athletes")[0]['n'] == 2
+    assert mysql.query("SELECT COUNT(*) AS n FROM teams")[0]['n'] == 1
+
+
+def test_missing_required_column_rejects_the_file(mysql):
+    with pytest.raises(ImportFormatError, match='team'):
+        AthleteImporter(connect=mysql.connect).run(io.StringIO("nome;camisa\nAna;1\n"))
+
+
+def test_errors_csv_report(mysql):
+    report = AthleteImporter(connect=mysql.connect).run(io.StringIO(CSV))
+    target = io.StringIO()
+    report.write_errors_csv(target)
+
+    lines = target.getvalue().splitlines()
+    assert lines[0] == 'linha;coluna;erro'
+    assert lines[4] == '6;document_number;CPF inválido: 123'
+    assert len(lines) == len(EXPECTED_ERRORS) + 1
+
+
+def test_statements_grow_with_chunks_not_rows(mysql):
+    lines = ["equipe,nome,camisa"]
+    lines += [f"Time {i % 20},Atleta {i},{i // 20}" for i in range(400)]
+
+    report = AthleteImporter(connect=mysql.connect, chunk_size=100).run(io.StringIO("\n".join(lines)))
+
+    assert report.imported == 400 and not report.errors
+    assert report.teams_created == 20
+    # No máximo 5 comandos por bloco de 100 linhas (docstring do módulo)
+    assert mysql.statements <= 4 * 5
@@ -0,0 +1,108 @@
+"""Rankings top-k com índices incrementais (database.leaderboards)"""
+import random
+import sqlite3
+
+import pytest
+
+pytest.importorskip('mysql.connector')
+
+from database import leaderboards
+from database.athlete_statistics import STAT_COLUMNS
+from database.leaderboards import INDEX_SIZE, LeaderboardService
+
+
+@pytest.fixture
+def db(monkeypatch):
+    db = sqlite3.connect(':memory:')
+    db.row_factory = sqlite3.Row
+    db.executescript(f"""
+        CREATE TABLE competitions (id INTEGER PRIMARY KEY, sport TEXT);
+        CREATE TABLE teams (id INTEGER PRIMARY KEY, name TEXT);
+        CREATE TABLE athletes (id INTEGER PRIMARY KEY, name TEXT, team_id INT);
+        CREATE TABLE athlete_statistics (athlete_id INT, competition_id INT, games_played INT,
+                                         {', '.join(f'{c} INT DEFAULT 0' for c in STAT_COLUMNS)},
+                                         updated_at TEXT DEFAULT '2026-10-01 10:00:00');
+        INSERT INTO competitions VALUES (1, 'football'), (2, 'football');
+        INSERT INTO teams VALUES (1, 'Tigres'), (2, 'Leões');
+    """)
+    rng = random.Random(28)
+    for athlete_id in range(1, 121):
+        db.execute("INSERT INTO athletes VALUES (?, ?, ?)", (athlete_id, f'Atleta {athlete_id}', athlete_id % 2 + 1))
+        for competition_id in (1, 2):
+            db.execute("INSERT INTO athlete_statistics (athlete_id, competition_id, games_played, "
+                       "goals_scored, points_scored, yellow_cards, red_cards) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                       (athlete_id, competition_id, rng.randint(1, 10), rng.randint(0, 15),
+                        rng.randint(0, 15), rng.randint(0, 4), rng.randint(0, 1)))
+
+    def execute_query(query, params=None, fetch=False):
+        cursor = db.execute(query.replace('%s', '?'), params or ())
+        return [dict(row) for row in cursor.fetchall()] if fetch else cursor.rowcount
+
+    monkeypatch.setattr(leaderboards, 'execute_query', execute_query)
+    return db
+
+
+def _expected(db, stat_columns, competition_id=None, k=10):
+    """Ranking calculado direto no banco, com o mesmo desempate"""
+    where = "WHERE competition_id = ?" if competition_id else ""
+    value = ' + '.join(f'SUM({c})' for c in stat_columns)
+    rows = db.execute(f"SELECT athlete_id, {value} AS value, SUM(games_played) AS games "
+                      f"FROM athlete_statistics {where} GROUP BY athlete_id "
+                      f"HAVING value > 0 ORDER BY value DESC, games ASC, athlete_id ASC LIMIT ?",
+                      ((competition_id,) if competition_id else ()) + (k,)).fetchall()
+    return [(row['athlete_id'], row['value']) for row in rows]
+
+
+def _ids(ranking):
+    return [(row['athlete_id'], row['value']) for row in ranking]
+
+
+def test_top_k_matches_full_ranking(db):
+    service = LeaderboardService()
+    assert _ids(service.top_competition(1, 'goals')) == _expected(db, ('goals_scored',), 1)
+    assert _ids(service.top_competition(2, 'cards', k=5)) == _expected(db, ('yellow_cards', 'red_cards'), 2, 5)
+    assert _ids(service.top_overall('points', k=INDEX_SIZE + 10)) == _expected(db, ('points_scored',), k=INDEX_SIZE + 10)
+    assert _ids(service.top_sport('football', 'goals')) == _expected(db, ('goals_scored',))
+
+
+def test_deltas_keep_the_index_in_order(db):
+    service = LeaderboardService()
+    service.top_competition(1, 'goals')
+    rng = random.Random(1)
+    for _ in range(300):
+        athlete_id = rng.randint(1, 120)
+        delta = {'goals_scored': rng.choice((-2, -1, 1, 3))}
+        service._on_statistics_changed(1, {athlete_id: delta})
+        db.execute("UPDATE athlete_statistics SET goals_scored = MAX(goals_scored + ?, 0) "
+                   "WHERE athlete_id = ? AND competition_id = 1", (delta['goals_scored'], athlete_id))
+
+    assert _ids(service.top_competition(1, 'goals', k=20)) == _expected(db, ('goals_scored',), 1, 20)
+
+
+def test_new_athlete_joins_from_delta(db):
+    service = LeaderboardService()
+    service.top_competition(1, 'goals')
+    db.execute("INSERT INTO athletes VALUES (500, 'Estreante', 1)")
+
+    service._on_statistics_changed(1, {500: {'games_played': 1, 'goals_scored': 99}})
+
+    top = service.top_competition(1, 'goals', k=1)[0]
+    assert (top['athlete_id'], top['value'], top['team_name']) == (500, 99, 'Tigres')
+
+
+def test_refresh_reads_changes_from_other_clients(db):
+    service = LeaderboardService(refresh_interval=0)
+    service.top_competition(1, 'goals')
+
+    db.execute("UPDATE athlete_statistics SET goals_scored = 80, updated_at = '2026-10-01 11:00:00' "
+               "WHERE athlete_id = 7 AND competition_id = 1")
+    assert service.top_competition(1, 'goals', k=1)[0]['athlete_id'] == 7
+
+    # Remoção (reconstrução) muda a contagem: o escopo é relido por inteiro
+    db.execute("DELETE FROM athlete_statistics WHERE athlete_id = 7")
+    assert 7 not in [row['athlete_id'] for row in service.top_competition(1, 'goals', k=INDEX_SIZE)]
+
+
+def test_invalid_stat_is_rejected(db):
+    with pytest.raises(ValueError):
+        LeaderboardService().top_overall('assists')
@@ -0,0 +1,42 @@
+"""Hub de eventos ao vivo (desktop_app.utils.live_events) e fan-out SQLite"""
+import runpy
+from pathlib import Path
+
+from desktop_app.utils.live_events import LiveEventHub, game_channel
+
+
+def test_fanout_is_on_by_default(monkeypatch):
+    monkeypatch.delenv('LIVE_EVENTS_DB', raising=False)
+    settings = runpy.run_path(str(Path(__file__).resolve().parent.parent / 'config' / 'settings.py'))
+    assert Path(settings['LIVE_EVENTS_CONFIG']['db']).parts[-2:] == ('data', 'live_events.sqlite3')
+
+    monkeypatch.setenv('LIVE_EVENTS_DB', '')
+    settings = runpy.run_path(str(Path(__file__).resolve().parent.parent / 'config' / 'settings.py'))
+    assert settings['LIVE_EVENTS_CONFIG']['db'] == ''
+
+
+def test_events_cross_hubs_sharing_the_file(tmp_path):
+    path = str(tmp_path / 'fanout' / 'live_events.sqlite3')
+    publisher, listener = LiveEventHub(), LiveEventHub()
+    publisher.configure(path)
+    listener.configure(path)
+
+    subscription = listener.subscribe([game_channel(1)])
+    try:
+        publisher.publish('score', {'home_score': 1, 'away_score': 0}, game_id=1, competition_id=3)
+        event = subscription.get(timeout=5)
+    finally:
+        listener.unsubscribe(subscription)
+
+    assert event['type'] == 'score' and event['data'] == {'home_score': 1, 'away_score': 0}
+    assert subscription.get(timeout=0.1) is None
+
+
+def test_unusable_path_falls_back_to_the_process(tmp_path):
+    hub = LiveEventHub()
+    hub.configure(str(tmp_path))
+    assert hub.fanout is None
+
+    subscription = hub.subscribe([game_channel(2)])
+    hub.publish('status', {'status': 'finished'}, game_id=2)
+    assert subscription.get(timeout=1)['data'] == {'status': 'finished'}
@@ -0,0 +1,250 @@
+"""
+Réplica local e outbox (desktop_app.utils.local_replica)
+
+O "servidor" é um SQLite em memória com o mesmo contrato do MySQL usado
+pela réplica: placeholders %s, coluna version incrementada por gatilho a
+cada UPDATE e client_uuid único.
+"""
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip('mysql.connector')
+
+from desktop_app.utils.local_replica import TABLES, LocalReplica
+
+
+class FakeServer:
+    def __init__(self):
+        self.db = sqlite3.connect(':memory:')
+        self.db.row_factory = sqlite3.Row
+        self.online = True
+        for spec in TABLES.values():
+            columns = ', '.join('id INTEGER PRIMARY KEY AUTOINCREMENT' if name == 'id' else name
+                                for name in spec.column_names)
+            self.db.execute(f"CREATE TABLE {spec.name} ({columns}, version INTEGER DEFAULT 1, "
+                            f"updated_at TEXT DEFAULT '2026-01-01 00:00:00', client_uuid TEXT UNIQUE)")
+            tracked = ', '.join(name for name in spec.column_names if name != 'id')
+            self.db.execute(f"CREATE TRIGGER {spec.name}_version AFTER UPDATE OF {tracked} ON {spec.name} "
+                            f"BEGIN UPDATE {spec.name} SET version = OLD.version + 1, "
+                            f"updated_at = datetime('now') WHERE id = NEW.id; END")
+        self.db.executescript("""
+            CREATE TABLE team_registrations (competition_id, team_id);
+            INSERT INTO competitions (id, name, status) VALUES (1, 'Copa', 'ongoing');
+            INSERT INTO teams (id, name, is_active) VALUES (1, 'Tigres', 1), (2, 'Leões', 1);
+            INSERT INTO team_registrations VALUES (1, 1), (1, 2);
+            INSERT INTO athletes (id, team_id, name, is_active) VALUES (10, 1, 'Ana', 1);
+            INSERT INTO games (id, competition_id, home_team_id, away_team_id, status,
+                               home_score, away_score, game_date)
+            VALUES (5, 1, 1, 2, 'scheduled', 0, 0, '2026-10-19 10:00:00');
+        """)
+
+    def execute(self, query, params=None, fetch=False):
+        if not self.online:
+            raise ConnectionError('sem conexão')
+        cursor = self.db.execute(query.replace('%s', '?'), params or ())
+        if fetch:
+            return [dict(row) for row in cursor.fetchall()]
+        return cursor.lastrowid if query.lstrip().upper().startswith('INSERT') else cursor.rowcount
+
+    def row(self, table, row_id):
+        return dict(self.db.execute(f"SELECT * FROM {table} WHERE id = ?", (row_id,)).fetchone())
+
+    def count(self, table):
+        return self.db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+@pytest.fixture
+def server():
+    return FakeServer()
+
+
+@pytest.fixture
+def replica(server):
+    replica = LocalReplica(':memory:', [1], execute=server.execute)
+    assert replica.sync(), replica.last_error
+    return replica
+
+
+def _event(athlete_id=10, event_type='goal'):
+    return {'game_id': 5, 'athlete_id': athlete_id, 'event_type': event_type, 'points_value': 1}
+
+
+def test_initial_pull_holds_tracked_competition(replica):
+    assert replica.holds('games', 5)
+    assert replica.holds('teams', 2)
+    assert replica.holds('athletes', 10)
+
+
+def test_offline_changes_are_pushed_on_reconnect(server, replica):
+    pushed = []
+    replica.on_pushed('game_events', lambda op, row_id, payload: pushed.append((op, row_id)))
+
+    server.online = False
+    replica.update('games', 5, {'status': 'ongoing'})
+    replica.update('games', 5, {'home_score': 2})
+    kept = replica.insert('game_events', _event())
+    dropped = replica.insert('game_events', _event())
+    replica.delete('game_events', dropped)
+
+    assert kept < 0
+    assert replica.status()['pending'] == 2
+    assert not replica.sync() and not replica.online
+
+    server.online = True
+    assert replica.sync(), replica.last_error
+    assert replica.status()['pending'] == 0
+
+    game = server.row('games', 5)
+    assert (game['status'], game['home_score'], game['version']) == ('ongoing', 2, 2)
+    assert replica.get('games', 5)['version'] == 2
+    assert server.count('game_events') == 1
+    new_id = replica.rows('game_events')[0]['id']
+    assert new_id > 0 and pushed == [('insert', new_id)]
+
+
+def test_concurrent_server_edit_becomes_conflict(server, replica):
+    server.db.execute("UPDATE games SET away_score = 7 WHERE id = 5")
+    replica.update('games', 5, {'home_score': 3})
+    replica.sync()
+
+    conflicts = replica.conflicts()
+    assert len(conflicts) == 1
+    assert replica.get('games', 5)['away_score'] == 7
+    assert replica.get('games', 5)['home_score'] == 0
+
+    replica.resolve_conflict(conflicts[0]['id'], keep_local=True)
+    replica.sync()
+    assert server.row('games', 5)['home_score'] == 3
+
+
+def test_incremental_pull_applies_server_inserts_and_deletes(server, replica):
+    server.db.execute("INSERT INTO athletes (id, team_id, name, is_active, updated_at) "
+                      "VALUES (11, 2, 'Bia', 1, '2026-02-01 00:00:00')")
+    server.db.execute("DELETE FROM athletes WHERE id = 10")
+    replica.sync()
+
+    assert replica.holds('athletes', 11)
+    assert not replica.holds('athletes', 10)
+
+
+def test_update_made_while_another_is_in_flight(server, replica):
+    def racing(query, params=None, fetch=False):
+        if query.startswith('UPDATE games'):
+            replica.execute = server.execute
+            replica.update('games', 5, {'away_score': 9})
+        return server.execute(query, params, fetch)
+
+    replica.execute = racing
+    replica.update('games', 5, {'home_score': 4})
+    replica.sync()
+    replica.sync()
+
+    game = server.row('games', 5)
+    assert (game['home_score'], game['away_score']) == (4, 9)
+    assert replica.status()['pending'] == 0
+    assert not replica.conflicts()
+
+
+def test_lost_insert_reply_does_not_duplicate(server, replica):
+    pushed = []
+    replica.on_pushed('game_events', lambda op, row_id, payload: pushed.append(op))
+
+    def lost_reply(query, params=None, fetch=False):
+        result = server.execute(query, params, fetch)
+        if query.startswith('INSERT INTO game_events'):
+            raise ConnectionError('resposta perdida')
+        return result
+
+    replica.execute = lost_reply
+    replica.insert('game_events', _event())
+    assert not replica.sync()
+
+    replica.execute = server.execute
+    assert replica.sync(), replica.last_error
+    assert server.count('game_events') == 1
+    assert pushed == ['insert']
+    assert replica.rows('game_events')[0]['id'] > 0
+
+
+def test_delete_while_insert_is_in_flight(server, replica):
+    def delete_during_insert(query, params=None, fetch=False):
+        result = server.execute(query, params, fetch)
+        if query.startswith('INSERT INTO game_events'):
+            replica.delete('game_events', temp_id)
+        return result
+
+    replica.execute = delete_during_insert
+    temp_id = replica.insert('game_events', _event(event_type='foul'))
+    replica.sync()
+    replica.execute = server.execute
+    replica.sync()
+
+    assert server.count('game_events') == 0
+    assert replica.status()['pending'] == 0
+    assert not replica.conflicts()
+
+
+class Clock:
+    def __init__(self):
+        self.now = datetime(2026, 10, 19, 12, 0)
+
+    def __call__(self):
+        return self.now
+
+
+def _rejecting_teams(server, attempts):
+    def execute(query, params=None, fetch=False):
+        if query.startswith('INSERT INTO teams'):
+            attempts.append(query)
+            raise ValueError('nome de equipe duplicado')
+        return server.execute(query, params, fetch)
+    return execute
+
+
+def test_rejected_entry_waits_before_retrying(server):
+    attempts = []
+    clock = Clock()
+    replica = LocalReplica(':memory:', [1], execute=_rejecting_teams(server, attempts),
+                           sync_interval=10, max_push_attempts=3, now=clock)
+    assert replica.sync(), replica.last_error
+    replica.insert('teams', {'name': 'Tigres', 'is_active': True})
+    replica.update('games', 5, {'home_score': 1})
+
+    assert replica.sync() and replica.sync()
+    assert len(attempts) == 1
+    # As entradas posteriores esperam a recusada, na ordem em que foram feitas
+    assert server.row('games', 5)['home_score'] == 0
+
+    clock.now += timedelta(seconds=10)
+    replica.sync()
+    assert len(attempts) == 2
+    clock.now += timedelta(seconds=10)
+    replica.sync()
+    assert len(attempts) == 2
+
+    clock.now += timedelta(seconds=10)
+    replica.sync()
+    assert len(attempts) == 3
+    assert [conflict['table_name'] for conflict in replica.conflicts()] == ['teams']
+    assert server.row('games', 5)['home_score'] == 1
+
+
+def test_rejected_insert_cascades_to_dependent_entries(server):
+    attempts = []
+    replica = LocalReplica(':memory:', [1], execute=_rejecting_teams(server, attempts),
+                           max_push_attempts=1)
+    team_id = replica.insert('teams', {'name': 'Tigres', 'is_active': True})
+    replica.update('teams', team_id, {'short_name': 'TIG'})
+    athlete_id = replica.insert('athletes', {'team_id': team_id, 'name': 'Caio', 'is_active': True})
+    replica.insert('game_events', _event(athlete_id=athlete_id))
+    replica.insert('game_events', _event())
+
+    assert replica.sync(), replica.last_error
+
+    conflicts = {(conflict['table_name'], conflict['row_id']) for conflict in replica.conflicts()}
+    assert conflicts == {('teams', team_id), ('athletes', athlete_id), ('game_events', -1)}
+    assert replica.status()['pending'] == 0
+    assert server.count('athletes') == 1
+    assert server.count('game_events') == 1
@@ -0,0 +1,47 @@
+"""Hash de senhas com bcrypt (desktop_app.utils.password_hasher)"""
+import hashlib
+
+import pytest
+
+pytest.importorskip('bcrypt')
+
+from desktop_app.utils.password_hasher import PasswordHasher, is_legacy_hash
+
+
+@pytest.fixture
+def hasher():
+    # Custo mínimo do bcrypt: o teste não mede tempo
+    hasher = PasswordHasher(target_ms=0, workers=2, min_rounds=4, max_rounds=6)
+    yield hasher
+    hasher.shutdown()
+
+
+def test_hash_and_verify(hasher):
+    hashed = hasher.hash('segredo')
+    assert hashed.startswith('$2b$04$')
+    assert hasher.verify('segredo', hashed)
+    assert not hasher.verify('errado', hashed)
+    assert not hasher.verify('segredo', 'não é um hash')
+    assert not hasher.verify('segredo', '')
+
+
+def test_legacy_sha256_is_accepted_and_flagged_for_rehash(hasher):
+    legacy = hashlib.sha256(b'segredo').hexdigest()
+    assert is_legacy_hash(legacy)
+    assert hasher.verify('segredo', legacy)
+    assert hasher.needs_rehash(legacy)
+    assert not hasher.needs_rehash(hasher.hash('segredo'))
+
+
+def test_calibration_raises_the_cost_up_to_the_target(hasher):
+    old = hasher.hash('segredo')
+    hasher.target_ms = 10 ** 6
+    assert hasher.calibrate() == 6
+    assert hasher.needs_rehash(old)
+    assert not hasher.needs_rehash(hasher.hash('segredo'))
+
+
+def test_dummy_hash_is_reused_at_the_same_cost(hasher):
+    dummy = hasher.dummy_hash()
+    assert dummy == hasher.dummy_hash()
+    assert not hasher.verify('', dummy)
@@ -0,0 +1,90 @@
+"""Renderizador incremental de PDF (desktop_app.utils.pdf_renderer)"""
+import io
+import re
+
+import pytest
+
+from desktop_app.utils.pdf_renderer import (PageBreak, PDFReportRenderer, TableSection,
+                                            TextSection, render_pdf)
+
+STANDINGS_COLUMNS = (('Pos', 4), ('Equipe', 24), ('Pts', 4))
+
+
+def _pages(data: bytes) -> int:
+    return int(re.search(rb'/Type /Pages /Kids \[[^\]]*\] /Count (\d+)', data).group(1))
+
+
+def _check_xref(data: bytes):
+    """Cada entrada da tabela de referências aponta para o início do seu objeto"""
+    start = int(re.search(rb'startxref\n(\d+)\n%%EOF', data).group(1))
+    header, *entries = data[start:].split(b'trailer')[0].splitlines()[1:]
+    total = int(header.split()[1])
+    assert len(entries) == total
+    for number, entry in enumerate(entries[1:], start=1):
+        offset = int(entry.split()[0])
+        assert data[offset:].startswith(b'%d 0 obj' % number)
+
+
+def test_long_table_spans_pages_with_repeated_header():
+    stream = io.BytesIO()
+    renderer = PDFReportRenderer(stream, 'Classificação')
+    rows = ((i, f'Equipe {i}', 100 - i) for i in range(1, 301))
+    renderer.render(['Copa', TableSection('Classificação', STANDINGS_COLUMNS, rows)])
+    pages = renderer.close()
+
+    data = stream.getvalue()
+    assert pages > 1 and _pages(data) == pages
+    assert data.count(b'Classifica\xe7\xe3o \\(continua\xe7\xe3o\\)') == pages - 1
+    assert b'Equipe 300' in data
+    _check_xref(data)
+
+
+def test_pages_are_written_while_rows_are_consumed():
+    stream = io.BytesIO()
+    renderer = PDFReportRenderer(stream, 'Elenco')
+    written = []
+
+    def rows():
+        for i in range(400):
+            written.append(renderer.writer.page_count)
+            yield (i, f'Atleta {i}', '')
+
+    renderer.render([TableSection('Elenco', STANDINGS_COLUMNS, rows())])
+    renderer.close()
+
+    # Antes da última linha, as primeiras páginas já estavam no arquivo
+    assert written[0] == 0 and written[-1] > 0
+
+
+def test_page_breaks_and_text_sections(tmp_path):
+    path = tmp_path / 'sumulas' / 'rodada.pdf'
+    sections = []
+    for game in range(3):
+        sections += [f'Jogo {game}', TextSection('Súmula', (f'Evento {n}' for n in range(5))), PageBreak()]
+
+    assert render_pdf(str(path), 'Súmulas', sections) == 3
+    data = path.read_bytes()
+    assert data.startswith(b'%PDF-1.4') and data.endswith(b'%%EOF\n')
+    _check_xref(data)
+
+
+def test_unknown_section_is_rejected():
+    renderer = PDFReportRenderer(io.BytesIO(), 'Relatório')
+    with pytest.raises(TypeError):
+        renderer.render([{'title': 'dicionário'}])
+
+
+def test_report_controller_export_pdf(tmp_path, monkeypatch):
+    pytest.importorskip('mysql.connector')
+    monkeypatch.chdir(tmp_path)
+    from desktop_app.controllers.report_controller import ReportController
+
+    controller = ReportController()
+    rows = ((i, f'Equipe {i}', i) for i in range(200))
+    ok, message = controller.export_pdf('Copa', ['Copa', TableSection('Classificação', STANDINGS_COLUMNS, rows)],
+                                        'copa')
+
+    assert ok, message
+    data = (tmp_path / 'reports' / 'copa.pdf').read_bytes()
+    assert _pages(data) > 1
+    _check_xref(data)
@@ -0,0 +1,66 @@
+"""Limitador de tentativas de login (desktop_app.utils.rate_limiter)"""
+import time
+
+import pytest
+
+from desktop_app.utils.rate_limiter import (LoginThrottle, MemoryRateLimitStore, SlidingWindowLimiter,
+                                            SQLiteRateLimitStore)
+
+WINDOW = 60.0
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def store(request, tmp_path):
+    if request.param == 'memory':
+        return MemoryRateLimitStore(2 * WINDOW)
+    return SQLiteRateLimitStore(str(tmp_path / 'limits.db'))
+
+
+def test_previous_window_is_weighted_by_the_uncovered_fraction(store):
+    limiter = SlidingWindowLimiter(5, WINDOW, store)
+    # Início de uma janela próxima do relógio real (a expiração das chaves usa o relógio)
+    start = (time.time() // WINDOW) * WINDOW
+    for _ in range(4):
+        limiter.hit('user:ana', now=start + 10)
+
+    # Metade da janela seguinte: 4 anteriores valem 2
+    assert limiter.count('user:ana', now=start + 90) == pytest.approx(2.0)
+    assert limiter.hit('user:ana', now=start + 90) == pytest.approx(3.0)
+    # Duas janelas depois nada resta
+    assert limiter.count('user:ana', now=start + 200) == 0.0
+
+
+def test_user_is_blocked_and_success_resets_only_the_user(store):
+    throttle = LoginThrottle(3, WINDOW, 5, store)
+    for _ in range(3):
+        throttle.register_failure('Ana ', '10.0.0.1')
+    assert throttle.is_blocked('ana')
+    assert not throttle.is_blocked('bia')
+
+    throttle.register_success('ana', '10.0.0.1')
+    assert not throttle.is_blocked('ana', '10.0.0.1')
+
+    for name in ('bia', 'caio'):
+        throttle.register_failure(name, '10.0.0.1')
+    assert throttle.is_blocked('davi', '10.0.0.1')
+    assert not throttle.is_blocked('davi', '10.0.0.2')
+
+
+def test_memory_store_evicts_when_full():
+    store = MemoryRateLimitStore(2 * WINDOW, max_keys=3)
+    limiter = SlidingWindowLimiter(5, WINDOW, store)
+    for n in range(10):
+        limiter.hit(f'user:{n}')
+    assert len(store) <= 3
+
+
+def test_require_shared_store_switches_to_sqlite(tmp_path):
+    throttle = LoginThrottle(3, WINDOW, 5, MemoryRateLimitStore(2 * WINDOW))
+    path = str(tmp_path / 'shared.db')
+    throttle.require_shared_store(path)
+    assert isinstance(throttle.store, SQLiteRateLimitStore)
+    assert throttle.by_source.store is throttle.store
+
+    throttle.register_failure('ana')
+    other = LoginThrottle(1, WINDOW, 5, SQLiteRateLimitStore(path))
+    assert other.is_blocked('ana')
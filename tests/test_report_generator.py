@@ -0,0 +1,80 @@
+"""Relatórios de texto em streaming (desktop_app.utils.report_generator)"""
+import io
+from datetime import datetime
+from enum import Enum
+from types import GeneratorType, SimpleNamespace
+
+import pytest
+
+pytest.importorskip('mysql.connector')
+
+from desktop_app.utils.report_generator import (STANDINGS_HEADER, ReportGenerator,
+                                                compile_template)
+
+
+class Kind(Enum):
+    GOAL = 'goal'
+    FOUL = 'foul'
+
+
+def _team(players):
+    return SimpleNamespace(name='Tigres', abbreviation='TIG', city=None, state='PE', founded_year=1990,
+                           colors=None, stadium=None, coach='Rui',
+                           created_at=datetime(2026, 1, 2, 8, 30), updated_at=None, players=players)
+
+
+def _game(events):
+    return SimpleNamespace(
+        home_team=SimpleNamespace(name='Tigres'), away_team=SimpleNamespace(name='Leões'),
+        game_date=datetime(2026, 10, 19), game_time=datetime(2026, 10, 19, 16, 0),
+        home_team_score=2, away_team_score=1, location=None,
+        status=SimpleNamespace(value='finished'), events=events)
+
+
+def test_team_report_lists_each_player():
+    players = [SimpleNamespace(name='Ana', position='Ala', age=21),
+               SimpleNamespace(name='Bia', position=None, age=None)]
+    report = ReportGenerator.generate_team_report(_team(players))
+
+    assert 'Cidade: Não informado\n' in report
+    assert 'Data de Criação: 02/01/2026 08:30\n' in report
+    assert report.endswith('Jogadores:\n- Ana (Ala) - 21 anos\n- Bia\n')
+    assert ReportGenerator.generate_team_report(_team([])).endswith('Nenhum jogador cadastrado.\n')
+
+
+def test_game_events_sorted_with_unknown_minutes_last():
+    events = [SimpleNamespace(minute=None, event_type=Kind.FOUL, player=None),
+              SimpleNamespace(minute=30, event_type=Kind.GOAL, player=SimpleNamespace(name='Ana')),
+              SimpleNamespace(minute=5, event_type=Kind.FOUL, player=SimpleNamespace(name='Bia'))]
+    report = ReportGenerator.generate_game_report(_game(events))
+
+    assert 'Tigres 2 x 1 Leões\nVencedor: Tigres\n' in report
+    assert report.endswith("5' - foul - Bia\n30' - goal - Ana\n-' - foul - Jogador não encontrado\n")
+
+
+def test_reports_are_streamed_line_by_line(tmp_path):
+    players = (SimpleNamespace(name=f'Atleta {i}', position=None, age=None) for i in range(1000))
+    lines = ReportGenerator.iter_team_report(_team(players))
+    assert isinstance(lines, GeneratorType)
+
+    stream = io.StringIO()
+    ReportGenerator.write_report(lines, stream)
+    assert stream.getvalue().count('- Atleta ') == 1000
+
+
+def test_standings_rows_align_with_the_header():
+    competition = SimpleNamespace(name='Copa', season='2026')
+    rows = [{'position': 1, 'team': 'Tigres', 'games': 3, 'wins': 3, 'draws': 0, 'losses': 0,
+             'goals_for': 9, 'goals_against': 1, 'goal_difference': 8, 'points': 9}]
+    report = ReportGenerator.generate_standings_report(competition)
+    header = ''.join(ReportGenerator.iter_standings_report(competition, rows)).splitlines()
+
+    assert header[3] == '=' * 12
+    assert [line.index('|') for line in header[-2:]] == [4, 4]
+    assert 'Exemplo Futebol Club' in report
+
+
+def test_templates_are_compiled_once():
+    assert compile_template(STANDINGS_HEADER) is compile_template(STANDINGS_HEADER)
+    with pytest.raises(ValueError):
+        compile_template('{team.name}')
@@ -0,0 +1,70 @@
+"""Revisões por tabela do banco web (services.revisions)"""
+from sqlalchemy import delete, update
+
+from web_app.database.database import SessionLocal
+from web_app.database.models import Player, Team
+from web_app.services.revisions import current
+
+
+def _add(*objects):
+    session = SessionLocal()
+    try:
+        session.add_all(objects)
+        session.commit()
+        return [obj.id for obj in objects]
+    finally:
+        session.close()
+
+
+def test_unknown_resources_start_at_zero(web_db):
+    assert current(['teams', 'players']) == {'teams': (0, None), 'players': (0, None)}
+
+
+def test_each_flush_bumps_only_changed_tables(web_db):
+    _add(Team(name='Tigres'))
+    _add(Team(name='Leões'))
+
+    revisions = current(['teams', 'players'])
+    assert revisions['teams'][0] == 2
+    assert revisions['players'] == (0, None)
+
+
+def test_same_second_edits_and_deletes_bump(web_db):
+    team_id, = _add(Team(name='Tigres'))
+    session = SessionLocal()
+    try:
+        for city in ('Recife', 'Olinda'):
+            session.get(Team, team_id).city = city
+            session.commit()
+        session.delete(session.get(Team, team_id))
+        session.commit()
+    finally:
+        session.close()
+
+    assert current(['teams'])['teams'][0] == 4
+
+
+def test_bulk_statements_bump(web_db):
+    _add(Team(name='Tigres'), Player(name='Ana'))
+    before = current(['players'])['players'][0]
+    session = SessionLocal()
+    try:
+        session.execute(update(Player).values(position='Ala'))
+        session.execute(delete(Player))
+        session.commit()
+    finally:
+        session.close()
+
+    assert current(['players'])['players'][0] == before + 2
+
+
+def test_rollback_discards_bump(web_db):
+    session = SessionLocal()
+    try:
+        session.add(Team(name='Tigres'))
+        session.flush()
+        session.rollback()
+    finally:
+        session.close()
+
+    assert current(['teams'])['teams'] == (0, None)
@@ -0,0 +1,82 @@
+"""Índice de busca do desktop (desktop_app.utils.search_index)"""
+from types import SimpleNamespace as Entity
+
+import pytest
+
+pytest.importorskip('mysql.connector')
+
+from desktop_app.utils import search_index as module
+from desktop_app.utils.search_index import SearchIndex, normalize
+
+
+@pytest.fixture
+def index():
+    index = SearchIndex()
+    index.build(
+        teams=[Entity(id=1, name='São Paulo F.C.', short_name='SPFC'),
+               Entity(id=2, name='Açaí Esporte', short_name=None)],
+        athletes=[Entity(id=10, team_id=1, name='Ana da Silva Souza', jersey_number=7),
+                  Entity(id=11, team_id=2, name='João Pedro', jersey_number=10)],
+        competitions=[Entity(id=5, name='Copa Regional')],
+        games=[Entity(id=100, home_team_id=1, away_team_id=2, competition_id=5)]
+    )
+    return index
+
+
+def test_normalize_strips_accents_and_punctuation():
+    assert normalize('São Paulo F.C.') == 'sao paulo f c'
+
+
+def test_prefix_infix_and_accents(index):
+    assert index.match_ids('sao pau', 'team') == {1}
+    assert index.match_ids('acai', 'team') == {2}
+    assert index.match_ids('silva', 'athlete') == {10}
+    assert index.match_ids('joao souza', 'athlete') == set()
+
+
+def test_teams_found_through_their_athletes_and_games_through_teams(index):
+    assert index.match_team_ids('joao') == {2}
+    assert index.match_team_ids('joao', include_athletes=False) == set()
+    assert index.match_game_ids('spfc regional') == {100}
+    assert index.match_game_ids('spfc liga') == set()
+
+
+def test_incremental_updates(index):
+    index.add_athlete(Entity(id=11, team_id=1, name='João Pedro', jersey_number=10))
+    assert index.match_team_ids('joao') == {1}
+
+    index.remove_team(1)
+    assert index.match_ids('sao', 'team') == set()
+    assert index.match_ids('joao', 'athlete') == set()
+
+    index.remove_game(100)
+    assert index.match_game_ids('acai') == set()
+
+
+def test_search_lists_leading_matches_first(index):
+    index.add_team(Entity(id=3, name='Real Paulista', short_name=None))
+    index.add_team(Entity(id=4, name='Paulistano', short_name=None))
+    results = index.search('paul', kinds=('team',))
+    assert [result.id for result in results] == [4, 3, 1]
+
+
+def test_build_from_database_uses_one_query_per_table(monkeypatch):
+    tables = {
+        'teams': [{'id': 1, 'name': 'Tigres', 'short_name': 'TIG'}],
+        'athletes': [{'id': 9, 'team_id': 1, 'name': 'Bia', 'jersey_number': None}],
+        'competitions': [{'id': 2, 'name': 'Liga'}],
+        'games': [{'id': 7, 'home_team_id': 1, 'away_team_id': 1, 'competition_id': 2}],
+    }
+    queries = []
+
+    def fake_execute_query(query, params=None, fetch=False):
+        queries.append(query)
+        return tables[query.split(' FROM ')[1].split()[0]]
+
+    monkeypatch.setattr(module, 'execute_query', fake_execute_query)
+    index = SearchIndex()
+    index.build_from_database()
+
+    assert len(queries) == 4 and index.ready.is_set()
+    assert index.match_team_ids('bia') == {1}
+    assert index.match_game_ids('liga') == {7}
@@ -0,0 +1,51 @@
+"""Aquecimento do servidor pré-fork (web_app.server)"""
+import pytest
+
+pytest.importorskip('mysql.connector')
+
+from web_app import server
+from web_app.app import create_app
+from web_app.database.database import engine
+from web_app.services.dashboard_stats import dashboard_stats
+from web_app.services.query_counter import count_statements
+
+
+class _Started(Exception):
+    pass
+
+
+def test_master_only_compiles_templates(web_db):
+    app = create_app({'TESTING': True})
+    with count_statements() as statements:
+        server.compile_templates(app)
+    assert statements == []
+    assert app.jinja_env.cache
+
+
+def test_worker_warmup_fills_the_dashboard_cache(web_db, monkeypatch):
+    app = create_app({'TESTING': True})
+    # O banco dos testes fica em memória: descartar o pool perderia as tabelas
+    disposed = []
+    monkeypatch.setattr(engine, 'dispose', lambda close=True: disposed.append(close))
+    server.warm_worker(app)
+    assert disposed == [False]
+
+    with count_statements() as statements:
+        dashboard_stats.get_stats()
+    assert statements == []
+
+
+def test_post_fork_runs_in_the_worker_before_serving(monkeypatch):
+    calls = []
+
+    def fake_wsgi_server(*args, **kwargs):
+        calls.append('serve')
+        raise _Started
+
+    monkeypatch.setattr(server.signal, 'signal', lambda *args: None)
+    monkeypatch.setattr(server, 'ThreadingWSGIServer', fake_wsgi_server)
+    prefork = server.PreforkServer(app=object(), post_fork=lambda app: calls.append('post_fork'))
+
+    with pytest.raises(_Started):
+        prefork._worker(0)
+    assert calls == ['post_fork', 'serve']
@@ -0,0 +1,139 @@
+"""
+Orçamento de comandos SQL das listagens (services.query_counter)
+
+Com ENFORCE_STATEMENT_BUDGETS a própria rota falha ao exceder o orçamento
+declarado em @statement_budget; assert_max_statements mede a requisição
+inteira. As listagens HTML renderizam um template falso que percorre os
+mesmos relacionamentos dos templates reais: um relacionamento sem eager
+loading vira uma consulta por linha e estoura o orçamento.
+"""
+import importlib
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip('mysql.connector')
+
+from sqlalchemy.orm import joinedload
+
+from web_app.app import create_app
+from web_app.database.database import SessionLocal
+from web_app.database.models import Competition, Game, Player, Team, TeamCompetition, User, UserType
+from web_app.services.query_counter import assert_max_statements, count_statements
+
+HTML_ROUTES = ('competitionroutes', 'dashboardroutes', 'gameroutes', 'playerroutes', 'teamroutes')
+TEAMS = 6
+PLAYERS_PER_TEAM = 3
+
+
+def _seed():
+    session = SessionLocal()
+    try:
+        user = User(username='admin', email='admin@example.com', password_hash='-',
+                    name='Admin', user_type=UserType.ADMIN)
+        competitions = [Competition(name='Copa'), Competition(name='Liga')]
+        teams = [Team(name=f'Equipe {i}') for i in range(TEAMS)]
+        session.add_all([user, *competitions, *teams])
+        session.flush()
+
+        for team in teams:
+            session.add_all(Player(name=f'{team.name} - {n}', team_id=team.id)
+                            for n in range(PLAYERS_PER_TEAM))
+            session.add_all(TeamCompetition(team_id=team.id, competition_id=c.id)
+                            for c in competitions)
+        start = datetime(2026, 10, 1)
+        for i, (home, away) in enumerate(zip(teams, teams[1:] + teams[:1])):
+            session.add(Game(home_team_id=home.id, away_team_id=away.id,
+                             competition_id=competitions[i % 2].id,
+                             game_date=start + timedelta(days=i),
+                             status='SCHEDULED' if i % 2 else 'FINISHED'))
+        session.commit()
+        return user.id
+    finally:
+        session.close()
+
+
+def _render(template, **context):
+    """Template falso: acessa os relacionamentos usados pelas listagens"""
+    lines = []
+    for game in (context.get('games', []) + context.get('recent_games', [])
+                 + context.get('upcoming_games', [])):
+        competition = game.competition.name if 'games' in context else ''
+        lines.append(f"{game.home_team.name} x {game.away_team.name} {competition}")
+    lines += [f"{team.name}: {len(team.players)}" for team in context.get('teams', [])]
+    lines += [f"{player.name} ({player.team.name})" for player in context.get('players', [])]
+    lines += [f"{c.name}: {len(c.team_competitions)}" for c in context.get('competitions', [])]
+    return '\n'.join(lines)
+
+
+@pytest.fixture
+def client(web_db, monkeypatch):
+    app = create_app({'TESTING': True, 'ENFORCE_STATEMENT_BUDGETS': True,
+                      'WEB_MULTIPROCESS': False})
+    for name in HTML_ROUTES:
+        monkeypatch.setattr(importlib.import_module(f'web_app.routes.{name}'), 'render_template', _render)
+
+    user_id = _seed()
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = str(user_id)
+        session['_fresh'] = True
+    return client
+
+
+# Listagens alteradas para eager loading: (url, comandos na requisição inteira)
+# As rotas da API somam o SELECT das revisões usado pelo ETag.
+LISTINGS = [
+    ('/games/', 1),
+    ('/players/', 1),
+    ('/teams/', 2),
+    ('/competitions/', 2),
+    ('/dashboard/', 2),
+    ('/api/teams', 2),
+    ('/api/players', 3),
+    ('/api/games', 5),
+    ('/api/competitions', 2),
+]
+
+
+@pytest.mark.parametrize('url, budget', LISTINGS)
+def test_listing_statement_count_does_not_grow_with_rows(client, url, budget):
+    # Aquecimento: usuário logado e contadores do dashboard vão para o cache
+    assert client.get(url).status_code == 200
+
+    with assert_max_statements(budget):
+        response = client.get(url)
+    assert response.status_code == 200
+
+
+def test_listing_pages_render_every_row(client):
+    assert client.get('/teams/').get_data(as_text=True).count(f': {PLAYERS_PER_TEAM}') == TEAMS
+    assert client.get('/competitions/').get_data(as_text=True).count(f': {TEAMS}') == 2
+    # 5 jogos recentes + os agendados (jogos ímpares)
+    assert client.get('/dashboard/').get_data(as_text=True).count(' x ') == 5 + TEAMS // 2
+
+
+def test_assert_max_statements_reports_lazy_loads(web_db):
+    _seed()
+    session = SessionLocal()
+    try:
+        with pytest.raises(AssertionError, match=f'executados {TEAMS + 1}'):
+            with assert_max_statements(1):
+                for player in session.query(Player).filter(Player.name.like('% - 0')):
+                    player.team.name
+    finally:
+        session.close()
+
+
+def test_count_statements_with_joinedload(web_db):
+    _seed()
+    session = SessionLocal()
+    try:
+        with count_statements() as statements:
+            players = session.query(Player).options(joinedload(Player.team)).all()
+            names = {player.team.name for player in players}
+    finally:
+        session.close()
+
+    assert len(names) == TEAMS
+    assert len(statements) == 1 and 'JOIN teams' in statements[0]
@@ -0,0 +1,62 @@
+"""Agregador de estatísticas de competição (desktop_app.utils.statistics_aggregator)"""
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from desktop_app.utils.statistics_aggregator import GameColumns, aggregate_competition
+
+
+def _game(game_id, home, away, home_score, away_score, status='finished', round_number=1, venue='Ginásio'):
+    return SimpleNamespace(id=game_id, home_team_id=home, away_team_id=away, home_score=home_score,
+                           away_score=away_score, status=status, round_number=round_number,
+                           venue=venue)
+
+
+GAMES = [
+    _game(1, 1, 2, 3, 1),
+    _game(2, 2, 3, 2, 2, round_number=2, venue='Arena'),
+    _game(3, 3, 1, 0, 4, round_number=2),
+    _game(4, 1, 3, None, None),                          # finalizado sem placar
+    _game(5, 2, 1, 1, 0, status='scheduled'),
+    _game(6, 2, 1, 5, 0, status=SimpleNamespace(value='FINISHED'), round_number=3),
+]
+
+
+def test_only_finished_games_with_score_are_counted():
+    columns = GameColumns.from_games(GAMES)
+    assert list(columns.game_ids) == [1, 2, 3, 6]
+
+
+def test_single_pass_metrics():
+    stats = aggregate_competition(GameColumns.from_games(GAMES), use_numpy=False)
+
+    assert stats['games_finished'] == 4
+    assert stats['total_goals'] == 17
+    assert (stats['home_wins'], stats['away_wins'], stats['draws']) == (2, 1, 1)
+    assert stats['highest_scoring_game']['game_id'] == 6
+    assert stats['biggest_margin_game']['score'] == '5-0'
+    assert stats['by_round'][2] == {'games': 2, 'goals': 8, 'average_goals': 4.0}
+    assert stats['by_venue']['Arena']['games'] == 1
+    assert stats['teams'][1] == {'games_played': 3, 'wins': 2, 'draws': 0, 'losses': 1,
+                                 'goals_for': 7, 'goals_against': 6}
+    # Empate em vitórias (equipes 1 e 2): vence o menor id
+    assert stats['most_wins_team_id'] == 1
+    assert stats['best_defense_team_id'] == 2
+
+
+def test_empty_competition():
+    stats = aggregate_competition(GameColumns(), use_numpy=False)
+    assert stats['games_finished'] == 0 and stats['average_goals_per_game'] == 0
+    assert stats['highest_scoring_game'] is None and stats['most_wins_team_id'] is None
+
+
+def test_numpy_matches_python():
+    pytest.importorskip('numpy')
+    rng = random.Random(29)
+    columns = GameColumns.from_rows(
+        (i, rng.randint(1, 20), rng.randint(21, 40), rng.randint(0, 6), rng.randint(0, 6),
+         rng.randint(1, 38), rng.choice(('grupos', 'final')), rng.choice(('A', 'B', None)))
+        for i in range(1, 3001)
+    )
+    assert aggregate_competition(columns, use_numpy=True) == aggregate_competition(columns, use_numpy=False)
@@ -0,0 +1,97 @@
+"""Carregamento em segundo plano das views Tk (desktop_app.views.task_runner)"""
+import threading
+
+import pytest
+
+pytest.importorskip('tkinter')
+
+from desktop_app.views.task_runner import Debouncer, TaskRunner
+
+
+class FakeWidget:
+    """Substitui o widget Tk: guarda os callbacks de after() para rodar sob demanda"""
+
+    def __init__(self):
+        self.pending = []
+        self.exists = True
+
+    def after(self, delay, callback, *args):
+        self.pending.append((callback, args))
+        return str(len(self.pending))
+
+    def after_cancel(self, after_id):
+        self.pending[int(after_id) - 1] = (lambda *args: None, ())
+
+    def winfo_exists(self):
+        return self.exists
+
+    def run_pending(self):
+        pending, self.pending = self.pending, []
+        for callback, args in pending:
+            callback(*args)
+
+
+class InlineExecutor:
+    def submit(self, fn):
+        fn()
+
+
+def test_newer_task_with_the_same_key_supersedes_the_older():
+    widget = FakeWidget()
+    runner = TaskRunner(widget, executor=InlineExecutor())
+    shown = []
+
+    first = runner.submit('games', lambda token: 'filtro antigo', shown.append)
+    runner.submit('games', lambda token: 'filtro novo', shown.append)
+    widget.run_pending()
+
+    assert first.cancelled
+    assert shown == ['filtro novo']
+    assert not runner.is_loading('games')
+
+
+def test_loader_runs_off_the_calling_thread_and_errors_reach_on_error():
+    widget = FakeWidget()
+    runner = TaskRunner(widget)
+    threads, errors = [], []
+    done = threading.Event()
+
+    def loader(token):
+        threads.append(threading.get_ident())
+        done.set()
+        raise ValueError('banco indisponível')
+
+    runner.submit('teams', loader, lambda result: None, on_error=errors.append)
+    assert done.wait(5)
+    while runner.is_loading('teams'):
+        widget.run_pending()
+
+    assert threads != [threading.get_ident()]
+    assert str(errors[0]) == 'banco indisponível'
+
+
+def test_cancelled_loader_and_destroyed_widget_deliver_nothing():
+    widget = FakeWidget()
+    runner = TaskRunner(widget, executor=InlineExecutor())
+    shown = []
+
+    def loader(token):
+        token.cancel()
+        token.raise_if_cancelled()
+
+    runner.submit('a', loader, shown.append)
+    widget.exists = False
+    runner.submit('b', lambda token: 'dados', shown.append)
+    widget.run_pending()
+
+    assert shown == [] and not runner.is_loading('b')
+
+
+def test_debouncer_runs_only_the_last_call():
+    widget = FakeWidget()
+    calls = []
+    debouncer = Debouncer(widget, 200, calls.append)
+    for text in ('t', 'ti', 'tig'):
+        debouncer.call(text)
+    widget.run_pending()
+    assert calls == ['tig']
@@ -0,0 +1,94 @@
+"""Importação de atletas pela rota web (POST /teams/import)"""
+import io
+
+import pytest
+
+pytest.importorskip('mysql.connector')
+
+from werkzeug.security import generate_password_hash
+
+from web_app.app import create_app
+from web_app.database.database import SessionLocal
+from web_app.database.models import Player, Team, User, UserType
+from web_app.routes import teamroutes
+
+CSV = """Equipe;Nome;Camisa;Nascimento;Capitão
+Tigres;Ana;10;01/02/2000;sim
+Tigres;Bia;10;;
+Leões;Carla;7;;
+"""
+
+
+@pytest.fixture
+def audits(monkeypatch):
+    audits = []
+    monkeypatch.setattr(teamroutes.auth_controller, 'audit',
+                        lambda action, *args: audits.append((action,) + args))
+    return audits
+
+
+@pytest.fixture
+def client(web_db, monkeypatch, audits):
+    rendered = []
+    monkeypatch.setattr(teamroutes, 'render_template',
+                        lambda template, **context: rendered.append(context) or template)
+    app = create_app({'TESTING': True})
+
+    session = SessionLocal()
+    try:
+        user = User(username='admin', email='admin@example.com', name='Admin',
+                    password_hash=generate_password_hash('senha'), user_type=UserType.ADMIN)
+        session.add_all([user, Team(name='Tigres')])
+        session.commit()
+        user_id = user.id
+    finally:
+        session.close()
+
+    client = app.test_client()
+    client.rendered = rendered
+    with client.session_transaction() as flask_session:
+        flask_session['_user_id'] = str(user_id)
+    return client
+
+
+def _upload(client, content, **form):
+    return client.post('/teams/import', headers={'Accept': 'application/json'},
+                       data=dict(form, file=(io.BytesIO(content.encode()), 'atletas.csv')),
+                       content_type='multipart/form-data')
+
+
+def test_imported_athletes_show_up_in_the_team_list(client, audits):
+    response = _upload(client, CSV)
+
+    assert response.status_code == 200
+    report = response.get_json()
+    assert (report['imported'], report['teams_created']) == (2, 1)
+    assert [error['line'] for error in report['errors']] == [3]
+
+    client.get('/teams/')
+    teams = {team.name: sorted(player.name for player in team.players)
+             for team in client.rendered[-1]['teams']}
+    assert teams == {'Tigres': ['Ana'], 'Leões': ['Carla']}
+
+    assert len(audits) == 1
+    action, entity_type, entity_id, details = audits[0]
+    assert (action, entity_type, details['web_user'], details['imported']) == \
+        ('athletes_imported', 'team', 'admin', 2)
+
+
+def test_dry_run_writes_nothing(client, audits):
+    report = _upload(client, CSV, dry_run='1').get_json()
+
+    assert report['imported'] == 2
+    session = SessionLocal()
+    try:
+        assert session.query(Team).count() == 1
+        assert session.query(Player).count() == 0
+    finally:
+        session.close()
+    assert audits == []
+
+
+def test_missing_header_is_rejected(client):
+    response = _upload(client, 'sem;colunas\n')
+    assert response.status_code == 400
@@ -0,0 +1,73 @@
+"""Cache do user_loader (services.user_cache)"""
+import pytest
+
+from sqlalchemy import update
+
+from web_app.database.database import SessionLocal
+from web_app.database.models import User, UserType
+from web_app.services.user_cache import UserLoaderCache
+
+
+@pytest.fixture
+def user_id(web_db):
+    session = SessionLocal()
+    try:
+        user = User(username='ana', email='ana@example.com', name='Ana',
+                    password_hash='x', user_type=UserType.USER)
+        session.add(user)
+        session.commit()
+        return user.id
+    finally:
+        session.close()
+
+
+def _rename(user_id, name):
+    session = SessionLocal()
+    try:
+        session.execute(update(User).where(User.id == user_id).values(name=name))
+        session.commit()
+    finally:
+        session.close()
+
+
+def test_snapshot_is_read_only(user_id):
+    snapshot = UserLoaderCache().get(user_id)
+    assert (snapshot.full_name, snapshot.get_id()) == ('Ana', str(user_id))
+    with pytest.raises(AttributeError):
+        snapshot.name = 'Outra'
+
+
+def test_hits_until_invalidated(user_id):
+    cache = UserLoaderCache()
+    cache.get(user_id)
+    _rename(user_id, 'Ana Maria')
+    assert cache.get(user_id).name == 'Ana'
+
+    cache.invalidate(user_id)
+    assert cache.get(user_id).name == 'Ana Maria'
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_shared_cache_follows_the_users_revision(user_id):
+    cache = UserLoaderCache(shared=True)
+    cache.get(user_id)
+    # Gravação feita por outro processo: não passa por invalidate()
+    _rename(user_id, 'Ana Maria')
+    assert cache.get(user_id).name == 'Ana Maria'
+
+
+def test_lru_keeps_max_entries(user_id):
+    session = SessionLocal()
+    try:
+        other = User(username='bia', email='bia@example.com', name='Bia', password_hash='x')
+        session.add(other)
+        session.commit()
+        other_id = other.id
+    finally:
+        session.close()
+
+    cache = UserLoaderCache(max_entries=1)
+    cache.get(user_id)
+    cache.get(other_id)
+    cache.get(user_id)
+    assert (cache.hits, cache.misses) == (0, 3)
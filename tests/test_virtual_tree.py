@@ -0,0 +1,47 @@
+"""Fonte de linhas da lista virtualizada (desktop_app.views.virtual_tree)"""
+import pytest
+
+pytest.importorskip('tkinter')
+
+from desktop_app.views.virtual_tree import ListRowSource
+
+ROWS = [
+    (1, ('Tigres', 12, 'Natal')),
+    (2, ('leões', 3, '')),
+    (3, ('Águias', None, 'Recife')),
+    (4, ('Baleias', 7, 'natal')),
+]
+
+
+def test_sort_puts_numbers_first_and_empty_values_last():
+    source = ListRowSource(ROWS)
+    source.sort_by(1)
+    assert [key for key, _ in source.fetch(0, 10)] == [2, 4, 1, 3]
+
+    # Invertida: vazios primeiro; iguais sem diferenciar maiúsculas mantêm a ordem
+    source.sort_by(2, reverse=True)
+    assert [key for key, _ in source.fetch(0, 10)] == [2, 3, 1, 4]
+
+
+def test_filter_and_keys_compose_and_survive_new_rows():
+    source = ListRowSource(ROWS)
+    source.sort_by(0)
+    source.set_filter(lambda values: (values[1] or 0) > 5)
+    source.set_keys({1, 2, 4})
+    assert [key for key, _ in source.fetch(0, 10)] == [4, 1]
+
+    source.set_rows(ROWS + [(5, ('Antas', 9, ''))])
+    assert [key for key, _ in source.fetch(0, 10)] == [4, 1]
+    source.set_keys(None)
+    assert [key for key, _ in source.fetch(0, 10)] == [5, 4, 1]
+    assert len(source) == 3
+
+
+def test_index_of_follows_the_current_view():
+    source = ListRowSource(ROWS)
+    assert source.index_of(4) == 3
+    source.sort_by(0)
+    assert source.index_of(4) == 0
+    source.set_filter(lambda values: values[2] == 'Natal')
+    assert source.index_of(4) is None
+    assert source.fetch(0, 1) == [ROWS[0]]
@@ -0,0 +1,94 @@
+"""Rotas de jogadores e usuários gravando no banco web"""
+import pytest
+
+pytest.importorskip('mysql.connector')
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from web_app.app import create_app
+from web_app.database.database import SessionLocal
+from web_app.database.models import Player, Team, User, UserType
+from web_app.routes import playerroutes, userroutes
+
+
+@pytest.fixture
+def client(web_db, monkeypatch):
+    for module in (playerroutes, userroutes):
+        monkeypatch.setattr(module, 'render_template', lambda template, **context: template)
+    app = create_app({'TESTING': True})
+
+    session = SessionLocal()
+    try:
+        user = User(username='admin', email='admin@example.com', name='Admin',
+                    password_hash=generate_password_hash('antiga'), user_type=UserType.ADMIN)
+        team = Team(name='Tigres')
+        session.add_all([user, team])
+        session.commit()
+        ids = user.id, team.id
+    finally:
+        session.close()
+
+    client = app.test_client()
+    client.user_id, client.team_id = ids
+    with client.session_transaction() as flask_session:
+        flask_session['_user_id'] = str(client.user_id)
+    return client
+
+
+def test_every_blueprint_is_registered(client):
+    assert {'public', 'dashboard', 'teams', 'players', 'competitions', 'games',
+            'users', 'api'} <= set(client.application.blueprints)
+
+
+def test_create_and_edit_player(client):
+    response = client.post('/players/create', data={
+        'name': 'Ana', 'position': 'Ala', 'jersey_number': '7', 'birth_date': '2000-05-01',
+        'team_id': str(client.team_id)})
+    assert response.status_code == 302
+
+    session = SessionLocal()
+    try:
+        player = session.query(Player).one()
+        assert (player.jersey_number, player.team_id, player.birth_date.year) == (7, client.team_id, 2000)
+        player_id = player.id
+    finally:
+        session.close()
+
+    client.post(f'/players/{player_id}/edit', data={'name': 'Ana Maria', 'team_id': ''})
+    assert client.get(f'/players/api/by-team/{client.team_id}').get_json() == []
+
+
+def test_invalid_player_form_is_not_saved(client):
+    client.post('/players/create', data={'name': 'Ana', 'height': 'alta'})
+
+    session = SessionLocal()
+    try:
+        assert session.query(Player).count() == 0
+    finally:
+        session.close()
+
+
+def test_change_password_checks_the_current_one(client):
+    form = {'current_password': 'errada', 'new_password': 'nova', 'confirm_password': 'nova'}
+    assert client.post('/users/change-password', data=form).status_code == 200
+
+    form['current_password'] = 'antiga'
+    assert client.post('/users/change-password', data=form).status_code == 302
+
+    session = SessionLocal()
+    try:
+        assert check_password_hash(session.get(User, client.user_id).password_hash, 'nova')
+    finally:
+        session.close()
+
+
+def test_admin_creates_user(client):
+    client.post('/users/create', data={'full_name': 'Bia', 'username': 'bia', 'email': 'bia@example.com',
+                                       'password': 'segredo', 'user_type': 'manager', 'is_active': 'on'})
+
+    session = SessionLocal()
+    try:
+        user = session.query(User).filter_by(username='bia').one()
+        assert user.user_type == UserType.MANAGER and user.is_active
+    finally:
+        session.close()
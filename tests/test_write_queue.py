@@ -0,0 +1,66 @@
+"""Fila de escrita do SQLite (web_app.database.database.SQLiteWriteQueue)"""
+import threading
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.exc import SQLAlchemyError
+
+from web_app.database.database import SQLiteWriteQueue, WriteQueueTimeout
+
+
+def _session():
+    return SimpleNamespace(info={})
+
+
+def _in_thread(target):
+    errors = []
+
+    def run():
+        try:
+            target()
+        except Exception as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    thread.join()
+    return errors
+
+
+def test_sessions_of_the_same_thread_share_the_turn():
+    queue = SQLiteWriteQueue(timeout=0.05)
+    first, second = _session(), _session()
+    queue.acquire(first)
+    queue.acquire(second)
+    queue.acquire(first)
+
+    queue.release(first)
+    assert isinstance(_in_thread(lambda: queue.acquire(_session()))[0], WriteQueueTimeout)
+
+    queue.release(second)
+    other = _session()
+    assert _in_thread(lambda: (queue.acquire(other), queue.release(other))) == []
+
+
+def test_timeout_raises_instead_of_writing_without_the_turn():
+    queue = SQLiteWriteQueue(timeout=0.05)
+    holder = _session()
+    queue.acquire(holder)
+
+    waiting = _session()
+    errors = _in_thread(lambda: queue.acquire(waiting))
+
+    assert len(errors) == 1 and isinstance(errors[0], SQLAlchemyError)
+    assert 'sqlite_write_lock' not in waiting.info
+    assert queue.waits == 1
+
+    queue.release(holder)
+
+
+def test_release_without_the_turn_is_ignored():
+    queue = SQLiteWriteQueue(timeout=0.05)
+    queue.release(_session())
+    session = _session()
+    queue.acquire(session)
+    queue.release(session)
+    assert session.info == {}
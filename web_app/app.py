@@ -4,22 +4,44 @@ Aplicação principal para o Sistema de Gerenciamento Esportivo
 
 from flask import Flask, render_template
 from flask_login import LoginManager
-from database.database import init_db
-from database.models import User
+from web_app.database.database import init_db
+from web_app.routes import register_routes
+from web_app.services.dashboard_stats import init_dashboard_stats
+from web_app.services.fragment_cache import init_fragment_cache
+from web_app.services.revisions import init_revisions
+from web_app.services.user_cache import init_user_cache, user_cache
+from web_app.server import register_stats_route
+from desktop_app.utils.rate_limiter import login_throttle
 import os
 
-def create_app():
+def create_app(config=None):
     app = Flask(__name__)
     
     # Configurações
     app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
     app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///database.db')
     app.config['UPLOAD_FOLDER'] = os.environ.get('UPLOAD_FOLDER', 'uploads')
+    # Vários processos atendendo (servidor pré-fork, gunicorn): caches locais não bastam
+    app.config['WEB_MULTIPROCESS'] = os.environ.get('WEB_MULTIPROCESS', '0') in ('1', 'true', 'True')
+    if config:
+        app.config.update(config)
 
     # Inicializa banco de dados com o app contexto
     with app.app_context():
         init_db()
 
+    # Revisões por tabela usadas pelos ETags (incrementadas a cada gravação)
+    init_revisions()
+
+    # Cache de fragmentos dos templates pesados ({% cache %})
+    init_fragment_cache(app)
+    init_dashboard_stats(app)
+    init_user_cache(app)
+
+    # Limite de login em memória seria multiplicado pelo número de workers
+    if app.config['WEB_MULTIPROCESS']:
+        login_throttle.require_shared_store(app.config.get('LOGIN_RATE_LIMIT_DB'))
+
     # Configuração do login
     login_manager = LoginManager()
     login_manager.init_app(app)
@@ -28,50 +50,15 @@ def create_app():
 
     @login_manager.user_loader
     def load_user(user_id):
-        from database.database import SessionLocal
-        session = SessionLocal()
-        try:
-            return session.query(User).get(int(user_id))
-        finally:
-            session.close()
-
-    # Registro de Blueprints com proteção de ImportError caso os arquivos não existam
-
-    try:
-        from routes.public_routes import public_bp
-        app.register_blueprint(public_bp)
-    except ImportError:
-        pass
-
-    try:
-        from routes.dashboard_routes import dashboard_bp
-        app.register_blueprint(dashboard_bp, url_prefix='/dashboard')
-    except ImportError:
-        pass
-
-    try:
-        from routes.team_routes import team_bp
-        app.register_blueprint(team_bp, url_prefix='/teams')
-    except ImportError:
-        pass
-
-    try:
-        from routes.player_routes import player_bp
-        app.register_blueprint(player_bp, url_prefix='/players')
-    except ImportError:
-        pass
-
-    try:
-        from routes.competition_routes import competition_bp
-        app.register_blueprint(competition_bp, url_prefix='/competitions')
-    except ImportError:
-        pass
-
-    try:
-        from routes.api_routes import api_bp
-        app.register_blueprint(api_bp, url_prefix='/api')
-    except ImportError:
-        pass
+        # Cópia imutável em cache: evita uma consulta por requisição autenticada
+        return user_cache.get(int(user_id))
+
+    # Registro de Blueprints: um módulo de rotas que não importa deve falhar aqui,
+    # e não deixar a aplicação no ar sem as rotas dele
+    register_routes(app)
+
+    # Contadores do servidor pré-fork (somente administradores)
+    register_stats_route(app)
 
     # Rota principal
     @app.route('/')
@@ -80,6 +67,26 @@ def create_app():
 
     return app
 
+def main(argv=None):
+    """Ponto de entrada de produção (sistema-web): servidor pré-fork com vários workers"""
+    import argparse
+    from web_app.server import serve
+
+    parser = argparse.ArgumentParser(description='Sistema de Gerenciamento Esportivo - Web')
+    parser.add_argument('--host', default=os.environ.get('HOST', '0.0.0.0'))
+    parser.add_argument('--port', type=int, default=int(os.environ.get('PORT', 5000)))
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('WEB_WORKERS', 0)),
+                        help='Número de workers (0 = número de CPUs)')
+    parser.add_argument('--no-preload', action='store_true',
+                        help='Não compila templates antes do fork nem aquece os workers')
+    args = parser.parse_args(argv)
+
+    # O servidor pré-fork sempre tem mais de um processo durante um reload (SIGHUP)
+    app = create_app({'WEB_MULTIPROCESS': hasattr(os, 'fork')})
+    serve(app, host=args.host, port=args.port, workers=args.workers, preload=not args.no_preload)
+    return 0
+
+
 if __name__ == '__main__':
     app = create_app()
     app.run(debug=True, host='0.0.0.0', port=5000)
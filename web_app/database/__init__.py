@@ -0,0 +1,3 @@
+"""
+Banco de dados da aplicação web (SQLAlchemy)
+"""
@@ -1,16 +1,135 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
 
 import os
+import threading
 
 DATABASE_URL = os.environ.get('DATABASE_URL', 'sqlite:///database.db')
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+# Pragmas aplicados a cada nova conexão SQLite
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',          # leitores não bloqueiam o escritor
+    'synchronous': 'NORMAL',        # seguro com WAL e bem mais rápido que FULL
+    'cache_size': -64000,           # 64 MB de cache de páginas
+    'mmap_size': 268435456,         # 256 MB mapeados em memória
+    'temp_store': 'MEMORY',
+    'busy_timeout': 5000            # espera até 5 s por um lock em vez de falhar
+}
+
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 5))
+DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 10))
+# Fila de escrita por processo (SQLiteWriteQueue); não coordena workers diferentes
+SQLITE_WRITE_QUEUE = os.environ.get('SQLITE_WRITE_QUEUE', '1') not in ('0', 'false', 'False')
+
+
+def _is_memory_sqlite(url: str) -> bool:
+    return url in ('sqlite://', 'sqlite:///:memory:') or 'mode=memory' in url
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def create_database_engine(url: str = DATABASE_URL) -> Engine:
+    """
+    Cria o engine com configurações de produção
+
+    Para SQLite em arquivo: WAL, pragmas de desempenho em cada conexão e
+    pool dimensionado por worker (DB_POOL_SIZE + DB_MAX_OVERFLOW). Para
+    SQLite em memória, uma única conexão compartilhada. Outros bancos usam
+    pool com verificação de conexões.
+    """
+    if not url.startswith('sqlite'):
+        return create_engine(url, pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW,
+                             pool_pre_ping=True, pool_recycle=3600)
+
+    connect_args = {"check_same_thread": False, "timeout": SQLITE_PRAGMAS['busy_timeout'] / 1000}
+    if _is_memory_sqlite(url):
+        engine = create_engine(url, connect_args=connect_args, poolclass=StaticPool)
+    else:
+        engine = create_engine(url, connect_args=connect_args,
+                               pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW)
+
+    event.listen(engine, 'connect', _apply_sqlite_pragmas)
+    return engine
+
+
+class WriteQueueTimeout(exc.TimeoutError):
+    """A sessão esperou mais que o timeout pela vez de escrever"""
+
+
+class SQLiteWriteQueue:
+    """
+    Serializa os escritores do processo
+
+    O SQLite aceita um único escritor por vez. Em vez de várias threads
+    disputarem o lock do arquivo (e receberem 'database is locked'), cada
+    sessão entra na fila no primeiro flush ou DML e sai ao terminar a
+    transação. Leituras nunca entram na fila.
+
+    A fila vale apenas dentro de um processo. Com vários workers (servidor
+    pré-fork, gunicorn), cada um tem a sua fila e escritores de processos
+    diferentes continuam disputando o arquivo, resolvidos pelo busy_timeout
+    do SQLite. Para muitos escritores concorrentes, use outro banco
+    (DATABASE_URL) em vez de SQLite.
+    """
+
+    def __init__(self, timeout: float = 30.0):
+        self.timeout = timeout
+        # Reentrante: várias sessões da mesma thread compartilham a vez
+        self._lock = threading.RLock()
+        self.waits = 0
+
+    def acquire(self, session: Session):
+        if session.info.get('sqlite_write_lock'):
+            return
+        if not self._lock.acquire(blocking=False):
+            self.waits += 1
+            if not self._lock.acquire(timeout=self.timeout):
+                raise WriteQueueTimeout(
+                    f"Fila de escrita do SQLite ocupada por mais de {self.timeout} s")
+        session.info['sqlite_write_lock'] = True
+
+    def release(self, session: Session):
+        if session.info.pop('sqlite_write_lock', False):
+            self._lock.release()
+
+    def install(self, session_factory):
+        event.listen(session_factory, 'before_flush', self._before_flush)
+        event.listen(session_factory, 'do_orm_execute', self._do_orm_execute)
+        event.listen(session_factory, 'after_transaction_end', self._after_transaction_end)
+
+    def _before_flush(self, session, flush_context, instances):
+        if session.new or session.dirty or session.deleted:
+            self.acquire(session)
+
+    def _do_orm_execute(self, orm_execute_state):
+        if not orm_execute_state.is_select:
+            self.acquire(orm_execute_state.session)
+
+    def _after_transaction_end(self, session, transaction):
+        if transaction.parent is None:
+            self.release(session)
+
+
+engine = create_database_engine(DATABASE_URL)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()  # Esta linha é importante para definir o Base
 
+# Instância global da fila de escrita (apenas SQLite)
+write_queue = SQLiteWriteQueue() if DATABASE_URL.startswith('sqlite') and SQLITE_WRITE_QUEUE else None
+if write_queue is not None:
+    write_queue.install(SessionLocal)
+
 def init_db():
     """
     Inicializa as tabelas do banco de dados.
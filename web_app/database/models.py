@@ -148,3 +148,11 @@ class PlayerStatistic(Base):
     # Relacionamentos
     player = relationship("Player", back_populates="statistics")
     game = relationship("Game", back_populates="statistics")
+
+class ResourceRevision(Base):
+    __tablename__ = 'resource_revisions'
+
+    # Nome do recurso (tabela ou chave derivada, ex.: 'games', 'fragments:competition:3')
+    name = Column(String(120), primary_key=True)
+    revision = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime)
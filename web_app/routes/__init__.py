@@ -2,19 +2,19 @@
 Rotas da aplicação web
 """
 
-from .public_routes import public_bp
-from .dashboard_routes import dashboard_bp
-from .team_routes import team_bp
-from .player_routes import player_bp
-from .competition_routes import competition_bp
-from .game_routes import game_bp
-from .user_routes import user_bp
-from .api_routes import api_bp
-
 
 def register_routes(app):
     """Registra todas as rotas na aplicação"""
-    
+    # Importados aqui: importar um módulo de rotas não carrega os demais
+    from .public_routes import public_bp
+    from .dashboardroutes import dashboard_bp
+    from .teamroutes import team_bp
+    from .playerroutes import player_bp
+    from .competitionroutes import competition_bp
+    from .gameroutes import game_bp
+    from .userroutes import user_bp
+    from .apiroutes import api_bp
+
     # Rotas públicas (login, etc)
     app.register_blueprint(public_bp)
     
@@ -40,14 +40,4 @@ def register_routes(app):
     app.register_blueprint(api_bp, url_prefix='/api')
 
 
-__all__ = [
-    'register_routes',
-    'public_bp',
-    'dashboard_bp',
-    'team_bp',
-    'player_bp',
-    'competition_bp',
-    'game_bp',
-    'user_bp',
-    'api_bp'
-]
+__all__ = ['register_routes']
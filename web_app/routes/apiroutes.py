@@ -1,31 +1,92 @@
 """
 Rotas da API REST
 """
+from datetime import date, timedelta
+
 from flask import Blueprint, jsonify, request
 from flask_login import login_required, current_user
+from sqlalchemy import func, or_
+from sqlalchemy.orm import joinedload
 
-from database.database import SessionLocal
-from database.models import Team, Player, Game, Competition
+from web_app.database.database import SessionLocal
+from web_app.database.models import Team, Player, Game, Competition
 from desktop_app.controllers.team_controller import team_controller
-from desktop_app.controllers.player_controller import player_controller
 from desktop_app.controllers.game_controller import game_controller
 from desktop_app.controllers.competition_controller import competition_controller
+from desktop_app.utils.live_events import competition_channel, game_channel
+from desktop_app.utils.statistics_aggregator import GameColumns, aggregate_competition
+from web_app.services.conditional import conditional_get, mysql_versioned, versioned
+from web_app.services.dashboard_stats import dashboard_stats
+from web_app.services.live_stream import sse_response
+from web_app.services.game_results import ResultBatchError, ingest_results
+from web_app.services.query_counter import statement_budget
+from web_app.services.api_query import (ApiQueryError, Include, Resource, list_resource,
+                                parse_date, parse_int)
 
 api_bp = Blueprint('api', __name__)
 
+_TEAM_SUMMARY = ('name', 'city', 'state')
+
+TEAMS = Resource(
+    Team,
+    fields=('id', 'name', 'city', 'state', 'founded_year', 'stadium', 'description', 'is_active',
+            'created_at', 'updated_at'),
+    default_fields=('id', 'name', 'city', 'state'),
+    filters={'is_active': lambda value: Team.is_active == (value.lower() in ('1', 'true'))}
+)
+
+PLAYERS = Resource(
+    Player,
+    fields=('id', 'name', 'birth_date', 'position', 'jersey_number', 'height', 'weight',
+            'nationality', 'team_id', 'is_active', 'created_at', 'updated_at'),
+    default_fields=('id', 'name', 'position', 'jersey_number', 'team_id'),
+    includes={'team': Include('team_id', Team, _TEAM_SUMMARY)},
+    filters={
+        'team_id': lambda value: Player.team_id == parse_int(value),
+        'position': lambda value: Player.position == value
+    }
+)
+
+GAMES = Resource(
+    Game,
+    fields=('id', 'home_team_id', 'away_team_id', 'competition_id', 'game_date', 'venue',
+            'home_score', 'away_score', 'status', 'round_number', 'notes', 'created_at', 'updated_at'),
+    default_fields=('id', 'home_team_id', 'away_team_id', 'competition_id', 'game_date',
+                    'home_score', 'away_score', 'status', 'round_number'),
+    includes={
+        'home_team': Include('home_team_id', Team, _TEAM_SUMMARY),
+        'away_team': Include('away_team_id', Team, _TEAM_SUMMARY),
+        'competition': Include('competition_id', Competition, ('name', 'season'))
+    },
+    filters={
+        'competition_id': lambda value: Game.competition_id == parse_int(value),
+        'status': lambda value: func.lower(Game.status) == value.lower(),
+        'team_id': lambda value: or_(Game.home_team_id == parse_int(value),
+                                     Game.away_team_id == parse_int(value)),
+        'date_from': lambda value: Game.game_date >= parse_date(value),
+        'date_to': lambda value: Game.game_date < parse_date(value) + timedelta(days=1)
+    }
+)
+
+COMPETITIONS = Resource(
+    Competition,
+    fields=('id', 'name', 'competition_type', 'season', 'start_date', 'end_date',
+            'registration_deadline', 'max_teams', 'description', 'is_active', 'created_at', 'updated_at'),
+    default_fields=('id', 'name', 'competition_type', 'season', 'is_active'),
+    filters={
+        'season': lambda value: Competition.season == value,
+        'is_active': lambda value: Competition.is_active == (value.lower() in ('1', 'true'))
+    }
+)
+
 
 @api_bp.route('/teams')
 @login_required
+@conditional_get(lambda: versioned('teams', Team))
+@statement_budget(1)
 def api_teams():
-    """Lista todas as equipes via API"""
-    teams = team_controller.get_all_teams()
-    return jsonify([{
-        'id': team.id,
-        'name': team.name,
-        'abbreviation': team.abbreviation,
-        'city': team.city,
-        'state': team.state
-    } for team in teams])
+    """Lista equipes via API (paginada por cursor)"""
+    return jsonify(list_resource(TEAMS, request.args))
 
 
 @api_bp.route('/teams/<int:team_id>')
@@ -51,56 +112,80 @@ def api_team_detail(team_id):
 
 @api_bp.route('/players')
 @login_required
+@conditional_get(lambda: versioned('players', Player, Team))
+@statement_budget(2)
 def api_players():
-    """Lista todos os jogadores via API"""
-    players = player_controller.get_all_players()
-    return jsonify([{
-        'id': player.id,
-        'name': player.name,
-        'position': player.position,
-        'age': player.age,
-        'team': player.team.name if player.team else None
-    } for player in players])
+    """Lista jogadores via API (paginada por cursor)"""
+    return jsonify(list_resource(PLAYERS, request.args))
 
 
 @api_bp.route('/players/<int:player_id>')
 @login_required
 def api_player_detail(player_id):
     """Detalhes de um jogador via API"""
-    player = player_controller.get_player_by_id(player_id)
-    if not player:
-        return jsonify({'error': 'Jogador não encontrado'}), 404
-    
-    return jsonify({
-        'id': player.id,
-        'name': player.name,
-        'position': player.position,
-        'age': player.age,
-        'height': player.height,
-        'weight': player.weight,
-        'nationality': player.nationality,
-        'team': player.team.name if player.team else None
-    })
+    session = SessionLocal()
+    try:
+        player = session.query(Player).options(joinedload(Player.team)).filter(Player.id == player_id).first()
+        if not player:
+            return jsonify({'error': 'Jogador não encontrado'}), 404
+
+        return jsonify({
+            'id': player.id,
+            'name': player.name,
+            'position': player.position,
+            'age': _age(player.birth_date),
+            'height': player.height,
+            'weight': player.weight,
+            'nationality': player.nationality,
+            'team': player.team.name if player.team else None
+        })
+    finally:
+        session.close()
+
+
+def _age(birth_date):
+    if not birth_date:
+        return None
+    today = date.today()
+    return today.year - birth_date.year - ((today.month, today.day) < (birth_date.month, birth_date.day))
 
 
 @api_bp.route('/games')
 @login_required
+@conditional_get(lambda: versioned('games', Game, Team, Competition))
+@statement_budget(4)
 def api_games():
-    """Lista todos os jogos via API"""
-    games = game_controller.get_all_games()
-    return jsonify([{
-        'id': game.id,
-        'home_team': game.home_team.name if game.home_team else None,
-        'away_team': game.away_team.name if game.away_team else None,
-        'game_date': game.game_date.isoformat() if game.game_date else None,
-        'home_score': game.home_team_score,
-        'away_score': game.away_team_score,
-        'status': game.status.value if game.status else None
-    } for game in games])
+    """Lista jogos via API (paginada por cursor)"""
+    return jsonify(list_resource(GAMES, request.args))
+
+
+@api_bp.route('/games/results', methods=['POST'])
+@login_required
+def api_games_results():
+    """Recebe resultados de vários jogos (placares e eventos) em uma requisição"""
+    payload = request.get_json(silent=True)
+    items = payload.get('results') if isinstance(payload, dict) else payload
+    try:
+        return jsonify(ingest_results(items))
+    except ResultBatchError as e:
+        return jsonify({'error': str(e)}), 400
+
+
+# Detalhes lidos do MySQL pelo controlador: versão das linhas que entram na resposta
+_GAME_VERSION = """
+    SELECT g.version AS game, g.updated_at, ht.version AS home_team,
+           at.version AS away_team, c.version AS competition
+    FROM games g
+    LEFT JOIN teams ht ON ht.id = g.home_team_id
+    LEFT JOIN teams at ON at.id = g.away_team_id
+    LEFT JOIN competitions c ON c.id = g.competition_id
+    WHERE g.id = %s
+"""
 
 
 @api_bp.route('/games/<int:game_id>')
 @login_required
+@conditional_get(lambda game_id: mysql_versioned('game', _GAME_VERSION, (game_id,)))
 def api_game_detail(game_id):
     """Detalhes de um jogo via API"""
     game = game_controller.get_game_by_id(game_id)
@@ -128,22 +213,35 @@ def api_game_detail(game_id):
     })
 
 
+@api_bp.route('/games/<int:game_id>/stream')
+@login_required
+def api_game_stream(game_id):
+    """Placar e eventos de um jogo ao vivo (Server-Sent Events)"""
+    session = SessionLocal()
+    try:
+        if session.get(Game, game_id) is None:
+            return jsonify({'error': 'Jogo não encontrado'}), 404
+    finally:
+        session.close()
+    return sse_response([game_channel(game_id)], request.headers.get('Last-Event-ID'))
+
+
 @api_bp.route('/competitions')
 @login_required
+@conditional_get(lambda: versioned('competitions', Competition))
+@statement_budget(1)
 def api_competitions():
-    """Lista todas as competições via API"""
-    competitions = competition_controller.get_all_competitions()
-    return jsonify([{
-        'id': competition.id,
-        'name': competition.name,
-        'type': competition.competition_type.value if competition.competition_type else None,
-        'season': competition.season,
-        'is_active': competition.is_active
-    } for competition in competitions])
+    """Lista competições via API (paginada por cursor)"""
+    return jsonify(list_resource(COMPETITIONS, request.args))
+
+
+_COMPETITION_VERSION = "SELECT version, updated_at FROM competitions WHERE id = %s"
 
 
 @api_bp.route('/competitions/<int:competition_id>')
 @login_required
+@conditional_get(lambda competition_id: mysql_versioned('competition', _COMPETITION_VERSION,
+                                                       (competition_id,)))
 def api_competition_detail(competition_id):
     """Detalhes de uma competição via API"""
     competition = competition_controller.get_competition_by_id(competition_id)
@@ -164,26 +262,78 @@ def api_competition_detail(competition_id):
     })
 
 
+@api_bp.route('/competitions/<int:competition_id>/stream')
+@login_required
+def api_competition_stream(competition_id):
+    """Placares e eventos ao vivo de todos os jogos de uma competição (Server-Sent Events)"""
+    session = SessionLocal()
+    try:
+        if session.get(Competition, competition_id) is None:
+            return jsonify({'error': 'Competição não encontrada'}), 404
+    finally:
+        session.close()
+    return sse_response([competition_channel(competition_id)], request.headers.get('Last-Event-ID'))
+
+
 @api_bp.route('/statistics/dashboard')
 @login_required
 def api_dashboard_stats():
     """Estatísticas para o dashboard"""
+    return jsonify(dashboard_stats.get_stats())
+
+
+@api_bp.route('/statistics/competitions/<int:competition_id>')
+@login_required
+@conditional_get(lambda competition_id: versioned('competition_statistics', Competition, Game, Team))
+def api_competition_statistics(competition_id):
+    """Estatísticas agregadas de uma competição para a página de estatísticas"""
     session = SessionLocal()
     try:
-        stats = {
-            'total_teams': session.query(Team).count(),
-            'total_players': session.query(Player).count(),
-            'total_games': session.query(Game).count(),
-            'total_competitions': session.query(Competition).count(),
-            'active_competitions': session.query(Competition).filter(Competition.is_active == True).count(),
-            'recent_games': session.query(Game).filter(Game.status == 'FINISHED').count(),
-            'scheduled_games': session.query(Game).filter(Game.status == 'SCHEDULED').count()
-        }
+        competition = session.get(Competition, competition_id)
+        if not competition:
+            return jsonify({'error': 'Competição não encontrada'}), 404
+        
+        # Apenas as colunas usadas pelo agregador, sem carregar objetos ORM; jogos
+        # finalizados sem placar ficam de fora, como em GameColumns.from_games
+        rows = session.query(
+            Game.id, Game.home_team_id, Game.away_team_id, Game.home_score,
+            Game.away_score, Game.round_number, Game.venue
+        ).filter(
+            Game.competition_id == competition_id,
+            func.lower(Game.status) == 'finished',
+            Game.home_score.isnot(None),
+            Game.away_score.isnot(None)
+        )
+        columns = GameColumns.from_rows(
+            (game_id, home_id, away_id, home_score, away_score, round_number, None, venue)
+            for game_id, home_id, away_id, home_score, away_score, round_number, venue in rows
+        )
+        stats = aggregate_competition(columns)
+        
+        team_names = dict(session.query(Team.id, Team.name).filter(Team.id.in_(list(stats['teams']))))
+        for key in ('highest_scoring_game', 'biggest_margin_game'):
+            if stats[key]:
+                stats[key]['home_team'] = team_names.get(stats[key]['home_team_id'])
+                stats[key]['away_team'] = team_names.get(stats[key]['away_team_id'])
+        stats['teams'] = [
+            {'id': team_id, 'name': team_names.get(team_id), **values}
+            for team_id, values in stats['teams'].items()
+        ]
+        stats['by_round'] = [{'round': round_number, **values}
+                             for round_number, values in stats['by_round'].items()]
+        stats['competition'] = {'id': competition.id, 'name': competition.name}
+        
         return jsonify(stats)
     finally:
         session.close()
 
 
+@api_bp.errorhandler(ApiQueryError)
+def api_bad_query(error):
+    """Handler para parâmetros de consulta inválidos"""
+    return jsonify({'error': str(error)}), 400
+
+
 @api_bp.errorhandler(404)
 def api_not_found(error):
     """Handler para 404 na API"""
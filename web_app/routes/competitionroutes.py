@@ -1,24 +1,31 @@
 """
 Rotas para gestão de competições
 """
-from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, g
 from flask_login import login_required, current_user
 
-from database.database import SessionLocal
-from database.models import Competition, Team
+from sqlalchemy.orm import selectinload
+
+from web_app.database.database import SessionLocal
+from web_app.database.models import Competition, Team
 from desktop_app.controllers.competition_controller import competition_controller
 from desktop_app.controllers.team_controller import team_controller
+from web_app.services.conditional import conditional_get, mysql_versioned
+from web_app.services.query_counter import statement_budget
 
 competition_bp = Blueprint('competitions', __name__)
 
 
 @competition_bp.route('/')
 @login_required
+@statement_budget(2)
 def list_competitions():
     """Lista todas as competições"""
     session = SessionLocal()
     try:
-        competitions = session.query(Competition).all()
+        competitions = (session.query(Competition)
+                        .options(selectinload(Competition.team_competitions))
+                        .all())
         return render_template('competitions/list.html', competitions=competitions)
     finally:
         session.close()
@@ -105,8 +112,27 @@ def view_competition(competition_id):
     return render_template('competitions/detail.html', competition=competition)
 
 
+# A classificação vem do MySQL: competição e jogos dela (hash de id:version)
+_STANDINGS_VERSION = """
+    SELECT c.version, c.updated_at,
+           (SELECT COUNT(*) FROM games g WHERE g.competition_id = c.id) AS games,
+           (SELECT COALESCE(SUM(CRC32(CONCAT(g.id, ':', g.version))), 0)
+            FROM games g WHERE g.competition_id = c.id) AS games_hash
+    FROM competitions c
+    WHERE c.id = %s
+"""
+
+
+STANDINGS_TTL = 300
+
+
+def _standings_version(competition_id):
+    return mysql_versioned('standings', _STANDINGS_VERSION, (competition_id,))
+
+
 @competition_bp.route('/<int:competition_id>/standings')
 @login_required
+@conditional_get(_standings_version)
 def competition_standings(competition_id):
     """Mostra classificação da competição"""
     competition = competition_controller.get_competition_by_id(competition_id)
@@ -114,12 +140,14 @@ def competition_standings(competition_id):
         flash('Competição não encontrada.', 'error')
         return redirect(url_for('competitions.list_competitions'))
     
-    # Aqui você implementaria a lógica para calcular a classificação
-    standings = []  # Placeholder
-    
-    return render_template('competitions/standings.html', 
-                         competition=competition, 
-                         standings=standings)
+    # O fragmento da tabela é chaveado pela mesma versão MySQL do ETag: qualquer
+    # jogo ou alteração na competição gera outra chave. Sem versão, não há cache.
+    version = g.get('resource_version')
+    return render_template('standings.html',
+                           competition=competition,
+                           load_standings=lambda: competition_controller.get_standings(competition_id),
+                           standings_key=('standings-table', competition_id, version.etag if version else '-'),
+                           standings_ttl=STANDINGS_TTL if version else 0)
 
 
 @competition_bp.route('/<int:competition_id>/register-team', methods=['POST'])
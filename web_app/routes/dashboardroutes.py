@@ -4,39 +4,35 @@ Rotas do dashboard principal
 from flask import Blueprint, render_template, jsonify
 from flask_login import login_required, current_user
 
-from database.database import SessionLocal
-from database.models import Team, Player, Game, Competition
+from sqlalchemy.orm import joinedload
+
+from web_app.database.database import SessionLocal
+from web_app.database.models import Game
+from web_app.services.dashboard_stats import dashboard_stats
+from web_app.services.query_counter import statement_budget
 
 dashboard_bp = Blueprint('dashboard', __name__)
 
 
 @dashboard_bp.route('/')
 @login_required
+@statement_budget(3)
 def index():
     """Dashboard principal"""
     session = SessionLocal()
     try:
-        # Estatísticas gerais
-        total_teams = session.query(Team).count()
-        total_players = session.query(Player).count()
-        total_games = session.query(Game).count()
-        total_competitions = session.query(Competition).count()
-        
+        # Estatísticas gerais (cacheadas e compartilhadas com a API)
+        stats = dashboard_stats.get_stats()
+
         # Jogos recentes
-        recent_games = session.query(Game).order_by(Game.game_date.desc()).limit(5).all()
+        teams = (joinedload(Game.home_team), joinedload(Game.away_team))
+        recent_games = session.query(Game).options(*teams).order_by(Game.game_date.desc()).limit(5).all()
         
         # Próximos jogos
-        upcoming_games = session.query(Game).filter(
+        upcoming_games = session.query(Game).options(*teams).filter(
             Game.status == 'SCHEDULED'
         ).order_by(Game.game_date.asc()).limit(5).all()
         
-        stats = {
-            'total_teams': total_teams,
-            'total_players': total_players,
-            'total_games': total_games,
-            'total_competitions': total_competitions
-        }
-        
         return render_template('dashboard/index.html', 
                              stats=stats,
                              recent_games=recent_games,
@@ -45,18 +41,21 @@ def index():
         session.close()
 
 
+@dashboard_bp.route('/statistics')
+@login_required
+def statistics():
+    """Página de estatísticas das competições"""
+    return render_template('statistics.html')
+
+
 @dashboard_bp.route('/api/stats')
 @login_required
 def api_stats():
     """API para estatísticas do dashboard"""
-    session = SessionLocal()
-    try:
-        stats = {
-            'teams': session.query(Team).count(),
-            'players': session.query(Player).count(),
-            'games': session.query(Game).count(),
-            'competitions': session.query(Competition).count()
-        }
-        return jsonify(stats)
-    finally:
-        session.close()
+    stats = dashboard_stats.get_stats()
+    return jsonify({
+        'teams': stats['total_teams'],
+        'players': stats['total_players'],
+        'games': stats['total_games'],
+        'competitions': stats['total_competitions']
+    })
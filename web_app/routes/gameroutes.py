@@ -4,22 +4,32 @@ Rotas para gestão de jogos
 from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
 from flask_login import login_required, current_user
 
-from database.database import SessionLocal
-from database.models import Game, Team, Competition
+from sqlalchemy.orm import joinedload
+
+from web_app.database.database import SessionLocal
+from web_app.database.models import Game, Team, Competition
 from desktop_app.controllers.game_controller import game_controller
 from desktop_app.controllers.team_controller import team_controller
 from desktop_app.controllers.competition_controller import competition_controller
+from web_app.services.game_results import ingest_results
+from web_app.services.query_counter import statement_budget
 
 game_bp = Blueprint('games', __name__)
 
 
 @game_bp.route('/')
 @login_required
+@statement_budget(1)
 def list_games():
     """Lista todos os jogos"""
     session = SessionLocal()
     try:
-        games = session.query(Game).order_by(Game.game_date.desc()).all()
+        # Equipes e competição vêm no mesmo SELECT (evita uma consulta por jogo)
+        games = (session.query(Game)
+                 .options(joinedload(Game.home_team), joinedload(Game.away_team),
+                          joinedload(Game.competition))
+                 .order_by(Game.game_date.desc())
+                 .all())
         return render_template('games/list.html', games=games)
     finally:
         session.close()
@@ -125,22 +135,31 @@ def game_events(game_id):
 @login_required
 def update_result(game_id):
     """Atualiza resultado do jogo"""
-    game = game_controller.get_game_by_id(game_id)
+    # Mesmo banco e mesmo caminho da API de resultados (classificação e eventos ao vivo)
+    session = SessionLocal()
+    try:
+        game = (session.query(Game)
+                .options(joinedload(Game.home_team), joinedload(Game.away_team))
+                .filter(Game.id == game_id)
+                .first())
+    finally:
+        session.close()
     if not game:
         flash('Jogo não encontrado.', 'error')
         return redirect(url_for('games.list_games'))
     
     if request.method == 'POST':
-        result_data = {
-            'home_team_score': request.form.get('home_team_score'),
-            'away_team_score': request.form.get('away_team_score'),
-            'status': 'FINISHED'
-        }
+        outcome = ingest_results([{
+            'game_id': game_id,
+            'home_score': request.form.get('home_team_score'),
+            'away_score': request.form.get('away_team_score'),
+            'status': 'finished'
+        }])
         
-        if game_controller.update_game_result(game_id, result_data):
+        if outcome['updated']:
             flash('Resultado atualizado com sucesso!', 'success')
-            return redirect(url_for('games.view_game', game_id=game_id))
+            return redirect(url_for('games.list_games'))
         else:
-            flash('Erro ao atualizar resultado.', 'error')
+            flash('Erro ao atualizar resultado: ' + '; '.join(outcome['results'][0]['errors']), 'error')
     
     return render_template('games/result.html', game=game)
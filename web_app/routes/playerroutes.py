@@ -1,92 +1,122 @@
 """
 Rotas para gestão de jogadores
 """
+from datetime import date
+
 from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
 from flask_login import login_required, current_user
 
-from database.database import SessionLocal
-from database.models import Player, Team
-from desktop_app.controllers.player_controller import player_controller
-from desktop_app.controllers.team_controller import team_controller
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import joinedload
+
+from web_app.database.database import SessionLocal
+from web_app.database.models import Player, Team
+from web_app.services.query_counter import statement_budget
 
 player_bp = Blueprint('players', __name__)
 
 
 @player_bp.route('/')
 @login_required
+@statement_budget(1)
 def list_players():
     """Lista todos os jogadores"""
     session = SessionLocal()
     try:
-        players = session.query(Player).all()
+        players = session.query(Player).options(joinedload(Player.team)).all()
         return render_template('players/list.html', players=players)
     finally:
         session.close()
 
 
+def _player_data(form):
+    """Campos do formulário convertidos para as colunas de Player"""
+    def number(name, convert):
+        value = form.get(name)
+        return convert(value) if value else None
+
+    return {
+        'name': form.get('name'),
+        'position': form.get('position'),
+        'jersey_number': number('jersey_number', int),
+        'birth_date': number('birth_date', date.fromisoformat),
+        'height': number('height', float),
+        'weight': number('weight', float),
+        'nationality': form.get('nationality'),
+        'team_id': number('team_id', int)
+    }
+
+
+def _active_teams(session):
+    return session.query(Team).filter(Team.is_active.is_(True)).order_by(Team.name).all()
+
+
 @player_bp.route('/create', methods=['GET', 'POST'])
 @login_required
 def create_player():
     """Cria novo jogador"""
-    if request.method == 'POST':
-        player_data = {
-            'name': request.form.get('name'),
-            'position': request.form.get('position'),
-            'age': request.form.get('age'),
-            'height': request.form.get('height'),
-            'weight': request.form.get('weight'),
-            'nationality': request.form.get('nationality'),
-            'team_id': request.form.get('team_id') if request.form.get('team_id') else None
-        }
+    session = SessionLocal()
+    try:
+        if request.method == 'POST':
+            try:
+                session.add(Player(**_player_data(request.form)))
+                session.commit()
+                flash('Jogador criado com sucesso!', 'success')
+                return redirect(url_for('players.list_players'))
+            except (ValueError, SQLAlchemyError):
+                session.rollback()
+                flash('Erro ao criar jogador.', 'error')
         
-        if player_controller.create_player(player_data):
-            flash('Jogador criado com sucesso!', 'success')
-            return redirect(url_for('players.list_players'))
-        else:
-            flash('Erro ao criar jogador.', 'error')
-    
-    teams = team_controller.get_all_teams()
-    return render_template('players/form.html', teams=teams)
+        return render_template('players/form.html', teams=_active_teams(session))
+    finally:
+        session.close()
 
 
 @player_bp.route('/<int:player_id>/edit', methods=['GET', 'POST'])
 @login_required
 def edit_player(player_id):
     """Edita jogador existente"""
-    player = player_controller.get_player_by_id(player_id)
-    if not player:
-        flash('Jogador não encontrado.', 'error')
-        return redirect(url_for('players.list_players'))
-    
-    if request.method == 'POST':
-        player_data = {
-            'name': request.form.get('name'),
-            'position': request.form.get('position'),
-            'age': request.form.get('age'),
-            'height': request.form.get('height'),
-            'weight': request.form.get('weight'),
-            'nationality': request.form.get('nationality'),
-            'team_id': request.form.get('team_id') if request.form.get('team_id') else None
-        }
-        
-        if player_controller.update_player(player_id, player_data):
-            flash('Jogador atualizado com sucesso!', 'success')
+    session = SessionLocal()
+    try:
+        player = session.get(Player, player_id)
+        if not player:
+            flash('Jogador não encontrado.', 'error')
             return redirect(url_for('players.list_players'))
-        else:
-            flash('Erro ao atualizar jogador.', 'error')
-    
-    teams = team_controller.get_all_teams()
-    return render_template('players/form.html', player=player, teams=teams)
+        
+        if request.method == 'POST':
+            try:
+                for field, value in _player_data(request.form).items():
+                    setattr(player, field, value)
+                session.commit()
+                flash('Jogador atualizado com sucesso!', 'success')
+                return redirect(url_for('players.list_players'))
+            except (ValueError, SQLAlchemyError):
+                session.rollback()
+                flash('Erro ao atualizar jogador.', 'error')
+        
+        return render_template('players/form.html', player=player, teams=_active_teams(session))
+    finally:
+        session.close()
 
 
 @player_bp.route('/<int:player_id>/delete', methods=['POST'])
 @login_required
 def delete_player(player_id):
     """Deleta jogador"""
-    if player_controller.delete_player(player_id):
-        flash('Jogador deletado com sucesso!', 'success')
-    else:
+    session = SessionLocal()
+    try:
+        player = session.get(Player, player_id)
+        if player:
+            session.delete(player)
+            session.commit()
+            flash('Jogador deletado com sucesso!', 'success')
+        else:
+            flash('Erro ao deletar jogador.', 'error')
+    except SQLAlchemyError:
+        session.rollback()
         flash('Erro ao deletar jogador.', 'error')
+    finally:
+        session.close()
     
     return redirect(url_for('players.list_players'))
 
@@ -95,19 +125,28 @@ def delete_player(player_id):
 @login_required
 def view_player(player_id):
     """Visualiza detalhes do jogador"""
-    player = player_controller.get_player_by_id(player_id)
-    if not player:
-        flash('Jogador não encontrado.', 'error')
-        return redirect(url_for('players.list_players'))
-    
-    return render_template('players/detail.html', player=player)
+    session = SessionLocal()
+    try:
+        player = session.query(Player).options(joinedload(Player.team)).filter(Player.id == player_id).first()
+        if not player:
+            flash('Jogador não encontrado.', 'error')
+            return redirect(url_for('players.list_players'))
+        
+        return render_template('players/detail.html', player=player)
+    finally:
+        session.close()
 
 
 @player_bp.route('/api/by-team/<int:team_id>')
 @login_required
 def api_players_by_team(team_id):
     """API para obter jogadores de uma equipe"""
-    players = player_controller.get_players_by_team(team_id)
+    session = SessionLocal()
+    try:
+        players = (session.query(Player.id, Player.name, Player.position)
+                   .filter(Player.team_id == team_id).order_by(Player.name).all())
+    finally:
+        session.close()
     return jsonify([{
         'id': player.id,
         'name': player.name,
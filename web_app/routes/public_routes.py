@@ -1,15 +1,21 @@
 """
 Rotas públicas (login, logout, etc)
 """
+import os
+
 from flask import Blueprint, render_template, request, redirect, url_for, flash
 from flask_login import login_user, logout_user, login_required, current_user
-from werkzeug.security import check_password_hash
+from werkzeug.security import check_password_hash, generate_password_hash
 
-from database.database import SessionLocal
-from database.models import User
+from web_app.database.database import SessionLocal
+from web_app.database.models import User
+from desktop_app.utils.rate_limiter import login_throttle
 
 public_bp = Blueprint('public', __name__)
 
+# Verificado quando o usuário não existe, para o tempo de resposta não revelar quais existem
+_DUMMY_PASSWORD_HASH = generate_password_hash(os.urandom(16).hex())
+
 
 @public_bp.route('/')
 def index():
@@ -34,17 +40,25 @@ def login():
             flash('Username e senha são obrigatórios.', 'error')
             return render_template('public/login.html')
         
+        source = request.remote_addr
+        if login_throttle.is_blocked(username, source):
+            flash('Muitas tentativas de login. Tente novamente mais tarde.', 'error')
+            return render_template('public/login.html'), 429
+
         session = SessionLocal()
         try:
             user = session.query(User).filter_by(username=username).first()
             
-            if user and user.is_active and check_password_hash(user.password_hash, password):
+            valid = check_password_hash(user.password_hash if user else _DUMMY_PASSWORD_HASH, password)
+            if user and user.is_active and valid:
+                login_throttle.register_success(username, source)
                 login_user(user, remember=remember)
                 next_page = request.args.get('next')
                 if next_page:
                     return redirect(next_page)
                 return redirect(url_for('dashboard.index'))
             else:
+                login_throttle.register_failure(username, source)
                 flash('Credenciais inválidas ou usuário inativo.', 'error')
         finally:
             session.close()
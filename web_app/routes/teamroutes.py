@@ -1,23 +1,33 @@
 """
 Rotas para gestão de equipes
 """
+import io
+
 from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
 from flask_login import login_required, current_user
 
-from database.database import SessionLocal
-from database.models import Team
+from sqlalchemy.orm import selectinload
+
+from web_app.database.database import SessionLocal
+from web_app.database.models import Team, UserType
 from desktop_app.controllers.team_controller import team_controller
+from desktop_app.controllers.auth_controller import auth_controller
+from desktop_app.controllers.import_controller import ImportFormatError
+from web_app.services.athlete_import import web_athlete_importer
+from web_app.services.query_counter import statement_budget
 
 team_bp = Blueprint('teams', __name__)
 
 
 @team_bp.route('/')
 @login_required
+@statement_budget(2)
 def list_teams():
     """Lista todas as equipes"""
     session = SessionLocal()
     try:
-        teams = session.query(Team).all()
+        # Jogadores de todas as equipes em um único SELECT ... IN
+        teams = session.query(Team).options(selectinload(Team.players)).all()
         return render_template('teams/list.html', teams=teams)
     finally:
         session.close()
@@ -48,6 +58,55 @@ def create_team():
     return render_template('teams/form.html')
 
 
+@team_bp.route('/import', methods=['POST'])
+@login_required
+def import_athletes():
+    """Importa equipes e atletas de um CSV enviado (campo 'file') para o banco web"""
+    wants_json = request.accept_mimetypes.best == 'application/json'
+    
+    def fail(message, status):
+        if wants_json:
+            return jsonify({'error': message}), status
+        flash(message, 'error')
+        return redirect(url_for('teams.list_teams'))
+    
+    if current_user.user_type not in (UserType.ADMIN, UserType.MANAGER):
+        return fail('Permissão insuficiente para importar atletas.', 403)
+    
+    upload = request.files.get('file')
+    if not upload or not upload.filename:
+        return fail('Nenhum arquivo enviado.', 400)
+    
+    # Lido em blocos direto do upload, sem carregar o arquivo inteiro
+    stream = io.TextIOWrapper(upload.stream, encoding='utf-8-sig', newline='')
+    dry_run = request.form.get('dry_run') == '1'
+    try:
+        report = web_athlete_importer.run(stream,
+                                          create_teams=request.form.get('create_teams', '1') != '0',
+                                          dry_run=dry_run)
+    except ImportFormatError as e:
+        return fail(str(e), 400)
+    except UnicodeDecodeError:
+        return fail('O arquivo deve estar codificado em UTF-8.', 400)
+    
+    if not dry_run:
+        auth_controller.audit('athletes_imported', 'team', None, {
+            'file': upload.filename,
+            'web_user': current_user.username,
+            'imported': report.imported,
+            'teams_created': report.teams_created,
+            'rejected_lines': report.rejected_lines
+        })
+    
+    if wants_json:
+        return jsonify(report.to_dict())
+    
+    flash(report.summary(), 'error' if report.errors else 'success')
+    for error in report.errors[:10]:
+        flash(f"Linha {error.line}: {error.message}", 'error')
+    return redirect(url_for('teams.list_teams'))
+
+
 @team_bp.route('/<int:team_id>/edit', methods=['GET', 'POST'])
 @login_required
 def edit_team(team_id):
@@ -3,15 +3,27 @@ Rotas para gestão de usuários
 """
 from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
 from flask_login import login_required, current_user
-from werkzeug.security import generate_password_hash
+from sqlalchemy.exc import SQLAlchemyError
+from werkzeug.security import check_password_hash, generate_password_hash
 
-from database.database import SessionLocal
-from database.models import User, UserType
-from desktop_app.controllers.user_controller import user_controller
+from web_app.database.database import SessionLocal
+from web_app.database.models import User, UserType
+from web_app.services.user_cache import user_cache
 
 user_bp = Blueprint('users', __name__)
 
 
+def _apply_user_data(user, form):
+    """Copia os campos do formulário para o usuário (senha somente se informada)"""
+    user.name = form.get('full_name')
+    user.username = form.get('username')
+    user.email = form.get('email')
+    user.user_type = UserType(form.get('user_type') or UserType.USER.value)
+    user.is_active = 'is_active' in form
+    if form.get('password'):
+        user.password_hash = generate_password_hash(form.get('password'))
+
+
 @user_bp.route('/')
 @login_required
 def list_users():
@@ -37,20 +49,23 @@ def create_user():
         return redirect(url_for('dashboard.index'))
     
     if request.method == 'POST':
-        user_data = {
-            'full_name': request.form.get('full_name'),
-            'username': request.form.get('username'),
-            'email': request.form.get('email'),
-            'password': request.form.get('password'),
-            'user_type': request.form.get('user_type'),
-            'is_active': 'is_active' in request.form
-        }
+        if not request.form.get('password'):
+            flash('A senha é obrigatória.', 'error')
+            return render_template('users/form.html')
         
-        if user_controller.create_user(user_data):
+        session = SessionLocal()
+        try:
+            user = User()
+            _apply_user_data(user, request.form)
+            session.add(user)
+            session.commit()
             flash('Usuário criado com sucesso!', 'success')
             return redirect(url_for('users.list_users'))
-        else:
+        except (ValueError, SQLAlchemyError):
+            session.rollback()
             flash('Erro ao criar usuário.', 'error')
+        finally:
+            session.close()
     
     return render_template('users/form.html')
 
@@ -63,32 +78,31 @@ def edit_user(user_id):
         flash('Acesso negado.', 'error')
         return redirect(url_for('dashboard.index'))
     
-    user = user_controller.get_user_by_id(user_id)
-    if not user:
-        flash('Usuário não encontrado.', 'error')
-        return redirect(url_for('users.list_users'))
-    
-    if request.method == 'POST':
-        user_data = {
-            'full_name': request.form.get('full_name'),
-            'username': request.form.get('username'),
-            'email': request.form.get('email'),
-            'user_type': request.form.get('user_type'),
-            'is_active': 'is_active' in request.form
-        }
+    session = SessionLocal()
+    try:
+        user = session.get(User, user_id)
+        if not user:
+            flash('Usuário não encontrado.', 'error')
+            return redirect(url_for('users.list_users'))
         
-        # Atualizar senha apenas se fornecida
-        new_password = request.form.get('password')
-        if new_password:
-            user_data['password'] = new_password
+        if request.method == 'POST':
+            # Somente administradores alteram o tipo de usuário
+            form = request.form.to_dict()
+            if current_user.user_type != UserType.ADMIN:
+                form['user_type'] = user.user_type.value
+            try:
+                _apply_user_data(user, form)
+                session.commit()
+                user_cache.invalidate(user_id)
+                flash('Usuário atualizado com sucesso!', 'success')
+                return redirect(url_for('users.list_users'))
+            except (ValueError, SQLAlchemyError):
+                session.rollback()
+                flash('Erro ao atualizar usuário.', 'error')
         
-        if user_controller.update_user(user_id, user_data):
-            flash('Usuário atualizado com sucesso!', 'success')
-            return redirect(url_for('users.list_users'))
-        else:
-            flash('Erro ao atualizar usuário.', 'error')
-    
-    return render_template('users/form.html', user=user)
+        return render_template('users/form.html', user=user)
+    finally:
+        session.close()
 
 
 @user_bp.route('/<int:user_id>/delete', methods=['POST'])
@@ -103,10 +117,21 @@ def delete_user(user_id):
         flash('Você não pode deletar seu próprio usuário.', 'error')
         return redirect(url_for('users.list_users'))
     
-    if user_controller.delete_user(user_id):
-        flash('Usuário deletado com sucesso!', 'success')
-    else:
+    session = SessionLocal()
+    try:
+        user = session.get(User, user_id)
+        if user:
+            session.delete(user)
+            session.commit()
+            user_cache.invalidate(user_id)
+            flash('Usuário deletado com sucesso!', 'success')
+        else:
+            flash('Erro ao deletar usuário.', 'error')
+    except SQLAlchemyError:
+        session.rollback()
         flash('Erro ao deletar usuário.', 'error')
+    finally:
+        session.close()
     
     return redirect(url_for('users.list_users'))
 
@@ -135,10 +160,20 @@ def change_password():
             flash('As senhas não coincidem.', 'error')
             return render_template('users/change_password.html')
         
-        if user_controller.change_password(current_user.id, current_password, new_password):
-            flash('Senha alterada com sucesso!', 'success')
-            return redirect(url_for('users.profile'))
-        else:
+        session = SessionLocal()
+        try:
+            user = session.get(User, current_user.id)
+            if user and check_password_hash(user.password_hash, current_password):
+                user.password_hash = generate_password_hash(new_password)
+                session.commit()
+                user_cache.invalidate(current_user.id)
+                flash('Senha alterada com sucesso!', 'success')
+                return redirect(url_for('users.profile'))
+            flash('Senha atual incorreta ou erro ao alterar senha.', 'error')
+        except SQLAlchemyError:
+            session.rollback()
             flash('Senha atual incorreta ou erro ao alterar senha.', 'error')
+        finally:
+            session.close()
     
     return render_template('users/change_password.html')
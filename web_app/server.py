@@ -0,0 +1,375 @@
+"""
+Servidor de produção pré-fork usando apenas a biblioteca padrão
+
+O processo mestre carrega a aplicação uma única vez, compila os templates,
+abre o socket e só então cria os workers com fork: o código e os templates
+já compilados são compartilhados por cópia-na-escrita. Conexões não
+atravessam o fork: cada worker abre o próprio pool e aquece o cache do
+dashboard logo após nascer (post_fork), antes de aceitar requisições. Cada
+worker atende requisições em threads (necessário para os streams SSE).
+
+Sinais aceitos pelo mestre:
+    SIGHUP          reinicia os workers de forma gradual
+    SIGTTIN/SIGTTOU aumenta / diminui um worker
+    SIGUSR1         imprime os contadores
+    SIGINT/SIGTERM  encerra, aguardando as requisições em andamento
+
+Os contadores ficam em memória compartilhada e podem ser consultados em
+/_server/stats (JSON), rota da aplicação restrita a administradores.
+"""
+import json
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+from ctypes import c_long
+from multiprocessing.sharedctypes import RawArray
+from socketserver import ThreadingMixIn
+from typing import Any, Callable, Dict, List, Optional
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer
+
+MAX_WORKERS = 64
+STATS_PATH = '/_server/stats'
+STATS_ENVIRON_KEY = 'prefork.stats'
+GRACEFUL_TIMEOUT = 30
+
+# Campos por worker na memória compartilhada
+_PID, _REQUESTS, _ACTIVE, _STARTED = range(4)
+_FIELDS = 4
+
+
+class ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    """Servidor WSGI com uma thread por conexão, usando um socket herdado"""
+
+    daemon_threads = True
+    block_on_close = False
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class ServerStats:
+    """Contadores compartilhados entre mestre e workers (cada slot é escrito por um só worker)"""
+
+    def __init__(self, max_workers: int = MAX_WORKERS):
+        self.max_workers = max_workers
+        self.master_pid = os.getpid()
+        self._data = RawArray(c_long, max_workers * _FIELDS)
+
+    def reset_slot(self, slot: int, pid: int):
+        base = slot * _FIELDS
+        self._data[base + _PID] = pid
+        self._data[base + _REQUESTS] = 0
+        self._data[base + _ACTIVE] = 0
+        self._data[base + _STARTED] = int(time.time())
+
+    def clear_slot(self, slot: int):
+        self._data[slot * _FIELDS + _PID] = 0
+        self._data[slot * _FIELDS + _ACTIVE] = 0
+
+    def add(self, slot: int, field: int, delta: int):
+        self._data[slot * _FIELDS + field] += delta
+
+    def active(self, slot: int) -> int:
+        return self._data[slot * _FIELDS + _ACTIVE]
+
+    def snapshot(self) -> Dict[str, Any]:
+        workers = []
+        for slot in range(self.max_workers):
+            base = slot * _FIELDS
+            if self._data[base + _PID]:
+                workers.append({
+                    'slot': slot,
+                    'pid': self._data[base + _PID],
+                    'requests': self._data[base + _REQUESTS],
+                    'active': self._data[base + _ACTIVE],
+                    'started_at': self._data[base + _STARTED]
+                })
+        return {
+            'master_pid': self.master_pid,
+            'workers': len(workers),
+            'requests': sum(worker['requests'] for worker in workers),
+            'active': sum(worker['active'] for worker in workers),
+            'per_worker': workers
+        }
+
+
+class StatsMiddleware:
+    """Conta as requisições do worker e expõe os contadores para a rota de estatísticas"""
+
+    def __init__(self, app: Callable, stats: ServerStats, slot: int):
+        self.app = app
+        self.stats = stats
+        self.slot = slot
+        self._lock = threading.Lock()
+
+    def _count(self, field: int, delta: int):
+        with self._lock:
+            self.stats.add(self.slot, field, delta)
+
+    def __call__(self, environ, start_response):
+        environ[STATS_ENVIRON_KEY] = self.stats
+        self._count(_REQUESTS, 1)
+        self._count(_ACTIVE, 1)
+        try:
+            result = self.app(environ, start_response)
+        except Exception:
+            self._count(_ACTIVE, -1)
+            raise
+        return _ClosingIterator(result, lambda: self._count(_ACTIVE, -1))
+
+
+class _ClosingIterator:
+    """Decrementa o contador de requisições ativas quando a resposta termina"""
+
+    def __init__(self, iterable, on_close: Callable[[], None]):
+        self._iterable = iterable
+        self._on_close = on_close
+
+    def __iter__(self):
+        return iter(self._iterable)
+
+    def close(self):
+        try:
+            if hasattr(self._iterable, 'close'):
+                self._iterable.close()
+        finally:
+            self._on_close()
+
+
+def register_stats_route(app) -> None:
+    """Registra /_server/stats na aplicação, atrás do login e apenas para administradores"""
+    from flask import abort, jsonify, request
+    from flask_login import current_user, login_required
+    from web_app.database.models import UserType
+
+    @app.route(STATS_PATH)
+    @login_required
+    def server_stats():
+        if current_user.user_type != UserType.ADMIN:
+            abort(403)
+        stats = request.environ.get(STATS_ENVIRON_KEY)
+        if stats is None:
+            # Servidor de desenvolvimento: não há contadores compartilhados
+            abort(404)
+        return jsonify(stats.snapshot())
+
+
+def compile_templates(app) -> None:
+    """Compila os templates no mestre, antes do fork, para os workers herdarem o cache do Jinja"""
+    for name in app.jinja_env.list_templates():
+        try:
+            app.jinja_env.get_template(name)
+        except Exception as e:
+            print(f"Erro ao compilar template {name}: {e}")
+
+
+def warm_worker(app) -> None:
+    """Abre o pool do próprio worker e aquece o cache do dashboard (após o fork)"""
+    from sqlalchemy import text
+    from web_app.database.database import engine
+    from web_app.services.dashboard_stats import dashboard_stats
+
+    # Conexões herdadas do mestre pertencem a ele: descarta sem fechá-las
+    engine.dispose(close=False)
+    try:
+        with engine.connect() as connection:
+            connection.execute(text('SELECT 1'))
+        with app.app_context():
+            dashboard_stats.get_stats()
+    except Exception as e:
+        print(f"Erro ao aquecer o worker {os.getpid()}: {e}")
+
+
+class PreforkServer:
+    """Mestre que cria, supervisiona e reinicia os workers"""
+
+    def __init__(self, app, host: str = '0.0.0.0', port: int = 5000, workers: int = 0,
+                 backlog: int = 2048, post_fork: Optional[Callable[[Any], None]] = None):
+        self.app = app
+        self.post_fork = post_fork
+        self.host = host
+        self.port = port
+        self.workers = min(workers or os.cpu_count() or 1, MAX_WORKERS)
+        self.backlog = backlog
+        self.stats = ServerStats()
+        self.socket: Optional[socket.socket] = None
+        self._children: Dict[int, int] = {}  # pid -> slot
+        self._signals: List[int] = []
+        self._running = True
+
+    # Mestre
+
+    def run(self):
+        """Abre o socket, cria os workers e supervisiona até receber SIGINT/SIGTERM"""
+        self.socket = socket.create_server((self.host, self.port), backlog=self.backlog,
+                                           reuse_port=False)
+        self.socket.set_inheritable(True)
+        print(f"Servidor em http://{self.host}:{self.port} com {self.workers} worker(s) (pid {os.getpid()})")
+
+        for sig in (signal.SIGHUP, signal.SIGTTIN, signal.SIGTTOU, signal.SIGUSR1,
+                    signal.SIGINT, signal.SIGTERM, signal.SIGCHLD):
+            signal.signal(sig, lambda signum, frame: self._signals.append(signum))
+
+        self._spawn_missing()
+        try:
+            while self._running:
+                self._handle_signals()
+                self._reap()
+                if self._running:
+                    self._spawn_missing()
+                time.sleep(0.2)
+        finally:
+            self._stop_all()
+            self.socket.close()
+
+    def _handle_signals(self):
+        while self._signals:
+            signum = self._signals.pop(0)
+            if signum in (signal.SIGINT, signal.SIGTERM):
+                self._running = False
+            elif signum == signal.SIGHUP:
+                self._reload()
+            elif signum == signal.SIGTTIN:
+                self.workers = min(self.workers + 1, MAX_WORKERS)
+            elif signum == signal.SIGTTOU and self.workers > 1:
+                self.workers -= 1
+                self._retire(1)
+            elif signum == signal.SIGUSR1:
+                print(json.dumps(self.stats.snapshot(), indent=2))
+
+    def _free_slot(self) -> int:
+        used = set(self._children.values())
+        return next(slot for slot in range(MAX_WORKERS) if slot not in used)
+
+    def _spawn_missing(self):
+        while len(self._children) < self.workers:
+            self._spawn(self._free_slot())
+
+    def _spawn(self, slot: int):
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                self._worker(slot)
+            except Exception as e:
+                print(f"Erro no worker {os.getpid()}: {e}")
+                code = 1
+            finally:
+                os._exit(code)
+        self.stats.reset_slot(slot, pid)
+        self._children[pid] = slot
+
+    def _reap(self):
+        while True:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            slot = self._children.pop(pid, None)
+            if slot is not None:
+                self.stats.clear_slot(slot)
+
+    def _reload(self):
+        """Sobe workers novos e só então encerra os antigos"""
+        old = list(self._children)
+        for _ in old:
+            self._spawn(self._free_slot())
+        for pid in old:
+            self._terminate(pid)
+
+    def _retire(self, count: int):
+        for pid in list(self._children)[:count]:
+            self._terminate(pid)
+
+    def _terminate(self, pid: int):
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+    def _stop_all(self):
+        for pid in list(self._children):
+            self._terminate(pid)
+        deadline = time.monotonic() + GRACEFUL_TIMEOUT
+        while self._children and time.monotonic() < deadline:
+            self._reap()
+            time.sleep(0.1)
+        for pid in list(self._children):
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        self._reap()
+
+    # Worker
+
+    def _worker(self, slot: int):
+        for sig in (signal.SIGHUP, signal.SIGTTIN, signal.SIGTTOU, signal.SIGUSR1,
+                    signal.SIGCHLD, signal.SIGTERM):
+            signal.signal(sig, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+        if self.post_fork is not None:
+            self.post_fork(self.app)
+
+        server = ThreadingWSGIServer((self.host, self.port), QuietRequestHandler,
+                                     bind_and_activate=False)
+        server.socket.close()
+        server.socket = self.socket
+        server.server_name = socket.getfqdn(self.host)
+        server.server_port = self.port
+        server.setup_environ()
+        server.set_app(StatsMiddleware(self.app, self.stats, slot))
+
+        # SIGTERM: para de aceitar conexões e deixa as requisições em andamento terminarem
+        signal.signal(signal.SIGTERM,
+                      lambda signum, frame: threading.Thread(target=server.shutdown).start())
+        server.serve_forever(poll_interval=0.5)
+        self._drain(slot)
+
+    def _drain(self, slot: int):
+        deadline = time.monotonic() + GRACEFUL_TIMEOUT
+        while self.stats.active(slot) > 0 and time.monotonic() < deadline:
+            time.sleep(0.1)
+
+
+def serve(app, host: str = '0.0.0.0', port: int = 5000, workers: int = 0, preload: bool = True):
+    """
+    Executa a aplicação com o servidor pré-fork
+
+    Args:
+        app: Aplicação Flask já criada
+        host: Endereço de escuta
+        port: Porta
+        workers: Número de workers (0 = número de CPUs)
+        preload: Compila os templates antes do fork e aquece pool e cache
+            do dashboard em cada worker antes de atender
+    """
+    if preload:
+        compile_templates(app)
+
+    if not hasattr(os, 'fork'):
+        # Sem fork (Windows): um único processo com threads
+        server = ThreadingWSGIServer((host, port), QuietRequestHandler)
+        stats = ServerStats(1)
+        stats.reset_slot(0, os.getpid())
+        if preload:
+            warm_worker(app)
+        server.set_app(StatsMiddleware(app, stats, 0))
+        print(f"Servidor em http://{host}:{port} (processo único)")
+        server.serve_forever()
+        return
+
+    PreforkServer(app, host, port, workers, post_fork=warm_worker if preload else None).run()
+
+
+if __name__ == '__main__':
+    from web_app.app import main
+    sys.exit(main())
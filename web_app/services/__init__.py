@@ -0,0 +1,3 @@
+"""
+Serviços compartilhados pelas rotas da aplicação web
+"""
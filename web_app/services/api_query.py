@@ -0,0 +1,188 @@
+"""
+Listagens da API com paginação por cursor, projeção de campos e includes
+
+Parâmetros aceitos pelas rotas de listagem:
+
+    ?limit=50&after=<cursor>       página ordenada por id, cursor opaco
+    ?ids=1,2,3                     busca múltipla por id (até MAX_LIMIT ids)
+    ?fields=id,name                colunas projetadas no SELECT
+    ?include=team,competition      relações resolvidas com uma consulta por relação
+    filtros declarados por recurso (ex.: ?competition_id=1&status=finished)
+
+Cada página custa no máximo 1 + número de includes consultas, e o tamanho da
+resposta é limitado por MAX_LIMIT.
+"""
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from web_app.database.database import SessionLocal
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+
+class ApiQueryError(ValueError):
+    """Parâmetro inválido em uma consulta da API (responde 400)"""
+
+
+class Include:
+    """Relação muitos-para-um expandida via ?include="""
+
+    def __init__(self, foreign_key: str, model, fields: Sequence[str]):
+        self.foreign_key = foreign_key
+        self.model = model
+        self.fields = tuple(fields)
+
+
+class Resource:
+    """Descrição de um recurso listável pela API"""
+
+    def __init__(self, model, fields: Sequence[str], default_fields: Sequence[str],
+                 includes: Optional[Dict[str, Include]] = None,
+                 filters: Optional[Dict[str, Callable[[str], Any]]] = None):
+        self.model = model
+        self.fields = tuple(fields)
+        self.default_fields = tuple(default_fields)
+        self.includes = includes or {}
+        self.filters = filters or {}
+
+    def column(self, name: str):
+        return getattr(self.model, name)
+
+
+def encode_cursor(last_id: int) -> str:
+    """Cursor opaco para a página seguinte"""
+    return base64.urlsafe_b64encode(json.dumps({'id': last_id}).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        return int(json.loads(base64.urlsafe_b64decode(padded.encode()))['id'])
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise ApiQueryError("Cursor inválido")
+
+
+def _parse_list(value: Optional[str]) -> List[str]:
+    return [item.strip() for item in value.split(',') if item.strip()] if value else []
+
+
+def _serialize(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return getattr(value, 'value', value)
+
+
+def parse_date(value: str) -> date:
+    """Conversor de filtro para datas ISO (AAAA-MM-DD)"""
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ApiQueryError(f"Data inválida: {value}")
+
+
+def parse_int(value: str) -> int:
+    """Conversor de filtro para inteiros"""
+    try:
+        return int(value)
+    except ValueError:
+        raise ApiQueryError(f"Número inválido: {value}")
+
+
+def list_resource(resource: Resource, args, criteria: Sequence[Any] = ()) -> Dict[str, Any]:
+    """
+    Executa a listagem paginada de um recurso
+
+    Args:
+        resource: Descrição do recurso
+        args: request.args da requisição
+        criteria: Condições extras já montadas pela rota
+
+    Returns:
+        Dicionário com data, next_cursor e has_more (e missing na busca por ids)
+    """
+    limit = parse_int(args.get('limit', DEFAULT_LIMIT))
+    if not 1 <= limit <= MAX_LIMIT:
+        raise ApiQueryError(f"limit deve estar entre 1 e {MAX_LIMIT}")
+
+    fields = _parse_list(args.get('fields')) or list(resource.default_fields)
+    unknown = [field for field in fields if field not in resource.fields]
+    if unknown:
+        raise ApiQueryError(f"Campos inválidos: {', '.join(unknown)}")
+
+    includes = _parse_list(args.get('include'))
+    unknown = [name for name in includes if name not in resource.includes]
+    if unknown:
+        raise ApiQueryError(f"Includes inválidos: {', '.join(unknown)}")
+
+    # id e chaves estrangeiras dos includes entram no SELECT mesmo fora de fields
+    selected = ['id'] + [field for field in fields if field != 'id']
+    for name in includes:
+        foreign_key = resource.includes[name].foreign_key
+        if foreign_key not in selected:
+            selected.append(foreign_key)
+
+    conditions = list(criteria)
+    for name, convert in resource.filters.items():
+        value = args.get(name)
+        if value not in (None, ''):
+            conditions.append(convert(value))
+
+    ids = _parse_list(args.get('ids'))
+    if ids:
+        ids = {parse_int(value) for value in ids}
+        if len(ids) > MAX_LIMIT:
+            raise ApiQueryError(f"Informe no máximo {MAX_LIMIT} ids")
+        conditions.append(resource.model.id.in_(ids))
+        limit = max(limit, len(ids))
+
+    after = args.get('after')
+    if after:
+        conditions.append(resource.model.id > decode_cursor(after))
+
+    session = SessionLocal()
+    try:
+        rows = (session.query(*[resource.column(field) for field in selected])
+                .filter(*conditions)
+                .order_by(resource.model.id)
+                .limit(limit + 1)
+                .all())
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        records = [dict(zip(selected, row)) for row in rows]
+
+        for name in includes:
+            _expand(session, resource.includes[name], name, records)
+    finally:
+        session.close()
+
+    output_fields = set(fields) | set(includes)
+    data = [{key: _serialize(value) for key, value in record.items() if key in output_fields}
+            for record in records]
+
+    result = {
+        'data': data,
+        'next_cursor': encode_cursor(records[-1]['id']) if has_more else None,
+        'has_more': has_more
+    }
+    if ids:
+        result['missing'] = sorted(ids - {record['id'] for record in records})
+    return result
+
+
+def _expand(session, include: Include, name: str, records: List[Dict[str, Any]]):
+    """Resolve uma relação para a página inteira com uma única consulta"""
+    ids = {record[include.foreign_key] for record in records if record[include.foreign_key] is not None}
+    related = {}
+    if ids:
+        columns = [getattr(include.model, field) for field in ('id',) + include.fields]
+        for row in session.query(*columns).filter(include.model.id.in_(ids)):
+            related[row[0]] = {field: _serialize(value)
+                               for field, value in zip(('id',) + include.fields, row)}
+
+    for record in records:
+        record[name] = related.get(record[include.foreign_key])
@@ -0,0 +1,76 @@
+"""
+Importação de atletas em lote no banco web
+
+Reaproveita o pipeline do desktop (leitura em blocos, validação por linha,
+camisas e capitães) trocando só a gravação: equipes e jogadores vão para
+as tabelas do SQLAlchemy, as mesmas que as rotas web leem. O banco web não
+guarda capitão nem documentos; esses campos são validados e descartados.
+"""
+from contextlib import contextmanager
+from typing import Any, Dict, List, Set
+
+from sqlalchemy import func, insert, select
+
+from desktop_app.controllers.import_controller import AthleteImporter
+from desktop_app.utils.search_index import normalize
+from web_app.database.database import SessionLocal
+from web_app.database.models import Player, Team
+
+PLAYER_COLUMNS = ('name', 'jersey_number', 'position', 'birth_date')
+
+
+class WebAthleteImporter(AthleteImporter):
+    """Pipeline de importação gravando equipes e jogadores no banco web"""
+
+    @contextmanager
+    def _connection(self):
+        # A sessão faz o papel do cursor e da conexão (commit/rollback)
+        session = SessionLocal()
+        try:
+            yield session, session
+        finally:
+            session.close()
+
+    @staticmethod
+    def _select_teams(session, names) -> Dict[str, int]:
+        found: Dict[str, int] = {}
+        rows = session.execute(
+            select(Team.id, Team.name).where(Team.name.in_(list(names))).order_by(Team.id)
+        )
+        for team_id, name in rows:
+            found.setdefault(normalize(name), team_id)
+        return found
+
+    def _create_teams(self, session, connection, missing: Dict[str, str]) -> Dict[str, int]:
+        session.execute(insert(Team), [{'name': name, 'is_active': True} for name in missing.values()])
+        session.commit()
+        return self._select_teams(session, missing.values())
+
+    @staticmethod
+    def _team_athletes(session, team_ids: List[int]) -> List[Dict[str, Any]]:
+        rows = session.execute(
+            select(Player.team_id, Player.jersey_number, Player.is_active)
+            .where(Player.team_id.in_(team_ids))
+        )
+        return [{'team_id': team_id, 'jersey_number': jersey_number,
+                 'is_captain': False, 'is_active': is_active}
+                for team_id, jersey_number, is_active in rows]
+
+    @staticmethod
+    def _write_athletes(session, rows, demote: Set[int]) -> int:
+        last_id = session.execute(select(func.coalesce(func.max(Player.id), 0))).scalar()
+        session.execute(insert(Player), [
+            dict({column: row.values[column] for column in PLAYER_COLUMNS},
+                 team_id=row.team_id, is_active=True)
+            for row in rows
+        ])
+        return last_id
+
+    @staticmethod
+    def _index_athletes(session, last_id: int, team_ids: List[int]):
+        # O índice de busca do desktop cobre só o MySQL
+        pass
+
+
+# Instância global do pipeline de importação web
+web_athlete_importer = WebAthleteImporter()
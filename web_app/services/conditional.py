@@ -0,0 +1,147 @@
+"""
+Requisições condicionais (ETag / Last-Modified) para as rotas web e da API
+
+Cada recurso declara uma função de versão barata, lida do mesmo banco que
+a rota consulta: a revisão monotônica das tabelas web (resource_revisions)
+ou a coluna version das linhas MySQL lidas pelos controladores do desktop.
+Se o cliente já possui a versão atual, a rota responde 304 antes de
+executar a consulta pesada ou o template.
+"""
+import hashlib
+from datetime import datetime, timezone
+from functools import wraps
+from typing import Any, Callable, Iterable, Optional, Sequence, Tuple
+
+from flask import Response, g, make_response, request
+from flask_login import current_user
+
+from database.connection import execute_query
+from web_app.services.revisions import current
+
+
+class ResourceVersion:
+    """Versão de um recurso: semente do ETag e data da última modificação"""
+
+    __slots__ = ('seed', 'last_modified')
+
+    def __init__(self, seed: str, last_modified: Optional[datetime] = None):
+        self.seed = seed
+        self.last_modified = _to_utc(last_modified)
+
+    @property
+    def etag(self) -> str:
+        return hashlib.sha1(self.seed.encode('utf-8')).hexdigest()
+
+
+def _to_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Normaliza datas do banco (sem fuso, em UTC) para comparação HTTP"""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).replace(microsecond=0)
+
+
+def build_version(name: str, parts: Iterable[Tuple[int, Optional[datetime]]]) -> ResourceVersion:
+    """Combina versões de várias tabelas em uma única versão de recurso"""
+    seed = [name]
+    latest = None
+    for value, last_modified in parts:
+        seed.append(f"{value}:{last_modified.isoformat() if last_modified else '-'}")
+        if last_modified and (latest is None or last_modified > latest):
+            latest = last_modified
+    return ResourceVersion('|'.join(seed), latest)
+
+
+def conditional_get(version_func: Callable[..., Optional[ResourceVersion]]):
+    """
+    Decorator que responde 304 quando o cliente já tem a versão atual
+
+    Args:
+        version_func: Recebe os mesmos argumentos da rota e retorna a versão
+            do recurso, ou None quando não há como versioná-lo
+
+    As respostas dependem do usuário logado, então o ETag inclui o id do
+    usuário e o cache é marcado como privado e sempre revalidado. A versão
+    calculada fica em g.resource_version para a rota reaproveitar (por
+    exemplo, na chave de um fragmento em cache).
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(*args, **kwargs)
+
+            version = g.resource_version = version_func(*args, **kwargs)
+            if version is None:
+                return view(*args, **kwargs)
+
+            user_id = current_user.get_id() if current_user and current_user.is_authenticated else ''
+            etag = ResourceVersion(f"{request.full_path}|{user_id}|{version.seed}").etag
+
+            if _not_modified(etag, version.last_modified):
+                response = Response(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag)
+            if version.last_modified:
+                response.last_modified = version.last_modified
+            response.headers['Cache-Control'] = 'private, no-cache'
+            return response
+
+        return wrapper
+    return decorator
+
+
+def _not_modified(etag: str, last_modified: Optional[datetime]) -> bool:
+    # If-None-Match tem precedência sobre If-Modified-Since (RFC 9110)
+    if request.if_none_match:
+        return request.if_none_match.contains(etag)
+    if request.if_modified_since and last_modified:
+        return last_modified <= request.if_modified_since
+    return False
+
+
+def versioned(name: str, *models: Any) -> ResourceVersion:
+    """
+    Calcula a versão de um recurso a partir das revisões das tabelas web
+
+    As revisões são incrementadas na mesma transação de cada gravação
+    (services.revisions), então duas edições no mesmo segundo e remoções
+    também mudam a versão. Todas as tabelas são lidas em um único SELECT.
+
+    Exemplo:
+        versioned('games', Game, Team)
+    """
+    revisions = current(model.__tablename__ for model in models)
+    return build_version(name, ((revision, _to_utc(last_modified))
+                                for revision, last_modified in revisions.values()))
+
+
+def mysql_versioned(name: str, query: str, params: Sequence[Any] = ()) -> Optional[ResourceVersion]:
+    """
+    Calcula a versão de um recurso lido do MySQL pelos controladores do desktop
+
+    A consulta deve retornar uma linha com as colunas version (incrementadas
+    por gatilho a cada UPDATE) das linhas que compõem a resposta; colunas de
+    data entram como Last-Modified. Sem linha (recurso inexistente ou banco
+    indisponível), retorna None e a rota responde normalmente.
+    """
+    try:
+        rows = execute_query(query, tuple(params), fetch=True)
+    except Exception as e:
+        print(f"Erro ao calcular versão de {name}: {e}")
+        return None
+    if not rows:
+        return None
+
+    parts = []
+    for column, value in rows[0].items():
+        if isinstance(value, datetime):
+            parts.append((column, _to_utc(value)))
+        else:
+            parts.append((f"{column}={value}", None))
+    return build_version(name, parts)
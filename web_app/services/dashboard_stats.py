@@ -0,0 +1,108 @@
+"""
+Estatísticas do dashboard
+
+Todos os contadores do dashboard saem de um único SELECT (uma subconsulta
+agregada por tabela, com somas condicionais para os filtros) e ficam em
+cache por alguns segundos. Quando o cache expira, apenas uma requisição
+recalcula; as demais continuam recebendo o valor anterior enquanto isso,
+ou aguardam o primeiro cálculo quando ainda não há valor algum.
+"""
+import threading
+import time
+from typing import Dict, Optional
+
+from sqlalchemy import case, func, select, true
+
+from web_app.database.database import SessionLocal
+from web_app.database.models import Team, Player, Game, Competition
+
+DEFAULT_TTL = 30
+
+
+def _count_if(condition):
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+def _stats_query():
+    """SELECT único com os contadores de todas as tabelas do dashboard"""
+    status = func.lower(Game.status)
+    teams = select(func.count().label('total_teams')).select_from(Team).subquery()
+    players = select(func.count().label('total_players')).select_from(Player).subquery()
+    games = select(
+        func.count().label('total_games'),
+        _count_if(status == 'finished').label('recent_games'),
+        _count_if(status == 'scheduled').label('scheduled_games')
+    ).select_from(Game).subquery()
+    competitions = select(
+        func.count().label('total_competitions'),
+        _count_if(Competition.is_active == True).label('active_competitions')  # noqa: E712
+    ).select_from(Competition).subquery()
+    # Cada subconsulta tem uma única linha: o JOIN ON TRUE apenas as justapõe
+    return select(teams, players, games, competitions).select_from(
+        teams.join(players, true()).join(games, true()).join(competitions, true()))
+
+
+class DashboardStatsService:
+    """Contadores do dashboard com cache TTL e recálculo único (single-flight)"""
+
+    def __init__(self, ttl: float = DEFAULT_TTL):
+        self.ttl = ttl
+        self._stats: Optional[Dict[str, int]] = None
+        self._expires_at = 0.0
+        self._refreshing = False
+        self._condition = threading.Condition()
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Retorna os contadores do dashboard
+
+        Returns:
+            Dicionário com total_teams, total_players, total_games,
+            total_competitions, active_competitions, recent_games e
+            scheduled_games
+        """
+        with self._condition:
+            while True:
+                if self._stats is not None and time.monotonic() < self._expires_at:
+                    return self._stats
+                if not self._refreshing:
+                    self._refreshing = True
+                    break
+                if self._stats is not None:
+                    # Outra requisição já está recalculando: serve o valor anterior
+                    return self._stats
+                self._condition.wait()
+
+        stats = None
+        try:
+            stats = self._load()
+            return stats
+        finally:
+            with self._condition:
+                if stats is not None:
+                    self._stats = stats
+                    self._expires_at = time.monotonic() + self.ttl
+                self._refreshing = False
+                self._condition.notify_all()
+
+    def invalidate(self):
+        """Força o recálculo na próxima leitura"""
+        with self._condition:
+            self._expires_at = 0.0
+
+    def _load(self) -> Dict[str, int]:
+        session = SessionLocal()
+        try:
+            row = session.execute(_stats_query()).mappings().one()
+            return {key: int(value or 0) for key, value in row.items()}
+        finally:
+            session.close()
+
+
+# Instância global do serviço de estatísticas do dashboard
+dashboard_stats = DashboardStatsService()
+
+
+def init_dashboard_stats(app):
+    """Aplica DASHBOARD_STATS_TTL da configuração da aplicação"""
+    dashboard_stats.ttl = app.config.get('DASHBOARD_STATS_TTL', DEFAULT_TTL)
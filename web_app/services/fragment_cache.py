@@ -0,0 +1,223 @@
+"""
+Cache de fragmentos de template (Jinja)
+
+Uso nos templates:
+
+    {% cache 'standings-table', competition=competition.id, ttl=300 %}
+        ... trecho pesado ...
+    {% endcache %}
+
+Os fragmentos ficam em um LRU em memória e, opcionalmente, em um
+armazenamento compartilhado entre processos (qualquer objeto com
+get(key) e set(key, value, ttl)). A chave inclui a geração de dados da
+competição: gravações em jogos, inscrições ou na própria competição
+incrementam apenas a geração daquela competição, invalidando somente os
+fragmentos dela. Fragmentos que resumem todas as competições usam
+competition='all', invalidado a cada gravação.
+
+Com vários workers (WEB_MULTIPROCESS) e sem armazenamento compartilhado,
+a geração é lida de resource_revisions, incrementada na mesma transação
+da gravação: a invalidação feita por um worker vale para todos.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Set
+
+from jinja2 import nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+from sqlalchemy import event
+from sqlalchemy.orm import object_session
+from sqlalchemy.orm.base import NO_VALUE
+
+from web_app.database.database import SessionLocal
+from web_app.database.models import Competition, Game, TeamCompetition
+from web_app.services.revisions import bump, current
+
+DEFAULT_TTL = 300
+DEFAULT_MAX_ENTRIES = 512
+
+
+class FragmentCache:
+    """LRU de fragmentos renderizados com TTL e gerações por competição"""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, storage: Any = None,
+                 shared_generations: bool = False):
+        self.max_entries = max_entries
+        self.storage = storage
+        self.shared_generations = shared_generations
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._generations: Dict[Any, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def make_key(self, key: Any, competition: Any = None) -> str:
+        """Monta a chave final incluindo a geração de dados da competição"""
+        parts = key if isinstance(key, (list, tuple)) else (key,)
+        generation = self._generation(competition)
+        return ':'.join(str(part) for part in parts) + f"|c={competition}|g={generation}"
+
+    def get_or_render(self, key: Any, render: Callable[[], str], ttl: int = DEFAULT_TTL,
+                      competition: Any = None) -> str:
+        """Retorna o fragmento em cache ou renderiza e armazena"""
+        cache_key = self.make_key(key, competition)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(cache_key)
+                self.hits += 1
+                return entry[1]
+
+        if self.storage is not None:
+            value = self.storage.get(cache_key)
+            if value is not None:
+                if isinstance(value, bytes):
+                    value = value.decode('utf-8')
+                self._store(cache_key, value, ttl, now)
+                self.hits += 1
+                return value
+
+        value = render()
+        self.misses += 1
+        self._store(cache_key, value, ttl, now)
+        if self.storage is not None:
+            self.storage.set(cache_key, value, ttl)
+        return value
+
+    def _store(self, cache_key: str, value: str, ttl: int, now: float):
+        with self._lock:
+            self._entries[cache_key] = (now + ttl, value)
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _generation(self, competition: Any) -> int:
+        if competition is None:
+            return 0
+        if self.storage is not None:
+            # Geração compartilhada para que outros processos vejam a invalidação
+            value = self.storage.get(f"fragment-generation:{competition}")
+            return int(value) if value is not None else 0
+        if self.shared_generations:
+            name = revision_name(competition)
+            return current([name])[name][0]
+        return self._generations.get(competition, 0)
+
+    def invalidate_competition(self, competition_id: Any):
+        """Invalida os fragmentos de uma competição e os marcados com competition='all'"""
+        for competition in (competition_id, 'all'):
+            generation = self._generation(competition) + 1
+            with self._lock:
+                self._generations[competition] = generation
+                # Entradas da geração antiga deixam de ser alcançáveis; libera já
+                stale = [key for key in self._entries if f"|c={competition}|" in key]
+                for key in stale:
+                    del self._entries[key]
+            if self.storage is not None:
+                self.storage.set(f"fragment-generation:{competition}", str(generation), None)
+
+    def clear(self):
+        """Remove todos os fragmentos em memória"""
+        with self._lock:
+            self._entries.clear()
+
+
+def revision_name(competition: Any) -> str:
+    """Nome da geração de fragmentos de uma competição em resource_revisions"""
+    return f"fragments:competition:{competition}"
+
+
+# Instância global do cache de fragmentos
+fragment_cache = FragmentCache()
+
+
+class FragmentCacheExtension(Extension):
+    """Extensão Jinja que adiciona o bloco {% cache key, ttl=..., competition=... %}"""
+
+    tags = {'cache'}
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        key = parser.parse_expression()
+        ttl = nodes.Const(DEFAULT_TTL)
+        competition = nodes.Const(None)
+
+        while parser.stream.skip_if('comma'):
+            name = parser.stream.expect('name').value
+            parser.stream.expect('assign')
+            value = parser.parse_expression()
+            if name == 'ttl':
+                ttl = value
+            elif name == 'competition':
+                competition = value
+            else:
+                parser.fail(f"Argumento desconhecido para cache: {name}", lineno)
+
+        body = parser.parse_statements(('name:endcache',), drop_needle=True)
+        return nodes.CallBlock(self.call_method('_render_cached', [key, ttl, competition]),
+                               [], [], body).set_lineno(lineno)
+
+    def _render_cached(self, key, ttl, competition, caller):
+        return Markup(fragment_cache.get_or_render(key, caller, ttl, competition))
+
+
+def _collect_competitions(session, flush_context, instances):
+    """Anota as competições afetadas pelas alterações da sessão"""
+    changed: Set[Any] = session.info.setdefault('fragment_cache_competitions', set())
+    for obj in _iter_changes(session):
+        if isinstance(obj, Competition):
+            changed.add(obj.id)
+        elif isinstance(obj, (Game, TeamCompetition)):
+            changed.add(obj.competition_id)
+
+
+def _track_competition_move(target, value, oldvalue, initiator):
+    """Jogo ou inscrição movidos de competição: a competição antiga também muda"""
+    session = object_session(target)
+    if session is not None and oldvalue is not None and oldvalue is not NO_VALUE and oldvalue != value:
+        session.info.setdefault('fragment_cache_competitions', set()).add(oldvalue)
+
+
+def _iter_changes(session) -> Iterable[Any]:
+    yield from session.new
+    yield from session.dirty
+    yield from session.deleted
+
+
+def _publish_generations(session, flush_context):
+    """Incrementa as gerações compartilhadas na transação da gravação"""
+    changed = session.info.get('fragment_cache_competitions')
+    if changed:
+        names = [revision_name(competition) for competition in changed if competition is not None]
+        bump(session.connection(), names + [revision_name('all')])
+
+
+def _invalidate_after_commit(session):
+    for competition_id in session.info.pop('fragment_cache_competitions', ()):
+        if competition_id is not None:
+            fragment_cache.invalidate_competition(competition_id)
+
+
+def _discard_after_rollback(session):
+    session.info.pop('fragment_cache_competitions', None)
+
+
+def init_fragment_cache(app):
+    """Registra a extensão Jinja e a invalidação automática por competição"""
+    fragment_cache.max_entries = app.config.get('FRAGMENT_CACHE_MAX_ENTRIES', DEFAULT_MAX_ENTRIES)
+    fragment_cache.storage = app.config.get('FRAGMENT_CACHE_STORAGE')
+    fragment_cache.shared_generations = app.config.get('WEB_MULTIPROCESS', False)
+    app.jinja_env.add_extension(FragmentCacheExtension)
+
+    if not event.contains(SessionLocal, 'before_flush', _collect_competitions):
+        event.listen(SessionLocal, 'before_flush', _collect_competitions)
+        event.listen(SessionLocal, 'after_flush', _publish_generations)
+        event.listen(SessionLocal, 'after_commit', _invalidate_after_commit)
+        event.listen(SessionLocal, 'after_rollback', _discard_after_rollback)
+        for model in (Game, TeamCompetition):
+            # active_history carrega o valor anterior mesmo com o atributo expirado
+            event.listen(model.competition_id, 'set', _track_competition_move, active_history=True)
@@ -0,0 +1,265 @@
+"""
+Ingestão em lote de resultados de jogos
+
+Recebe os resultados de uma rodada inteira (placares e eventos) e os aplica
+com um número fixo de consultas, independente da quantidade de jogos:
+
+    1. jogos do lote                       (1 SELECT ... IN)
+    2. jogadores citados nos eventos       (1 SELECT ... IN)
+    3. placares + estatísticas             (UPDATE/DELETE/INSERT em lote)
+    4. jogos finalizados das competições   (1 SELECT ... IN)
+    5. inscrições das competições          (1 SELECT ... IN + UPDATE em lote)
+
+Tudo acontece em uma única transação e a classificação de cada competição
+afetada é recalculada uma única vez. Itens inválidos não impedem os demais:
+a resposta traz o status de cada item.
+"""
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import func, insert, update
+
+from web_app.database.database import SessionLocal
+from desktop_app.utils.live_events import live_event_hub
+from web_app.database.models import Game, Player, PlayerStatistic, TeamCompetition
+from desktop_app.utils.statistics_aggregator import GameColumns, aggregate_competition
+
+MAX_BATCH_SIZE = 500
+WIN_POINTS = 3
+DRAW_POINTS = 1
+
+RESULT_STATUSES = ('finished', 'in_progress')
+CLOSED_STATUSES = ('cancelled',)
+
+# Tipo de evento -> coluna de PlayerStatistic
+EVENT_COLUMNS = {
+    'goal': 'goals',
+    'assist': 'assists',
+    'yellow_card': 'yellow_cards',
+    'red_card': 'red_cards'
+}
+
+
+class ResultBatchError(ValueError):
+    """Lote malformado como um todo (responde 400)"""
+
+
+def _as_int(value: Any) -> Optional[int]:
+    if isinstance(value, bool):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _validate_item(item: Any, games: Dict[int, Game],
+                   player_teams: Dict[int, Optional[int]]) -> List[str]:
+    """Valida um item do lote contra os dados já carregados"""
+    if not isinstance(item, dict):
+        return ["Item deve ser um objeto"]
+
+    errors = []
+    game = games.get(_as_int(item.get('game_id')))
+    if game is None:
+        return [f"Jogo não encontrado: {item.get('game_id')}"]
+    if (game.status or '').lower() in CLOSED_STATUSES:
+        errors.append("Jogo cancelado não aceita resultado")
+
+    for field in ('home_score', 'away_score'):
+        score = _as_int(item.get(field))
+        if score is None or score < 0:
+            errors.append(f"{field} deve ser um inteiro não negativo")
+
+    status = str(item.get('status', 'finished')).lower()
+    if status not in RESULT_STATUSES:
+        errors.append(f"Status inválido: {item.get('status')}")
+
+    events = item.get('events', [])
+    if not isinstance(events, list):
+        return errors + ["events deve ser uma lista"]
+
+    game_teams = {game.home_team_id, game.away_team_id}
+    for position, event in enumerate(events):
+        if not isinstance(event, dict):
+            errors.append(f"Evento {position}: deve ser um objeto")
+            continue
+        if event.get('type') not in EVENT_COLUMNS:
+            errors.append(f"Evento {position}: tipo inválido {event.get('type')}")
+        player_id = _as_int(event.get('player_id'))
+        if player_id not in player_teams:
+            errors.append(f"Evento {position}: jogador não encontrado {event.get('player_id')}")
+        elif player_teams[player_id] not in game_teams:
+            errors.append(f"Evento {position}: jogador {player_id} não pertence às equipes do jogo")
+
+    return errors
+
+
+def _player_ids(items: Iterable[Any]) -> Set[int]:
+    ids = set()
+    for item in items:
+        if isinstance(item, dict) and isinstance(item.get('events'), list):
+            for event in item['events']:
+                if isinstance(event, dict) and _as_int(event.get('player_id')) is not None:
+                    ids.add(_as_int(event['player_id']))
+    return ids
+
+
+def _statistics_rows(game_id: int, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Consolida os eventos de um jogo em uma linha de estatística por jogador"""
+    totals: Dict[int, Dict[str, int]] = defaultdict(lambda: dict.fromkeys(EVENT_COLUMNS.values(), 0))
+    minutes: Dict[int, int] = {}
+    for event in events:
+        player_id = int(event['player_id'])
+        totals[player_id][EVENT_COLUMNS[event['type']]] += 1
+        minute = _as_int(event.get('minute'))
+        if minute is not None:
+            minutes[player_id] = max(minutes.get(player_id, 0), minute)
+
+    return [dict(player_id=player_id, game_id=game_id, minutes_played=minutes.get(player_id, 0), **columns)
+            for player_id, columns in totals.items()]
+
+
+def recompute_standings(session, competition_ids: Iterable[int]) -> Dict[int, int]:
+    """
+    Recalcula a classificação das competições informadas
+
+    Args:
+        session: Sessão SQLAlchemy da transação corrente
+        competition_ids: Competições afetadas
+
+    Returns:
+        Dicionário competition_id -> número de inscrições atualizadas
+    """
+    competition_ids = [cid for cid in set(competition_ids) if cid is not None]
+    if not competition_ids:
+        return {}
+
+    rows = (session.query(Game.competition_id, Game.id, Game.home_team_id, Game.away_team_id,
+                          Game.home_score, Game.away_score)
+            .filter(Game.competition_id.in_(competition_ids),
+                    Game.home_score.isnot(None), Game.away_score.isnot(None),
+                    func.lower(Game.status) == 'finished')
+            .all())
+
+    columns_by_competition: Dict[int, GameColumns] = defaultdict(GameColumns)
+    for competition_id, *game in rows:
+        columns_by_competition[competition_id].append(*game)
+
+    updated: Dict[int, int] = defaultdict(int)
+    registrations = (session.query(TeamCompetition.id, TeamCompetition.competition_id,
+                                   TeamCompetition.team_id)
+                     .filter(TeamCompetition.competition_id.in_(competition_ids))
+                     .all())
+    team_stats = {cid: aggregate_competition(columns)['teams']
+                  for cid, columns in columns_by_competition.items()}
+
+    # Todas as colunas em todas as linhas: um único UPDATE por chave primária em lote
+    empty = {'wins': 0, 'draws': 0, 'losses': 0, 'goals_for': 0, 'goals_against': 0}
+    values = []
+    for registration_id, competition_id, team_id in registrations:
+        stats = team_stats.get(competition_id, {}).get(team_id, empty)
+        values.append({
+            'id': registration_id,
+            'wins': stats['wins'],
+            'draws': stats['draws'],
+            'losses': stats['losses'],
+            'goals_for': stats['goals_for'],
+            'goals_against': stats['goals_against'],
+            'points': stats['wins'] * WIN_POINTS + stats['draws'] * DRAW_POINTS
+        })
+        updated[competition_id] += 1
+    if values:
+        session.execute(update(TeamCompetition), values)
+
+    return dict(updated)
+
+
+def ingest_results(items: List[Any]) -> Dict[str, Any]:
+    """
+    Valida e aplica um lote de resultados em uma única transação
+
+    Args:
+        items: Lista de {game_id, home_score, away_score, status?, events?},
+            com events no formato [{player_id, type, minute?}]. Os eventos
+            enviados substituem as estatísticas já gravadas do jogo.
+
+    Returns:
+        Dicionário com o status de cada item e os totais do lote
+    """
+    if not isinstance(items, list) or not items:
+        raise ResultBatchError("Envie uma lista não vazia de resultados")
+    if len(items) > MAX_BATCH_SIZE:
+        raise ResultBatchError(f"O lote aceita no máximo {MAX_BATCH_SIZE} resultados")
+
+    game_ids = {_as_int(item.get('game_id')) for item in items if isinstance(item, dict)}
+    game_ids.discard(None)
+
+    session = SessionLocal()
+    try:
+        games = {game.id: game for game in
+                 session.query(Game).filter(Game.id.in_(game_ids))} if game_ids else {}
+        player_ids = _player_ids(items)
+        player_teams = dict(session.query(Player.id, Player.team_id)
+                            .filter(Player.id.in_(player_ids))) if player_ids else {}
+
+        results: List[Dict[str, Any]] = []
+        accepted: List[Tuple[Game, Dict[str, Any]]] = []
+        seen: Set[int] = set()
+        for index, item in enumerate(items):
+            errors = _validate_item(item, games, player_teams)
+            game_id = _as_int(item.get('game_id')) if isinstance(item, dict) else None
+            if not errors and game_id in seen:
+                errors = ["Jogo repetido no lote"]
+            if errors:
+                results.append({'index': index, 'game_id': game_id, 'status': 'error', 'errors': errors})
+                continue
+            seen.add(game_id)
+            accepted.append((games[game_id], item))
+            results.append({'index': index, 'game_id': game_id, 'status': 'updated'})
+
+        if accepted:
+            for game, item in accepted:
+                game.home_score = int(item['home_score'])
+                game.away_score = int(item['away_score'])
+                game.status = str(item.get('status', 'finished')).lower()
+
+            with_events = [(game, item) for game, item in accepted if 'events' in item]
+            if with_events:
+                (session.query(PlayerStatistic)
+                 .filter(PlayerStatistic.game_id.in_([game.id for game, _ in with_events]))
+                 .delete(synchronize_session=False))
+                rows = [row for game, item in with_events for row in _statistics_rows(game.id, item['events'])]
+                if rows:
+                    session.execute(insert(PlayerStatistic), rows)
+
+            session.flush()
+            standings = recompute_standings(session, (game.competition_id for game, _ in accepted))
+
+            # Montados antes do commit: depois dele os jogos expiram e cada leitura
+            # de atributo faria um SELECT por jogo
+            published = [({
+                'game_id': game.id,
+                'home_score': game.home_score,
+                'away_score': game.away_score,
+                'status': game.status
+            }, game.competition_id) for game, _ in accepted]
+            session.commit()
+
+            for payload, competition_id in published:
+                live_event_hub.publish('score', payload, game_id=payload['game_id'],
+                                       competition_id=competition_id)
+        else:
+            standings = {}
+
+        return {
+            'results': results,
+            'updated': len(accepted),
+            'failed': len(items) - len(accepted),
+            'standings_recomputed': sorted(standings)
+        }
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
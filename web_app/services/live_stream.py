@@ -0,0 +1,49 @@
+"""
+Streams Server-Sent Events dos placares ao vivo
+
+Cada conexão SSE é apenas uma inscrição no hub de eventos: nenhuma consulta
+ao banco é feita enquanto o cliente acompanha o jogo. Linhas de comentário
+(heartbeat) mantêm a conexão aberta através de proxies.
+"""
+import json
+from typing import Iterable, Iterator, Optional
+
+from flask import Response, stream_with_context
+
+from desktop_app.utils.live_events import live_event_hub
+
+HEARTBEAT_INTERVAL = 15
+RETRY_MILLISECONDS = 3000
+
+
+def _format_event(event) -> str:
+    data = json.dumps(event['data'], default=str)
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {data}\n\n"
+
+
+def event_stream(channels: Iterable[str], last_event_id: Optional[str] = None) -> Iterator[str]:
+    """
+    Gera as mensagens SSE dos canais informados até o cliente desconectar
+
+    Args:
+        channels: Canais do hub (game:<id>, competition:<id>)
+        last_event_id: Cabeçalho Last-Event-ID enviado na reconexão
+    """
+    subscription = live_event_hub.subscribe(channels, last_event_id)
+    try:
+        yield f"retry: {RETRY_MILLISECONDS}\n\n"
+        while True:
+            event = subscription.get(timeout=HEARTBEAT_INTERVAL)
+            yield ": heartbeat\n\n" if event is None else _format_event(event)
+    finally:
+        # GeneratorExit quando o cliente fecha a conexão
+        live_event_hub.unsubscribe(subscription)
+
+
+def sse_response(channels: Iterable[str], last_event_id: Optional[str] = None) -> Response:
+    """Resposta HTTP em streaming para um EventSource"""
+    response = Response(stream_with_context(event_stream(list(channels), last_event_id)),
+                        mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,80 @@
+"""
+Contagem de comandos SQL por rota
+
+Ferramentas para garantir que as listagens não voltem a fazer uma consulta
+por linha (N+1):
+
+    with assert_max_statements(3):
+        client.get('/games/')
+
+    @game_bp.route('/')
+    @login_required
+    @statement_budget(1)
+    def list_games(): ...
+
+Com ENFORCE_STATEMENT_BUDGETS=True na configuração da aplicação (testes,
+desenvolvimento), uma rota que exceder o próprio orçamento gera
+AssertionError com a lista dos comandos executados.
+"""
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from typing import Iterator, List
+
+from flask import current_app
+from sqlalchemy import event
+
+from web_app.database.database import engine
+
+
+@contextmanager
+def count_statements(bind=engine) -> Iterator[List[str]]:
+    """
+    Registra os comandos SQL executados pela thread atual
+
+    Yields:
+        Lista (preenchida durante o bloco) com o texto de cada comando
+    """
+    statements: List[str] = []
+    thread_id = threading.get_ident()
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if threading.get_ident() == thread_id:
+            statements.append(statement)
+
+    event.listen(bind, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(bind, 'before_cursor_execute', before_cursor_execute)
+
+
+@contextmanager
+def assert_max_statements(max_count: int, bind=engine) -> Iterator[List[str]]:
+    """Falha se o bloco executar mais de max_count comandos SQL"""
+    with count_statements(bind) as statements:
+        yield statements
+    if len(statements) > max_count:
+        listing = '\n'.join(f"  {i + 1}. {sql}" for i, sql in enumerate(statements))
+        raise AssertionError(f"Esperado no máximo {max_count} comando(s) SQL, "
+                             f"executados {len(statements)}:\n{listing}")
+
+
+def statement_budget(max_count: int):
+    """
+    Declara o número máximo de comandos SQL da rota
+
+    O orçamento fica em view.statement_budget e só é verificado quando
+    ENFORCE_STATEMENT_BUDGETS está ativo.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not current_app.config.get('ENFORCE_STATEMENT_BUDGETS'):
+                return view(*args, **kwargs)
+            with assert_max_statements(max_count):
+                return view(*args, **kwargs)
+
+        wrapper.statement_budget = max_count
+        return wrapper
+    return decorator
@@ -0,0 +1,88 @@
+"""
+Revisões monotônicas por recurso no banco web
+
+Cada flush de uma sessão incrementa, na mesma transação, a revisão das
+tabelas alteradas em resource_revisions. Como a tabela fica no próprio
+banco, todos os workers enxergam a mesma revisão: ETags e caches comparam
+um número que só cresce, em vez de datas com resolução de um segundo.
+
+Outros módulos podem incrementar chaves derivadas (por exemplo, a geração
+dos fragmentos de uma competição) com bump().
+"""
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import event, insert, select, update
+
+from web_app.database.database import SessionLocal
+from web_app.database.models import ResourceRevision
+
+# (revisão, data da última alteração)
+Revision = Tuple[int, Optional[datetime]]
+
+_TABLE = ResourceRevision.__table__
+
+
+def bump(connection, names: Iterable[str]):
+    """
+    Incrementa as revisões na conexão (e transação) informada
+
+    Os nomes são processados em ordem para que duas transações nunca
+    disputem as mesmas linhas em ordens diferentes.
+    """
+    now = datetime.utcnow()
+    for name in sorted(set(names)):
+        result = connection.execute(
+            update(_TABLE).where(_TABLE.c.name == name)
+            .values(revision=_TABLE.c.revision + 1, updated_at=now)
+        )
+        if result.rowcount == 0:
+            connection.execute(insert(_TABLE).values(name=name, revision=1, updated_at=now))
+
+
+def current(names: Iterable[str]) -> Dict[str, Revision]:
+    """Revisões atuais em um único SELECT (recursos nunca alterados valem 0)"""
+    names = list(names)
+    session = SessionLocal()
+    try:
+        rows = session.execute(
+            select(_TABLE.c.name, _TABLE.c.revision, _TABLE.c.updated_at)
+            .where(_TABLE.c.name.in_(names))
+        ).all()
+    finally:
+        session.close()
+    found = {row.name: (row.revision, row.updated_at) for row in rows}
+    return {name: found.get(name, (0, None)) for name in names}
+
+
+def _changed_tables(session) -> Set[str]:
+    tables = set()
+    for objects in (session.new, session.dirty, session.deleted):
+        for obj in objects:
+            table = getattr(obj, '__tablename__', None)
+            if table and table != ResourceRevision.__tablename__:
+                tables.add(table)
+    return tables
+
+
+def _bump_after_flush(session, flush_context):
+    # Ainda dentro da transação do flush: a revisão é gravada junto com os dados
+    tables = _changed_tables(session)
+    if tables:
+        bump(session.connection(), tables)
+
+
+def _bump_bulk_statement(orm_execute_state):
+    """UPDATE/DELETE/INSERT em massa via session.execute() não passam pelo flush"""
+    if orm_execute_state.is_select:
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and mapper.local_table is not _TABLE:
+        bump(orm_execute_state.session.connection(), [mapper.local_table.name])
+
+
+def init_revisions():
+    """Registra o incremento automático de revisões nas sessões web"""
+    if not event.contains(SessionLocal, 'after_flush', _bump_after_flush):
+        event.listen(SessionLocal, 'after_flush', _bump_after_flush)
+        event.listen(SessionLocal, 'do_orm_execute', _bump_bulk_statement)
@@ -0,0 +1,117 @@
+"""
+Cache do user_loader do Flask-Login
+
+O usuário logado é carregado a cada requisição autenticada, antes de
+qualquer rota. Este cache guarda cópias imutáveis e desconectadas da sessão
+(UserSnapshot) por alguns segundos, em um LRU de tamanho limitado. As rotas
+que alteram usuários chamam user_cache.invalidate(user_id).
+
+A invalidação explícita só alcança o próprio processo. Com vários workers
+(WEB_MULTIPROCESS), cada entrada guarda também a revisão da tabela users
+(resource_revisions) e só é usada enquanto essa revisão não mudar: uma
+leitura de uma linha por chave primária no lugar da carga do usuário.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from flask_login import UserMixin
+
+from web_app.database.database import SessionLocal
+from web_app.database.models import User
+from web_app.services.revisions import current
+
+DEFAULT_TTL = 60
+DEFAULT_MAX_ENTRIES = 1024
+
+
+class UserSnapshot(UserMixin):
+    """Cópia somente leitura dos dados do usuário usados pelas rotas e templates"""
+
+    __slots__ = ('id', 'username', 'email', 'name', 'user_type', 'is_active',
+                 'created_at', 'updated_at')
+
+    def __init__(self, user: User):
+        for field in self.__slots__:
+            object.__setattr__(self, field, getattr(user, field))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("UserSnapshot é somente leitura")
+
+    @property
+    def full_name(self) -> str:
+        return self.name
+
+    def get_id(self):
+        return str(self.id)
+
+
+class UserLoaderCache:
+    """LRU com TTL de UserSnapshot por id"""
+
+    def __init__(self, ttl: float = DEFAULT_TTL, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 shared: bool = False):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.shared = shared
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: int) -> Optional[UserSnapshot]:
+        """Retorna o usuário do cache ou carrega do banco"""
+        now = time.monotonic()
+        # Lida antes da carga: uma gravação no meio faz a próxima requisição recarregar
+        revision = self._revision()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] > now and entry[2] == revision:
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return entry[1]
+
+        snapshot = self._load(user_id)
+        self.misses += 1
+        if snapshot is not None:
+            with self._lock:
+                self._entries[user_id] = (now + self.ttl, snapshot, revision)
+                self._entries.move_to_end(user_id)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return snapshot
+
+    def invalidate(self, user_id: int):
+        """Descarta o usuário do cache (após edição, exclusão ou troca de senha)"""
+        with self._lock:
+            self._entries.pop(int(user_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _revision(self) -> int:
+        if not self.shared:
+            return 0
+        return current([User.__tablename__])[User.__tablename__][0]
+
+    @staticmethod
+    def _load(user_id: int) -> Optional[UserSnapshot]:
+        session = SessionLocal()
+        try:
+            user = session.get(User, user_id)
+            return UserSnapshot(user) if user is not None else None
+        finally:
+            session.close()
+
+
+# Instância global do cache de usuários
+user_cache = UserLoaderCache()
+
+
+def init_user_cache(app):
+    """Aplica USER_CACHE_TTL, USER_CACHE_MAX_ENTRIES e WEB_MULTIPROCESS da configuração"""
+    user_cache.ttl = app.config.get('USER_CACHE_TTL', DEFAULT_TTL)
+    user_cache.max_entries = app.config.get('USER_CACHE_MAX_ENTRIES', DEFAULT_MAX_ENTRIES)
+    user_cache.shared = app.config.get('WEB_MULTIPROCESS', False)